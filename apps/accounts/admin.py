@@ -3,7 +3,7 @@ Django admin configuration for accounts app.
 """
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, UserProfile, StylePreference, UserFollowing
+from .models import User, UserProfile, StylePreference, UserFollowing, AccountDeletion
 
 
 @admin.register(User)
@@ -47,3 +47,13 @@ class UserFollowingAdmin(admin.ModelAdmin):
     raw_id_fields = ['follower', 'following']
     date_hierarchy = 'created_at'
 
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    """Admin interface for AccountDeletion model (teardown progress)."""
+    list_display = ['user', 'status', 'step', 'attempts', 'created_at', 'completed_at']
+    list_filter = ['status']
+    search_fields = ['user__username']
+    raw_id_fields = ['user']
+    readonly_fields = ['step', 'progress', 'error', 'attempts', 'started_at', 'completed_at']
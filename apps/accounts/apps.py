@@ -6,3 +6,6 @@ class AccountsConfig(AppConfig):
     name = 'apps.accounts'
     verbose_name = 'User Accounts'
 
+    def ready(self):
+        from .signals import connect_user_cache_signals
+        connect_user_cache_signals()
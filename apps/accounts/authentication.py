@@ -0,0 +1,130 @@
+"""
+Cached JWT authentication for CuratorAI.
+
+SimpleJWT's JWTAuthentication loads the User row from the database on every
+request. CachedJWTAuthentication resolves it from a two-tier cache instead:
+
+* a per-user *version* lives in the shared Django cache (Redis in
+  production) and is bumped whenever the user or one of its one-to-one
+  relations is saved, so invalidation is visible to every worker at once;
+* the pickled user is cached under ``(user id, version)`` in the shared cache
+  and, for a few seconds, in process memory (see core.cache).
+
+Every request gets its own unpickled copy, so views can mutate
+``request.user`` safely. If the cache is unavailable we fall back to the
+database, exactly like the stock backend.
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from core.cache import VersionedCache
+from core.db.routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTH_USER_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TTL': 60,
+    'LOCAL_TTL': 5,
+    'SELECT_RELATED': [],
+}
+
+
+def auth_user_cache_config():
+    """AUTH_USER_CACHE settings merged over the defaults."""
+    return {**DEFAULT_AUTH_USER_CACHE, **getattr(settings, 'AUTH_USER_CACHE', {})}
+
+
+class UserCache(VersionedCache):
+    """Two-tier store of authenticated users, with one version per user (see core.cache)."""
+
+    def __init__(self):
+        super().__init__('auth:user', auth_user_cache_config)
+
+    def get(self, user_id):
+        """Return ``(user or None, version)``; version is None if the cache is down."""
+        try:
+            version = self.current_version(user_id)
+        except Exception as e:
+            logger.debug(f'Auth user cache unavailable: {str(e)}')
+            return None, None
+        return self.read(user_id, version), version
+
+    def set(self, user, version):
+        """Cache ``user`` under ``version`` in both tiers."""
+        if version is not None:
+            self.write(user.pk, version, user)
+
+    def invalidate(self, user_id):
+        """Bump the user's version so every worker stops serving cached copies."""
+        self.bump(user_id, keys=[user_id])
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(user_id):
+    """
+    Invalidate the cached authentication state for ``user_id``.
+
+    Invalidates immediately and again once the surrounding transaction
+    commits, so a request that re-reads the not-yet-committed row in between
+    can't keep a stale copy cached.
+    """
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from UserCache before the database.
+
+    The one-to-one relations listed in ``AUTH_USER_CACHE['SELECT_RELATED']``
+    (e.g. ``profile``, ``style_preference``) are loaded with the user and
+    cached alongside it, so views touching them don't issue extra queries.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user, version = user_cache.get(user_id)
+        if user is None:
+            queryset = self.user_model.objects.all()
+            select_related = auth_user_cache_config()['SELECT_RELATED']
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            try:
+                # Read from the primary: a lagging replica could cache a stale
+                # user under the freshly bumped version.
+                with use_primary():
+                    user = queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            user_cache.set(user, version)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code='password_changed'
+                )
+
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI security scheme for CachedJWTAuthentication (same as SimpleJWT's)."""
+    target_class = 'apps.accounts.authentication.CachedJWTAuthentication'
@@ -0,0 +1,448 @@
+"""
+Management command to generate large synthetic datasets quickly.
+
+Unlike ``seed_data`` (which builds a small, hand-crafted dataset one
+``create()`` at a time), this command streams rows in batches through
+PostgreSQL ``COPY`` when available and ``bulk_create`` otherwise. Follower
+and like counts follow a power-law, so the resulting tables have the same
+skew as production and produce realistic query plans.
+
+Usage:
+    python manage.py seed_bulk --users 100000 --posts 1000000 --post-likes 10000000
+"""
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+from apps.accounts.models import UserProfile, StylePreference, UserFollowing
+from apps.outfits.models import Outfit, OutfitItem, OutfitLike
+from apps.lookbooks.models import Lookbook, LookbookOutfit
+from apps.social.models import Post, PostLike
+from apps.tags.models import LookbookTag, OutfitTag, PostTag, Tag
+from apps.tags.sync import backfill_tags
+
+User = get_user_model()
+
+STYLES = [
+    'minimalist', 'boho', 'streetwear', 'preppy', 'vintage', 'modern', 'classic',
+    'edgy', 'romantic', 'athleisure', 'chic', 'casual', 'elegant', 'urban',
+]
+COLORS = [
+    'black', 'white', 'navy', 'beige', 'gray', 'brown', 'olive', 'burgundy',
+    'camel', 'cream', 'charcoal', 'blush', 'sage', 'rust', 'emerald', 'denim',
+]
+BRANDS = ['Zara', 'H&M', 'Uniqlo', 'COS', 'Everlane', 'Reformation', 'Madewell', 'Arket', 'Ganni']
+OUTFIT_ITEM_TYPES = ['top', 'bottom', 'shoes', 'outerwear', 'accessory']
+OCCASIONS = ['casual', 'work', 'formal', 'party', 'date', 'travel']
+SEASONS = ['spring', 'summer', 'fall', 'winter', 'all']
+LOOKBOOK_OCCASIONS = ['casual', 'work', 'formal', 'party', 'travel', 'vacation']
+
+
+class BulkWriter:
+    """
+    Stream rows into a model's table in fixed-size batches.
+
+    Rows are plain tuples matching ``fields``; every other concrete column is
+    filled with the field's default (and ``now`` for auto timestamps), so
+    callers only describe the columns they care about. On PostgreSQL with
+    psycopg 3 each batch is loaded with ``COPY ... FROM STDIN``; elsewhere it
+    falls back to ``bulk_create``.
+    """
+
+    def __init__(self, batch_size=10000, use_copy=True, now=None):
+        self.batch_size = batch_size
+        self.now = now or timezone.now()
+        self.use_copy = use_copy and self._copy_supported()
+
+    @staticmethod
+    def _copy_supported():
+        if connection.vendor != 'postgresql':
+            return False
+        try:
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        except ImportError:
+            return False
+        return is_psycopg3
+
+    def _columns(self, model, fields):
+        """Resolve the full column list and the constant tail for each row."""
+        opts = model._meta
+        given = set(fields)
+        extra_fields = []
+        extra_values = []
+        for field in opts.concrete_fields:
+            if field.primary_key or field.attname in given:
+                continue
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                value = self.now
+            else:
+                value = field.get_default()
+            extra_fields.append(field.attname)
+            extra_values.append(value)
+        return list(fields) + extra_fields, tuple(extra_values)
+
+    def write(self, model, fields, rows):
+        """Insert all ``rows`` and return how many were written."""
+        attnames, tail = self._columns(model, fields)
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(tuple(row) + tail)
+            if len(batch) >= self.batch_size:
+                written += self._flush(model, attnames, batch)
+                batch = []
+        if batch:
+            written += self._flush(model, attnames, batch)
+        return written
+
+    def _flush(self, model, attnames, batch):
+        if self.use_copy:
+            self._copy(model, attnames, batch)
+        else:
+            objs = [model(**dict(zip(attnames, row))) for row in batch]
+            with explicit_timestamps(model), transaction.atomic():
+                model.objects.bulk_create(objs, batch_size=self.batch_size)
+        return len(batch)
+
+    def _copy(self, model, attnames, batch):
+        opts = model._meta
+        by_attname = {f.attname: f for f in opts.concrete_fields}
+        columns = []
+        json_positions = []
+        for position, name in enumerate(attnames):
+            field = by_attname[name]
+            columns.append(connection.ops.quote_name(field.column))
+            if isinstance(field, models.JSONField):
+                json_positions.append(position)
+        sql = f'COPY {connection.ops.quote_name(opts.db_table)} ({", ".join(columns)}) FROM STDIN'
+        with transaction.atomic(), connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in batch:
+                    if json_positions:
+                        row = list(row)
+                        for position in json_positions:
+                            row[position] = json.dumps(row[position])
+                    copy.write_row(row)
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """
+    Temporarily disable auto_now/auto_now_add so generated timestamps are kept.
+
+    bulk_create runs ``pre_save`` on every field, which would otherwise
+    overwrite back-dated ``created_at`` values with the current time.
+    """
+    toggled = []
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            toggled.append((field, field.auto_now, field.auto_now_add))
+            field.auto_now = False
+            field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in toggled:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def power_law_counts(rng, n, total, alpha, cap):
+    """
+    Split ``total`` across ``n`` slots with Pareto-distributed weights.
+
+    Every count is capped at ``cap`` (e.g. the number of distinct users who
+    could possibly like a post), so the sum can come out slightly below
+    ``total`` for very skewed distributions.
+    """
+    if n <= 0 or total <= 0:
+        return [0] * max(n, 0)
+    weights = [rng.paretovariate(alpha) for _ in range(n)]
+    scale = total / sum(weights)
+    return [min(cap, int(w * scale + rng.random())) for w in weights]
+
+
+def sample_distinct(rng, population, k, exclude=None, cum_weights=None):
+    """
+    Draw ``k`` distinct members of ``population``, optionally weighted.
+
+    Weighted draws use a few rounds of rejection on duplicates, which is fast
+    while ``k`` is a small fraction of the population; whatever is still
+    missing afterwards (or any large request) is filled uniformly.
+    """
+    size = len(population) - (1 if exclude is not None else 0)
+    k = min(k, size)
+    if k <= 0:
+        return []
+    if cum_weights is None or k * 4 > size:
+        picked = rng.sample(population, k + (1 if exclude is not None else 0))
+        return [p for p in picked if p != exclude][:k]
+    chosen = {}
+    for _ in range(3):
+        for p in rng.choices(population, cum_weights=cum_weights, k=k - len(chosen)):
+            if p != exclude:
+                chosen[p] = None
+        if len(chosen) >= k:
+            return list(chosen)[:k]
+    remaining = [p for p in population if p != exclude and p not in chosen]
+    return list(chosen) + rng.sample(remaining, k - len(chosen))
+
+
+def zipf_cum_weights(n, alpha):
+    """Cumulative Zipf weights for ``n`` ranked items (rank 1 is heaviest)."""
+    total = 0.0
+    cum = []
+    for rank in range(1, n + 1):
+        total += 1.0 / (rank ** alpha)
+        cum.append(total)
+    return cum
+
+
+class Command(BaseCommand):
+    help = 'Generates a large, deterministic synthetic dataset using batched COPY/bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to create')
+        parser.add_argument('--follows', type=int, default=20000, help='Total number of follow relationships')
+        parser.add_argument('--outfits', type=int, default=5000, help='Number of outfits to create')
+        parser.add_argument('--outfit-likes', type=int, default=50000, help='Total number of outfit likes')
+        parser.add_argument('--posts', type=int, default=10000, help='Number of social posts to create')
+        parser.add_argument('--post-likes', type=int, default=100000, help='Total number of post likes')
+        parser.add_argument('--lookbooks', type=int, default=500, help='Number of lookbooks to create')
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many past days')
+        parser.add_argument('--alpha', type=float, default=1.2,
+                            help='Power-law exponent for follower/like distributions (lower is more skewed)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for deterministic output')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per COPY/bulk_create batch')
+        parser.add_argument('--prefix', default='bulk', help='Username/email prefix for generated users')
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create even on PostgreSQL')
+
+    def handle(self, *args, **options):
+        tables = connection.introspection.table_names()
+        if 'users' not in tables or 'posts' not in tables:
+            raise CommandError('Database tables do not exist. Run "python manage.py migrate" first.')
+
+        prefix = options['prefix']
+        if User.objects.filter(email__startswith=f'{prefix}_', email__endswith='@example.com').exists():
+            raise CommandError(
+                f'Users with prefix "{prefix}" already exist. Use a different --prefix to add another dataset.'
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.alpha = options['alpha']
+        self.days = options['days']
+        self.writer = BulkWriter(batch_size=options['batch_size'], use_copy=not options['no_copy'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeding with {"COPY" if self.writer.use_copy else "bulk_create"} '
+            f'in batches of {options["batch_size"]} (seed={options["seed"]})'
+        ))
+
+        user_ids = self._step('users', self.seed_users, options['users'], prefix)
+        self._step('follows', self.seed_follows, user_ids, options['follows'])
+        outfit_ids = self._step('outfits and outfit likes', self.seed_outfits, user_ids,
+                                options['outfits'], options['outfit_likes'])
+        self._step('posts and post likes', self.seed_posts, user_ids, outfit_ids,
+                   options['posts'], options['post_likes'])
+        self._step('lookbooks', self.seed_lookbooks, user_ids, outfit_ids, options['lookbooks'])
+        self._step('tags', self.seed_tags, options['batch_size'])
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in (User, UserFollowing, Outfit, OutfitItem, OutfitLike, Post, PostLike,
+                              Lookbook, LookbookOutfit, Tag, OutfitTag, PostTag, LookbookTag):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+        self.stdout.write(self.style.SUCCESS('✅ Bulk seeding completed successfully!'))
+
+    def _step(self, label, func, *args):
+        started = time.monotonic()
+        result = func(*args)
+        self.stdout.write(f'  {label}: done in {time.monotonic() - started:.1f}s')
+        return result
+
+    def _new_ids(self, model, after_id):
+        """IDs inserted after ``after_id``, in insertion (sequence) order."""
+        return list(model.objects.filter(pk__gt=after_id).order_by('pk').values_list('pk', flat=True))
+
+    def _max_id(self, model):
+        return model.objects.aggregate(max_id=models.Max('pk'))['max_id'] or 0
+
+    def _timestamp(self):
+        return self.writer.now - timedelta(seconds=self.rng.randint(0, self.days * 86400))
+
+    def _power_law_popularity(self, ids):
+        """Zipf weights over a shuffled copy of ``ids`` so popular rows are spread out."""
+        ranked = list(ids)
+        self.rng.shuffle(ranked)
+        return ranked, zipf_cum_weights(len(ranked), self.alpha)
+
+    def seed_users(self, count, prefix):
+        """Create users with profiles and style preferences."""
+        rng = self.rng
+        password = make_password('testpass123')
+        after = self._max_id(User)
+
+        def rows():
+            for i in range(count):
+                joined = self._timestamp()
+                yield (
+                    f'{prefix}_{i}', f'{prefix}_{i}@example.com', password,
+                    rng.choice(STYLES).title(), f'User{i}', rng.random() < 0.75,
+                    True, joined, joined, joined,
+                )
+
+        self.writer.write(User, [
+            'username', 'email', 'password', 'first_name', 'last_name', 'is_verified',
+            'is_active', 'date_joined', 'created_at', 'updated_at',
+        ], rows())
+        user_ids = self._new_ids(User, after)
+
+        self.writer.write(UserProfile, ['user_id', 'gender', 'body_type', 'height', 'top_size'], (
+            (uid, rng.choice('MFO'), rng.choice(['slim', 'athletic', 'average', 'curvy', 'plus']),
+             rng.randint(155, 190), rng.choice(['XS', 'S', 'M', 'L', 'XL']))
+            for uid in user_ids
+        ))
+        self.writer.write(StylePreference, [
+            'user_id', 'preferred_styles', 'preferred_colors', 'preferred_brands', 'budget_max',
+        ], (
+            (uid, rng.sample(STYLES, 3), rng.sample(COLORS, 4), rng.sample(BRANDS, 2),
+             Decimal(rng.choice([500, 1000, 2000])))
+            for uid in user_ids
+        ))
+        return user_ids
+
+    def seed_follows(self, user_ids, total):
+        """Create follow edges with a power-law follower (in-degree) distribution."""
+        rng = self.rng
+        counts = power_law_counts(rng, len(user_ids), total, self.alpha, cap=len(user_ids) - 1)
+
+        def rows():
+            for followee, n in zip(user_ids, counts):
+                for follower in sample_distinct(rng, user_ids, n, exclude=followee):
+                    yield (follower, followee, self._timestamp())
+
+        return self.writer.write(UserFollowing, ['follower_id', 'following_id', 'created_at'], rows())
+
+    def seed_outfits(self, user_ids, count, total_likes):
+        """
+        Create outfits with 3-5 items each, plus their likes.
+
+        Authors and like counts follow a power-law; like counts are planned
+        before the outfits are written so ``Outfit.likes_count`` is correct on
+        insert and no UPDATE pass is needed.
+        """
+        rng = self.rng
+        authors, author_weights = self._power_law_popularity(user_ids)
+        likers, liker_weights = self._power_law_popularity(user_ids)
+        like_counts = power_law_counts(rng, count, total_likes, self.alpha, cap=max(len(user_ids) - 1, 0))
+        after = self._max_id(Outfit)
+
+        def rows():
+            for i, likes in enumerate(like_counts):
+                created = self._timestamp()
+                occasion = rng.choice(OCCASIONS)
+                yield (
+                    rng.choices(authors, cum_weights=author_weights)[0],
+                    f'{occasion.title()} look #{i}', occasion, rng.choice(SEASONS),
+                    rng.sample(STYLES, 2), rng.sample(COLORS, 3), likes, True, created, created,
+                )
+
+        self.writer.write(Outfit, [
+            'user_id', 'title', 'occasion', 'season', 'style_tags', 'color_palette',
+            'likes_count', 'is_public', 'created_at', 'updated_at',
+        ], rows())
+        outfit_ids = self._new_ids(Outfit, after)
+
+        def item_rows():
+            for outfit_id in outfit_ids:
+                for item_type in rng.sample(OUTFIT_ITEM_TYPES, rng.randint(3, 5)):
+                    yield (
+                        outfit_id, item_type, f'{rng.choice(COLORS).title()} {item_type}',
+                        rng.choice(BRANDS), rng.choice(COLORS), Decimal(rng.randint(20, 300)),
+                    )
+
+        self.writer.write(OutfitItem, ['outfit_id', 'item_type', 'name', 'brand', 'color', 'price'], item_rows())
+
+        def like_rows():
+            for outfit_id, n in zip(outfit_ids, like_counts):
+                for user_id in sample_distinct(rng, likers, n, cum_weights=liker_weights):
+                    yield (user_id, outfit_id, self._timestamp())
+
+        self.writer.write(OutfitLike, ['user_id', 'outfit_id', 'created_at'], like_rows())
+        return outfit_ids
+
+    def seed_posts(self, user_ids, outfit_ids, count, total_likes):
+        """
+        Create posts and their likes.
+
+        Like counts are planned before the posts are written so
+        ``Post.likes_count`` is correct on insert and no UPDATE pass is needed.
+        """
+        rng = self.rng
+        authors, author_weights = self._power_law_popularity(user_ids)
+        likers, liker_weights = self._power_law_popularity(user_ids)
+        like_counts = power_law_counts(rng, count, total_likes, self.alpha, cap=max(len(user_ids) - 1, 0))
+        after = self._max_id(Post)
+
+        def rows():
+            for i, likes in enumerate(like_counts):
+                created = self._timestamp()
+                outfit_id = rng.choice(outfit_ids) if outfit_ids and rng.random() < 0.3 else None
+                yield (
+                    rng.choices(authors, cum_weights=author_weights)[0],
+                    f'Post #{i} #{rng.choice(STYLES)}', [rng.choice(STYLES), rng.choice(COLORS)],
+                    outfit_id, likes, rng.choice(['public'] * 8 + ['friends', 'private']),
+                    created, created,
+                )
+
+        self.writer.write(Post, [
+            'user_id', 'caption', 'tags', 'outfit_id', 'likes_count', 'privacy', 'created_at', 'updated_at',
+        ], rows())
+        post_ids = self._new_ids(Post, after)
+
+        def like_rows():
+            for post_id, n in zip(post_ids, like_counts):
+                for user_id in sample_distinct(rng, likers, n, cum_weights=liker_weights):
+                    yield (user_id, post_id, self._timestamp())
+
+        return self.writer.write(PostLike, ['user_id', 'post_id', 'created_at'], like_rows())
+
+    def seed_lookbooks(self, user_ids, outfit_ids, count):
+        """Create lookbooks, each holding 3-8 distinct outfits."""
+        rng = self.rng
+        after = self._max_id(Lookbook)
+
+        def rows():
+            for i in range(count):
+                created = self._timestamp()
+                yield (
+                    rng.choice(user_ids), f'Lookbook #{i}', 'Generated lookbook',
+                    rng.choice(SEASONS), rng.choice(LOOKBOOK_OCCASIONS), rng.sample(STYLES, 2),
+                    True, created, created,
+                )
+
+        self.writer.write(Lookbook, [
+            'creator_id', 'title', 'description', 'season', 'occasion', 'style',
+            'is_public', 'created_at', 'updated_at',
+        ], rows())
+        lookbook_ids = self._new_ids(Lookbook, after)
+
+        def outfit_rows():
+            for lookbook_id in lookbook_ids:
+                for order, outfit_id in enumerate(sample_distinct(rng, outfit_ids, rng.randint(3, 8))):
+                    yield (lookbook_id, outfit_id, order)
+
+        self.writer.write(LookbookOutfit, ['lookbook_id', 'outfit_id', 'order'], outfit_rows())
+        return lookbook_ids
+
+    def seed_tags(self, batch_size):
+        """Sync the normalized tag tables, which COPY and bulk_create bypass."""
+        for model in (Outfit, Post, Lookbook):
+            backfill_tags(model, batch_size=batch_size)
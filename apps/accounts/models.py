@@ -190,3 +190,44 @@ class EmailVerificationCode(models.Model):
     
     def __str__(self):
         return f"Verification code for {self.user.email}"
+
+
+class AccountDeletion(models.Model):
+    """
+    Background teardown of a deleted account's data.
+
+    The account is anonymized and deactivated when it is deleted; its posts,
+    comments, likes, wardrobe, cart and notifications are then removed (or
+    hidden) table by table, one batch at a time, by apps.accounts.teardown.
+    ``step`` and ``progress`` record how far the teardown got, so it can be
+    resumed after a crash.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='deletion')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    step = models.CharField(max_length=50, blank=True, help_text='Current (or last) teardown step')
+    progress = models.JSONField(default=dict, help_text='Rows processed per step')
+    error = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'account_deletions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"Deletion of user {self.user_id} ({self.status})"
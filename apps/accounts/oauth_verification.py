@@ -0,0 +1,184 @@
+"""
+OAuth provider token verification helpers.
+
+Google ID tokens are verified locally against Google's published JWKS key set,
+which is cached in-process and refreshed when it expires or when a token is
+signed with a key we haven't seen yet. Calls that still have to reach a
+provider (Google access tokens, Facebook) share one pooled ``requests.Session``
+with default timeouts instead of opening a new connection per login.
+"""
+import logging
+import re
+import threading
+import time
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+
+class PooledSession(requests.Session):
+    """requests.Session that applies a default timeout to every request."""
+
+    def __init__(self, timeout, pool_size):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Return the process-wide pooled session used for OAuth provider calls."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = PooledSession(
+                    timeout=getattr(settings, 'OAUTH_HTTP_TIMEOUT', 5),
+                    pool_size=getattr(settings, 'OAUTH_HTTP_POOL_SIZE', 10),
+                )
+    return _session
+
+
+class JWKSCache:
+    """
+    In-process cache of a JWKS key set.
+
+    Keys are refreshed when the cache expires (honouring the response's
+    ``Cache-Control: max-age``) or when a token names an unknown ``kid``;
+    unknown-kid refreshes are rate limited so garbage tokens can't make us
+    hammer the provider. If a refresh fails, the previous keys stay in use
+    and the next attempt waits ``failure_backoff`` seconds, so an outage
+    doesn't turn every login into a blocking fetch.
+    """
+
+    def __init__(self, url, ttl=3600, min_refresh_interval=60, failure_backoff=30, fetch=None):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.failure_backoff = failure_backoff
+        self._fetch = fetch or self._fetch_remote
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch_remote(self):
+        """Fetch the key set; returns (jwks dict, max-age seconds or None)."""
+        response = get_http_session().get(self.url)
+        response.raise_for_status()
+        max_age = None
+        match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+        if match:
+            max_age = int(match.group(1))
+        return response.json(), max_age
+
+    def _refresh(self):
+        now = time.monotonic()
+        self._last_refresh = now
+        try:
+            jwks, max_age = self._fetch()
+        except Exception as e:
+            logger.warning(f'Failed to refresh JWKS from {self.url}: {str(e)}')
+            self._expires_at = now + self.failure_backoff
+            return
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            try:
+                keys[jwk['kid']] = jwt.PyJWK(jwk).key
+            except Exception as e:
+                logger.warning(f'Skipping unusable JWK {jwk.get("kid")}: {str(e)}')
+        if keys:
+            self._keys = keys
+            self._expires_at = now + (max_age if max_age is not None else self.ttl)
+        else:
+            logger.warning(f'JWKS from {self.url} has no usable keys; keeping the previous ones')
+            self._expires_at = now + self.failure_backoff
+
+    def get_key(self, kid):
+        """Return the verification key for ``kid``, refreshing if needed."""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._expires_at:
+                self._refresh()
+            elif kid not in self._keys and now - self._last_refresh >= self.min_refresh_interval:
+                self._refresh()
+            return self._keys.get(kid)
+
+    def clear(self):
+        """Drop all cached keys (used by tests and key-rotation tooling)."""
+        with self._lock:
+            self._keys = {}
+            self._expires_at = 0.0
+            self._last_refresh = 0.0
+
+
+google_jwks = JWKSCache(
+    url=getattr(settings, 'GOOGLE_JWKS_URL', 'https://www.googleapis.com/oauth2/v3/certs'),
+    ttl=getattr(settings, 'GOOGLE_JWKS_CACHE_SECONDS', 3600),
+)
+
+
+def get_google_client_id():
+    """Google OAuth client ID from SOCIALACCOUNT_PROVIDERS or GOOGLE_OAUTH_CLIENT_ID."""
+    return (
+        getattr(settings, 'SOCIALACCOUNT_PROVIDERS', {})
+        .get('google', {})
+        .get('APP', {})
+        .get('client_id')
+    ) or getattr(settings, 'GOOGLE_OAUTH_CLIENT_ID', None)
+
+
+def verify_google_id_token(id_token, jwks=None):
+    """
+    Verify a Google ID token locally and return its claims, or None.
+
+    Checks the RS256 signature against the cached JWKS, expiry, issuer and,
+    when a client ID is configured, the audience.
+    """
+    jwks = jwks or google_jwks
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except jwt.PyJWTError as e:
+        logger.warning(f'Malformed Google ID token: {str(e)}')
+        return None
+
+    key = jwks.get_key(header.get('kid'))
+    if key is None:
+        logger.warning(f'Google ID token signed with unknown key {header.get("kid")}')
+        return None
+
+    client_id = get_google_client_id()
+    try:
+        claims = jwt.decode(
+            id_token,
+            key=key,
+            algorithms=['RS256'],
+            audience=client_id if client_id else None,
+            options={'verify_aud': bool(client_id), 'require': ['exp', 'iat', 'iss', 'sub']},
+            leeway=30,
+        )
+    except jwt.InvalidAudienceError:
+        logger.warning(f'Token audience mismatch: expected {client_id}')
+        return None
+    except jwt.PyJWTError as e:
+        logger.warning(f'Google ID token verification failed: {str(e)}')
+        return None
+
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        logger.warning(f'Google ID token has unexpected issuer {claims.get("iss")}')
+        return None
+    return claims
@@ -13,6 +13,7 @@ from allauth.socialaccount.models import SocialAccount
 from drf_spectacular.utils import extend_schema, inline_serializer
 from .serializers import UserSerializer
 from .models import UserProfile, StylePreference
+from .oauth_verification import get_http_session, verify_google_id_token
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse
 
 User = get_user_model()
@@ -132,90 +133,56 @@ class GoogleOAuthView(views.APIView):
     def _verify_google_id_token(self, id_token):
         """
         Verify Google ID token (JWT) and extract user info.
-        Uses Google's tokeninfo endpoint to verify the ID token.
+        The signature is checked locally against Google's cached JWKS key set,
+        so no round trip to Google is needed per login.
         """
-        import requests
         import logging
         
         logger = logging.getLogger(__name__)
         
-        try:
-            # Verify ID token with Google's tokeninfo endpoint
-            response = requests.get(
-                'https://oauth2.googleapis.com/tokeninfo',
-                params={'id_token': id_token},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                token_info = response.json()
-                
-                # Verify the token is for our client
-                # Try to get from SOCIALACCOUNT_PROVIDERS first, then from direct settings
-                google_client_id = (
-                    getattr(settings, 'SOCIALACCOUNT_PROVIDERS', {})
-                    .get('google', {})
-                    .get('APP', {})
-                    .get('client_id')
-                ) or getattr(settings, 'GOOGLE_OAUTH_CLIENT_ID', None)
-                
-                if google_client_id:
-                    aud = token_info.get('aud')
-                    if aud != google_client_id:
-                        logger.warning(f'Token audience mismatch: expected {google_client_id}, got {aud}')
-                        return None
-                
-                # Extract user info from token
-                user_info = {
-                    'id': token_info.get('sub'),  # Google user ID
-                    'email': token_info.get('email'),
-                    'email_verified': token_info.get('email_verified', False),
-                    'given_name': token_info.get('given_name', ''),
-                    'family_name': token_info.get('family_name', ''),
-                    'name': token_info.get('name', ''),
-                    'picture': token_info.get('picture', ''),
-                }
-                
-                # Ensure we have required fields
-                if not user_info.get('id') or not user_info.get('email'):
-                    logger.error('ID token missing required fields (sub or email)')
-                    return None
-                
-                return user_info
-            else:
-                logger.error(f'Google tokeninfo endpoint returned status {response.status_code}: {response.text}')
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Google ID token verification error: {str(e)}')
+        token_info = verify_google_id_token(id_token)
+        if not token_info:
             return None
-        except Exception as e:
-            logger.error(f'Unexpected error verifying Google ID token: {str(e)}')
+        
+        # Extract user info from token
+        user_info = {
+            'id': token_info.get('sub'),  # Google user ID
+            'email': token_info.get('email'),
+            'email_verified': token_info.get('email_verified', False),
+            'given_name': token_info.get('given_name', ''),
+            'family_name': token_info.get('family_name', ''),
+            'name': token_info.get('name', ''),
+            'picture': token_info.get('picture', ''),
+        }
+        
+        # Ensure we have required fields
+        if not user_info.get('id') or not user_info.get('email'):
+            logger.error('ID token missing required fields (sub or email)')
             return None
+        
+        return user_info
     
     def _verify_google_access_token(self, access_token):
         """Verify Google access token and get user info."""
-        import requests
         import logging
         
         logger = logging.getLogger(__name__)
+        session = get_http_session()
         
         try:
             # First try v2 API
-            response = requests.get(
+            response = session.get(
                 'https://www.googleapis.com/oauth2/v2/userinfo',
-                headers={'Authorization': f'Bearer {access_token}'},
-                timeout=10
+                headers={'Authorization': f'Bearer {access_token}'}
             )
             
             if response.status_code == 200:
                 return response.json()
             
             # If v2 fails, try v3 API
-            response = requests.get(
+            response = session.get(
                 'https://www.googleapis.com/oauth2/v3/userinfo',
-                headers={'Authorization': f'Bearer {access_token}'},
-                timeout=10
+                headers={'Authorization': f'Bearer {access_token}'}
             )
             
             if response.status_code == 200:
@@ -398,14 +365,15 @@ class FacebookOAuthView(views.APIView):
             app_id = getattr(settings, 'SOCIALACCOUNT_PROVIDERS', {}).get('facebook', {}).get('APP', {}).get('client_id')
             app_secret = getattr(settings, 'SOCIALACCOUNT_PROVIDERS', {}).get('facebook', {}).get('APP', {}).get('secret')
             
+            session = get_http_session()
+            
             # First, verify the token
-            verify_response = requests.get(
-                f'https://graph.facebook.com/debug_token',
+            verify_response = session.get(
+                'https://graph.facebook.com/debug_token',
                 params={
                     'input_token': access_token,
                     'access_token': f'{app_id}|{app_secret}'
-                },
-                timeout=10
+                }
             )
             
             if verify_response.status_code != 200:
@@ -416,13 +384,12 @@ class FacebookOAuthView(views.APIView):
                 return None
             
             # Get user info
-            response = requests.get(
+            response = session.get(
                 'https://graph.facebook.com/me',
                 params={
                     'access_token': access_token,
                     'fields': 'id,name,email,first_name,last_name,picture.type(large)'
-                },
-                timeout=10
+                }
             )
             
             if response.status_code == 200:
@@ -0,0 +1,37 @@
+"""
+Signal handlers for accounts app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from .authentication import auth_user_cache_config, invalidate_cached_user
+
+User = get_user_model()
+
+
+def invalidate_user_on_change(sender, instance, **kwargs):
+    """Drop the cached authenticated user when the user row changes."""
+    invalidate_cached_user(instance.pk)
+
+
+def invalidate_user_on_relation_change(sender, instance, **kwargs):
+    """Drop the cached authenticated user when an eagerly attached relation changes."""
+    invalidate_cached_user(instance.user_id)
+
+
+def connect_user_cache_signals():
+    """
+    Invalidate cached users on any save/delete of the user or of the
+    one-to-one relations cached with it (AUTH_USER_CACHE['SELECT_RELATED']).
+    """
+    post_save.connect(invalidate_user_on_change, sender=User, dispatch_uid='auth_user_cache_user_save')
+    post_delete.connect(invalidate_user_on_change, sender=User, dispatch_uid='auth_user_cache_user_delete')
+    for name in auth_user_cache_config()['SELECT_RELATED']:
+        related_model = User._meta.get_field(name).related_model
+        post_save.connect(
+            invalidate_user_on_relation_change, sender=related_model,
+            dispatch_uid=f'auth_user_cache_{name}_save'
+        )
+        post_delete.connect(
+            invalidate_user_on_relation_change, sender=related_model,
+            dispatch_uid=f'auth_user_cache_{name}_delete'
+        )
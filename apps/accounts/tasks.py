@@ -0,0 +1,18 @@
+"""
+Celery tasks for accounts app.
+"""
+from celery import shared_task
+from .teardown import resume_account_deletions as resume_deletions
+from .teardown import run_teardown
+
+
+@shared_task(ignore_result=True)
+def teardown_account(deletion_id):
+    """Delete a deleted account's data in batches."""
+    run_teardown(deletion_id)
+
+
+@shared_task(ignore_result=True)
+def resume_account_deletions():
+    """Requeue account teardowns that stalled or failed."""
+    resume_deletions()
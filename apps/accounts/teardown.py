@@ -0,0 +1,249 @@
+"""
+Background teardown of deleted accounts.
+
+Deleting an account anonymizes and deactivates the ``User`` row and records
+an ``AccountDeletion``; everything else the account owns is removed here,
+in the background, because a synchronous cascade over a heavy user's posts,
+likes and wardrobe would not fit in a request.
+
+The teardown is a fixed sequence of steps, one per table. A step handles at
+most ``BATCH_SIZE`` of the account's remaining rows in one short
+transaction, which also adjusts the denormalized counters of the rows it
+touches (likes, saves and comments counts, tag counts), and is repeated
+until it finds less than a full batch. Counter updates touch each shared
+row once per batch, in primary-key order, so other users' posts are never
+locked for longer than a batch.
+
+Every step only looks at the rows that are left, so a teardown stopped
+half-way (crash, deploy) resumes by running again from its recorded
+``step``; ``resume_account_deletions`` does that periodically for stalled
+and failed teardowns, and for pending ones whose queued task was lost.
+
+Posts and comments are soft-deleted, so they leave feeds at once and are
+hard-deleted later by the soft-delete purge (see core.purge). Likes, saves,
+follows, lookbooks, outfits, the wardrobe, cart and notifications are
+deleted, and notifications sent to other users no longer point at the
+account.
+"""
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from apps.cart.models import ShoppingCart
+from apps.lookbooks.models import Lookbook, LookbookLike
+from apps.notifications.models import Notification, NotificationPreference
+from apps.outfits.models import Outfit, OutfitLike, OutfitSave
+from apps.social.models import Comment, CommentLike, Post, PostLike, PostSave
+from apps.tags.sync import clear_tags, sync_tags, tagged_field
+from apps.wardrobe.models import Wardrobe, WardrobeImportJob, WardrobeItem
+from core.background import run_in_background
+from core.purge import delete_with_children
+from .authentication import invalidate_cached_user
+from .models import (
+    AccountDeletion, EmailVerificationCode, PasswordResetCode, StylePreference, User, UserFollowing, UserProfile
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACCOUNT_TEARDOWN = {
+    'BATCH_SIZE': 500,
+    'STALLED_AFTER': 900,
+    'MAX_ATTEMPTS': 5,
+}
+
+
+def teardown_config():
+    return {**DEFAULT_ACCOUNT_TEARDOWN, **getattr(settings, 'ACCOUNT_TEARDOWN', {})}
+
+
+# Steps: each handles one batch of an account's rows and returns how many it processed
+
+def _decrement(model, counter, pks):
+    """Decrement ``counter`` once per occurrence of a pk in ``pks``, with one UPDATE per distinct delta."""
+    by_delta = defaultdict(list)
+    for pk, delta in Counter(pks).items():
+        by_delta[delta].append(pk)
+    for delta, ids in by_delta.items():
+        model.objects.filter(pk__in=sorted(ids)).update(**{counter: Greatest(F(counter) - delta, 0)})
+
+
+def _hide_posts(user_id, batch_size):
+    posts = list(Post.objects.filter(user_id=user_id, is_deleted=False).order_by('pk').only('pk', 'tags')[:batch_size])
+    now = timezone.now()
+    for post in posts:
+        post.is_deleted = True
+    with transaction.atomic():
+        Post.objects.filter(pk__in=[post.pk for post in posts]).update(is_deleted=True, deleted_at=now, updated_at=now)
+        sync_tags(posts)
+    return len(posts)
+
+
+def _hide_comments(user_id, batch_size):
+    rows = list(
+        Comment.objects.filter(user_id=user_id, is_deleted=False).order_by('pk').values_list('pk', 'post_id')[:batch_size]
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        Comment.objects.filter(pk__in=[pk for pk, _ in rows]).update(is_deleted=True, deleted_at=now, updated_at=now)
+        _decrement(Post, 'comments_count', [post_id for _, post_id in rows])
+    return len(rows)
+
+
+def _delete_reactions(model, target, counter):
+    """Step deleting the account's ``model`` rows (likes, saves) and decrementing ``target``'s ``counter``."""
+    target_model = model._meta.get_field(target).related_model
+
+    def step(user_id, batch_size):
+        rows = list(model.objects.filter(user_id=user_id).order_by('pk').values_list('pk', f'{target}_id')[:batch_size])
+        with transaction.atomic():
+            model.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+            _decrement(target_model, counter, [target_id for _, target_id in rows])
+        return len(rows)
+    return step
+
+
+def _delete_owned(model, lookup):
+    """Step hard-deleting the account's ``model`` rows (looked up by ``lookup``) with their children."""
+    def step(user_id, batch_size):
+        pks = list(model.objects.filter(**{lookup: user_id}).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if tagged_field(model):
+            # Children (tag links included) are deleted first, so counts are adjusted up front
+            clear_tags([model(pk=pk) for pk in pks])
+        delete_with_children(model, pks, batch_size)
+        return len(pks)
+    return step
+
+
+def _delete_follows(user_id, batch_size):
+    pks = list(
+        UserFollowing.objects.filter(Q(follower_id=user_id) | Q(following_id=user_id))
+        .order_by('pk').values_list('pk', flat=True)[:batch_size]
+    )
+    UserFollowing.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def _detach_sent_notifications(user_id, batch_size):
+    pks = list(Notification.objects.filter(actor_id=user_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+    Notification.objects.filter(pk__in=pks).update(actor=None)
+    return len(pks)
+
+
+def _clear_account_data(user_id, batch_size):
+    with transaction.atomic():
+        processed = sum(
+            model.objects.filter(user_id=user_id).delete()[0]
+            for model in (StylePreference, NotificationPreference, PasswordResetCode, EmailVerificationCode)
+        )
+        processed += UserProfile.objects.filter(user_id=user_id).update(
+            gender='', date_of_birth=None, phone_number='', country='', city='', body_type='',
+            height=None, weight=None, top_size='', bottom_size='', shoe_size='', dress_size='',
+        )
+        user = User.objects.get(pk=user_id)
+        if user.avatar:
+            transaction.on_commit(partial(user.avatar.storage.delete, user.avatar.name))
+        User.objects.filter(pk=user_id).update(avatar=None, avatar_url='', oauth_provider=None, oauth_id=None)
+    invalidate_cached_user(user_id)
+    return processed
+
+
+# In order: content leaves feeds first; shared counters are fixed before owned rows go
+STEPS = [
+    ('posts', _hide_posts),
+    ('comments', _hide_comments),
+    ('post_likes', _delete_reactions(PostLike, 'post', 'likes_count')),
+    ('post_saves', _delete_reactions(PostSave, 'post', 'saves_count')),
+    ('comment_likes', _delete_reactions(CommentLike, 'comment', 'likes_count')),
+    ('outfit_likes', _delete_reactions(OutfitLike, 'outfit', 'likes_count')),
+    ('outfit_saves', _delete_reactions(OutfitSave, 'outfit', 'saves_count')),
+    ('lookbook_likes', _delete_reactions(LookbookLike, 'lookbook', 'likes_count')),
+    ('follows', _delete_follows),
+    ('lookbooks', _delete_owned(Lookbook, 'creator_id')),
+    ('outfits', _delete_owned(Outfit, 'user_id')),
+    ('wardrobe_items', _delete_owned(WardrobeItem, 'wardrobe__user_id')),
+    ('wardrobe', _delete_owned(Wardrobe, 'user_id')),
+    ('wardrobe_imports', _delete_owned(WardrobeImportJob, 'user_id')),
+    ('cart', _delete_owned(ShoppingCart, 'user_id')),
+    ('notifications', _delete_owned(Notification, 'user_id')),
+    ('sent_notifications', _detach_sent_notifications),
+    ('account', _clear_account_data),
+]
+
+
+def run_teardown(deletion_id):
+    """
+    Run a pending account teardown, from its recorded step, until every step is done.
+
+    Progress is saved after each batch. Returns the final status, or None
+    if the deletion was not pending (e.g. already running elsewhere).
+    """
+    config = teardown_config()
+    now = timezone.now()
+    claimed = AccountDeletion.objects.filter(id=deletion_id, status='pending').update(
+        status='running', attempts=F('attempts') + 1, started_at=now, updated_at=now
+    )
+    if not claimed:
+        return None
+    deletion = AccountDeletion.objects.get(id=deletion_id)
+
+    names = [name for name, _ in STEPS]
+    start = names.index(deletion.step) if deletion.step in names else 0
+    try:
+        for name, step in STEPS[start:]:
+            deletion.step = name
+            while True:
+                processed = step(deletion.user_id, config['BATCH_SIZE'])
+                if processed:
+                    deletion.progress[name] = deletion.progress.get(name, 0) + processed
+                deletion.save(update_fields=['step', 'progress', 'updated_at'])
+                if processed < config['BATCH_SIZE']:
+                    break
+    except Exception as e:
+        logger.exception(f'Teardown of user {deletion.user_id} failed at step {deletion.step}')
+        deletion.status = 'failed'
+        deletion.error = str(e)
+        deletion.save(update_fields=['status', 'step', 'error', 'updated_at'])
+        return deletion.status
+
+    deletion.status = 'completed'
+    deletion.error = ''
+    deletion.completed_at = timezone.now()
+    deletion.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+    logger.info(f'Tore down account of user {deletion.user_id}: {deletion.progress}')
+    return deletion.status
+
+
+def resume_account_deletions():
+    """
+    Requeue teardowns that stalled or failed fewer than ``MAX_ATTEMPTS`` times.
+
+    A running teardown saves its progress after every batch, so one not
+    updated for ``STALLED_AFTER`` seconds lost its worker; a pending one
+    that old lost its queued task (broker outage, restart of the thread
+    backend). Returns the number of teardowns requeued.
+    """
+    config = teardown_config()
+    now = timezone.now()
+    stalled = Q(status__in=['pending', 'running'], updated_at__lt=now - timedelta(seconds=config['STALLED_AFTER']))
+    retryable = Q(status='failed', attempts__lt=config['MAX_ATTEMPTS'])
+    ids = list(AccountDeletion.objects.filter(stalled | retryable).values_list('id', flat=True))
+    for deletion_id in ids:
+        # Only requeue rows nobody else picked up in the meantime; the new
+        # updated_at starts the clock again in case this dispatch is lost too
+        requeued = AccountDeletion.objects.filter(Q(id=deletion_id) & (stalled | retryable)).update(
+            status='pending', updated_at=now
+        )
+        if requeued:
+            schedule_teardown(deletion_id)
+    return len(ids)
+
+
+def schedule_teardown(deletion_id):
+    """Queue an account teardown once the current transaction commits."""
+    from .tasks import teardown_account
+    run_in_background(teardown_account, deletion_id)
@@ -0,0 +1,177 @@
+"""
+Tests for the background teardown of deleted accounts.
+"""
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts import teardown
+from apps.accounts.models import AccountDeletion, UserFollowing, UserProfile
+from apps.cart.models import ShoppingCart
+from apps.notifications.models import Notification
+from apps.outfits.models import Outfit, OutfitItem, OutfitLike
+from apps.social.models import Comment, CommentLike, Post, PostLike, PostSave
+from apps.tags.models import Tag
+from apps.wardrobe.models import Wardrobe, WardrobeItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    user = User.objects.create_user(
+        email='leaving@example.com',
+        username='leavinguser',
+        password='testpass123'
+    )
+    UserProfile.objects.create(user=user, city='Lisbon', phone_number='+351000000')
+    return user
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def other():
+    return User.objects.create_user(email='staying@example.com', username='stayinguser', password='testpass123')
+
+
+@pytest.fixture
+def sync_teardown(settings):
+    settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+    settings.ACCOUNT_TEARDOWN = {**settings.ACCOUNT_TEARDOWN, 'BATCH_SIZE': 2}
+
+
+def account_with_content(user, other):
+    """Give ``user`` posts, comments, likes, saves, follows, a wardrobe, an outfit, a cart and notifications."""
+    for i in range(3):
+        Post.objects.create(user=user, caption=f'Mine {i}', tags=['linen'])
+    theirs = [Post.objects.create(user=other, caption=f'Theirs {i}') for i in range(3)]
+    for post in theirs:
+        PostLike.objects.create(user=user, post=post)
+        PostLike.objects.create(user=other, post=post)
+        PostSave.objects.create(user=user, post=post)
+        Comment.objects.create(post=post, user=user, content='Love it')
+        Comment.objects.create(post=post, user=other, content='Thanks')
+        Post.objects.filter(id=post.id).update(likes_count=2, saves_count=1, comments_count=2)
+    comment = Comment.objects.filter(user=other).first()
+    CommentLike.objects.create(user=user, comment=comment)
+    Comment.objects.filter(id=comment.id).update(likes_count=1)
+
+    outfit = Outfit.objects.create(user=other, title='Theirs', occasion='casual', season='summer', likes_count=1)
+    OutfitLike.objects.create(user=user, outfit=outfit)
+    own_outfit = Outfit.objects.create(user=user, title='Mine', occasion='casual', season='summer', style_tags=['linen'])
+    OutfitItem.objects.create(outfit=own_outfit, item_type='top', name='Shirt', color='white')
+
+    wardrobe = Wardrobe.objects.create(user=user)
+    for i in range(3):
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name=f'Shirt {i}', color='white', tags=['linen'])
+    ShoppingCart.objects.create(user=user)
+    UserFollowing.objects.create(follower=user, following=other)
+    UserFollowing.objects.create(follower=other, following=user)
+    for i in range(3):
+        Notification.objects.create(user=user, type='system', title='Hi', message='Hi')
+    Notification.objects.create(user=other, type='system', title='Liked', message='Liked', actor=user)
+    return theirs, outfit
+
+
+@pytest.mark.django_db
+class TestAccountTeardown:
+    """Deleting an account removes its content in batches."""
+
+    def test_delete_account_tears_down_content(self, authenticated_client, user, other, sync_teardown):
+        theirs, outfit = account_with_content(user, other)
+        assert Tag.objects.get(name='linen').post_count == 3
+
+        response = authenticated_client.delete('/api/v1/auth/delete/', {
+            'password': 'testpass123',
+            'confirmation': 'DELETE MY ACCOUNT',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        deletion = AccountDeletion.objects.get(user=user)
+        assert deletion.status == 'completed'
+        assert deletion.step == 'account'
+        assert deletion.progress['posts'] == 3
+        assert deletion.progress['post_likes'] == 3
+        assert deletion.progress['wardrobe_items'] == 3
+
+        assert not Post.objects.filter(user=user, is_deleted=False).exists()
+        assert not Comment.objects.filter(user=user, is_deleted=False).exists()
+        for post in Post.objects.filter(id__in=[post.id for post in theirs]):
+            assert (post.likes_count, post.saves_count, post.comments_count) == (1, 0, 1)
+        assert not Comment.objects.filter(likes_count__gt=0).exists()
+        outfit.refresh_from_db()
+        assert outfit.likes_count == 0
+
+        linen = Tag.objects.get(name='linen')
+        assert (linen.post_count, linen.outfit_count, linen.wardrobe_item_count) == (0, 0, 0)
+        assert not Outfit.objects.filter(user=user).exists()
+        assert not OutfitItem.objects.exists()
+        assert not Wardrobe.objects.filter(user=user).exists()
+        assert not WardrobeItem.objects.exists()
+        assert not ShoppingCart.objects.filter(user=user).exists()
+        assert not UserFollowing.objects.exists()
+        assert not Notification.objects.filter(user=user).exists()
+        assert Notification.objects.get(user=other).actor is None
+        profile = UserProfile.objects.get(user=user)
+        assert (profile.city, profile.phone_number) == ('', '')
+
+    def test_failed_teardown_resumes_without_double_counting(self, user, other, sync_teardown, monkeypatch):
+        theirs, _ = account_with_content(user, other)
+        deletion = AccountDeletion.objects.create(user=user)
+        steps = dict(teardown.STEPS)
+
+        def broken(user_id, batch_size):
+            raise RuntimeError('database went away')
+
+        monkeypatch.setattr(teardown, 'STEPS', [(name, broken if name == 'follows' else step) for name, step in teardown.STEPS])
+        assert teardown.run_teardown(deletion.id) == 'failed'
+        deletion.refresh_from_db()
+        assert (deletion.step, deletion.error) == ('follows', 'database went away')
+        assert UserFollowing.objects.count() == 2
+
+        monkeypatch.setattr(teardown, 'STEPS', list(steps.items()))
+        assert teardown.resume_account_deletions() == 1
+
+        deletion.refresh_from_db()
+        assert deletion.status == 'completed'
+        assert deletion.attempts == 2
+        assert deletion.progress['post_likes'] == 3
+        assert not UserFollowing.objects.exists()
+        assert set(Post.objects.filter(user=other).values_list('likes_count', flat=True)) == {1}
+
+    def test_resumes_stalled_running_teardowns(self, user, sync_teardown):
+        stalled = AccountDeletion.objects.create(user=user, status='running', step='cart')
+        AccountDeletion.objects.filter(id=stalled.id).update(updated_at=timezone.now() - timedelta(hours=1))
+        other = User.objects.create_user(email='busy@example.com', username='busy', password='x')
+        AccountDeletion.objects.create(user=other, status='running')
+
+        assert teardown.resume_account_deletions() == 1
+
+        stalled.refresh_from_db()
+        assert stalled.status == 'completed'
+        assert 'posts' not in stalled.progress
+        assert AccountDeletion.objects.get(user=other).status == 'running'
+
+    def test_resumes_pending_teardowns_whose_dispatch_was_lost(self, user, sync_teardown):
+        lost = AccountDeletion.objects.create(user=user)
+        AccountDeletion.objects.filter(id=lost.id).update(updated_at=timezone.now() - timedelta(hours=1))
+        other = User.objects.create_user(email='queued@example.com', username='queued', password='x')
+        AccountDeletion.objects.create(user=other)
+
+        assert teardown.resume_account_deletions() == 1
+
+        lost.refresh_from_db()
+        assert (lost.status, lost.attempts) == ('completed', 1)
+        assert AccountDeletion.objects.get(user=other).status == 'pending'
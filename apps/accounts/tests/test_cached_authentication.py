@@ -0,0 +1,108 @@
+"""
+Tests for cached JWT authentication.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.authentication import UserCache, user_cache
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def empty_user_cache():
+    """Start every test with both cache tiers empty."""
+    cache.clear()
+    user_cache.clear_local()
+    yield
+    user_cache.clear_local()
+
+
+@pytest.fixture
+def user():
+    """Create a test user with the relations registration creates."""
+    from apps.accounts.models import UserProfile, StylePreference
+
+    user = User.objects.create_user(
+        email='cached@example.com',
+        username='cacheduser',
+        password='testpass123',
+        first_name='Cached',
+        last_name='User'
+    )
+    UserProfile.objects.create(user=user)
+    StylePreference.objects.create(user=user)
+    return user
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+def user_lookups(queries):
+    """Queries that load rows from the user table."""
+    table = User._meta.db_table
+    return [q for q in queries if f'FROM "{table}"' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Test that authenticated users are served from the cache."""
+
+    def test_repeat_requests_skip_user_lookup(self, authenticated_client):
+        """Test only the first request loads the user from the database."""
+        response = authenticated_client.get('/api/v1/auth/me/')
+        assert response.status_code == status.HTTP_200_OK
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get('/api/v1/auth/me/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['email'] == 'cached@example.com'
+        assert user_lookups(ctx.captured_queries) == []
+
+    def test_profile_update_invalidates_cache(self, authenticated_client):
+        """Test updates are visible on the next request."""
+        authenticated_client.get('/api/v1/auth/me/')
+        response = authenticated_client.patch(
+            '/api/v1/auth/me/', {'first_name': 'Renamed'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = authenticated_client.get('/api/v1/auth/me/')
+        assert response.data['data']['first_name'] == 'Renamed'
+
+    def test_deactivated_user_rejected(self, authenticated_client, user):
+        """Test deactivating a cached user takes effect immediately."""
+        assert authenticated_client.get('/api/v1/auth/me/').status_code == status.HTTP_200_OK
+
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+
+        response = authenticated_client.get('/api/v1/auth/me/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_related_change_invalidates_cache(self, user):
+        """Test saving a cached one-to-one relation bumps the user's version."""
+        _, version = user_cache.get(user.pk)
+        user.profile.save()
+        _, new_version = user_cache.get(user.pk)
+        assert new_version != version
+
+    def test_cache_unavailable_falls_back_to_database(self, authenticated_client, monkeypatch):
+        """Test requests still authenticate when the cache backend is down."""
+        def unavailable(self):
+            raise ConnectionError('cache down')
+
+        monkeypatch.setattr(UserCache, 'shared', property(unavailable))
+        response = authenticated_client.get('/api/v1/auth/me/')
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,141 @@
+"""
+Tests for local Google ID-token verification.
+"""
+import json
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts import oauth_verification
+from apps.accounts.oauth_verification import JWKSCache, verify_google_id_token
+
+User = get_user_model()
+
+CLIENT_ID = 'test-client-id.apps.googleusercontent.com'
+
+
+class LocalKeySet:
+    """Stand-in for Google's JWKS endpoint backed by a locally generated key."""
+
+    def __init__(self, kid='local-key'):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        jwk.update({'kid': self.kid, 'alg': 'RS256', 'use': 'sig'})
+        return {'keys': [jwk]}, None
+
+    def sign(self, kid=None, **overrides):
+        now = int(time.time())
+        claims = {
+            'iss': 'https://accounts.google.com',
+            'aud': CLIENT_ID,
+            'sub': '1234567890',
+            'email': 'google.user@example.com',
+            'email_verified': True,
+            'given_name': 'Google',
+            'family_name': 'User',
+            'iat': now,
+            'exp': now + 3600,
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, self.private_key, algorithm='RS256', headers={'kid': kid or self.kid})
+
+
+@pytest.fixture
+def key_set(monkeypatch, settings):
+    """Route Google JWKS lookups to a local key set."""
+    settings.GOOGLE_OAUTH_CLIENT_ID = CLIENT_ID
+    local = LocalKeySet()
+    monkeypatch.setattr(oauth_verification, 'google_jwks', JWKSCache(url='local', fetch=local.fetch))
+    return local
+
+
+class TestGoogleIdTokenVerification:
+    """Test verify_google_id_token."""
+
+    def test_valid_token(self, key_set):
+        """Test a correctly signed token returns its claims."""
+        claims = verify_google_id_token(key_set.sign())
+        assert claims['sub'] == '1234567890'
+        assert claims['email'] == 'google.user@example.com'
+
+    def test_wrong_audience(self, key_set):
+        """Test tokens issued for another client are rejected."""
+        assert verify_google_id_token(key_set.sign(aud='someone-else')) is None
+
+    def test_expired_token(self, key_set):
+        """Test expired tokens are rejected."""
+        assert verify_google_id_token(key_set.sign(exp=int(time.time()) - 3600)) is None
+
+    def test_wrong_issuer(self, key_set):
+        """Test tokens from other issuers are rejected."""
+        assert verify_google_id_token(key_set.sign(iss='https://evil.example.com')) is None
+
+    def test_keys_are_cached(self, key_set):
+        """Test the key set is fetched once and reused across verifications."""
+        verify_google_id_token(key_set.sign())
+        verify_google_id_token(key_set.sign())
+        assert key_set.fetches == 1
+
+    def test_unknown_kid_refresh_is_rate_limited(self, key_set):
+        """Test unknown key IDs trigger at most one refresh per interval."""
+        verify_google_id_token(key_set.sign())
+        assert verify_google_id_token(key_set.sign(kid='rotated')) is None
+        assert verify_google_id_token(key_set.sign(kid='rotated')) is None
+        assert key_set.fetches == 1
+
+
+class TestJWKSCache:
+    """Test key set refreshes."""
+
+    def test_failed_refresh_keeps_stale_keys_and_backs_off(self, monkeypatch):
+        """Test an outage serves the previous keys and isn't retried on every lookup."""
+        local = LocalKeySet()
+        clock = [1000.0]
+        monkeypatch.setattr(oauth_verification.time, 'monotonic', lambda: clock[0])
+        cache = JWKSCache(url='local', ttl=60, failure_backoff=30, fetch=local.fetch)
+        key = cache.get_key(local.kid)
+        assert key is not None
+
+        def unavailable():
+            local.fetches += 1
+            raise ConnectionError('provider down')
+
+        cache._fetch = unavailable
+        clock[0] += 61
+        assert cache.get_key(local.kid) is key
+        assert cache.get_key(local.kid) is key
+        assert local.fetches == 2
+
+        clock[0] += 31
+        assert cache.get_key(local.kid) is key
+        assert local.fetches == 3
+
+
+@pytest.mark.django_db
+class TestGoogleOAuthWithIdToken:
+    """Test Google OAuth endpoint with locally verified ID tokens."""
+
+    def test_login_without_network(self, key_set, monkeypatch):
+        """Test ID-token login creates the user without calling Google."""
+        def no_network():
+            raise AssertionError('ID-token login must not make HTTP calls')
+        monkeypatch.setattr('apps.accounts.oauth_views.get_http_session', no_network)
+
+        response = APIClient().post('/api/v1/auth/oauth/google/', {'access_token': key_set.sign()}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['is_new_user'] is True
+        assert User.objects.filter(email='google.user@example.com').exists()
+
+    def test_login_with_bad_signature(self, key_set):
+        """Test ID tokens signed by another key are rejected."""
+        forged = LocalKeySet().sign()
+        response = APIClient().post('/api/v1/auth/oauth/google/', {'access_token': forged}, format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,63 @@
+"""
+Tests for the bulk synthetic data generator.
+"""
+import random
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F, Sum
+from apps.accounts.management.commands.seed_bulk import power_law_counts, sample_distinct
+from apps.accounts.models import UserFollowing
+from apps.outfits.models import Outfit, OutfitLike
+from apps.social.models import Post, PostLike
+
+SMALL_DATASET = {
+    'users': 30, 'follows': 120, 'outfits': 20, 'outfit_likes': 80,
+    'posts': 40, 'post_likes': 200, 'lookbooks': 5, 'batch_size': 7,
+}
+
+
+class TestDistributions:
+    """Test sampling helpers."""
+
+    def test_power_law_counts_respect_cap_and_total(self):
+        """Test counts never exceed the cap and roughly sum to the total."""
+        counts = power_law_counts(random.Random(1), 100, 1000, 1.2, cap=50)
+        assert max(counts) <= 50
+        assert 0 < sum(counts) <= 1100
+
+    def test_sample_distinct_excludes_and_dedupes(self):
+        """Test weighted sampling returns distinct members without the excluded one."""
+        population = list(range(20))
+        picked = sample_distinct(random.Random(1), population, 10, exclude=3,
+                                 cum_weights=[i + 1 for i in range(20)])
+        assert len(picked) == len(set(picked)) == 10
+        assert 3 not in picked
+
+
+@pytest.mark.django_db
+class TestSeedBulkCommand:
+    """Test seed_bulk management command."""
+
+    def test_creates_consistent_counters(self):
+        """Test denormalized like counters match the generated like rows."""
+        call_command('seed_bulk', prefix='t1', **SMALL_DATASET)
+        assert Post.objects.count() == 40
+        assert Post.objects.aggregate(total=Sum('likes_count'))['total'] == PostLike.objects.count()
+        assert Outfit.objects.aggregate(total=Sum('likes_count'))['total'] == OutfitLike.objects.count()
+        assert not UserFollowing.objects.filter(follower_id=F('following_id')).exists()
+
+    def test_is_deterministic(self):
+        """Test the same seed produces the same like graph."""
+        call_command('seed_bulk', prefix='a', seed=7, **SMALL_DATASET)
+        first = sorted(Post.objects.values_list('likes_count', flat=True))
+        Post.objects.all().delete()
+        call_command('seed_bulk', prefix='b', seed=7, **SMALL_DATASET)
+        assert sorted(Post.objects.values_list('likes_count', flat=True)) == first
+
+    def test_rejects_existing_prefix(self):
+        """Test re-running with the same prefix fails instead of colliding."""
+        call_command('seed_bulk', prefix='dup', **SMALL_DATASET)
+        with pytest.raises(CommandError):
+            call_command('seed_bulk', prefix='dup', **SMALL_DATASET)
+
@@ -7,6 +7,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Q
 from datetime import timedelta
 import random
@@ -16,7 +17,9 @@ from drf_spectacular.utils import (
     inline_serializer,
     OpenApiTypes
 )
-from .models import User, UserProfile, StylePreference, UserFollowing, PasswordResetCode, EmailVerificationCode
+from .models import (
+    User, UserProfile, StylePreference, UserFollowing, PasswordResetCode, EmailVerificationCode, AccountDeletion
+)
 from .serializers import (
     UserSerializer,
     UserRegisterSerializer,
@@ -30,6 +33,8 @@ from core.serializers import (
     NotFoundErrorResponse,
     ConflictErrorResponse,
 )
+from core.throttling import GCRAThrottle
+from .teardown import schedule_teardown
 from decimal import Decimal
 
 
@@ -322,6 +327,8 @@ class FollowUserView(views.APIView):
     Follow/unfollow a user.
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [GCRAThrottle]
+    throttle_scope = 'follow'
     
     @extend_schema(
         summary="Follow user",
@@ -793,12 +800,16 @@ class SearchUsersView(generics.ListAPIView):
 class DeleteAccountView(views.APIView):
     """
     Delete user account (soft delete).
+    
+    The user is anonymized and deactivated at once; their posts, comments,
+    likes, wardrobe, cart and notifications are removed in the background
+    (see apps.accounts.teardown).
     """
     permission_classes = [IsAuthenticated]
     
     @extend_schema(
         summary="Delete account",
-        description="Soft delete user account",
+        description="Soft delete user account. The account's content is removed in the background.",
         tags=["Users"],
         request=inline_serializer(
             name='DeleteAccountRequest',
@@ -833,13 +844,18 @@ class DeleteAccountView(views.APIView):
             }, status=status.HTTP_401_UNAUTHORIZED)
         
         # Soft delete: mark user as inactive and anonymize data
-        user.is_active = False
-        user.username = f'deleted_user_{user.id}'
-        user.email = f'deleted_{user.id}@deleted.com'
-        user.first_name = '[Deleted]'
-        user.last_name = '[User]'
-        user.bio = ''
-        user.save()
+        with transaction.atomic():
+            user.is_active = False
+            user.username = f'deleted_user_{user.id}'
+            user.email = f'deleted_{user.id}@deleted.com'
+            user.first_name = '[Deleted]'
+            user.last_name = '[User]'
+            user.bio = ''
+            user.save()
+            
+            deletion, created = AccountDeletion.objects.get_or_create(user=user)
+            if created:
+                schedule_teardown(deletion.id)
         
         return Response(status=status.HTTP_204_NO_CONTENT)
 
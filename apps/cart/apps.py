@@ -5,3 +5,6 @@ class CartConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cart'
 
+    def ready(self):
+        from .signals import connect_promo_code_signals
+        connect_promo_code_signals()
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:01
+
+from django.db import migrations, models
+
+
+def hold_existing_reservations(apps, schema_editor):
+    """Carts that already hold a code keep it for one more hold period, then release it."""
+    from apps.cart.promos import reservation_expiry
+    ShoppingCart = apps.get_model('cart', 'ShoppingCart')
+    ShoppingCart.objects.exclude(promo_code='').update(promo_reserved_until=reservation_expiry())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shoppingcart',
+            name='promo_reserved_until',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the promo code use held by this cart is given back', null=True),
+        ),
+        migrations.RunPython(hold_existing_reservations, migrations.RunPython.noop),
+    ]
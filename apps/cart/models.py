@@ -12,6 +12,9 @@ class ShoppingCart(models.Model):
     """
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='shopping_cart')
     promo_code = models.CharField(max_length=50, blank=True)
+    promo_reserved_until = models.DateTimeField(
+        null=True, blank=True, db_index=True, help_text='When the promo code use held by this cart is given back'
+    )
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -110,7 +113,8 @@ class PromoCode(models.Model):
     def __str__(self):
         return self.code
     
-    def is_valid(self):
+    def is_current(self):
+        """Active and within its validity window (usage not considered)."""
         from django.utils import timezone
         now = timezone.now()
         
@@ -118,6 +122,12 @@ class PromoCode(models.Model):
             return False
         if now < self.valid_from or now > self.valid_until:
             return False
+        
+        return True
+    
+    def is_valid(self):
+        if not self.is_current():
+            return False
         if self.max_uses > 0 and self.times_used >= self.max_uses:
             return False
         
@@ -0,0 +1,147 @@
+"""
+Promo code lookup and redemption.
+
+Lookups go through PromoCodeCache: codes (including unknown ones, so guessing
+doesn't reach the database) are cached in process memory for a few seconds
+and in the shared Django cache for a few minutes, under a global version that
+is bumped whenever any PromoCode is saved or deleted (see core.cache).
+
+Cached codes are only used to decide whether a code exists and is current.
+Usage is reserved with a single conditional UPDATE
+(``times_used = times_used + 1 WHERE times_used < max_uses``), so concurrent
+redemptions can never push a code past ``max_uses``; the cached
+``times_used`` is never trusted.
+
+A cart holds its reserved use for ``PROMO_CODE_RESERVATION['HOLD_FOR']``
+seconds after the code was last applied. ``release_expired_reservations``
+runs periodically and takes the code off carts whose hold has run out,
+giving the use back, so abandoned carts don't use up limited codes.
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.cache import VersionedCache
+from .models import PromoCode, ShoppingCart
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMO_CODE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TTL': 300,
+    'LOCAL_TTL': 10,
+}
+
+DEFAULT_PROMO_CODE_RESERVATION = {
+    'HOLD_FOR': 1800,
+}
+
+ALL_CODES = 'all'
+MISSING = 'missing'
+
+
+def promo_code_cache_config():
+    """PROMO_CODE_CACHE settings merged over the defaults."""
+    return {**DEFAULT_PROMO_CODE_CACHE, **getattr(settings, 'PROMO_CODE_CACHE', {})}
+
+
+def promo_code_reservation_config():
+    """PROMO_CODE_RESERVATION settings merged over the defaults."""
+    return {**DEFAULT_PROMO_CODE_RESERVATION, **getattr(settings, 'PROMO_CODE_RESERVATION', {})}
+
+
+def normalize_code(code):
+    return code.strip().upper()
+
+
+class PromoCodeCache(VersionedCache):
+    """Two-tier store of promo codes by code, with one version for all codes (see core.cache)."""
+    
+    def __init__(self):
+        super().__init__('promo:code', promo_code_cache_config)
+    
+    def get(self, code):
+        """Return the PromoCode for ``code``, or None if there is no such code."""
+        try:
+            version = self.current_version(ALL_CODES)
+        except Exception as e:
+            logger.debug(f'Promo code cache unavailable: {str(e)}')
+            return PromoCode.objects.filter(code=code).first()
+        
+        promo = self.read(code, version)
+        if promo is None:
+            promo = PromoCode.objects.filter(code=code).first() or MISSING
+            self.write(code, version, promo)
+        return None if promo == MISSING else promo
+    
+    def invalidate(self):
+        """Bump the version so every worker reloads every code."""
+        self.bump(ALL_CODES)
+
+
+promo_code_cache = PromoCodeCache()
+
+
+def get_promo_code(code):
+    """Look up a promo code (case-insensitive) through the cache."""
+    return promo_code_cache.get(normalize_code(code))
+
+
+def invalidate_promo_codes():
+    """Invalidate cached promo codes now and again when the transaction commits."""
+    promo_code_cache.invalidate()
+    transaction.on_commit(promo_code_cache.invalidate)
+
+
+def reservation_expiry():
+    """When a promo code use reserved now stops being held."""
+    return timezone.now() + timedelta(seconds=promo_code_reservation_config()['HOLD_FOR'])
+
+
+def reserve_promo_code(promo):
+    """
+    Atomically take one use of ``promo``.
+    
+    Returns False if the code has been used up, deactivated or has expired
+    since it was cached.
+    """
+    now = timezone.now()
+    return PromoCode.objects.filter(
+        Q(max_uses=0) | Q(times_used__lt=F('max_uses')),
+        pk=promo.pk,
+        is_active=True,
+        valid_from__lte=now,
+        valid_until__gte=now,
+    ).update(times_used=F('times_used') + 1, updated_at=now) == 1
+
+
+def release_promo_code(code):
+    """Give back one use of ``code`` (when it is removed from a cart)."""
+    PromoCode.objects.filter(code=normalize_code(code), times_used__gt=0).update(
+        times_used=F('times_used') - 1,
+        updated_at=timezone.now()
+    )
+
+
+def release_expired_reservations():
+    """
+    Take promo codes off carts whose reservation expired and give their uses back.
+    
+    Each cart is cleared with a conditional UPDATE, so a cart whose code was
+    re-applied (extending the hold) in the meantime is left alone. Returns
+    the number of reservations released.
+    """
+    now = timezone.now()
+    expired = ShoppingCart.objects.exclude(promo_code='').filter(promo_reserved_until__lt=now)
+    released = 0
+    for cart_id, code in expired.values_list('id', 'promo_code'):
+        with transaction.atomic():
+            cleared = ShoppingCart.objects.filter(
+                id=cart_id, promo_code=code, promo_reserved_until__lt=now
+            ).update(promo_code='', discount=0, promo_reserved_until=None, updated_at=now)
+            if cleared:
+                release_promo_code(code)
+                released += 1
+    return released
@@ -49,3 +49,49 @@ class AddToCartSerializer(serializers.Serializer):
     product_url = serializers.URLField(required=False, allow_blank=True)
     in_stock = serializers.BooleanField(default=True)
 
+
+class CartOperationSerializer(serializers.Serializer):
+    """
+    One operation in a batch cart update.
+    
+    ``add`` takes the AddToCartSerializer fields and merges into an existing
+    line with the same (outfit_item_id, size). ``update`` and ``remove``
+    target a line by ``item_id`` or by (outfit_item_id, size).
+    """
+    OPERATION_CHOICES = ['add', 'update', 'remove']
+    
+    op = serializers.ChoiceField(choices=OPERATION_CHOICES)
+    item_id = serializers.IntegerField(required=False)
+    outfit_item_id = serializers.IntegerField(required=False)
+    size = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    quantity = serializers.IntegerField(required=False, min_value=1, max_value=10)
+    
+    def to_internal_value(self, data):
+        validated = super().to_internal_value(data)
+        if validated['op'] == 'add':
+            # Product details are validated (and defaulted) like a single add
+            add_serializer = AddToCartSerializer(data=data)
+            add_serializer.is_valid(raise_exception=True)
+            validated.update(add_serializer.validated_data)
+        return validated
+    
+    def validate(self, data):
+        if data['op'] != 'add' and 'item_id' not in data and 'outfit_item_id' not in data:
+            raise serializers.ValidationError('item_id or outfit_item_id is required')
+        if data['op'] == 'update' and 'quantity' not in data:
+            raise serializers.ValidationError({'quantity': 'This field is required.'})
+        return data
+
+
+class CartBatchSerializer(serializers.Serializer):
+    """Serializer for batch cart updates."""
+    operations = CartOperationSerializer(many=True, required=False, max_length=50)
+    outfit_id = serializers.IntegerField(
+        required=False,
+        help_text='Add every purchasable item of this outfit (applied before operations)'
+    )
+    
+    def validate(self, data):
+        if not data.get('operations') and 'outfit_id' not in data:
+            raise serializers.ValidationError('Provide operations and/or outfit_id')
+        return data
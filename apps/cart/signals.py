@@ -0,0 +1,16 @@
+"""
+Signal handlers for cart app.
+"""
+from django.db.models.signals import post_delete, post_save
+from .models import PromoCode
+from .promos import invalidate_promo_codes
+
+
+def invalidate_promo_codes_on_change(sender, instance, **kwargs):
+    """Drop cached promo codes when any code is edited or deleted."""
+    invalidate_promo_codes()
+
+
+def connect_promo_code_signals():
+    post_save.connect(invalidate_promo_codes_on_change, sender=PromoCode, dispatch_uid='promo_code_cache_save')
+    post_delete.connect(invalidate_promo_codes_on_change, sender=PromoCode, dispatch_uid='promo_code_cache_delete')
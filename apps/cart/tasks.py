@@ -0,0 +1,11 @@
+"""
+Celery tasks for cart app.
+"""
+from celery import shared_task
+from .promos import release_expired_reservations
+
+
+@shared_task(ignore_result=True)
+def release_expired_promo_reservations():
+    """Give back promo code uses held by carts for longer than the hold period."""
+    release_expired_reservations()
@@ -0,0 +1 @@
+# Tests for cart app
@@ -0,0 +1,130 @@
+"""
+Tests for batch cart updates.
+"""
+from decimal import Decimal
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.cart.models import ShoppingCart, CartItem
+from apps.outfits.models import Outfit, OutfitItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='shopper@example.com',
+        username='shopper',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def cart(user):
+    """Cart with a t-shirt (M) and jeans."""
+    cart = ShoppingCart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, outfit_item_id=1, name='T-Shirt', price=Decimal('20.00'), size='M', color='white')
+    CartItem.objects.create(cart=cart, outfit_item_id=2, name='Jeans', price=Decimal('50.00'), size='32', color='blue')
+    return cart
+
+
+def batch_url(user):
+    return f'/api/v1/cart/{user.id}/items/batch/'
+
+
+@pytest.mark.django_db
+class TestBatchUpdateCart:
+    """Test the batch cart endpoint."""
+    
+    def test_operations_upsert_update_and_remove(self, authenticated_client, user, cart):
+        jeans = cart.items.get(outfit_item_id=2)
+        response = authenticated_client.post(batch_url(user), {'operations': [
+            {'op': 'add', 'outfit_item_id': 1, 'size': 'M', 'name': 'T-Shirt', 'price': '20.00', 'color': 'white', 'quantity': 2},
+            {'op': 'add', 'outfit_item_id': 1, 'size': 'L', 'name': 'T-Shirt', 'price': '20.00', 'color': 'white'},
+            {'op': 'add', 'outfit_item_id': 3, 'name': 'Cap', 'price': '15.00', 'color': 'black'},
+            {'op': 'update', 'outfit_item_id': 3, 'quantity': 3},
+            {'op': 'remove', 'item_id': jeans.id},
+        ]}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        quantities = {(item.outfit_item_id, item.size): item.quantity for item in cart.items.all()}
+        assert quantities == {(1, 'M'): 3, (1, 'L'): 1, (3, ''): 3}
+        data = response.data['data']
+        assert data['item_count'] == 7
+        assert Decimal(data['subtotal']) == Decimal('125.00')
+    
+    def test_remove_then_add_same_line(self, authenticated_client, user, cart):
+        shirt = cart.items.get(outfit_item_id=1, size='M')
+        response = authenticated_client.post(batch_url(user), {'operations': [
+            {'op': 'remove', 'item_id': shirt.id},
+            {'op': 'add', 'outfit_item_id': 1, 'size': 'M', 'name': 'T-Shirt', 'price': '18.00', 'color': 'white', 'quantity': 2},
+        ]}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        line = cart.items.get(outfit_item_id=1, size='M')
+        assert line.id != shirt.id
+        assert (line.quantity, line.price) == (2, Decimal('18.00'))
+        assert cart.items.count() == 2
+    
+    def test_missing_target_rolls_back_everything(self, authenticated_client, user, cart):
+        response = authenticated_client.post(batch_url(user), {'operations': [
+            {'op': 'add', 'outfit_item_id': 9, 'name': 'Belt', 'price': '30.00', 'color': 'brown'},
+            {'op': 'remove', 'item_id': 999999},
+        ]}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data['errors']['operations']) == [1]
+        assert cart.items.count() == 2
+    
+    def test_add_outfit_items(self, authenticated_client, user):
+        author = User.objects.create_user(email='stylist@example.com', username='stylist', password='testpass123')
+        outfit = Outfit.objects.create(user=author, title='Weekend', occasion='casual', season='summer')
+        tee = OutfitItem.objects.create(outfit=outfit, item_type='top', name='Linen Shirt', price=Decimal('40.00'),
+                                        size='M', color='white', purchase_url='https://shop.example.com/shirt')
+        OutfitItem.objects.create(outfit=outfit, item_type='bottom', name='Chinos', price=Decimal('60.00'), color='khaki')
+        OutfitItem.objects.create(outfit=outfit, item_type='accessory', name='Vintage Watch', color='gold')
+        
+        response = authenticated_client.post(batch_url(user), {
+            'outfit_id': outfit.id,
+            'operations': [{'op': 'update', 'outfit_item_id': tee.id, 'size': 'M', 'quantity': 2}],
+        }, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        items = {item.name: item for item in CartItem.objects.filter(cart__user=user)}
+        assert set(items) == {'Linen Shirt', 'Chinos'}
+        assert items['Linen Shirt'].quantity == 2
+        assert items['Linen Shirt'].product_url == 'https://shop.example.com/shirt'
+    
+    def test_query_count_does_not_grow_with_operations(self, authenticated_client, user, cart):
+        def run(count, start):
+            operations = [
+                {'op': 'add', 'outfit_item_id': start + i, 'name': f'Item {i}', 'price': '5.00', 'color': 'red'}
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.post(batch_url(user), {'operations': operations}, format='json')
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+        
+        run(1, 50)  # warm the authenticated-user cache
+        assert run(2, 100) == run(10, 200)
+    
+    def test_cannot_update_another_users_cart(self, authenticated_client, user):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        response = authenticated_client.post(batch_url(other), {'outfit_id': 1}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
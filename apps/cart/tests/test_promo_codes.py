@@ -0,0 +1,132 @@
+"""
+Tests for promo code lookup and redemption.
+"""
+import threading
+from datetime import timedelta
+from decimal import Decimal
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.cart.models import ShoppingCart, CartItem, PromoCode
+from apps.cart.promos import get_promo_code, promo_code_cache, release_expired_reservations, reserve_promo_code
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_promo_cache():
+    promo_code_cache.invalidate()
+    yield
+    promo_code_cache.invalidate()
+
+
+def make_promo(code='SAVE10', **kwargs):
+    now = timezone.now()
+    defaults = {
+        'discount_percentage': 10,
+        'valid_from': now - timedelta(days=1),
+        'valid_until': now + timedelta(days=1),
+    }
+    return PromoCode.objects.create(code=code, **{**defaults, **kwargs})
+
+
+def client_with_cart(username):
+    user = User.objects.create_user(email=f'{username}@example.com', username=username, password='testpass123')
+    cart = ShoppingCart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, outfit_item_id=1, name='Coat', price=Decimal('200.00'), color='camel')
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client, user
+
+
+@pytest.mark.django_db
+class TestPromoCodeCache:
+    """Test cached promo code lookups."""
+    
+    def test_lookups_are_cached_and_invalidated_on_save(self):
+        promo = make_promo()
+        assert get_promo_code('save10').pk == promo.pk
+        with CaptureQueriesContext(connection) as queries:
+            assert get_promo_code('SAVE10').pk == promo.pk
+            assert get_promo_code('NOPE') is None
+            assert get_promo_code('NOPE') is None
+        assert len(queries) == 1  # only the first miss for NOPE
+        
+        promo.discount_percentage = 25
+        promo.save()
+        assert get_promo_code('SAVE10').discount_percentage == 25
+
+
+@pytest.mark.django_db
+class TestPromoCodeRedemption:
+    """Test applying and releasing promo codes."""
+    
+    def test_apply_reserves_a_use_once_and_remove_releases_it(self):
+        promo = make_promo(max_uses=1)
+        client, user = client_with_cart('saver')
+        url = f'/api/v1/cart/{user.id}/promo/'
+        
+        assert client.post(url, {'code': 'save10'}, format='json').status_code == status.HTTP_200_OK
+        assert client.post(url, {'code': 'SAVE10'}, format='json').status_code == status.HTTP_200_OK
+        promo.refresh_from_db()
+        assert promo.times_used == 1
+        
+        other_client, other = client_with_cart('latecomer')
+        response = other_client.post(f'/api/v1/cart/{other.id}/promo/', {'code': 'SAVE10'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        
+        assert client.delete(f'/api/v1/cart/{user.id}/promo/remove/').status_code == status.HTTP_200_OK
+        promo.refresh_from_db()
+        assert promo.times_used == 0
+        response = other_client.post(f'/api/v1/cart/{other.id}/promo/', {'code': 'SAVE10'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert Decimal(str(response.data['discount'])) == Decimal('20.00')
+
+    
+    def test_expired_reservation_is_released(self):
+        promo = make_promo(max_uses=1)
+        client, user = client_with_cart('abandoner')
+        assert client.post(f'/api/v1/cart/{user.id}/promo/', {'code': 'SAVE10'}, format='json').status_code == status.HTTP_200_OK
+        cart = ShoppingCart.objects.get(user=user)
+        assert cart.promo_reserved_until > timezone.now()
+        
+        assert release_expired_reservations() == 0
+        ShoppingCart.objects.filter(id=cart.id).update(promo_reserved_until=timezone.now() - timedelta(seconds=1))
+        assert release_expired_reservations() == 1
+        
+        cart.refresh_from_db()
+        assert (cart.promo_code, cart.discount, cart.promo_reserved_until) == ('', 0, None)
+        promo.refresh_from_db()
+        assert promo.times_used == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_never_exceed_max_uses():
+    promo = make_promo(code='FLASH', max_uses=5)
+    threads = 20
+    barrier = threading.Barrier(threads)
+    results = []
+    
+    def redeem():
+        try:
+            cached = get_promo_code('FLASH')
+            barrier.wait()
+            results.append(reserve_promo_code(cached))
+        finally:
+            connections.close_all()
+    
+    workers = [threading.Thread(target=redeem) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    promo.refresh_from_db()
+    assert results.count(True) == 5
+    assert len(results) == threads
+    assert promo.times_used == 5
@@ -7,6 +7,7 @@ from .views import (
     AddToCartView,
     UpdateCartItemView,
     RemoveFromCartView,
+    BatchUpdateCartView,
     ApplyPromoCodeView,
     RemovePromoCodeView,
     ClearCartView,
@@ -21,6 +22,7 @@ urlpatterns = [
     path('<int:user_id>/items/', AddToCartView.as_view(), name='add-to-cart'),
     path('<int:user_id>/items/<int:item_id>/', UpdateCartItemView.as_view(), name='update-cart-item'),
     path('<int:user_id>/items/<int:item_id>/remove/', RemoveFromCartView.as_view(), name='remove-from-cart'),
+    path('<int:user_id>/items/batch/', BatchUpdateCartView.as_view(), name='batch-update-cart'),
     path('<int:user_id>/clear/', ClearCartView.as_view(), name='clear-cart'),
     
     # Promo Codes
@@ -4,12 +4,16 @@ Views for cart app.
 from rest_framework import generics, status, views, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema, inline_serializer, OpenApiTypes
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
-from .models import ShoppingCart, CartItem, PromoCode
-from .serializers import ShoppingCartSerializer, CartItemSerializer, AddToCartSerializer
+from apps.outfits.models import Outfit
+from .models import ShoppingCart, CartItem
+from .promos import get_promo_code, release_promo_code, reservation_expiry, reserve_promo_code
+from .serializers import ShoppingCartSerializer, CartItemSerializer, AddToCartSerializer, CartBatchSerializer
 
 
 class GetCartView(generics.RetrieveAPIView):
@@ -215,6 +219,166 @@ class RemoveFromCartView(views.APIView):
         }, status=status.HTTP_200_OK)
 
 
+def outfit_add_operations(request, outfit):
+    """``add`` operations for every outfit item that has a price."""
+    operations = []
+    for item in outfit.items.all():
+        if item.price is None:
+            continue
+        image_url = item.image_url
+        if not image_url and item.image:
+            image_url = request.build_absolute_uri(item.image.url)
+        operations.append({
+            'op': 'add',
+            'outfit_item_id': item.id,
+            'name': item.name[:200],
+            'brand': item.brand,
+            'price': item.price,
+            'size': item.size,
+            'color': item.color,
+            'quantity': 1,
+            'image_url': image_url,
+            'product_url': item.affiliate_link or item.purchase_url,
+            'in_stock': item.is_available,
+        })
+    return operations
+
+
+def apply_cart_operations(cart, operations):
+    """
+    Apply add/update/remove operations to ``cart`` in memory, then write them
+    with one delete, one bulk_create and one bulk_update.
+    
+    Lines are keyed by (outfit_item_id, size), matching the table's unique
+    constraint, so adds upsert. Returns ``{index: error}`` for operations
+    whose target line doesn't exist; nothing is written if there are any.
+    """
+    lines = {(item.outfit_item_id, item.size): item for item in cart.items.select_for_update()}
+    by_id = {item.id: item for item in lines.values()}
+    changed = set()
+    removed = set()
+    errors = {}
+    
+    for index, operation in enumerate(operations):
+        if operation['op'] == 'add':
+            key = (operation['outfit_item_id'], operation.get('size', ''))
+            line = lines.get(key)
+            if line is None:
+                fields = {name: value for name, value in operation.items() if name != 'op'}
+                lines[key] = CartItem(cart=cart, **fields)
+            else:
+                line.quantity += operation['quantity']
+                changed.add(key)
+            continue
+        
+        if 'item_id' in operation:
+            line = by_id.get(operation['item_id'])
+        else:
+            line = lines.get((operation['outfit_item_id'], operation.get('size', '')))
+        key = (line.outfit_item_id, line.size) if line is not None else None
+        if line is None or lines.get(key) is not line:
+            errors[index] = 'Cart item not found'
+            continue
+        if operation['op'] == 'update':
+            line.quantity = operation['quantity']
+            changed.add(key)
+        else:
+            del lines[key]
+            if line.pk is not None:
+                removed.add(line.pk)
+    
+    if errors:
+        return errors
+    
+    # Delete first: a removed line may be re-added under the same (outfit_item_id, size)
+    if removed:
+        CartItem.objects.filter(cart=cart, id__in=removed).delete()
+    now = timezone.now()
+    CartItem.objects.bulk_create([line for line in lines.values() if line.pk is None])
+    updates = [lines[key] for key in changed if key in lines and lines[key].pk is not None]
+    for line in updates:
+        line.updated_at = now
+    CartItem.objects.bulk_update(updates, ['quantity', 'updated_at'])
+    return {}
+
+
+class BatchUpdateCartView(views.APIView):
+    """
+    Apply several cart changes at once.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Batch update cart",
+        description=(
+            "Apply a list of add/update/remove operations (and optionally add every priced item of "
+            "an outfit) in one transaction. Adds merge into an existing line with the same "
+            "outfit_item_id and size. If any operation targets a missing item, nothing is changed."
+        ),
+        tags=["Shopping Cart"],
+        request=CartBatchSerializer,
+        responses={
+            200: inline_serializer(
+                name='BatchUpdateCartResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': ShoppingCartSerializer(),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+            403: ForbiddenErrorResponse,
+            404: NotFoundErrorResponse,
+        }
+    )
+    def post(self, request, user_id):
+        # Ensure user can only update their own cart
+        if request.user.id != user_id:
+            return Response({
+                'success': False,
+                'message': 'Unauthorized'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = CartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        operations = []
+        outfit_id = serializer.validated_data.get('outfit_id')
+        if outfit_id is not None:
+            outfit = get_object_or_404(
+                Outfit.objects.prefetch_related('items'),
+                Q(is_public=True) | Q(user=request.user),
+                id=outfit_id
+            )
+            operations.extend(outfit_add_operations(request, outfit))
+        operations.extend(serializer.validated_data.get('operations', []))
+        
+        with transaction.atomic():
+            cart, _ = ShoppingCart.objects.get_or_create(user=request.user)
+            # Serialize concurrent batches on the same cart
+            cart = ShoppingCart.objects.select_for_update().get(pk=cart.pk)
+            errors = apply_cart_operations(cart, operations)
+            if errors:
+                transaction.set_rollback(True)
+            else:
+                cart.save(update_fields=['updated_at'])
+        
+        if errors:
+            return Response({
+                'success': False,
+                'message': 'Some operations could not be applied',
+                'errors': {'operations': errors}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Totals are computed once, from a single items query
+        cart = ShoppingCart.objects.prefetch_related('items').get(pk=cart.pk)
+        response_serializer = ShoppingCartSerializer(cart)
+        return Response({
+            'success': True,
+            'data': response_serializer.data
+        }, status=status.HTTP_200_OK)
+
+
 class ApplyPromoCodeView(views.APIView):
     """
     Apply promo code to cart.
@@ -265,15 +429,14 @@ class ApplyPromoCodeView(views.APIView):
         
         cart = get_object_or_404(ShoppingCart, user=request.user)
         
-        try:
-            promo = PromoCode.objects.get(code=code.upper())
-        except PromoCode.DoesNotExist:
+        promo = get_promo_code(code)
+        if promo is None:
             return Response({
                 'success': False,
                 'message': 'Invalid promo code'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        if not promo.is_valid():
+        if not promo.is_current():
             return Response({
                 'success': False,
                 'message': 'Promo code is expired or invalid'
@@ -285,11 +448,23 @@ class ApplyPromoCodeView(views.APIView):
                 'message': f'Minimum purchase amount is {promo.min_purchase_amount}'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Apply discount
-        discount = promo.calculate_discount(cart.subtotal)
-        cart.promo_code = code.upper()
-        cart.discount = discount
-        cart.save()
+        with transaction.atomic():
+            cart = ShoppingCart.objects.select_for_update().get(pk=cart.pk)
+            # Re-applying the cart's own code only refreshes the discount
+            if cart.promo_code != promo.code:
+                if not reserve_promo_code(promo):
+                    return Response({
+                        'success': False,
+                        'message': 'Promo code is expired or invalid'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                if cart.promo_code:
+                    release_promo_code(cart.promo_code)
+            
+            # Apply discount; applying again extends the hold on the reserved use
+            cart.promo_code = promo.code
+            cart.promo_reserved_until = reservation_expiry()
+            cart.discount = promo.calculate_discount(cart.subtotal)
+            cart.save()
         
         response_serializer = ShoppingCartSerializer(cart)
         return Response({
@@ -334,9 +509,14 @@ class RemovePromoCodeView(views.APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         cart = get_object_or_404(ShoppingCart, user=request.user)
-        cart.promo_code = ''
-        cart.discount = 0
-        cart.save()
+        with transaction.atomic():
+            cart = ShoppingCart.objects.select_for_update().get(pk=cart.pk)
+            if cart.promo_code:
+                release_promo_code(cart.promo_code)
+            cart.promo_code = ''
+            cart.promo_reserved_until = None
+            cart.discount = 0
+            cart.save()
         
         response_serializer = ShoppingCartSerializer(cart)
         return Response({
@@ -371,10 +551,15 @@ class ClearCartView(views.APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         cart = get_object_or_404(ShoppingCart, user=request.user)
-        cart.items.all().delete()
-        cart.promo_code = ''
-        cart.discount = 0
-        cart.save()
+        with transaction.atomic():
+            cart = ShoppingCart.objects.select_for_update().get(pk=cart.pk)
+            cart.items.all().delete()
+            if cart.promo_code:
+                release_promo_code(cart.promo_code)
+            cart.promo_code = ''
+            cart.promo_reserved_until = None
+            cart.discount = 0
+            cart.save()
         
         return Response({
             'success': True,
@@ -1,9 +1,11 @@
 """
 Serializers for lookbooks app.
 """
+from django.db import models
 from rest_framework import serializers
 from apps.accounts.models import User
-from apps.outfits.serializers import OutfitSerializer
+from core.nested import NestedChildren, create_nested
+from apps.outfits.serializers import OutfitSerializer, load_outfit_viewer_state
 from .models import Lookbook, LookbookOutfit, LookbookLike
 
 
@@ -29,6 +31,15 @@ class UserBasicSerializer(serializers.ModelSerializer):
         return None
 
 
+class LookbookOutfitListSerializer(serializers.ListSerializer):
+    """Loads the viewer's outfit likes and saves for the whole list at once."""
+    
+    def to_representation(self, data):
+        entries = data.all() if isinstance(data, models.manager.BaseManager) else data
+        load_outfit_viewer_state(self.context, [entry.outfit_id for entry in entries])
+        return super().to_representation(entries)
+
+
 class LookbookOutfitSerializer(serializers.ModelSerializer):
     """Serializer for lookbook outfits."""
     outfit = OutfitSerializer(read_only=True)
@@ -36,6 +47,18 @@ class LookbookOutfitSerializer(serializers.ModelSerializer):
     class Meta:
         model = LookbookOutfit
         fields = ['id', 'outfit', 'order', 'notes', 'created_at']
+        list_serializer_class = LookbookOutfitListSerializer
+
+
+class LookbookListSerializer(serializers.ListSerializer):
+    """Loads the viewer's outfit likes and saves across every lookbook in the list at once."""
+    
+    def to_representation(self, data):
+        lookbooks = data.all() if isinstance(data, models.manager.BaseManager) else data
+        load_outfit_viewer_state(self.context, [
+            entry.outfit_id for lookbook in lookbooks for entry in lookbook.outfits.all()
+        ])
+        return super().to_representation(lookbooks)
 
 
 class LookbookSerializer(serializers.ModelSerializer):
@@ -58,6 +81,7 @@ class LookbookSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'likes_count', 'views_count', 'comments_count', 'created_at', 'updated_at']
+        list_serializer_class = LookbookListSerializer
     
     def get_cover_image(self, obj):
         """Return image URL from cover_image_url field or ImageField as fallback."""
@@ -155,11 +179,9 @@ class LookbookCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         outfit_ids = validated_data.pop('outfit_ids', [])
-        lookbook = Lookbook.objects.create(**validated_data)
-        
-        # Add outfits to lookbook
-        for idx, outfit_id in enumerate(outfit_ids):
-            LookbookOutfit.objects.create(lookbook=lookbook, outfit_id=outfit_id, order=idx)
-        
-        return lookbook
+        return create_nested(Lookbook, validated_data, [
+            NestedChildren('outfit_ids', LookbookOutfit, 'lookbook', [
+                {'outfit_id': outfit_id, 'order': idx} for idx, outfit_id in enumerate(outfit_ids)
+            ]),
+        ])
 
@@ -6,11 +6,19 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer, OpenApiTypes
+from apps.tags.sync import filter_by_tags
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
 from .models import Lookbook, LookbookLike
 from .serializers import LookbookSerializer, LookbookCreateSerializer
 
 
+def with_outfits(queryset):
+    """Load lookbooks with their creator and outfits, as LookbookSerializer renders them."""
+    return queryset.select_related('creator').prefetch_related(
+        'outfits__outfit__user', 'outfits__outfit__items'
+    )
+
+
 class LookbookListView(generics.ListAPIView):
     """
     List lookbooks with filtering.
@@ -26,6 +34,7 @@ class LookbookListView(generics.ListAPIView):
             OpenApiParameter(name='season', description='Filter by season', required=False, type=str),
             OpenApiParameter(name='occasion', description='Filter by occasion', required=False, type=str),
             OpenApiParameter(name='featured', description='Show only featured', required=False, type=bool),
+            OpenApiParameter(name='tags', description='Lookbooks having all of these tags (comma-separated, case-insensitive)', required=False, type=str),
             OpenApiParameter(name='page', description='Page number', required=False, type=int),
         ],
         responses={
@@ -57,7 +66,11 @@ class LookbookListView(generics.ListAPIView):
         if featured and featured.lower() == 'true':
             queryset = queryset.filter(is_featured=True)
         
-        return queryset
+        tags = self.request.query_params.get('tags')
+        if tags:
+            queryset = filter_by_tags(queryset, tags.split(','))
+        
+        return with_outfits(queryset)
 
 
 class FeaturedLookbooksView(generics.ListAPIView):
@@ -83,7 +96,7 @@ class FeaturedLookbooksView(generics.ListAPIView):
         }
     )
     def get_queryset(self):
-        return Lookbook.objects.filter(is_public=True, is_featured=True)[:10]
+        return with_outfits(Lookbook.objects.filter(is_public=True, is_featured=True))[:10]
 
 
 class LookbookDetailView(generics.RetrieveAPIView):
@@ -104,7 +117,7 @@ class LookbookDetailView(generics.RetrieveAPIView):
         }
     )
     def get_queryset(self):
-        return Lookbook.objects.filter(is_public=True)
+        return with_outfits(Lookbook.objects.filter(is_public=True))
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -146,7 +159,7 @@ class LookbookCreateView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
-        instance = serializer.instance
+        instance = with_outfits(Lookbook.objects.filter(pk=serializer.instance.pk)).get()
         
         # Return wrapped response
         return Response({
@@ -0,0 +1,91 @@
+"""
+Management command to maintain monthly notification partitions.
+
+Pre-creates upcoming month partitions and archives/drops partitions older than
+the retention window. Intended to run daily (cron, or the
+maintain_notification_partitions Celery task which does the same).
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from apps.notifications.partitions import (
+    ensure_partitions,
+    expire_partitions,
+    is_partitioned,
+    partition_config,
+)
+
+
+class Command(BaseCommand):
+    help = 'Pre-create upcoming notification partitions and expire old ones (PostgreSQL only)'
+
+    def add_arguments(self, parser):
+        config = partition_config()
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=config['MONTHS_AHEAD'],
+            help='Number of future months to create partitions for'
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=config['RETENTION_MONTHS'],
+            help='Number of past months to keep besides the current one'
+        )
+        parser.add_argument(
+            '--no-archive',
+            action='store_true',
+            help='Drop expired partitions without archiving them to JSONL'
+        )
+        parser.add_argument(
+            '--no-expire',
+            action='store_true',
+            help='Only create partitions; never drop any'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report expired partitions without archiving or dropping them'
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to maintain'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not is_partitioned(connection):
+            self.stdout.write(self.style.WARNING(
+                'The notifications table is not partitioned on this database '
+                '(partitioning requires PostgreSQL); nothing to do.'
+            ))
+            return
+
+        if not options['dry_run']:
+            created = ensure_partitions(months_ahead=options['months_ahead'], connection=connection)
+            for name in created:
+                self.stdout.write(self.style.SUCCESS(f'Created partition {name}'))
+            if not created:
+                self.stdout.write('All upcoming partitions already exist')
+
+        if options['no_expire']:
+            return
+
+        expired = expire_partitions(
+            retention_months=options['retention_months'],
+            archive=not options['no_archive'],
+            connection=connection,
+            dry_run=options['dry_run'],
+        )
+        for result in expired:
+            if options['dry_run']:
+                self.stdout.write(f"Would expire partition {result['partition']}")
+            elif result['archive']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Archived {result['rows']} rows to {result['archive']} and dropped {result['partition']}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Dropped partition {result['partition']}"))
+        if not expired:
+            self.stdout.write('No partitions past the retention window')
@@ -0,0 +1,143 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationPreference',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('email_likes', models.BooleanField(default=True)),
+                ('email_comments', models.BooleanField(default=True)),
+                ('email_follows', models.BooleanField(default=True)),
+                ('email_recommendations', models.BooleanField(default=False)),
+                ('email_marketing', models.BooleanField(default=False)),
+                (
+                    'email_digest',
+                    models.CharField(
+                        choices=[
+                            ('daily', 'Daily'),
+                            ('weekly', 'Weekly'),
+                            ('never', 'Never'),
+                        ],
+                        default='weekly',
+                        max_length=20,
+                    ),
+                ),
+                ('push_likes', models.BooleanField(default=True)),
+                ('push_comments', models.BooleanField(default=True)),
+                ('push_follows', models.BooleanField(default=True)),
+                ('push_recommendations', models.BooleanField(default=True)),
+                ('push_marketing', models.BooleanField(default=False)),
+                ('inapp_likes', models.BooleanField(default=True)),
+                ('inapp_comments', models.BooleanField(default=True)),
+                ('inapp_follows', models.BooleanField(default=True)),
+                ('inapp_recommendations', models.BooleanField(default=True)),
+                ('inapp_system', models.BooleanField(default=True)),
+                ('dnd_enabled', models.BooleanField(default=False)),
+                ('dnd_start_time', models.TimeField(blank=True, null=True)),
+                ('dnd_end_time', models.TimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                (
+                    'user',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='notification_preferences',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'notification_preferences',
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'type',
+                    models.CharField(
+                        choices=[
+                            ('like', 'Like'),
+                            ('comment', 'Comment'),
+                            ('follow', 'Follow'),
+                            ('recommendation', 'Recommendation'),
+                            ('sale', 'Sale'),
+                            ('system', 'System'),
+                            ('promo', 'Promo'),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('image_url', models.URLField(blank=True)),
+                ('action_url', models.CharField(blank=True, max_length=500)),
+                ('is_read', models.BooleanField(default=False)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                (
+                    'actor',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='triggered_notifications',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='notifications',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'notifications',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(
+                        fields=['user', '-created_at'],
+                        name='notificatio_user_id_611c58_idx',
+                    ),
+                    models.Index(
+                        fields=['user', 'is_read'],
+                        name='notificatio_user_id_a4dd5c_idx',
+                    ),
+                    models.Index(fields=['type'], name='notificatio_type_8a8a78_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+"""
+Convert the notifications table to a table range-partitioned by month on
+created_at (PostgreSQL only; a no-op on other databases).
+
+PostgreSQL requires the partition key in the primary key, so the table's
+primary key becomes (id, created_at); ids still come from a single sequence
+and stay unique. Existing rows are copied into month partitions covering
+their range, and partitions are pre-created a few months ahead.
+"""
+from django.db import migrations
+
+FIELD_COLUMNS = (
+    'id, type, title, message, image_url, action_url, is_read, read_at, '
+    'created_at, actor_id, user_id'
+)
+
+
+def partition_notifications(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from apps.notifications.partitions import create_default_partition, ensure_partitions, month_start
+
+    Notification = apps.get_model('notifications', 'Notification')
+    connection = schema_editor.connection
+    execute = schema_editor.execute
+
+    execute('ALTER TABLE notifications RENAME TO notifications_unpartitioned')
+    execute(
+        'CREATE TABLE notifications (LIKE notifications_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+    execute('CREATE SEQUENCE notifications_partitioned_id_seq OWNED BY notifications.id')
+    execute("ALTER TABLE notifications ALTER COLUMN id SET DEFAULT nextval('notifications_partitioned_id_seq')")
+    execute('ALTER TABLE notifications ADD PRIMARY KEY (id, created_at)')
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT min(created_at) FROM notifications_unpartitioned')
+        oldest = cursor.fetchone()[0]
+    create_default_partition(connection)
+    ensure_partitions(months_ahead=3, since=month_start(oldest) if oldest else None, connection=connection)
+
+    execute(
+        f'INSERT INTO notifications ({FIELD_COLUMNS}) '
+        f'SELECT {FIELD_COLUMNS} FROM notifications_unpartitioned'
+    )
+    execute(
+        "SELECT setval('notifications_partitioned_id_seq', "
+        "COALESCE((SELECT max(id) FROM notifications), 0) + 1, false)"
+    )
+    execute('DROP TABLE notifications_unpartitioned')
+    execute('ALTER SEQUENCE notifications_partitioned_id_seq RENAME TO notifications_id_seq')
+
+    # Recreate the foreign keys and indexes (with their original names) on the
+    # partitioned parent; PostgreSQL propagates indexes to every partition.
+    for field_name in ('actor', 'user'):
+        field = Notification._meta.get_field(field_name)
+        execute(schema_editor._create_fk_sql(Notification, field, '_fk_%(to_table)s_%(to_column)s'))
+        for sql in schema_editor._field_indexes_sql(Notification, field):
+            execute(sql)
+    for index in Notification._meta.indexes:
+        schema_editor.add_index(Notification, index)
+
+
+def unpartition_notifications(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Notification = apps.get_model('notifications', 'Notification')
+    execute = schema_editor.execute
+
+    execute('CREATE TABLE notifications_partitioned AS SELECT * FROM notifications')
+    execute('DROP TABLE notifications CASCADE')
+    schema_editor.create_model(Notification)
+    execute(
+        f'INSERT INTO notifications ({FIELD_COLUMNS}) '
+        f'SELECT {FIELD_COLUMNS} FROM notifications_partitioned'
+    )
+    execute(
+        "SELECT setval(pg_get_serial_sequence('notifications', 'id'), "
+        "COALESCE((SELECT max(id) FROM notifications), 0) + 1, false)"
+    )
+    execute('DROP TABLE notifications_partitioned')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_notifications, unpartition_notifications),
+    ]
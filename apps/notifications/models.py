@@ -8,6 +8,9 @@ from django.conf import settings
 class Notification(models.Model):
     """
     User notification model.
+
+    On PostgreSQL the table is range-partitioned by month on created_at (see
+    apps.notifications.partitions), with primary key (id, created_at).
     """
     TYPE_CHOICES = [
         ('like', 'Like'),
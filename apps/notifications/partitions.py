@@ -0,0 +1,274 @@
+"""
+Monthly range partitioning of the notifications table (PostgreSQL only).
+
+``notifications`` is partitioned by ``created_at`` into one partition per
+calendar month (UTC), named ``notifications_pYYYY_MM``, plus a
+``notifications_default`` partition that catches rows for months that have no
+partition yet. ``ensure_partitions()`` pre-creates upcoming months (and moves
+any rows that landed in the default partition into their month), and
+``expire_partitions()`` archives partitions older than the retention window to
+gzipped JSON Lines in default storage before dropping them.
+
+Both run from ``manage.py notification_partitions`` and the daily
+``maintain_notification_partitions`` Celery task.
+
+Inbox reads (the notification list and unread counts) only look at the
+last ``RECENT_DAYS`` days (``recent_cutoff()``), so PostgreSQL prunes them to
+the newest few partitions instead of probing every month's index.
+"""
+import gzip
+import logging
+import re
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection as default_connection, transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'notifications'
+DEFAULT_PARTITION = 'notifications_default'
+PARTITION_NAME_RE = re.compile(r'^notifications_p(\d{4})_(\d{2})$')
+ARCHIVE_BATCH_SIZE = 5000
+
+DEFAULT_NOTIFICATION_PARTITIONS = {
+    'MONTHS_AHEAD': 3,
+    'RETENTION_MONTHS': 12,
+    'ARCHIVE': True,
+    'ARCHIVE_PATH': 'archives/notifications',
+    'RECENT_DAYS': 90,
+}
+
+
+def partition_config():
+    """NOTIFICATION_PARTITIONS settings merged over the defaults."""
+    return {**DEFAULT_NOTIFICATION_PARTITIONS, **getattr(settings, 'NOTIFICATION_PARTITIONS', {})}
+
+
+def month_start(value):
+    """First day of the month containing ``value`` (a date or datetime)."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    """First day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'notifications_p{month.year:04d}_{month.month:02d}'
+
+
+def partition_month(name):
+    """Month covered by partition ``name``, or None if it isn't a month partition."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def month_bounds(month):
+    """UTC ``[start, end)`` timestamps of a month partition."""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=dt_timezone.utc)
+    return start, end
+
+
+def retention_cutoff(retention_months, today):
+    """Partitions for months before this date are expired."""
+    return add_months(month_start(today), -retention_months)
+
+
+def recent_cutoff(now=None):
+    """Oldest ``created_at`` shown in inboxes: ``RECENT_DAYS`` days ago."""
+    return (now or datetime.now(dt_timezone.utc)) - timedelta(days=partition_config()['RECENT_DAYS'])
+
+
+def is_partitioned(connection=None):
+    """Whether the notifications table is a partitioned table on this database."""
+    connection = connection or default_connection
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(connection=None):
+    """Month partitions of the notifications table, as ``{month: name}``."""
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits i '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            'WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)',
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return {
+        partition_month(name): name
+        for name in names
+        if partition_month(name) is not None
+    }
+
+
+def create_default_partition(connection=None):
+    connection = connection or default_connection
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT'
+        )
+
+
+def create_partition(month, connection=None):
+    """
+    Create and attach the partition for ``month``.
+
+    Rows for that month already sitting in the default partition are moved
+    into the new partition before it is attached.
+    """
+    connection = connection or default_connection
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    start, end = month_bounds(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(
+            f'WITH moved AS ('
+            f'DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s RETURNING *'
+            f') INSERT INTO {qn(name)} SELECT * FROM moved',
+            [start, end]
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return name
+
+
+def ensure_partitions(months_ahead=None, since=None, connection=None, today=None):
+    """
+    Create missing month partitions and return their names.
+
+    Covers every month from ``since`` (default: the current month) through
+    ``months_ahead`` months from now, plus any month that has rows in the
+    default partition.
+    """
+    connection = connection or default_connection
+    if months_ahead is None:
+        months_ahead = partition_config()['MONTHS_AHEAD']
+    current = month_start(today or datetime.now(dt_timezone.utc))
+
+    months = set()
+    month = month_start(since) if since else current
+    while month <= add_months(current, months_ahead):
+        months.add(month)
+        month = add_months(month, 1)
+
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+            f"FROM {qn(DEFAULT_PARTITION)}"
+        )
+        months.update(row[0] for row in cursor.fetchall())
+
+    existing = existing_partitions(connection)
+    created = []
+    for month in sorted(months):
+        if month not in existing:
+            created.append(create_partition(month, connection))
+            logger.info(f'Created notification partition {created[-1]}')
+    return created
+
+
+def archive_partition(name, connection=None, storage=None):
+    """
+    Write every row of partition ``name`` to ``<ARCHIVE_PATH>/<name>.jsonl.gz``.
+
+    Rows are read in primary-key order in batches, so memory use stays flat
+    however large the partition is. Returns ``(path, row count)``.
+    """
+    connection = connection or default_connection
+    storage = storage or default_storage
+    qn = connection.ops.quote_name
+    path = f"{partition_config()['ARCHIVE_PATH'].rstrip('/')}/{name}.jsonl.gz"
+
+    rows = 0
+    last_id = 0
+    with tempfile.TemporaryFile() as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode='wb') as archive, connection.cursor() as cursor:
+            while True:
+                cursor.execute(
+                    f'SELECT id, row_to_json(t)::text FROM {qn(name)} t '
+                    f'WHERE id > %s ORDER BY id LIMIT %s',
+                    [last_id, ARCHIVE_BATCH_SIZE]
+                )
+                batch = cursor.fetchall()
+                if not batch:
+                    break
+                for _, line in batch:
+                    archive.write(line.encode('utf-8') + b'\n')
+                rows += len(batch)
+                last_id = batch[-1][0]
+        tmp.seek(0)
+        # A previous run may have archived but failed to drop; replace its file.
+        if storage.exists(path):
+            storage.delete(path)
+        path = storage.save(path, File(tmp))
+    return path, rows
+
+
+def expire_partitions(retention_months=None, archive=None, connection=None,
+                      storage=None, today=None, dry_run=False):
+    """
+    Archive (optionally) and drop month partitions past the retention window.
+
+    The current month and the ``retention_months`` months before it are kept.
+    Returns a list of ``{'partition', 'month', 'rows', 'archive'}`` dicts.
+    """
+    connection = connection or default_connection
+    config = partition_config()
+    if retention_months is None:
+        retention_months = config['RETENTION_MONTHS']
+    if archive is None:
+        archive = config['ARCHIVE']
+    cutoff = retention_cutoff(retention_months, today or datetime.now(dt_timezone.utc))
+    qn = connection.ops.quote_name
+
+    expired = []
+    for month, name in sorted(existing_partitions(connection).items()):
+        if month >= cutoff:
+            continue
+        result = {'partition': name, 'month': month.isoformat(), 'rows': None, 'archive': None}
+        if not dry_run:
+            if archive:
+                result['archive'], result['rows'] = archive_partition(name, connection, storage)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+            logger.info(f'Dropped notification partition {name}')
+        expired.append(result)
+    return expired
+
+
+def maintain_partitions(connection=None, today=None):
+    """Pre-create upcoming partitions, then expire old ones."""
+    connection = connection or default_connection
+    if not is_partitioned(connection):
+        logger.info('Notifications table is not partitioned; skipping partition maintenance')
+        return {'created': [], 'expired': []}
+    return {
+        'created': ensure_partitions(connection=connection, today=today),
+        'expired': expire_partitions(connection=connection, today=today),
+    }
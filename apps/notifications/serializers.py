@@ -35,3 +35,36 @@ class NotificationPreferenceSerializer(serializers.ModelSerializer):
         model = NotificationPreference
         exclude = ['id', 'user', 'created_at', 'updated_at']
 
+
+
+class BulkNotificationActionSerializer(serializers.Serializer):
+    """
+    Bulk action on the user's notifications.
+
+    Selectors combine with AND; at least one is required so a typo can't
+    delete a whole inbox (use read-all to mark everything read).
+    """
+    ACTION_CHOICES = ['mark_read', 'mark_unread', 'delete']
+    MAX_IDS = 1000
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_IDS,
+        help_text=f"Notification IDs (up to {MAX_IDS})"
+    )
+    type = serializers.ChoiceField(
+        choices=[choice for choice, _ in Notification.TYPE_CHOICES],
+        required=False,
+        help_text="Only notifications of this type"
+    )
+    before = serializers.DateTimeField(
+        required=False,
+        help_text="Only notifications created before this time (e.g. the oldest one on screen)"
+    )
+
+    def validate(self, attrs):
+        if not any(key in attrs for key in ('ids', 'type', 'before')):
+            raise serializers.ValidationError('Provide at least one of ids, type or before.')
+        return attrs
@@ -0,0 +1,11 @@
+"""
+Celery tasks for notifications app.
+"""
+from celery import shared_task
+from .partitions import maintain_partitions
+
+
+@shared_task(ignore_result=True)
+def maintain_notification_partitions():
+    """Pre-create upcoming notification partitions and expire old ones."""
+    maintain_partitions()
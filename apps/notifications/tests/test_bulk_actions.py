@@ -0,0 +1,119 @@
+"""
+Tests for bulk notification actions.
+"""
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.notifications.models import Notification
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='inbox@example.com',
+        username='inboxuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def notifications(user):
+    """Create likes and follows, the follows a week old."""
+    created = [
+        Notification.objects.create(user=user, type='like', title='Like', message='liked')
+        for _ in range(3)
+    ] + [
+        Notification.objects.create(user=user, type='follow', title='Follow', message='followed')
+        for _ in range(2)
+    ]
+    week_ago = timezone.now() - timedelta(days=7)
+    Notification.objects.filter(type='follow').update(created_at=week_ago)
+    return created
+
+
+def bulk_url(user):
+    return f'/api/v1/notifications/{user.id}/bulk/'
+
+
+@pytest.mark.django_db
+class TestBulkNotificationActions:
+    """Test the bulk notification endpoint."""
+
+    def test_mark_read_by_ids(self, authenticated_client, user, notifications):
+        """Test marking a list of notifications read returns new counts."""
+        ids = [n.id for n in notifications[:2]]
+        response = authenticated_client.post(bulk_url(user), {'action': 'mark_read', 'ids': ids}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert response.data['unread'] == {'count': 3, 'by_type': {'like': 1, 'follow': 2}}
+        assert Notification.objects.filter(id__in=ids, is_read=True, read_at__isnull=False).count() == 2
+
+    def test_mark_unread_by_type(self, authenticated_client, user, notifications):
+        """Test marking a type unread only touches read notifications of that type."""
+        Notification.objects.filter(user=user).update(is_read=True, read_at=timezone.now())
+        response = authenticated_client.post(
+            bulk_url(user), {'action': 'mark_unread', 'type': 'follow'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert response.data['unread'] == {'count': 2, 'by_type': {'follow': 2}}
+        assert not Notification.objects.filter(type='follow', read_at__isnull=False).exists()
+
+    def test_delete_older_than(self, authenticated_client, user, notifications):
+        """Test deleting everything created before a cursor."""
+        before = (timezone.now() - timedelta(days=1)).isoformat()
+        response = authenticated_client.post(
+            bulk_url(user), {'action': 'delete', 'before': before}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert response.data['unread'] == {'count': 3, 'by_type': {'like': 3}}
+        assert not Notification.objects.filter(type='follow').exists()
+
+    def test_single_statement_per_action(
+        self, authenticated_client, user, notifications, django_assert_max_num_queries
+    ):
+        """Test the action and unread counts don't scale with the selection."""
+        ids = [n.id for n in notifications]
+        with django_assert_max_num_queries(4):
+            response = authenticated_client.post(bulk_url(user), {'action': 'delete', 'ids': ids}, format='json')
+        assert response.data['count'] == 5
+
+    def test_other_users_notifications_untouched(self, authenticated_client, user, notifications):
+        """Test ids belonging to another user are ignored."""
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        theirs = Notification.objects.create(user=other, type='like', title='Like', message='liked')
+        response = authenticated_client.post(
+            bulk_url(user), {'action': 'delete', 'ids': [theirs.id]}, format='json'
+        )
+        assert response.data['count'] == 0
+        assert Notification.objects.filter(id=theirs.id).exists()
+
+    def test_selector_required(self, authenticated_client, user, notifications):
+        """Test an action without any selector is rejected."""
+        response = authenticated_client.post(bulk_url(user), {'action': 'delete'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Notification.objects.filter(user=user).count() == 5
+
+    def test_forbidden_for_other_user(self, authenticated_client, user):
+        """Test users can't act on another user's inbox."""
+        response = authenticated_client.post(
+            f'/api/v1/notifications/{user.id + 1}/bulk/', {'action': 'mark_read', 'type': 'like'}, format='json'
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
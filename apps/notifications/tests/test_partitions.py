@@ -0,0 +1,199 @@
+"""
+Tests for notification partition maintenance.
+"""
+import gzip
+import json
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.notifications.models import Notification
+from apps.notifications.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    archive_partition,
+    create_partition,
+    ensure_partitions,
+    existing_partitions,
+    expire_partitions,
+    is_partitioned,
+    month_bounds,
+    month_start,
+    partition_month,
+    partition_name,
+    retention_cutoff,
+)
+
+User = get_user_model()
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='notification partitioning needs PostgreSQL'
+)
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='partitions@example.com',
+        username='partitionsuser',
+        password='testpass123'
+    )
+
+
+def notification_at(user, created_at):
+    notification = Notification.objects.create(user=user, type='system', title='Hi', message='Hi')
+    Notification.objects.filter(id=notification.id).update(created_at=created_at)
+    return notification
+
+
+def partition_of(notification_id):
+    """Name of the partition holding a notification row."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tableoid::regclass::text FROM notifications WHERE id = %s', [notification_id])
+        return cursor.fetchone()[0]
+
+
+class TestPartitionHelpers:
+    """Test month arithmetic and partition naming."""
+
+    def test_add_months_across_years(self):
+        """Test month arithmetic wraps years in both directions."""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+    def test_partition_name_round_trip(self):
+        """Test partition names map back to their month."""
+        assert partition_name(date(2026, 3, 1)) == 'notifications_p2026_03'
+        assert partition_month('notifications_p2026_03') == date(2026, 3, 1)
+        assert partition_month('notifications_default') is None
+
+    def test_month_bounds(self):
+        """Test partitions cover [first of month, first of next month) in UTC."""
+        start, end = month_bounds(date(2026, 12, 1))
+        assert start == datetime(2026, 12, 1, tzinfo=timezone.utc)
+        assert end == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+    def test_retention_cutoff_keeps_current_month(self):
+        """Test the current month plus N previous months are retained."""
+        today = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        assert retention_cutoff(12, today) == date(2025, 10, 1)
+        assert retention_cutoff(0, today) == date(2026, 10, 1)
+
+
+@pytest.mark.django_db
+class TestNotificationPartitionsCommand:
+    """Test the management command."""
+
+    def test_noop_without_postgres_partitioning(self):
+        """Test the command exits cleanly when the table isn't partitioned."""
+        out = StringIO()
+        call_command('notification_partitions', stdout=out)
+        assert 'not partitioned' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestRecentWindow:
+    """Test inbox reads are limited to recent notifications."""
+
+    def test_old_notifications_are_not_listed_or_counted(self, user, settings):
+        settings.NOTIFICATION_PARTITIONS = {**settings.NOTIFICATION_PARTITIONS, 'RECENT_DAYS': 30}
+        recent = Notification.objects.create(user=user, type='like', title='Like', message='liked')
+        notification_at(user, datetime.now(timezone.utc) - timedelta(days=31))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        response = client.get(f'/api/v1/notifications/{user.id}/')
+        assert [n['id'] for n in response.data['results']] == [recent.id]
+        response = client.get(f'/api/v1/notifications/{user.id}/unread-count/')
+        assert response.data == {'count': 1, 'by_type': {'like': 1}}
+
+
+@pytest.mark.postgresql
+@postgresql_only
+@pytest.mark.django_db
+class TestPostgresPartitions:
+    """Test partition maintenance against a partitioned PostgreSQL table."""
+
+    def test_migration_partitions_table(self):
+        """Test the migration leaves the current and upcoming months partitioned."""
+        assert is_partitioned()
+        current = month_start(datetime.now(timezone.utc))
+        months = existing_partitions()
+        assert all(add_months(current, offset) in months for offset in range(4))
+
+    def test_rows_in_default_partition_move_to_new_partition(self, user):
+        """Test ensure_partitions picks up months that only exist in the default partition."""
+        month = add_months(month_start(datetime.now(timezone.utc)), 24)
+        start, _ = month_bounds(month)
+        notification = notification_at(user, start + timedelta(days=3))
+        assert partition_of(notification.id) == DEFAULT_PARTITION
+
+        assert partition_name(month) in ensure_partitions()
+        assert partition_of(notification.id) == partition_name(month)
+        assert ensure_partitions() == []
+
+    def test_create_partition(self, user):
+        """Test a new partition takes the rows of its month from the default partition."""
+        month = date(2001, 1, 1)
+        start, end = month_bounds(month)
+        inside = notification_at(user, start)
+        outside = notification_at(user, end)
+
+        assert create_partition(month) == 'notifications_p2001_01'
+        assert partition_of(inside.id) == 'notifications_p2001_01'
+        assert partition_of(outside.id) == DEFAULT_PARTITION
+
+    def test_archive_and_expire(self, user, tmp_path):
+        """Test expired partitions are archived to storage, then dropped."""
+        storage = FileSystemStorage(location=tmp_path)
+        today = datetime.now(timezone.utc)
+        old_month = add_months(month_start(today), -14)
+        ensure_partitions(since=old_month)
+        old = notification_at(user, month_bounds(old_month)[0] + timedelta(hours=1))
+        kept = Notification.objects.create(user=user, type='system', title='Now', message='Now')
+
+        path, rows = archive_partition(partition_name(old_month), storage=storage)
+        assert rows == 1
+        with storage.open(path, 'rb') as archive:
+            lines = gzip.decompress(archive.read()).splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [old.id]
+
+        dry = expire_partitions(retention_months=12, storage=storage, today=today, dry_run=True)
+        assert partition_name(old_month) in [result['partition'] for result in dry]
+        assert Notification.objects.filter(id=old.id).exists()
+
+        expired = expire_partitions(retention_months=12, storage=storage, today=today)
+        by_name = {result['partition']: result for result in expired}
+        assert by_name[partition_name(old_month)]['rows'] == 1
+        assert partition_name(old_month) not in existing_partitions().values()
+        assert not Notification.objects.filter(id=old.id).exists()
+        assert Notification.objects.filter(id=kept.id).exists()
+
+
+@pytest.mark.postgresql
+@postgresql_only
+@pytest.mark.django_db(transaction=True)
+def test_partition_migration_round_trip(user):
+    """Test 0002 can be reversed and reapplied without losing rows or ids."""
+    notification = notification_at(user, datetime.now(timezone.utc) - timedelta(days=40))
+    executor = MigrationExecutor(connection)
+    try:
+        executor.migrate([('notifications', '0001_initial')])
+        assert not is_partitioned()
+        assert Notification.objects.filter(id=notification.id).exists()
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    assert is_partitioned()
+    assert Notification.objects.get(id=notification.id).title == 'Hi'
+    newer = Notification.objects.create(user=user, type='system', title='Next', message='Next')
+    assert newer.id > notification.id
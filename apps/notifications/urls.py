@@ -7,6 +7,7 @@ from .views import (
     UnreadCountView,
     MarkNotificationReadView,
     MarkAllReadView,
+    BulkNotificationActionView,
     DeleteNotificationView,
     NotificationPreferencesView,
 )
@@ -19,6 +20,7 @@ urlpatterns = [
     path('<int:user_id>/unread-count/', UnreadCountView.as_view(), name='unread-count'),
     path('<int:notification_id>/read/', MarkNotificationReadView.as_view(), name='mark-read'),
     path('<int:user_id>/read-all/', MarkAllReadView.as_view(), name='mark-all-read'),
+    path('<int:user_id>/bulk/', BulkNotificationActionView.as_view(), name='bulk-action'),
     path('<int:pk>/delete/', DeleteNotificationView.as_view(), name='delete-notification'),
     
     # Preferences
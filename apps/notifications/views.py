@@ -4,23 +4,44 @@ Views for notifications app.
 from rest_framework import generics, status, views, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer, OpenApiTypes
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
 from .models import Notification, NotificationPreference
-from .serializers import NotificationSerializer, NotificationPreferenceSerializer
+from .partitions import recent_cutoff
+from .serializers import (
+    BulkNotificationActionSerializer,
+    NotificationSerializer,
+    NotificationPreferenceSerializer,
+)
+
+
+def unread_counts(user):
+    """Recent unread notification count for ``user``, total and by type, in one query."""
+    rows = (
+        Notification.objects.filter(user=user, is_read=False, created_at__gte=recent_cutoff())
+        .order_by()
+        .values('type')
+        .annotate(count=Count('id'))
+    )
+    by_type = {row['type']: row['count'] for row in rows}
+    return {
+        'count': sum(by_type.values()),
+        'by_type': by_type,
+    }
 
 
 class NotificationListView(generics.ListAPIView):
     """
-    List user notifications with filtering.
+    List user notifications from the last RECENT_DAYS days, with filtering.
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
     
     @extend_schema(
         summary="Get notifications",
-        description="List user notifications with optional filtering",
+        description="List the user's notifications from the last 90 days with optional filtering",
         tags=["Notifications"],
         parameters=[
             OpenApiParameter(name='type', description='Filter by notification type', required=False, type=str),
@@ -41,7 +62,8 @@ class NotificationListView(generics.ListAPIView):
         }
     )
     def get_queryset(self):
-        queryset = Notification.objects.filter(user=self.request.user)
+        # Only recent months, so the partitioned table is pruned to a few partitions
+        queryset = Notification.objects.filter(user=self.request.user, created_at__gte=recent_cutoff())
         
         # Apply filters
         notification_type = self.request.query_params.get('type')
@@ -86,20 +108,7 @@ class UnreadCountView(views.APIView):
                 'message': 'Unauthorized'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        notifications = Notification.objects.filter(user=request.user, is_read=False)
-        total_count = notifications.count()
-        
-        # Count by type
-        by_type = {}
-        for notification_type, _ in Notification.TYPE_CHOICES:
-            count = notifications.filter(type=notification_type).count()
-            if count > 0:
-                by_type[notification_type] = count
-        
-        return Response({
-            'count': total_count,
-            'by_type': by_type
-        }, status=status.HTTP_200_OK)
+        return Response(unread_counts(request.user), status=status.HTTP_200_OK)
 
 
 class MarkNotificationReadView(views.APIView):
@@ -186,6 +195,80 @@ class MarkAllReadView(views.APIView):
         }, status=status.HTTP_200_OK)
 
 
+class BulkNotificationActionView(views.APIView):
+    """
+    Mark read, mark unread or delete many notifications at once.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Bulk notification action",
+        description=(
+            "Mark read, mark unread or delete the user's notifications selected by "
+            "id list, type and/or created-before cursor, as a single update/delete. "
+            "Returns the updated unread counts."
+        ),
+        tags=["Notifications"],
+        request=BulkNotificationActionSerializer,
+        responses={
+            200: inline_serializer(
+                name='BulkNotificationActionResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'action': serializers.CharField(),
+                    'count': serializers.IntegerField(),
+                    'unread': inline_serializer(
+                        name='BulkNotificationUnreadCounts',
+                        fields={
+                            'count': serializers.IntegerField(),
+                            'by_type': serializers.DictField(),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+            403: ForbiddenErrorResponse,
+        }
+    )
+    def post(self, request, user_id):
+        # Ensure user can only act on their own notifications
+        if request.user.id != user_id:
+            return Response({
+                'success': False,
+                'message': 'Unauthorized'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = BulkNotificationActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        notifications = Notification.objects.filter(user=request.user)
+        if 'ids' in data:
+            notifications = notifications.filter(id__in=data['ids'])
+        if 'type' in data:
+            notifications = notifications.filter(type=data['type'])
+        if 'before' in data:
+            notifications = notifications.filter(created_at__lt=data['before'])
+        
+        action = data['action']
+        if action == 'mark_read':
+            count = notifications.filter(is_read=False).update(is_read=True, read_at=timezone.now())
+        elif action == 'mark_unread':
+            count = notifications.filter(is_read=True).update(is_read=False, read_at=None)
+        else:
+            # Notifications have no dependents or delete signals, so this is a
+            # single DELETE statement.
+            count, _ = notifications.delete()
+        
+        return Response({
+            'success': True,
+            'action': action,
+            'count': count,
+            'unread': unread_counts(request.user),
+        }, status=status.HTTP_200_OK)
+
+
 class DeleteNotificationView(generics.DestroyAPIView):
     """
     Delete a notification.
@@ -2,7 +2,7 @@
 Django admin configuration for outfits app.
 """
 from django.contrib import admin
-from .models import Outfit, OutfitItem, OutfitLike, OutfitSave
+from .models import Outfit, OutfitEmbedding, OutfitItem, OutfitLike, OutfitSave
 
 
 class OutfitItemInline(admin.TabularInline):
@@ -33,6 +33,16 @@ class OutfitItemAdmin(admin.ModelAdmin):
     raw_id_fields = ['outfit']
 
 
+@admin.register(OutfitEmbedding)
+class OutfitEmbeddingAdmin(admin.ModelAdmin):
+    """Admin interface for OutfitEmbedding model."""
+    list_display = ['outfit', 'model_version', 'dimension', 'dtype', 'updated_at']
+    list_filter = ['model_version', 'dtype']
+    exclude = ['vector']
+    readonly_fields = ['model_version', 'dimension', 'dtype', 'updated_at']
+    raw_id_fields = ['outfit']
+
+
 @admin.register(OutfitLike)
 class OutfitLikeAdmin(admin.ModelAdmin):
     """Admin interface for OutfitLike model."""
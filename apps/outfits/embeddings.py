@@ -0,0 +1,148 @@
+"""
+Outfit image embeddings.
+
+Embeddings live in ``OutfitEmbedding``, one row per outfit, as packed
+little-endian float32 or float16 bytes with their dimension and the model
+version that produced them. Decoding is a zero-copy ``np.frombuffer``, and
+``load_embeddings`` stacks any number of outfits into one matrix from a
+single query, ready for similarity search.
+"""
+import numpy as np
+from django.apps import apps as global_apps
+from django.conf import settings
+
+DEFAULT_EMBEDDINGS = {
+    'MODEL_VERSION': 'v1',
+    'DTYPE': 'float32',
+}
+
+DTYPES = {'float32': np.dtype('<f4'), 'float16': np.dtype('<f2')}
+
+
+def embedding_config():
+    return {**DEFAULT_EMBEDDINGS, **getattr(settings, 'EMBEDDINGS', {})}
+
+
+def pack_vector(values, dtype='float32'):
+    """Pack a sequence of floats as little-endian ``dtype`` bytes."""
+    return np.asarray(values, dtype=DTYPES[dtype]).tobytes()
+
+
+def unpack_vector(data, dtype='float32'):
+    """Read-only float32 array from bytes written by ``pack_vector``."""
+    vector = np.frombuffer(data, dtype=DTYPES[dtype])
+    return vector if dtype == 'float32' else vector.astype(np.float32)
+
+
+def set_outfit_embedding(outfit, values, model_version=None, dtype=None, apps=global_apps):
+    """Store ``values`` as the embedding of ``outfit``, replacing any previous one."""
+    OutfitEmbedding = apps.get_model('outfits', 'OutfitEmbedding')
+    config = embedding_config()
+    dtype = dtype or config['DTYPE']
+    if dtype not in DTYPES:
+        raise ValueError(f'Unsupported embedding dtype: {dtype}')
+    vector = np.asarray(values, dtype=np.float32)
+    if vector.ndim != 1 or not vector.size:
+        raise ValueError('An embedding must be a non-empty flat list of numbers')
+    embedding, _ = OutfitEmbedding.objects.update_or_create(
+        outfit_id=outfit.pk,
+        defaults={
+            'model_version': model_version or config['MODEL_VERSION'],
+            'dimension': vector.size,
+            'dtype': dtype,
+            'vector': pack_vector(vector, dtype),
+        },
+    )
+    return embedding
+
+
+def get_outfit_embedding(outfit, model_version=None):
+    """The outfit's embedding as a float32 array, or None if it has none (for ``model_version``)."""
+    from .models import OutfitEmbedding
+
+    embeddings = OutfitEmbedding.objects.filter(outfit_id=outfit.pk)
+    if model_version:
+        embeddings = embeddings.filter(model_version=model_version)
+    row = embeddings.values_list('vector', 'dtype').first()
+    return unpack_vector(row[0], row[1]) if row else None
+
+
+def load_embeddings(outfit_ids=None, model_version=None):
+    """
+    ``(outfit ids, matrix)`` with one float32 row per embedded outfit, in one query.
+
+    Only embeddings of ``model_version`` (default: the configured one) are
+    loaded, so every row has the same dimension. ``outfit_ids`` limits the
+    outfits; None loads every embedding of the version.
+    """
+    from .models import OutfitEmbedding
+
+    embeddings = OutfitEmbedding.objects.filter(model_version=model_version or embedding_config()['MODEL_VERSION'])
+    if outfit_ids is not None:
+        embeddings = embeddings.filter(outfit_id__in=outfit_ids)
+    rows = list(embeddings.order_by('outfit_id').values_list('outfit_id', 'vector', 'dtype', 'dimension'))
+    if not rows:
+        return [], np.empty((0, 0), dtype=np.float32)
+    dimension = rows[0][3]
+    matrix = np.empty((len(rows), dimension), dtype=np.float32)
+    for index, (_, data, dtype, row_dimension) in enumerate(rows):
+        if row_dimension != dimension:
+            raise ValueError(f'Mixed embedding dimensions for model version {model_version}')
+        matrix[index] = np.frombuffer(data, dtype=DTYPES[dtype])
+    return [row[0] for row in rows], matrix
+
+
+def migrate_json_embeddings(batch_size=500, apps=global_apps):
+    """
+    Copy JSON ``Outfit.embedding_vector`` lists into ``OutfitEmbedding`` rows.
+
+    Used by the migration that moves embeddings out of the outfits table;
+    reads outfits in primary-key batches and skips lists that are empty or
+    not numeric. Returns the number of embeddings written.
+    """
+    Outfit = apps.get_model('outfits', 'Outfit')
+    OutfitEmbedding = apps.get_model('outfits', 'OutfitEmbedding')
+    config = embedding_config()
+    outfits = Outfit.objects.exclude(embedding_vector=None).order_by('pk')
+    written = 0
+    last_pk = 0
+    while True:
+        batch = list(outfits.filter(pk__gt=last_pk).values_list('pk', 'embedding_vector')[:batch_size])
+        if not batch:
+            return written
+        embeddings = []
+        for outfit_id, values in batch:
+            try:
+                vector = np.asarray(values, dtype=np.float32)
+            except (TypeError, ValueError):
+                continue
+            if vector.ndim != 1 or not vector.size:
+                continue
+            embeddings.append(OutfitEmbedding(
+                outfit_id=outfit_id,
+                model_version=config['MODEL_VERSION'],
+                dimension=vector.size,
+                dtype=config['DTYPE'],
+                vector=pack_vector(vector, config['DTYPE']),
+            ))
+        OutfitEmbedding.objects.bulk_create(embeddings, ignore_conflicts=True)
+        written += len(embeddings)
+        last_pk = batch[-1][0]
+
+
+def restore_json_embeddings(batch_size=500, apps=global_apps):
+    """Reverse of ``migrate_json_embeddings``: write the stored vectors back as JSON lists."""
+    Outfit = apps.get_model('outfits', 'Outfit')
+    OutfitEmbedding = apps.get_model('outfits', 'OutfitEmbedding')
+    embeddings = OutfitEmbedding.objects.order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(embeddings.filter(pk__gt=last_pk).values_list('pk', 'vector', 'dtype')[:batch_size])
+        if not batch:
+            return
+        outfits = [
+            Outfit(pk=outfit_id, embedding_vector=unpack_vector(bytes(data), dtype).tolist())
+            for outfit_id, data, dtype in batch
+        ]
+        Outfit.objects.bulk_update(outfits, ['embedding_vector'])
+        last_pk = batch[-1][0]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:28
+
+from django.db import migrations, models
+
+
+def backfill_color_codes(apps, schema_editor):
+    from core.colors import backfill_color_codes
+    backfill_color_codes(apps.get_model('outfits', 'OutfitItem').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0003_outfititem_outfit_item_outfit__c8753f_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outfititem',
+            name='color_code',
+            field=models.CharField(blank=True, db_index=True, help_text='Canonical palette color (see core.colors), derived from color', max_length=20),
+        ),
+        migrations.RunPython(backfill_color_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def migrate_json_embeddings(apps, schema_editor):
+    from apps.outfits.embeddings import migrate_json_embeddings
+    migrate_json_embeddings(apps=apps)
+
+
+def restore_json_embeddings(apps, schema_editor):
+    from apps.outfits.embeddings import restore_json_embeddings
+    restore_json_embeddings(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0004_outfititem_color_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutfitEmbedding',
+            fields=[
+                ('outfit', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='outfits.outfit')),
+                ('model_version', models.CharField(help_text='Embedding model that produced the vector', max_length=50)),
+                ('dimension', models.PositiveIntegerField()),
+                ('dtype', models.CharField(choices=[('float32', 'float32'), ('float16', 'float16')], default='float32', max_length=10)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'outfit_embeddings',
+                'indexes': [models.Index(fields=['model_version'], name='outfit_embe_model_v_52e02d_idx')],
+            },
+        ),
+        migrations.RunPython(migrate_json_embeddings, restore_json_embeddings),
+        migrations.RemoveField(
+            model_name='outfit',
+            name='embedding_vector',
+        ),
+    ]
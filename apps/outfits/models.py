@@ -3,6 +3,7 @@ Outfit models for CuratorAI.
 """
 from django.db import models
 from django.conf import settings
+from core.colors import normalize_color
 
 
 class Outfit(models.Model):
@@ -45,7 +46,6 @@ class Outfit(models.Model):
     # AI Features
     ai_generated = models.BooleanField(default=False)
     confidence_score = models.FloatField(null=True, blank=True, help_text='AI confidence score (0-1)')
-    embedding_vector = models.JSONField(null=True, blank=True, help_text='Image embedding for similarity search')
     
     # Social
     is_public = models.BooleanField(default=True)
@@ -71,6 +71,35 @@ class Outfit(models.Model):
         return f"{self.title} by {self.user.username}"
 
 
+class OutfitEmbedding(models.Model):
+    """
+    Image embedding of an outfit, for similarity search.
+    
+    Kept out of the ``outfits`` row so list queries never load it. The vector
+    is stored as packed little-endian floats; see apps.outfits.embeddings.
+    """
+    DTYPE_CHOICES = [
+        ('float32', 'float32'),
+        ('float16', 'float16'),
+    ]
+    
+    outfit = models.OneToOneField(Outfit, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model_version = models.CharField(max_length=50, help_text='Embedding model that produced the vector')
+    dimension = models.PositiveIntegerField()
+    dtype = models.CharField(max_length=10, choices=DTYPE_CHOICES, default='float32')
+    vector = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'outfit_embeddings'
+        indexes = [
+            models.Index(fields=['model_version']),
+        ]
+    
+    def __str__(self):
+        return f"Outfit {self.outfit_id} embedding ({self.model_version}, {self.dimension}d)"
+
+
 class OutfitItem(models.Model):
     """
     Individual clothing item within an outfit.
@@ -100,6 +129,7 @@ class OutfitItem(models.Model):
     currency = models.CharField(max_length=3, default='USD')
     size = models.CharField(max_length=20, blank=True)
     color = models.CharField(max_length=50, blank=True)
+    color_code = models.CharField(max_length=20, blank=True, db_index=True, help_text='Canonical palette color (see core.colors), derived from color')
     material = models.CharField(max_length=100, blank=True)
     
     # Purchase Links
@@ -124,6 +154,13 @@ class OutfitItem(models.Model):
     
     def __str__(self):
         return f"{self.item_type}: {self.name}"
+    
+    def save(self, *args, **kwargs):
+        self.color_code = normalize_color(self.color)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'color' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'color_code'}
+        super().save(*args, **kwargs)
 
 
 class OutfitLike(models.Model):
@@ -1,10 +1,18 @@
 """
 Serializers for outfits app.
 """
+from django.db import models
 from rest_framework import serializers
+from core.colors import normalize_color
+from core.nested import NestedChildren, create_nested
 from .models import Outfit, OutfitItem, OutfitLike, OutfitSave
 
 
+def set_item_color_code(item):
+    """OutfitItem.save() derives color_code; bulk inserts need it set up front."""
+    item.color_code = normalize_color(item.color)
+
+
 class OutfitItemSerializer(serializers.ModelSerializer):
     """Serializer for OutfitItem model."""
     image = serializers.SerializerMethodField()
@@ -47,6 +55,40 @@ class OutfitItemSerializer(serializers.ModelSerializer):
         return None
 
 
+def load_outfit_viewer_state(context, outfit_ids):
+    """
+    Whether the request user liked and saved each of ``outfit_ids``.
+    
+    The state is kept in the serializer ``context``, which nested serializers
+    share, so each outfit is looked up once per response, and a whole page in
+    two queries when list serializers load it up front. Returns None for
+    anonymous requests.
+    """
+    request = context.get('request')
+    if not (request and request.user.is_authenticated):
+        return None
+    state = context.setdefault('outfit_viewer_state', {'loaded': set(), 'liked': set(), 'saved': set()})
+    missing = set(outfit_ids) - state['loaded']
+    if missing:
+        state['liked'].update(
+            OutfitLike.objects.filter(user=request.user, outfit_id__in=missing).values_list('outfit_id', flat=True)
+        )
+        state['saved'].update(
+            OutfitSave.objects.filter(user=request.user, outfit_id__in=missing).values_list('outfit_id', flat=True)
+        )
+        state['loaded'].update(missing)
+    return state
+
+
+class OutfitListSerializer(serializers.ListSerializer):
+    """Loads the viewer's likes and saves for every outfit in the list at once."""
+    
+    def to_representation(self, data):
+        outfits = data.all() if isinstance(data, models.manager.BaseManager) else data
+        load_outfit_viewer_state(self.context, [outfit.id for outfit in outfits])
+        return super().to_representation(outfits)
+
+
 class OutfitSerializer(serializers.ModelSerializer):
     """Serializer for Outfit model."""
     items = OutfitItemSerializer(many=True, read_only=True)
@@ -68,6 +110,7 @@ class OutfitSerializer(serializers.ModelSerializer):
             'user', 'likes_count', 'saves_count', 'views_count',
             'ai_generated', 'confidence_score', 'created_at', 'updated_at'
         ]
+        list_serializer_class = OutfitListSerializer
     
     def get_main_image(self, obj):
         """Return image URL from main_image_url field or ImageField as fallback."""
@@ -83,16 +126,12 @@ class OutfitSerializer(serializers.ModelSerializer):
         return None
     
     def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return OutfitLike.objects.filter(user=request.user, outfit=obj).exists()
-        return False
+        state = load_outfit_viewer_state(self.context, [obj.id])
+        return bool(state) and obj.id in state['liked']
     
     def get_is_saved(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return OutfitSave.objects.filter(user=request.user, outfit=obj).exists()
-        return False
+        state = load_outfit_viewer_state(self.context, [obj.id])
+        return bool(state) and obj.id in state['saved']
 
 
 class OutfitCreateSerializer(serializers.ModelSerializer):
@@ -133,13 +172,9 @@ class OutfitCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
-        outfit = Outfit.objects.create(**validated_data)
-        
-        # Create outfit items
-        for item_data in items_data:
-            OutfitItem.objects.create(outfit=outfit, **item_data)
-        
-        return outfit
+        return create_nested(Outfit, validated_data, [
+            NestedChildren('items', OutfitItem, 'outfit', items_data, prepare=set_item_color_code),
+        ])
 
 
 class OutfitLikeSerializer(serializers.ModelSerializer):
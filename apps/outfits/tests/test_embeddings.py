@@ -0,0 +1,96 @@
+"""
+Tests for packed outfit embeddings.
+"""
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+from apps.outfits.embeddings import (
+    get_outfit_embedding, load_embeddings, pack_vector, set_outfit_embedding, unpack_vector,
+)
+from apps.outfits.models import Outfit, OutfitEmbedding
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='embeddings@example.com',
+        username='embeddingsuser',
+        password='testpass123'
+    )
+
+
+def test_pack_and_unpack_vector():
+    values = [0.25, -1.5, 3.0]
+
+    assert len(pack_vector(values)) == 12
+    assert unpack_vector(pack_vector(values)).tolist() == values
+    assert len(pack_vector(values, 'float16')) == 6
+    assert unpack_vector(pack_vector(values, 'float16'), 'float16').dtype == np.float32
+
+
+@pytest.mark.django_db
+class TestOutfitEmbeddings:
+    """Embeddings are stored beside the outfit, not in it."""
+
+    def test_set_and_get_embedding(self, user):
+        outfit = Outfit.objects.create(user=user, title='Look', occasion='casual', season='all')
+
+        set_outfit_embedding(outfit, [0.1, 0.2, 0.3, 0.4])
+        set_outfit_embedding(outfit, [1, 2], model_version='v2', dtype='float16')
+
+        embedding = OutfitEmbedding.objects.get(outfit=outfit)
+        assert (embedding.model_version, embedding.dimension, embedding.dtype) == ('v2', 2, 'float16')
+        assert get_outfit_embedding(outfit).tolist() == [1.0, 2.0]
+        assert get_outfit_embedding(outfit, model_version='v1') is None
+
+    def test_invalid_embedding_is_rejected(self, user):
+        outfit = Outfit.objects.create(user=user, title='Look', occasion='casual', season='all')
+
+        with pytest.raises(ValueError):
+            set_outfit_embedding(outfit, [])
+        with pytest.raises(ValueError):
+            set_outfit_embedding(outfit, [1.0], dtype='float64')
+
+    def test_load_embeddings_matrix(self, user):
+        outfits = [Outfit.objects.create(user=user, title=f'Look {i}', occasion='casual', season='all') for i in range(3)]
+        for i, outfit in enumerate(outfits):
+            set_outfit_embedding(outfit, [i, i + 0.5], dtype='float16' if i == 1 else 'float32')
+        set_outfit_embedding(outfits[2], [9.0, 9.0, 9.0], model_version='v2')
+
+        ids, matrix = load_embeddings()
+
+        assert ids == [outfits[0].id, outfits[1].id]
+        assert matrix.dtype == np.float32
+        assert matrix.tolist() == [[0.0, 0.5], [1.0, 1.5]]
+        assert load_embeddings([outfits[2].id], model_version='v2')[1].shape == (1, 3)
+
+    def test_outfit_list_does_not_select_embeddings(self, user):
+        outfit = Outfit.objects.create(user=user, title='Look', occasion='casual', season='all')
+        set_outfit_embedding(outfit, [0.5] * 512)
+
+        with CaptureQueriesContext(connection) as queries:
+            list(Outfit.objects.all())
+        assert 'vector' not in queries[0]['sql']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_moves_json_embeddings(user):
+    executor = MigrationExecutor(connection)
+    executor.migrate([('outfits', '0004_outfititem_color_code')])
+    old_apps = executor.loader.project_state([('outfits', '0004_outfititem_color_code')]).apps
+    OldOutfit = old_apps.get_model('outfits', 'Outfit')
+    embedded = OldOutfit.objects.create(user_id=user.id, title='A', occasion='casual', season='all', embedding_vector=[0.5, -0.25])
+    OldOutfit.objects.create(user_id=user.id, title='B', occasion='casual', season='all', embedding_vector=['not', 'numbers'])
+    OldOutfit.objects.create(user_id=user.id, title='C', occasion='casual', season='all')
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    assert list(OutfitEmbedding.objects.values_list('outfit_id', 'dimension')) == [(embedded.id, 2)]
+    assert get_outfit_embedding(Outfit.objects.get(id=embedded.id)).tolist() == [0.5, -0.25]
@@ -0,0 +1,161 @@
+"""
+Tests for bulk nested writes (core.nested).
+"""
+from io import BytesIO
+import pytest
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.lookbooks.models import Lookbook
+from apps.outfits.models import Outfit
+from apps.social.models import Post, PostImage
+from apps.social.serializers import post_image_children
+from apps.wardrobe.models import WardrobeItem
+from core.nested import NestedChildren, create_nested
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='nested@example.com',
+        username='nesteduser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+def post_query_count(client, url, data):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, data, format='json')
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    return len(queries)
+
+
+def outfit_data(count):
+    return {
+        'title': 'Layers',
+        'items': [
+            {'item_type': 'top', 'name': f'Shirt {i}', 'color': 'Navy'} for i in range(count)
+        ],
+    }
+
+
+@pytest.mark.django_db
+class TestNestedWrites:
+    """Children are validated up front and inserted in one statement per model."""
+
+    def test_outfit_items_are_bulk_created(self, authenticated_client):
+        authenticated_client.get('/api/v1/outfits/')  # warm the authenticated user cache
+        one = post_query_count(authenticated_client, '/api/v1/outfits/', outfit_data(1))
+        ten = post_query_count(authenticated_client, '/api/v1/outfits/', outfit_data(10))
+
+        assert ten == one
+        outfit = Outfit.objects.latest('id')
+        assert outfit.items.count() == 10
+        # Derived in OutfitItem.save(), which bulk_create skips
+        assert set(outfit.items.values_list('color_code', flat=True)) == {'navy'}
+
+    def test_lookbook_outfits_are_bulk_created_in_order(self, authenticated_client, user):
+        outfits = [Outfit.objects.create(user=user, title=f'Look {i}', occasion='casual', season='all') for i in range(30)]
+        data = {'title': 'Capsule', 'description': 'Thirty looks'}
+        authenticated_client.get('/api/v1/outfits/')
+
+        one = post_query_count(authenticated_client, '/api/v1/lookbooks/create/', {**data, 'outfit_ids': [outfits[0].id]})
+        thirty = post_query_count(
+            authenticated_client, '/api/v1/lookbooks/create/', {**data, 'outfit_ids': [outfit.id for outfit in outfits[::-1]]}
+        )
+
+        assert thirty == one
+        lookbook = Lookbook.objects.latest('id')
+        assert list(lookbook.outfits.values_list('outfit_id', flat=True)) == [outfit.id for outfit in outfits[::-1]]
+
+    def test_unknown_lookbook_outfit_is_rejected_before_writing(self, authenticated_client, user):
+        outfit = Outfit.objects.create(user=user, title='Look', occasion='casual', season='all')
+
+        response = authenticated_client.post('/api/v1/lookbooks/create/', {
+            'title': 'Capsule', 'description': 'Looks', 'outfit_ids': [outfit.id, 999999],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Lookbook.objects.exists()
+
+    def test_wardrobe_item_attributes(self, authenticated_client):
+        response = authenticated_client.post('/api/v1/wardrobe/items/create/', {
+            'category': 'top', 'name': 'Tee', 'color': 'White',
+            'attributes': [{'key': 'Material', 'value': 'Linen'}, {'key': 'Fit', 'value': 'Slim'},
+                           {'key': 'Fit', 'value': 'Relaxed'}],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        item = WardrobeItem.objects.get()
+        assert dict(item.attributes.values_list('key', 'value')) == {'Material': 'Linen', 'Fit': 'Relaxed'}
+
+    def test_post_image_urls(self, authenticated_client):
+        response = authenticated_client.post('/api/v1/social/posts/', {
+            'caption': 'Gallery',
+            'image_urls': [f'https://img.example.com/{i}.jpg' for i in range(3)],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        post = Post.objects.get()
+        assert list(post.images.values_list('order', 'image_url')) == [
+            (i, f'https://img.example.com/{i}.jpg') for i in range(3)
+        ]
+
+    def test_post_image_uploads(self, authenticated_client, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+        files = []
+        for i in range(2):
+            buffer = BytesIO()
+            Image.new('RGB', (4, 4), 'red').save(buffer, format='PNG')
+            files.append(SimpleUploadedFile(f'photo{i}.png', buffer.getvalue(), content_type='image/png'))
+
+        response = authenticated_client.post('/api/v1/social/posts/', {'caption': 'Uploads', 'images_data': files})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        images = list(Post.objects.get().images.all())
+        assert [image.order for image in images] == [0, 1]
+        assert all(image.is_processed and (tmp_path / image.image.name).exists() for image in images)
+
+    def test_prepare_runs_after_validation(self, user):
+        prepared = []
+        spec = NestedChildren('images', PostImage, 'post', [
+            {'image_url': 'https://img.example.com/0.jpg', 'order': 0},
+            {'image_url': 'not a url', 'order': 1},
+        ], prepare=prepared.append)
+
+        with pytest.raises(serializers.ValidationError):
+            create_nested(Post, {'user': user, 'caption': 'Bad'}, [spec])
+
+        assert prepared == []
+        assert not Post.objects.exists()
+
+    def test_staged_uploads_are_deleted_on_rollback(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        buffer = BytesIO()
+        Image.new('RGB', (4, 4), 'red').save(buffer, format='PNG')
+        upload = SimpleUploadedFile('photo.png', buffer.getvalue(), content_type='image/png')
+
+        # No author: the post insert fails after the upload was staged
+        with pytest.raises(IntegrityError):
+            create_nested(Post, {'caption': 'Orphan', 'status': 'processing'}, [post_image_children([upload])])
+
+        assert not Post.objects.exists()
+        assert [path for path in tmp_path.rglob('*') if path.is_file()] == []
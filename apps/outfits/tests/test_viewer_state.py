@@ -0,0 +1,111 @@
+"""
+Tests for batched viewer like/save state on outfit lists.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.lookbooks.models import Lookbook, LookbookOutfit
+from apps.outfits.models import Outfit, OutfitItem, OutfitLike, OutfitSave
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='viewer@example.com',
+        username='vieweruser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def creator():
+    return User.objects.create_user(email='creator@example.com', username='creator', password='testpass123')
+
+
+def create_outfits(creator, count):
+    outfits = []
+    for i in range(count):
+        outfit = Outfit.objects.create(user=creator, title=f'Look {i}', is_public=True)
+        OutfitItem.objects.create(outfit=outfit, item_type='top', name='Tee')
+        outfits.append(outfit)
+    return outfits
+
+
+def query_count(client, url):
+    client.get(url)  # warm the authenticated user cache
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(queries), response
+
+
+@pytest.mark.django_db
+class TestOutfitViewerState:
+    """is_liked/is_saved are resolved for the whole page at once."""
+
+    def test_flags_follow_the_viewer(self, authenticated_client, user, creator):
+        liked, saved, neither = create_outfits(creator, 3)
+        OutfitLike.objects.create(user=user, outfit=liked)
+        OutfitSave.objects.create(user=user, outfit=saved)
+        OutfitLike.objects.create(user=creator, outfit=neither)
+
+        response = authenticated_client.get('/api/v1/outfits/')
+
+        flags = {outfit['id']: (outfit['is_liked'], outfit['is_saved']) for outfit in response.data['results']}
+        assert flags == {liked.id: (True, False), saved.id: (False, True), neither.id: (False, False)}
+
+    def test_anonymous_viewer_has_no_flags(self, creator):
+        create_outfits(creator, 2)
+
+        response = APIClient().get('/api/v1/outfits/')
+
+        assert [(outfit['is_liked'], outfit['is_saved']) for outfit in response.data['results']] == [(False, False)] * 2
+
+    def test_outfit_list_query_count_is_constant(self, authenticated_client, user, creator):
+        outfits = create_outfits(creator, 2)
+        small, _ = query_count(authenticated_client, f'/api/v1/outfits/user/{creator.id}/')
+        for outfit in outfits + create_outfits(creator, 15):
+            OutfitLike.objects.create(user=user, outfit=outfit)
+
+        large, response = query_count(authenticated_client, f'/api/v1/outfits/user/{creator.id}/')
+        assert large == small
+        assert all(outfit['is_liked'] for outfit in response.data['results'])
+
+    def test_lookbook_list_loads_nested_outfit_state_once(self, authenticated_client, user, creator):
+        def add_lookbook(outfits):
+            lookbook = Lookbook.objects.create(creator=creator, title='Book', description='Looks', is_public=True)
+            for order, outfit in enumerate(outfits):
+                LookbookOutfit.objects.create(lookbook=lookbook, outfit=outfit, order=order)
+            return lookbook
+
+        add_lookbook(create_outfits(creator, 1))
+        small, _ = query_count(authenticated_client, '/api/v1/lookbooks/')
+        outfits = create_outfits(creator, 6)
+        OutfitSave.objects.create(user=user, outfit=outfits[4])
+        add_lookbook(outfits[:3])
+        add_lookbook(outfits[3:])
+
+        large, response = query_count(authenticated_client, '/api/v1/lookbooks/')
+        saved = [
+            entry['outfit']['id'] for lookbook in response.data['results']
+            for entry in lookbook['outfits'] if entry['outfit']['is_saved']
+        ]
+        assert saved == [outfits[4].id]
+        # Only the per-lookbook like lookups grow with the page
+        assert large == small + 2
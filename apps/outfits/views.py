@@ -6,9 +6,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer, OpenApiTypes
+from apps.tags.sync import filter_by_tags
+from core.colors import color_filter_codes, parse_color_distance
 from core.permissions import IsOwnerOrReadOnly
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
-from .models import Outfit, OutfitLike, OutfitSave
+from .models import Outfit, OutfitItem, OutfitLike, OutfitSave
 from .serializers import OutfitSerializer, OutfitCreateSerializer
 
 
@@ -36,6 +38,26 @@ class OutfitListCreateView(generics.ListCreateAPIView):
         if season:
             queryset = queryset.filter(season=season)
         
+        # Filter by the color of any item
+        color = self.request.query_params.get('color')
+        if color:
+            try:
+                max_delta_e = parse_color_distance(self.request.query_params.get('color_distance'))
+            except ValueError:
+                raise serializers.ValidationError({'color_distance': ['Must be a non-negative number']})
+            codes = color_filter_codes(color, max_delta_e)
+            if codes is None:
+                # Not a known color; fall back to matching the free text
+                items = OutfitItem.objects.filter(color__icontains=color)
+            else:
+                items = OutfitItem.objects.filter(color_code__in=codes)
+            queryset = queryset.filter(id__in=items.values('outfit_id'))
+        
+        # Filter by style tags (all must match)
+        tags = self.request.query_params.get('tags')
+        if tags:
+            queryset = filter_by_tags(queryset, tags.split(','))
+        
         # Search by title or description
         search = self.request.query_params.get('search')
         if search:
@@ -55,6 +77,9 @@ class OutfitListCreateView(generics.ListCreateAPIView):
         parameters=[
             OpenApiParameter(name='occasion', description='Filter by occasion', required=False, type=str),
             OpenApiParameter(name='season', description='Filter by season', required=False, type=str),
+            OpenApiParameter(name='color', description='Outfits with an item of this color (name, synonym or hex)', required=False, type=str),
+            OpenApiParameter(name='color_distance', description='Also match palette colors within this CIE76 ΔE of color (non-negative)', required=False, type=float),
+            OpenApiParameter(name='tags', description='Outfits having all of these style tags (comma-separated, case-insensitive)', required=False, type=str),
             OpenApiParameter(name='search', description='Search in title and description', required=False, type=str),
             OpenApiParameter(name='page', description='Page number', required=False, type=int),
         ],
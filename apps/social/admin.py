@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, PostImage, PostLike, PostSave, Comment, CommentLike
+from .models import Post, PostImage, PostLike, PostSave, Comment, CommentLike, HashtagUsage
 
 admin.site.register(Post)
 admin.site.register(PostImage)
@@ -8,3 +8,4 @@ admin.site.register(PostSave)
 admin.site.register(Comment)
 admin.site.register(CommentLike)
 
+admin.site.register(HashtagUsage)
@@ -5,3 +5,6 @@ class SocialConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.social'
 
+    def ready(self):
+        from .signals import connect_hashtag_signals
+        connect_hashtag_signals()
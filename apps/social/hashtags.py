@@ -0,0 +1,234 @@
+"""
+Hashtag feeds and trending hashtags.
+
+Hashtags are the post tags kept by apps.tags. ``PostTag`` rows, indexed on
+(tag, post), are the per-hashtag post id index: a hashtag feed walks it
+newest post first with keyset pagination (``post_id < cursor``), so every
+page costs the same however deep the client scrolls.
+
+Trending hashtags are ranked from ``HashtagUsage`` rollups: the number of
+posts tagged with each hashtag per hour and per day, bucketed by when the
+tag was applied. Only public, published posts count, so hashtags used only
+in private, processing or failed posts never trend. The rollups are updated
+incrementally: from the tags app's ``tags_changed`` signal for the tag
+changes of public, published posts (whenever one is created, edited or
+deleted), and with all of a post's tags when it becomes, or stops being,
+public and published. A hashtag's score is the sum of its bucket counts, each decayed by
+``0.5 ** (age / half-life)``. Recent hours come from the hourly rollup and
+older days from the daily one, so ranking reads at most
+``HOURLY_WINDOW_HOURS + 24`` hourly and ``DAILY_WINDOW_DAYS`` daily buckets
+per hashtag.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Q, Sum, Value, When
+from django.utils import timezone
+from apps.tags.models import PostTag, Tag
+from apps.tags.sync import normalize_tag
+from .models import HashtagUsage, Post
+
+DEFAULT_HASHTAGS = {
+    'HALF_LIFE_HOURS': 12,
+    'HOURLY_WINDOW_HOURS': 48,
+    'DAILY_WINDOW_DAYS': 7,
+    'TRENDING_CACHE_TTL': 300,
+    'FEED_PAGE_SIZE': 20,
+    'MAX_FEED_PAGE_SIZE': 50,
+}
+
+
+# Posts whose hashtags count towards trending
+TRENDING_POSTS = {'privacy': 'public', 'status': 'published'}
+
+
+def hashtag_config():
+    return {**DEFAULT_HASHTAGS, **getattr(settings, 'HASHTAGS', {})}
+
+
+def counts_towards_trending(post):
+    """Whether ``post``'s hashtags count towards trending."""
+    return all(getattr(post, field) == value for field, value in TRENDING_POSTS.items())
+
+
+def hour_bucket(moment):
+    """Start of the UTC hour containing ``moment``."""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(moment):
+    """Start of the UTC day containing ``moment``."""
+    return hour_bucket(moment).replace(hour=0)
+
+
+def record_hashtag_usage(added, removed):
+    """
+    Apply post tag link changes to the hourly and daily rollups.
+
+    ``added`` and ``removed`` are ``(post id, tag id, link created_at)``
+    tuples; a removed link is subtracted from the buckets it was counted in.
+    """
+    deltas = defaultdict(int)  # (period, bucket, tag id) -> posts_count change
+    for links, sign in ((added, 1), (removed, -1)):
+        for _, tag_id, created_at in links:
+            deltas[('hour', hour_bucket(created_at), tag_id)] += sign
+            deltas[('day', day_bucket(created_at), tag_id)] += sign
+
+    by_delta = defaultdict(list)  # (period, bucket, delta) -> tag ids
+    for (period, bucket, tag_id), delta in deltas.items():
+        if delta:
+            by_delta[(period, bucket, delta)].append(tag_id)
+
+    with transaction.atomic():
+        # Removals only touch existing rows; a pruned bucket stays pruned
+        HashtagUsage.objects.bulk_create([
+            HashtagUsage(tag_id=tag_id, period=period, bucket=bucket)
+            for (period, bucket, delta), tag_ids in by_delta.items() if delta > 0
+            for tag_id in tag_ids
+        ], ignore_conflicts=True)
+        for (period, bucket, delta), tag_ids in by_delta.items():
+            HashtagUsage.objects.filter(tag_id__in=tag_ids, period=period, bucket=bucket).update(
+                posts_count=F('posts_count') + delta
+            )
+
+
+def record_post_tag_changes(added, removed):
+    """
+    Apply the post tag link changes of public, published posts to the rollups.
+
+    Takes the ``tags_changed`` lists; links of other posts are ignored, since
+    their tags are only counted once the post becomes public and published.
+    """
+    post_ids = {post_id for post_id, _, _ in added} | {post_id for post_id, _, _ in removed}
+    trending = set(Post.objects.filter(id__in=post_ids, **TRENDING_POSTS).values_list('id', flat=True))
+    added = [link for link in added if link[0] in trending]
+    removed = [link for link in removed if link[0] in trending]
+    if added or removed:
+        record_hashtag_usage(added, removed)
+
+
+def record_post_visibility(post_ids, visible):
+    """
+    Add (``visible``) or subtract all tag links of posts that just became, or
+    are about to stop being, public and published.
+    """
+    links = list(PostTag.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id', 'created_at'))
+    if not links:
+        return
+    if visible:
+        record_hashtag_usage(links, [])
+    else:
+        record_hashtag_usage([], links)
+
+
+def window_starts(now):
+    """First hourly and first daily bucket that trending reads at ``now``."""
+    config = hashtag_config()
+    hourly_start = day_bucket(now - timedelta(hours=config['HOURLY_WINDOW_HOURS']))
+    return hourly_start, hourly_start - timedelta(days=config['DAILY_WINDOW_DAYS'])
+
+
+def prune_hashtag_usage(now=None):
+    """Delete rollup buckets older than the trending windows; return the number deleted."""
+    hourly_start, daily_start = window_starts(now or timezone.now())
+    deleted, _ = HashtagUsage.objects.filter(
+        Q(period='hour', bucket__lt=hourly_start) | Q(period='day', bucket__lt=daily_start)
+    ).delete()
+    return deleted
+
+
+def _decay(age, half_life_hours):
+    return 0.5 ** (max(age.total_seconds(), 0) / 3600 / half_life_hours)
+
+
+def trending_hashtags(limit=10, now=None):
+    """
+    Top ``limit`` hashtags by time-decayed usage, best first.
+
+    Returns dicts with the hashtag, its score, the posts tagged with it in the
+    last 24 hours and its total post count.
+    """
+    config = hashtag_config()
+    now = now or timezone.now()
+    half_life = config['HALF_LIFE_HOURS']
+    hourly_start, daily_start = window_starts(now)
+
+    # Each bucket's decay weight, measured from its midpoint
+    weights = []
+    bucket = hourly_start
+    while bucket <= now:
+        weight = _decay(now - bucket - timedelta(minutes=30), half_life)
+        weights.append(When(period='hour', bucket=bucket, then=Value(weight)))
+        bucket += timedelta(hours=1)
+    bucket = daily_start
+    while bucket < hourly_start:
+        weight = _decay(now - bucket - timedelta(hours=12), half_life)
+        weights.append(When(period='day', bucket=bucket, then=Value(weight)))
+        bucket += timedelta(days=1)
+
+    rows = (
+        HashtagUsage.objects
+        .filter(
+            Q(period='hour', bucket__gte=hourly_start)
+            | Q(period='day', bucket__gte=daily_start, bucket__lt=hourly_start)
+        )
+        .values('tag_id', 'tag__name', 'tag__post_count')
+        .annotate(
+            score=Sum(ExpressionWrapper(
+                F('posts_count') * Case(*weights, default=Value(0.0), output_field=FloatField()),
+                output_field=FloatField(),
+            )),
+            recent_posts=Sum(Case(
+                When(period='hour', bucket__gt=hour_bucket(now - timedelta(hours=24)), then=F('posts_count')),
+                default=Value(0),
+            )),
+        )
+        .filter(score__gt=0)
+        .order_by('-score', 'tag__name')[:limit]
+    )
+    return [
+        {
+            'hashtag': row['tag__name'],
+            'score': round(row['score'], 3),
+            'posts_last_24h': row['recent_posts'],
+            'post_count': row['tag__post_count'],
+        }
+        for row in rows
+    ]
+
+
+def cached_trending_hashtags(limit=10):
+    """trending_hashtags(), cached for ``TRENDING_CACHE_TTL`` seconds."""
+    cache_key = f'hashtags:trending:{limit}'
+    trending = cache.get(cache_key)
+    if trending is None:
+        trending = trending_hashtags(limit)
+        cache.set(cache_key, trending, hashtag_config()['TRENDING_CACHE_TTL'])
+    return trending
+
+
+def hashtag_feed(hashtag, cursor=None, limit=20):
+    """
+    One page of public posts tagged with ``hashtag``, newest first.
+
+    Returns ``(tag, posts, next_cursor)``; ``tag`` is None for an unknown
+    hashtag, and ``next_cursor`` (the last post id of the page) is None on
+    the last page.
+    """
+    tag = Tag.objects.filter(name=normalize_tag(hashtag)).first()
+    if tag is None:
+        return None, [], None
+
+    # Soft-deleted posts have no tag links, so only privacy and publishing need the join
+    links = PostTag.objects.filter(tag=tag, post__privacy='public', post__status='published')
+    if cursor:
+        links = links.filter(post_id__lt=cursor)
+    post_ids = list(links.order_by('-post_id').values_list('post_id', flat=True)[:limit + 1])
+    next_cursor = post_ids[limit - 1] if len(post_ids) > limit else None
+    post_ids = post_ids[:limit]
+
+    posts = Post.objects.filter(id__in=post_ids).select_related('user', 'outfit').prefetch_related('images')
+    by_id = {post.id: post for post in posts}
+    return tag, [by_id[post_id] for post_id in post_ids if post_id in by_id], next_cursor
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0003_postimage_post_images_post_id_8637ba_idx'),
+        ('tags', '0003_backfill_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HashtagUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField(help_text='Start of the hour or day (UTC)')),
+                ('posts_count', models.IntegerField(default=0)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='tags.tag')),
+            ],
+            options={
+                'db_table': 'hashtag_usage',
+                'indexes': [models.Index(fields=['period', 'bucket'], name='hashtag_usa_period_6af491_idx')],
+                'unique_together': {('tag', 'period', 'bucket')},
+            },
+        ),
+    ]
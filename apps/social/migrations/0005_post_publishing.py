@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0004_hashtagusage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('published', 'Published'), ('failed', 'Failed')], default='published', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='is_processed',
+            field=models.BooleanField(default=True, help_text='False while the upload waits in staging to be resized'),
+        ),
+    ]
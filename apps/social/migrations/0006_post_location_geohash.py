@@ -0,0 +1,31 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_geohashes(apps, schema_editor):
+    from apps.social.nearby import backfill_geohashes
+    backfill_geohashes(apps.get_model('social', 'Post').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0005_outfit_embeddings'),
+        ('social', '0005_post_publishing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='location_geohash',
+            field=models.CharField(blank=True, help_text='Geohash of location_lat/lng (see core.geo), for nearby feeds', max_length=12),
+        ),
+        migrations.RunPython(backfill_geohashes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['location_geohash'], name='posts_locatio_57575e_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # Rows deleted before deleted_at existed start their grace period from their last update
+    for name in ('Post', 'Comment'):
+        model = apps.get_model('social', name)
+        model.objects.filter(is_deleted=True, deleted_at__isnull=True).update(deleted_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0005_outfit_embeddings'),
+        ('social', '0006_post_location_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comments_post_id_8fd787_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comments_user_id_a80af7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_user_id_dfa368_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_privacy_26a00d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_likes_c_a3a26f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_is_dele_76d2f1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_locatio_57575e_idx',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['post', '-created_at'], name='comments_live_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-created_at'], name='comments_live_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='comments_purge_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-created_at'], name='posts_live_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['privacy', '-created_at'], name='posts_live_privacy_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-likes_count'], name='posts_live_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['location_geohash'], name='posts_live_geohash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='posts_purge_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:31
+
+from collections import Counter
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def rebuild_hashtag_usage(apps, schema_editor):
+    """
+    Rebuild the rollups from the tag links of public, published posts: they
+    used to count every post, private and unpublished ones included.
+    """
+    from apps.social.hashtags import day_bucket, hour_bucket, window_starts
+    HashtagUsage = apps.get_model('social', 'HashtagUsage')
+    PostTag = apps.get_model('tags', 'PostTag')
+
+    counts = Counter()
+    links = PostTag.objects.filter(
+        post__privacy='public', post__status='published', created_at__gte=window_starts(timezone.now())[1]
+    ).values_list('tag_id', 'created_at')
+    for tag_id, created_at in links.iterator(chunk_size=1000):
+        counts[(tag_id, 'hour', hour_bucket(created_at))] += 1
+        counts[(tag_id, 'day', day_bucket(created_at))] += 1
+
+    HashtagUsage.objects.all().delete()
+    HashtagUsage.objects.bulk_create([
+        HashtagUsage(tag_id=tag_id, period=period, bucket=bucket, posts_count=count)
+        for (tag_id, period, bucket), count in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0007_soft_delete_purge'),
+        ('tags', '0003_backfill_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_hashtag_usage, migrations.RunPython.noop),
+    ]
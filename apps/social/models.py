@@ -2,7 +2,9 @@
 Social media models for CuratorAI - Posts, Comments, Likes, Feed.
 """
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from core.geo import encode_geohash, valid_coordinates
 
 
 class Post(models.Model):
@@ -15,6 +17,12 @@ class Post(models.Model):
         ('private', 'Private'),
     ]
     
+    STATUS_CHOICES = [
+        ('processing', 'Processing'),
+        ('published', 'Published'),
+        ('failed', 'Failed'),
+    ]
+    
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     caption = models.TextField(max_length=2200)
     
@@ -31,6 +39,9 @@ class Post(models.Model):
     location_name = models.CharField(max_length=200, blank=True)
     location_lat = models.FloatField(null=True, blank=True)
     location_lng = models.FloatField(null=True, blank=True)
+    location_geohash = models.CharField(
+        max_length=12, blank=True, help_text='Geohash of location_lat/lng (see core.geo), for nearby feeds'
+    )
     
     # Social metrics
     likes_count = models.IntegerField(default=0)
@@ -42,8 +53,12 @@ class Post(models.Model):
     # Privacy
     privacy = models.CharField(max_length=20, choices=PRIVACY_CHOICES, default='public')
     
-    # Soft delete
+    # Publishing: posts with uploaded images stay out of feeds until apps.social.publishing has processed them
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='published')
+    
+    # Soft delete (hard-deleted after a grace period, see core.purge)
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -53,14 +68,26 @@ class Post(models.Model):
         db_table = 'posts'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['privacy', '-created_at']),
-            models.Index(fields=['-likes_count']),
-            models.Index(fields=['is_deleted']),
+            # Feeds only read live posts: partial indexes leave deleted rows out
+            models.Index(fields=['user', '-created_at'], name='posts_live_user_created_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['privacy', '-created_at'], name='posts_live_privacy_created_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['-likes_count'], name='posts_live_likes_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['location_geohash'], name='posts_live_geohash_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['deleted_at'], name='posts_purge_idx', condition=Q(is_deleted=True)),
         ]
     
     def __str__(self):
         return f"Post by {self.user.username} at {self.created_at}"
+    
+    def save(self, *args, **kwargs):
+        if valid_coordinates(self.location_lat, self.location_lng):
+            self.location_geohash = encode_geohash(self.location_lat, self.location_lng)
+        else:
+            self.location_geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'location_lat', 'location_lng'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'location_geohash'}
+        super().save(*args, **kwargs)
 
 
 class PostImage(models.Model):
@@ -71,6 +98,7 @@ class PostImage(models.Model):
     image = models.ImageField(upload_to='posts/')
     image_url = models.URLField(blank=True, help_text='External image URL (used when image is not available)')
     order = models.IntegerField(default=0)
+    is_processed = models.BooleanField(default=True, help_text='False while the upload waits in staging to be resized')
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -138,8 +166,9 @@ class Comment(models.Model):
     # Metrics
     likes_count = models.IntegerField(default=0)
     
-    # Soft delete
+    # Soft delete (hard-deleted after a grace period, see core.purge)
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -149,9 +178,10 @@ class Comment(models.Model):
         db_table = 'comments'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['post', '-created_at']),
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['post', '-created_at'], name='comments_live_post_created_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['user', '-created_at'], name='comments_live_user_created_idx', condition=Q(is_deleted=False)),
             models.Index(fields=['parent_comment']),
+            models.Index(fields=['deleted_at'], name='comments_purge_idx', condition=Q(is_deleted=True)),
         ]
     
     def __str__(self):
@@ -176,3 +206,31 @@ class CommentLike(models.Model):
     def __str__(self):
         return f"{self.user.username} likes comment {self.comment.id}"
 
+
+
+class HashtagUsage(models.Model):
+    """
+    Hourly and daily rollup of how many posts were tagged with a hashtag.
+    
+    Maintained incrementally from post tag changes (see apps.social.hashtags)
+    and read to rank trending hashtags.
+    """
+    PERIOD_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+    
+    tag = models.ForeignKey('tags.Tag', on_delete=models.CASCADE, related_name='usage')
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket = models.DateTimeField(help_text='Start of the hour or day (UTC)')
+    posts_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'hashtag_usage'
+        unique_together = ('tag', 'period', 'bucket')
+        indexes = [
+            models.Index(fields=['period', 'bucket']),
+        ]
+    
+    def __str__(self):
+        return f"{self.tag_id} {self.period} {self.bucket}: {self.posts_count}"
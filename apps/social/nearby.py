@@ -0,0 +1,147 @@
+"""
+Nearby posts feed.
+
+Every post with a location stores the geohash of ``location_lat/lng``
+(``Post.location_geohash``, kept up to date by ``Post.save()`` and indexed).
+A nearby query covers the search circle with at most nine geohash cells and
+reads only the posts in them, one index range scan per cell, narrowed by the
+circle's bounding box (see core.geo). When the circle cannot be covered that
+way (it reaches a pole or is continent-sized) the feed falls back to the
+bounding box alone.
+
+The remaining candidates, at most ``MAX_CANDIDATES`` most recent ones, are
+ranked in Python by exact distance plus an age penalty of ``KM_PER_DAY``: a
+post a day older ranks like one ``KM_PER_DAY`` kilometers further away.
+Posts age at the same rate, so ``distance - KM_PER_DAY * created_at``
+(in days) gives the same order whenever the feed is read; that value and the
+post id form the keyset cursor, which stays valid from page to page.
+
+Distances are only ever used rounded to ``DISTANCE_STEP_KM``, in the
+``distance_km`` shown, the rank in the cursor and the radius check alike,
+so repeated queries from different points or with different radii cannot
+pin down where a post was made (its coordinates are never returned).
+"""
+import heapq
+from django.conf import settings
+from django.db.models import Q
+from core.geo import KM_PER_DEGREE, PREFIX_END, bounding_box, covering_cells, encode_geohash, haversine_km, valid_coordinates
+from .models import Post
+
+DEFAULT_NEARBY_FEED = {
+    'DEFAULT_RADIUS_KM': 10,
+    'MAX_RADIUS_KM': 200,
+    'KM_PER_DAY': 1.0,
+    'DISTANCE_STEP_KM': 0.1,
+    'MAX_CANDIDATES': 5000,
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 50,
+}
+
+
+def nearby_config():
+    return {**DEFAULT_NEARBY_FEED, **getattr(settings, 'NEARBY_FEED', {})}
+
+
+def backfill_geohashes(queryset, batch_size=1000):
+    """
+    Set ``location_geohash`` from ``location_lat/lng`` for every row of ``queryset``.
+
+    Walks the table in primary-key order, one batch at a time, and only writes
+    rows whose geohash changes. Returns the number of rows updated.
+    """
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')
+            .only('pk', 'location_lat', 'location_lng', 'location_geohash')[:batch_size]
+        )
+        if not batch:
+            return updated
+        changed = []
+        for post in batch:
+            if valid_coordinates(post.location_lat, post.location_lng):
+                geohash = encode_geohash(post.location_lat, post.location_lng)
+            else:
+                geohash = ''
+            if geohash != post.location_geohash:
+                post.location_geohash = geohash
+                changed.append(post)
+        queryset.bulk_update(changed, ['location_geohash'])
+        updated += len(changed)
+        last_pk = batch[-1].pk
+
+
+def parse_cursor(cursor):
+    """``(rank, post id)`` from a ``next_cursor`` string; raises ValueError if malformed."""
+    rank, post_id = cursor.split(':')
+    return float(rank), int(post_id)
+
+
+def _candidates(lat, lng, radius_km):
+    posts = Post.objects.filter(is_deleted=False, privacy='public', status='published')
+
+    cells = covering_cells(lat, lng, radius_km)
+    if cells:
+        # Prefix ranges rather than LIKE, so any B-tree index on the column is usable
+        in_cells = Q()
+        for cell in cells:
+            in_cells |= Q(location_geohash__gte=cell, location_geohash__lt=cell + PREFIX_END)
+        posts = posts.filter(in_cells)
+    else:
+        posts = posts.exclude(location_geohash='')
+
+    box = bounding_box(lat, lng, radius_km)
+    if box:
+        south, west, north, east = box
+        posts = posts.filter(location_lat__gte=south, location_lat__lte=north)
+        if west <= east:
+            posts = posts.filter(location_lng__gte=west, location_lng__lte=east)
+        else:
+            posts = posts.filter(Q(location_lng__gte=west) | Q(location_lng__lte=east))
+    else:
+        d_lat = radius_km / KM_PER_DEGREE
+        posts = posts.filter(location_lat__gte=lat - d_lat, location_lat__lte=lat + d_lat)
+    return posts
+
+
+def nearby_feed(lat, lng, radius_km, cursor=None, limit=20):
+    """
+    One page of public posts within ``radius_km`` of (``lat``, ``lng``), best ranked first.
+
+    Returns ``(posts, next_cursor)``; each post has a ``distance_km``
+    attribute (rounded to ``DISTANCE_STEP_KM``), and ``next_cursor`` is None
+    on the last page.
+    """
+    config = nearby_config()
+    km_per_day = config['KM_PER_DAY']
+    step = config['DISTANCE_STEP_KM']
+    # Widened by a step so every post whose rounded distance is in range is a candidate
+    rows = (
+        _candidates(lat, lng, radius_km + step)
+        .order_by('-created_at')
+        .values_list('id', 'location_lat', 'location_lng', 'created_at')[:config['MAX_CANDIDATES']]
+    )
+
+    ranked = []
+    for post_id, post_lat, post_lng, created_at in rows:
+        distance = round(round(haversine_km(lat, lng, post_lat, post_lng) / step) * step, 3)
+        if distance > radius_km:
+            continue
+        rank = round(distance - km_per_day * created_at.timestamp() / 86400, 6)
+        if cursor is not None and (rank, post_id) <= cursor:
+            continue
+        ranked.append((rank, post_id, distance))
+    page = heapq.nsmallest(limit + 1, ranked)
+    next_cursor = f'{page[limit - 1][0]}:{page[limit - 1][1]}' if len(page) > limit else None
+    page = page[:limit]
+
+    posts = Post.objects.filter(id__in=[post_id for _, post_id, _ in page]).select_related('user', 'outfit').prefetch_related('images')
+    by_id = {post.id: post for post in posts}
+    results = []
+    for _, post_id, distance in page:
+        post = by_id.get(post_id)
+        if post is not None:
+            post.distance_km = distance
+            results.append(post)
+    return results, next_cursor
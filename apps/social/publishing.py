@@ -0,0 +1,194 @@
+"""
+Asynchronous post publishing.
+
+A post created with uploaded images is saved in the ``processing`` state:
+the request only streams each upload, untouched, to a staging path in the
+default storage and records an unprocessed ``PostImage``. A background
+worker then resizes and re-encodes every staged image into its final
+location, removes the staged copy and flips the post to ``published`` (or
+``failed`` if no image could be used). Feeds only show published posts.
+
+The author can poll the post's status, and is sent a notification when
+processing finishes. Posts without uploads (text or external image URLs
+only) are published straight away.
+
+Work queued to a worker can be lost (process restart, deploy), so
+``requeue_stalled_posts`` periodically processes posts stuck in
+``processing`` again, and gives up on them after ``FAIL_AFTER`` seconds.
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from core.background import run_in_background
+from core.utils import compress_image, generate_unique_filename
+from .hashtags import TRENDING_POSTS, record_post_visibility
+from .models import Post, PostImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POST_PUBLISHING = {
+    'STAGING_PATH': 'posts/staging',
+    'MAX_WIDTH': 1920,
+    'QUALITY': 85,
+    'STALLED_AFTER': 900,
+    'FAIL_AFTER': 86400,
+}
+
+
+def publishing_config():
+    return {**DEFAULT_POST_PUBLISHING, **getattr(settings, 'POST_PUBLISHING', {})}
+
+
+def stage_image(post_image):
+    """
+    Store an unsaved ``PostImage``'s upload, as is, under the staging path.
+
+    Used as the ``prepare`` callback of the post image NestedChildren. An
+    upload that cannot be stored (e.g. read-only filesystem without S3)
+    leaves an empty, unprocessed image row: the post is still created, and
+    processing drops the row (failing the post if no image is left).
+    """
+    upload = post_image.image
+    if not upload or upload._committed:
+        return
+    name = f"{publishing_config()['STAGING_PATH']}/{generate_unique_filename(upload.name)}"
+    try:
+        post_image.image = upload.storage.save(name, upload.file)
+    except (OSError, IOError) as fs_error:
+        logger.warning(f"Cannot stage image {post_image.order} (read-only filesystem?): {str(fs_error)}")
+        logger.warning("S3 is not enabled. Please enable S3 or use image_urls instead.")
+        post_image.image = ''
+    post_image.is_processed = False
+
+
+def schedule_post_processing(post):
+    """Queue processing of ``post``'s staged images once the current transaction commits."""
+    from .tasks import process_post_images
+    run_in_background(process_post_images, post.id)
+
+
+def _process_image(post_image, config):
+    """Resize a staged image into its final location and delete the staged copy."""
+    staged = post_image.image.name
+    storage = post_image.image.storage
+    try:
+        with storage.open(staged, 'rb') as source:
+            content = compress_image(source, quality=config['QUALITY'], max_width=config['MAX_WIDTH'])
+        post_image.image.save(
+            generate_unique_filename('image.jpg', prefix=f'post-{post_image.post_id}-'),
+            ContentFile(content.read()),
+            save=False
+        )
+        post_image.is_processed = True
+    finally:
+        try:
+            storage.delete(staged)
+        except Exception as e:
+            logger.warning(f'Could not delete staged post image {staged}: {str(e)}')
+
+
+def process_post(post_id):
+    """
+    Process a ``processing`` post's staged images and publish it.
+
+    Images that cannot be read as images are dropped. The post is published
+    if it still has at least one image, and marked ``failed`` otherwise.
+    Returns the new status, or None if the post was not processing.
+    """
+    config = publishing_config()
+    post = Post.objects.filter(id=post_id, status='processing').first()
+    if post is None:
+        return None
+
+    processed, failed = [], []
+    for post_image in PostImage.objects.filter(post_id=post_id, is_processed=False):
+        if not post_image.image:
+            # The upload could not be staged
+            failed.append(post_image.id)
+            continue
+        try:
+            _process_image(post_image, config)
+            processed.append(post_image)
+        except Exception as e:
+            logger.warning(f'Failed to process image {post_image.id} of post {post_id}: {str(e)}')
+            failed.append(post_image.id)
+
+    with transaction.atomic():
+        PostImage.objects.bulk_update(processed, ['image', 'is_processed'])
+        PostImage.objects.filter(id__in=failed).delete()
+        status = 'published' if PostImage.objects.filter(post_id=post_id).exists() else 'failed'
+        updated = Post.objects.filter(id=post_id, status='processing').update(status=status, updated_at=timezone.now())
+        if updated and status == 'published':
+            # update() sends no signals, so count the post's hashtags here
+            record_post_visibility(
+                Post.objects.filter(id=post_id, **TRENDING_POSTS).values_list('id', flat=True), visible=True
+            )
+    if updated:
+        notify_author(post, status)
+    return status
+
+
+def requeue_stalled_posts():
+    """
+    Process posts stuck in ``processing`` again, or fail them.
+
+    A post still processing ``STALLED_AFTER`` seconds after it was created
+    (or last requeued) lost its worker and is queued again; one still
+    processing ``FAIL_AFTER`` seconds after it was created is marked
+    ``failed``, its staged uploads deleted and its author notified.
+    Returns ``(requeued, failed)`` counts.
+    """
+    config = publishing_config()
+    now = timezone.now()
+    processing = Post.objects.filter(status='processing')
+
+    expired = list(processing.filter(created_at__lt=now - timedelta(seconds=config['FAIL_AFTER'])))
+    failed = 0
+    for post in expired:
+        staged = list(PostImage.objects.filter(post_id=post.id, is_processed=False))
+        with transaction.atomic():
+            if not Post.objects.filter(id=post.id, status='processing').update(status='failed', updated_at=now):
+                continue
+            PostImage.objects.filter(id__in=[post_image.id for post_image in staged]).delete()
+        for post_image in staged:
+            if post_image.image:
+                try:
+                    post_image.image.storage.delete(post_image.image.name)
+                except Exception as e:
+                    logger.warning(f'Could not delete staged post image {post_image.image.name}: {str(e)}')
+        notify_author(post, 'failed')
+        failed += 1
+
+    stalled = processing.filter(updated_at__lt=now - timedelta(seconds=config['STALLED_AFTER']))
+    requeued = 0
+    for post_id in stalled.values_list('id', flat=True):
+        # updated_at restarts the stall timer, so a post is requeued once per STALLED_AFTER
+        if Post.objects.filter(id=post_id, status='processing').update(updated_at=now):
+            schedule_post_processing(Post(id=post_id))
+            requeued += 1
+    if requeued or failed:
+        logger.info(f'Requeued {requeued} stalled posts, failed {failed} expired ones')
+    return requeued, failed
+
+
+def notify_author(post, status):
+    """Tell the author their post finished processing."""
+    from apps.notifications.models import Notification
+
+    if status == 'published':
+        title, message = 'Your post is live', 'Your post has been published.'
+    else:
+        title, message = 'Your post could not be published', 'None of the images could be processed. Please try again.'
+    try:
+        Notification.objects.create(
+            user_id=post.user_id,
+            type='system',
+            title=title,
+            message=message,
+            action_url=f'/posts/{post.id}',
+        )
+    except Exception as e:
+        logger.warning(f'Could not notify user {post.user_id} about post {post.id}: {str(e)}')
@@ -0,0 +1,188 @@
+"""
+"For You" feed ranking.
+
+A user's For You feed is built in two steps, in a background worker:
+
+1. Candidate generation: recent public posts (``CANDIDATE_WINDOW_DAYS``)
+   from authors the user follows, posts liked by users with similar taste
+   (those who liked the most of the same posts) and trending posts, up to
+   ``CANDIDATES_PER_SOURCE`` from each source. The user's own posts are not
+   candidates.
+2. Ranking: every candidate gets a weighted sum (``WEIGHTS``) of four
+   features in [0, 1]: author affinity (follows the author, and has liked or
+   commented on their posts lately), tag overlap with the user's
+   ``StylePreference``, engagement velocity (weighted engagement per hour of
+   age, relative to the best candidate) and freshness (halved every
+   ``FRESHNESS_HALF_LIFE_HOURS``).
+
+The top ``FEED_SIZE`` post ids are cached per user for ``CACHE_TTL``
+seconds, so every page of the feed reads the same ranked list. A list older
+than ``REFRESH_AFTER`` seconds is still served while a new one is ranked.
+Until a user's first list is ready, the feed falls back to recent public
+posts.
+"""
+import logging
+import math
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+from apps.tags.sync import normalize_tags
+from core.background import run_in_background
+from .models import Comment, Post, PostLike
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FOR_YOU = {
+    'CANDIDATE_WINDOW_DAYS': 14,
+    'CANDIDATES_PER_SOURCE': 300,
+    'SIMILAR_USERS': 50,
+    'AFFINITY_WINDOW_DAYS': 60,
+    'FRESHNESS_HALF_LIFE_HOURS': 24,
+    'WEIGHTS': {'affinity': 3.0, 'tag_overlap': 2.0, 'velocity': 1.5, 'freshness': 1.0},
+    'FEED_SIZE': 500,
+    'CACHE_TTL': 3600,
+    'REFRESH_AFTER': 600,
+}
+
+# How long a scheduled ranking blocks scheduling another one for the same user
+RANKING_LOCK_TTL = 300
+
+
+def for_you_config():
+    return {**DEFAULT_FOR_YOU, **getattr(settings, 'FOR_YOU', {})}
+
+
+def feed_cache_key(user_id):
+    return f'social:foryou:{user_id}'
+
+
+def _lock_key(user_id):
+    return f'social:foryou:{user_id}:ranking'
+
+
+def candidate_post_ids(user, config, now):
+    """Candidate post ids for ``user``'s feed, from followed authors, similar users and trending posts."""
+    limit = config['CANDIDATES_PER_SOURCE']
+    recent = Post.objects.filter(
+        is_deleted=False, privacy='public', status='published',
+        created_at__gte=now - timedelta(days=config['CANDIDATE_WINDOW_DAYS']),
+    ).exclude(user=user)
+
+    following = recent.filter(user__followers__follower=user).order_by('-created_at')
+    candidates = set(following.values_list('id', flat=True)[:limit])
+
+    liked = list(PostLike.objects.filter(user=user).order_by('-created_at').values_list('post_id', flat=True)[:200])
+    if liked:
+        similar_users = list(
+            PostLike.objects.filter(post_id__in=liked).exclude(user=user)
+            .values('user_id').annotate(shared=Count('id')).order_by('-shared')
+            .values_list('user_id', flat=True)[:config['SIMILAR_USERS']]
+        )
+        candidates.update(
+            PostLike.objects.filter(user_id__in=similar_users, post__in=recent).exclude(post_id__in=liked)
+            .order_by('-created_at').values_list('post_id', flat=True)[:limit]
+        )
+
+    candidates.update(recent.order_by('-likes_count', '-created_at').values_list('id', flat=True)[:limit])
+    return candidates
+
+
+def _preferred_tags(user):
+    from apps.accounts.models import StylePreference
+
+    preference = StylePreference.objects.filter(user=user).first()
+    if preference is None:
+        return set()
+    return set(normalize_tags(
+        preference.preferred_styles + preference.preferred_colors + preference.preferred_brands
+        + preference.preferred_patterns + preference.occasions
+    ))
+
+
+def score_posts(user, post_ids, config, now):
+    """``{post id: score}`` for ``post_ids`` as ranked for ``user``."""
+    posts = list(Post.objects.filter(id__in=post_ids).values(
+        'id', 'user_id', 'tags', 'likes_count', 'comments_count', 'shares_count', 'saves_count', 'created_at'
+    ))
+    if not posts:
+        return {}
+    authors = {post['user_id'] for post in posts}
+    followed = set(user.following.filter(following_id__in=authors).values_list('following_id', flat=True))
+    since = now - timedelta(days=config['AFFINITY_WINDOW_DAYS'])
+    interactions = dict.fromkeys(authors, 0)
+    for model in (PostLike, Comment):
+        rows = model.objects.filter(user=user, created_at__gte=since, post__user_id__in=authors)
+        if model is Comment:
+            rows = rows.filter(is_deleted=False)
+        for author_id, count in rows.values('post__user_id').annotate(n=Count('id')).values_list('post__user_id', 'n'):
+            interactions[author_id] += count
+    preferred = _preferred_tags(user)
+
+    velocities = {}
+    for post in posts:
+        age_hours = max((now - post['created_at']).total_seconds() / 3600, 0)
+        engagement = (
+            post['likes_count'] + 2 * post['comments_count'] + 2 * post['saves_count'] + 3 * post['shares_count']
+        )
+        velocities[post['id']] = engagement / (age_hours + 2) ** 1.5
+    top_velocity = max(velocities.values()) or 1
+
+    weights = config['WEIGHTS']
+    scores = {}
+    for post in posts:
+        age_hours = max((now - post['created_at']).total_seconds() / 3600, 0)
+        tags = set(post['tags']) if isinstance(post['tags'], list) else set()
+        features = {
+            'affinity': 0.5 * (post['user_id'] in followed)
+            + 0.5 * min(1.0, math.log1p(interactions[post['user_id']]) / math.log1p(10)),
+            'tag_overlap': min(1.0, len(tags & preferred) / 2),
+            'velocity': velocities[post['id']] / top_velocity,
+            'freshness': 0.5 ** (age_hours / config['FRESHNESS_HALF_LIFE_HOURS']),
+        }
+        scores[post['id']] = sum(weights.get(name, 0) * value for name, value in features.items())
+    return scores
+
+
+def rank_for_you(user_id):
+    """Rank and cache ``user_id``'s For You feed; return the ranked post ids."""
+    config = for_you_config()
+    user = get_user_model().objects.filter(id=user_id).first()
+    try:
+        if user is None:
+            return []
+        now = timezone.now()
+        scores = score_posts(user, candidate_post_ids(user, config, now), config, now)
+        post_ids = sorted(scores, key=lambda post_id: (-scores[post_id], -post_id))[:config['FEED_SIZE']]
+        cache.set(
+            feed_cache_key(user_id), {'post_ids': post_ids, 'ranked_at': now.timestamp()}, config['CACHE_TTL']
+        )
+        return post_ids
+    finally:
+        cache.delete(_lock_key(user_id))
+
+
+def schedule_ranking(user_id):
+    """Rank ``user_id``'s feed in the background, unless a ranking is already scheduled."""
+    if not cache.add(_lock_key(user_id), True, RANKING_LOCK_TTL):
+        return
+    from .tasks import rank_for_you_feed
+    run_in_background(rank_for_you_feed, user_id)
+
+
+def ranked_post_ids(user):
+    """
+    ``user``'s cached For You post ids, best first, or None if not ranked yet.
+
+    Schedules a ranking when the list is missing or older than
+    ``REFRESH_AFTER``.
+    """
+    config = for_you_config()
+    ranked = cache.get(feed_cache_key(user.id))
+    if ranked is None or timezone.now().timestamp() - ranked['ranked_at'] > config['REFRESH_AFTER']:
+        schedule_ranking(user.id)
+        # The sync backend has ranked by now
+        ranked = cache.get(feed_cache_key(user.id)) or ranked
+    return ranked['post_ids'] if ranked else None
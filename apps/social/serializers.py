@@ -3,7 +3,9 @@ Serializers for social app.
 """
 from rest_framework import serializers
 from apps.accounts.models import User
+from core.nested import NestedChildren, create_nested
 from .models import Post, PostImage, PostLike, PostSave, Comment, CommentLike
+from .publishing import schedule_post_processing, stage_image
 
 
 class PostImageSerializer(serializers.ModelSerializer):
@@ -102,11 +104,11 @@ class PostSerializer(serializers.ModelSerializer):
             'id', 'user', 'caption', 'tags', 'outfit', 'outfit_id', 'tagged_items',
             'location_name', 'images', 'likes_count', 'comments_count', 
             'shares_count', 'saves_count', 'views_count', 'is_liked', 
-            'is_saved', 'privacy', 'created_at', 'updated_at'
+            'is_saved', 'privacy', 'status', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'likes_count', 'comments_count', 'shares_count', 
-            'saves_count', 'views_count', 'created_at', 'updated_at'
+            'saves_count', 'views_count', 'status', 'created_at', 'updated_at'
         ]
     
     def get_outfit_id(self, obj):
@@ -135,6 +137,36 @@ class PostSerializer(serializers.ModelSerializer):
         return False
 
 
+class NearbyPostSerializer(PostSerializer):
+    """
+    Post in the nearby feed, with its rounded distance from the searched point.
+    
+    Coordinates are left out on purpose: they would give away where the
+    author was (see apps.social.nearby).
+    """
+    distance_km = serializers.FloatField(read_only=True)
+    
+    class Meta(PostSerializer.Meta):
+        fields = PostSerializer.Meta.fields + ['distance_km']
+
+
+def post_image_children(files=(), urls=()):
+    """
+    NestedChildren for a post's uploaded ``files`` followed by its external ``urls``.
+    
+    Uploads are only staged here; apps.social.publishing resizes them in the
+    background.
+    """
+    files = [image_file for image_file in files if image_file]
+    rows = [{'image': image_file, 'order': idx} for idx, image_file in enumerate(files)]
+    rows += [
+        {'image_url': image_url, 'order': idx + len(files)}
+        for idx, image_url in enumerate(url for url in urls if url and url.strip())
+    ]
+    # Uploads are staged by stage_image rather than validated as fields
+    return NestedChildren('images', PostImage, 'post', rows, prepare=stage_image, exclude=('image',))
+
+
 class PostCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating posts."""
     images_data = serializers.ListField(
@@ -257,77 +289,13 @@ class PostCreateSerializer(serializers.ModelSerializer):
             
             user = request.user
             
-            # Create the post
-            post = Post.objects.create(user=user, **validated_data)
-            
-            # Handle file uploads (from images_data field)
-            # Upload to S3 if enabled, otherwise save to filesystem or use image_url field
-            if images_data:
-                from django.conf import settings
-                use_s3 = getattr(settings, 'USE_S3', False)
-                
-                for idx, image_file in enumerate(images_data):
-                    if image_file:  # Check if file is not None
-                        try:
-                            if use_s3:
-                                # S3 is enabled - upload to S3, Django will handle it automatically
-                                # The ImageField will automatically upload to S3 when saved
-                                post_image = PostImage.objects.create(post=post, image=image_file, order=idx)
-                                # Also save the S3 URL to image_url field for redundancy
-                                if post_image.image:
-                                    try:
-                                        # Get the S3 URL from the ImageField
-                                        s3_url = post_image.image.url
-                                        # Update image_url field with S3 URL
-                                        post_image.image_url = s3_url
-                                        post_image.save(update_fields=['image_url'])
-                                        logger.info(f"Uploaded image {idx} to S3 for post {post.id}, URL: {s3_url}")
-                                    except Exception as url_error:
-                                        logger.warning(f"Could not get S3 URL for image {idx}: {str(url_error)}")
-                                else:
-                                    logger.warning(f"Image {idx} uploaded but URL not available")
-                            else:
-                                # S3 not enabled - try to save to filesystem
-                                # On Vercel, this will fail, so we'll catch and use image_url instead
-                                try:
-                                    post_image = PostImage.objects.create(post=post, image=image_file, order=idx)
-                                    # Try to get the URL and save to image_url field
-                                    if post_image.image:
-                                        try:
-                                            request = self.context.get('request')
-                                            if request:
-                                                file_url = request.build_absolute_uri(post_image.image.url)
-                                            else:
-                                                file_url = post_image.image.url
-                                            post_image.image_url = file_url
-                                            post_image.save(update_fields=['image_url'])
-                                        except Exception:
-                                            pass
-                                    logger.info(f"Saved image {idx} to filesystem for post {post.id}")
-                                except (OSError, IOError) as fs_error:
-                                    # Filesystem is read-only (Vercel) - can't save files
-                                    logger.warning(f"Cannot save image to filesystem (read-only): {str(fs_error)}")
-                                    logger.warning("S3 is not enabled. Please enable S3 or use image_urls instead.")
-                                    # Create PostImage with only image_url (will be empty, but post is created)
-                                    # Frontend should use image_urls field instead
-                                    PostImage.objects.create(post=post, order=idx)
-                                    logger.warning(f"Created PostImage {idx} without image file for post {post.id}. Please enable S3 or use image_urls.")
-                        except Exception as img_error:
-                            logger.error(f"Error saving image {idx}: {str(img_error)}", exc_info=True)
-                            # Continue with other images even if one fails
-                            continue
-            
-            # Handle URL-based images (from image_urls field)
-            if image_urls:
-                for idx, image_url in enumerate(image_urls):
-                    if image_url and image_url.strip():  # Check if URL is not empty
-                        try:
-                            PostImage.objects.create(post=post, image_url=image_url, order=idx + len(images_data))
-                            logger.info(f"Saved image URL {idx} for post {post.id}")
-                        except Exception as url_error:
-                            logger.error(f"Error saving image URL {idx}: {str(url_error)}", exc_info=True)
-                            continue
-            
+            # Posts with uploads are published once their images are processed
+            status = 'processing' if any(images_data) else 'published'
+            post = create_nested(Post, {'user': user, 'status': status, **validated_data}, [
+                post_image_children(images_data, image_urls),
+            ])
+            if status == 'processing':
+                schedule_post_processing(post)
             return post
         except serializers.ValidationError:
             # Re-raise validation errors as-is
@@ -0,0 +1,34 @@
+"""
+Signal handlers for social app.
+"""
+from django.db.models.signals import pre_save
+from apps.tags.sync import tags_changed
+from .hashtags import TRENDING_POSTS, counts_towards_trending, record_post_tag_changes, record_post_visibility
+from .models import Post
+
+
+def update_hashtag_usage(sender, added, removed, **kwargs):
+    """Roll post tag changes (create, edit, delete) into the hashtag usage buckets."""
+    record_post_tag_changes(added, removed)
+
+
+def update_hashtag_visibility(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Add or subtract a post's hashtags when it becomes, or stops being, public
+    and published.
+
+    Runs before the save, so the tag sync that follows it (post_save) already
+    sees the new privacy and status.
+    """
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {'privacy', 'status'} & set(update_fields):
+        return
+    was_trending = Post.objects.filter(pk=instance.pk, **TRENDING_POSTS).exists()
+    if was_trending != counts_towards_trending(instance):
+        record_post_visibility([instance.pk], visible=not was_trending)
+
+
+def connect_hashtag_signals():
+    tags_changed.connect(update_hashtag_usage, sender=Post, dispatch_uid='hashtag_usage_rollup')
+    pre_save.connect(update_hashtag_visibility, sender=Post, dispatch_uid='hashtag_usage_visibility')
@@ -0,0 +1,40 @@
+"""
+Celery tasks for social app.
+"""
+from celery import shared_task
+from core.purge import purge_soft_deleted
+from .hashtags import prune_hashtag_usage
+from .models import Comment, Post
+from .publishing import process_post, requeue_stalled_posts as requeue_posts
+from .ranking import rank_for_you
+
+
+@shared_task(ignore_result=True)
+def prune_hashtag_usage_rollups():
+    """Delete hashtag usage buckets that no longer count towards trending."""
+    prune_hashtag_usage()
+
+
+@shared_task(ignore_result=True)
+def process_post_images(post_id):
+    """Resize a new post's staged images and publish it."""
+    process_post(post_id)
+
+
+@shared_task(ignore_result=True)
+def requeue_stalled_posts():
+    """Process posts whose image processing was lost again."""
+    requeue_posts()
+
+
+@shared_task(ignore_result=True)
+def rank_for_you_feed(user_id):
+    """Rank and cache a user's For You feed."""
+    rank_for_you(user_id)
+
+
+@shared_task(ignore_result=True)
+def purge_deleted_posts():
+    """Hard-delete comments and posts soft-deleted longer than the grace period."""
+    purge_soft_deleted(Comment)
+    purge_soft_deleted(Post)
@@ -0,0 +1,184 @@
+"""
+Tests for hashtag feeds and trending hashtags.
+"""
+from datetime import timedelta
+from importlib import import_module
+import pytest
+from django.apps import apps as global_apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.social.hashtags import hour_bucket, prune_hashtag_usage, record_hashtag_usage, trending_hashtags
+from apps.social.models import HashtagUsage, Post, PostImage
+from apps.social.publishing import process_post
+from apps.tags.models import PostTag, Tag
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='hashtags@example.com',
+        username='hashtagsuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def usage(name, period='hour'):
+    return sum(HashtagUsage.objects.filter(tag__name=name, period=period).values_list('posts_count', flat=True))
+
+
+@pytest.mark.django_db
+class TestHashtagRollups:
+    """Rollups follow post creation, edits and deletes."""
+
+    def test_create_edit_and_delete_update_rollups(self, authenticated_client, user):
+        response = authenticated_client.post(
+            '/api/v1/social/posts/', {'caption': 'Beach day', 'tags': ['#Summer', 'beach']}, format='json'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        post_id = response.data['data']['id']
+        assert (usage('summer'), usage('summer', 'day'), usage('beach')) == (1, 1, 1)
+
+        response = authenticated_client.patch(
+            f'/api/v1/social/posts/{post_id}/update/', {'caption': 'Beach day', 'tags': ['summer', 'linen']},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert (usage('summer'), usage('beach'), usage('linen')) == (1, 0, 1)
+
+        authenticated_client.delete(f'/api/v1/social/posts/{post_id}/delete/')
+        assert (usage('summer'), usage('linen'), usage('linen', 'day')) == (0, 0, 0)
+
+    def test_private_posts_never_trend(self, authenticated_client, user):
+        response = authenticated_client.post(
+            '/api/v1/social/posts/', {'caption': 'Shh', 'tags': ['mysecretplan'], 'privacy': 'private'}, format='json'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        post = Post.objects.get(id=response.data['data']['id'])
+        Post.objects.create(user=user, caption='Close friends', tags=['mysecretplan'], privacy='friends')
+        assert usage('mysecretplan') == 0
+        assert trending_hashtags() == []
+
+        post.privacy = 'public'
+        post.save()
+        assert (usage('mysecretplan'), usage('mysecretplan', 'day')) == (1, 1)
+
+        post.privacy = 'friends'
+        post.tags = ['mysecretplan', 'linen']
+        post.save()
+        assert (usage('mysecretplan'), usage('linen')) == (0, 0)
+        assert trending_hashtags() == []
+
+    def test_posts_count_once_published(self, user):
+        processing = Post.objects.create(user=user, caption='Uploading', tags=['wip'], status='processing')
+        PostImage.objects.create(post=processing, image_url='https://example.com/look.jpg')
+        failing = Post.objects.create(user=user, caption='Broken', tags=['wip'], status='processing')
+        assert usage('wip') == 0
+
+        assert process_post(failing.id) == 'failed'
+        assert usage('wip') == 0
+        assert process_post(processing.id) == 'published'
+        assert usage('wip') == 1
+
+    def test_rebuild_migration_drops_private_usage(self, user):
+        Post.objects.create(user=user, caption='Out', tags=['linen'])
+        private = Post.objects.create(user=user, caption='In', tags=['linen', 'mysecretplan'], privacy='private')
+        record_hashtag_usage(list(PostTag.objects.filter(post=private).values_list('post_id', 'tag_id', 'created_at')), [])
+        assert (usage('linen'), usage('mysecretplan')) == (2, 1)
+
+        rebuild = import_module('apps.social.migrations.0008_rebuild_hashtag_usage').rebuild_hashtag_usage
+        rebuild(global_apps, None)
+
+        assert (usage('linen'), usage('linen', 'day'), usage('mysecretplan')) == (1, 1, 0)
+
+    def test_trending_decays_older_usage(self, user):
+        now = timezone.now()
+        old = Tag.objects.create(name='old')
+        new = Tag.objects.create(name='new')
+        record_hashtag_usage([(1, old.id, now - timedelta(hours=30))] * 3 + [(2, new.id, now)] * 2, [])
+
+        trending = trending_hashtags(now=now)
+
+        assert [row['hashtag'] for row in trending] == ['new', 'old']
+        assert trending[0]['posts_last_24h'] == 2
+        assert trending[1]['posts_last_24h'] == 0
+        # Three uses 30h ago with a 12h half-life are worth about 0.53 recent uses
+        assert 0.4 < trending[1]['score'] < 0.7
+
+    def test_trending_uses_daily_buckets_beyond_hourly_window(self, user):
+        now = timezone.now()
+        tag = Tag.objects.create(name='weekly')
+        record_hashtag_usage([(1, tag.id, now - timedelta(days=4))], [])
+
+        assert [row['hashtag'] for row in trending_hashtags(now=now)] == ['weekly']
+        assert trending_hashtags(now=now + timedelta(days=10)) == []
+
+    def test_prune_hashtag_usage(self, user):
+        now = timezone.now()
+        tag = Tag.objects.create(name='stale')
+        record_hashtag_usage([(1, tag.id, now - timedelta(days=5)), (2, tag.id, now)], [])
+
+        prune_hashtag_usage(now=now)
+
+        assert set(HashtagUsage.objects.values_list('period', 'bucket')) == {
+            ('hour', hour_bucket(now)),
+            ('day', hour_bucket(now).replace(hour=0)),
+            ('day', hour_bucket(now - timedelta(days=5)).replace(hour=0)),
+        }
+
+
+@pytest.mark.django_db
+class TestHashtagEndpoints:
+    """Hashtag feed and trending endpoints."""
+
+    def test_hashtag_feed_keyset_pagination(self, authenticated_client, user):
+        posts = [Post.objects.create(user=user, caption=f'Post {i}', tags=['ootd']) for i in range(5)]
+        Post.objects.create(user=user, caption='Private', tags=['ootd'], privacy='private')
+        Post.objects.create(user=user, caption='Other', tags=['other'])
+
+        response = authenticated_client.get('/api/v1/social/hashtags/OOTD/posts/', {'limit': 3})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert data['hashtag'] == 'ootd'
+        assert [post['id'] for post in data['results']] == [post.id for post in posts[:1:-1]]
+
+        response = authenticated_client.get(
+            '/api/v1/social/hashtags/ootd/posts/', {'limit': 3, 'cursor': data['next_cursor']}
+        )
+        data = response.data['data']
+        assert [post['id'] for post in data['results']] == [posts[1].id, posts[0].id]
+        assert data['next_cursor'] is None
+
+    def test_hashtag_feed_unknown_hashtag(self, authenticated_client):
+        response = authenticated_client.get('/api/v1/social/hashtags/nothing/posts/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_trending_hashtags_endpoint(self, authenticated_client, user):
+        Post.objects.create(user=user, caption='A', tags=['summer', 'beach'])
+        Post.objects.create(user=user, caption='B', tags=['summer'])
+
+        response = authenticated_client.get('/api/v1/social/hashtags/trending/', {'limit': 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['hashtag'] for row in response.data['data']] == ['summer']
+        assert response.data['data'][0]['post_count'] == 2
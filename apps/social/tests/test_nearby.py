@@ -0,0 +1,173 @@
+"""
+Tests for geohash-indexed nearby feeds.
+"""
+import random
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.social.models import Post
+from apps.social.nearby import backfill_geohashes, nearby_feed, parse_cursor
+from core.geo import covering_cells, encode_geohash, haversine_km
+
+User = get_user_model()
+
+# Washington Square Park, New York
+LAT, LNG = 40.7308, -73.9973
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='nearby@example.com',
+        username='nearbyuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+def post_at(user, lat, lng, age_days=0, **fields):
+    post = Post.objects.create(user=user, caption='Here', location_lat=lat, location_lng=lng, **fields)
+    if age_days:
+        Post.objects.filter(id=post.id).update(created_at=timezone.now() - timedelta(days=age_days))
+    return post
+
+
+class TestGeohash:
+    """Geohash encoding and circle covers."""
+
+    def test_encode_geohash(self):
+        assert encode_geohash(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+    @pytest.mark.parametrize('lat, lng, radius_km', [(LAT, LNG, 5), (-33.86, 151.2, 40), (0.0, 179.99, 25)])
+    def test_cover_contains_every_point_in_radius(self, lat, lng, radius_km):
+        cells = covering_cells(lat, lng, radius_km)
+        assert 0 < len(cells) <= 9
+        rng = random.Random(7)
+        for _ in range(500):
+            point = (lat + rng.uniform(-1, 1) * radius_km / 111, lng + rng.uniform(-1, 1) * radius_km / 80)
+            point = (point[0], (point[1] + 540) % 360 - 180)
+            if haversine_km(lat, lng, *point) <= radius_km:
+                assert encode_geohash(*point).startswith(tuple(cells))
+
+    def test_polar_circles_are_not_covered(self):
+        assert covering_cells(89.95, 0, 20) is None
+
+
+@pytest.mark.django_db
+class TestNearbyFeed:
+    """Nearby feed queries and ranking."""
+
+    def test_geohash_follows_location(self, user):
+        post = post_at(user, LAT, LNG)
+        assert post.location_geohash == encode_geohash(LAT, LNG)
+
+        post.location_lat, post.location_lng = None, None
+        post.save(update_fields=['location_lat', 'location_lng'])
+        post.refresh_from_db()
+        assert post.location_geohash == ''
+
+        Post.objects.filter(id=post.id).update(location_lat=LAT, location_lng=LNG)
+        assert backfill_geohashes(Post.objects.all()) == 1
+        assert Post.objects.get(id=post.id).location_geohash == encode_geohash(LAT, LNG)
+
+    def test_ranks_by_distance_and_recency(self, user):
+        near_old = post_at(user, LAT + 0.01, LNG, age_days=5)  # ~1.1 km, 5 days old
+        far_new = post_at(user, LAT + 0.03, LNG)  # ~3.3 km, new
+        near_new = post_at(user, LAT, LNG + 0.01)  # ~0.8 km, new
+        post_at(user, LAT + 0.2, LNG)  # ~22 km, out of range
+        post_at(user, LAT, LNG, privacy='private')
+        post_at(user, LAT, LNG, status='processing')
+        Post.objects.create(user=user, caption='Nowhere')
+
+        posts, next_cursor = nearby_feed(LAT, LNG, 10)
+
+        assert [post.id for post in posts] == [near_new.id, far_new.id, near_old.id]
+        assert posts[0].distance_km == 0.8
+        assert next_cursor is None
+
+    def test_distances_are_rounded(self, user):
+        post = post_at(user, LAT + 0.0094, LNG)  # ~1.045 km
+        assert 1.04 < haversine_km(LAT, LNG, post.location_lat, post.location_lng) < 1.05
+
+        posts, _ = nearby_feed(LAT, LNG, 1.0)
+        assert [(p.id, p.distance_km) for p in posts] == [(post.id, 1.0)]
+        assert nearby_feed(LAT, LNG, 0.9)[0] == []
+
+    def test_keyset_pagination(self, user):
+        rng = random.Random(3)
+        posts = [
+            post_at(user, LAT + rng.uniform(-0.05, 0.05), LNG + rng.uniform(-0.05, 0.05), age_days=rng.randint(0, 3))
+            for _ in range(7)
+        ]
+
+        seen = []
+        cursor = None
+        while True:
+            page, next_cursor = nearby_feed(LAT, LNG, 10, cursor=cursor and parse_cursor(cursor), limit=3)
+            seen += [post.id for post in page]
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+
+        assert sorted(seen) == sorted(post.id for post in posts)
+        assert seen == [post.id for post in nearby_feed(LAT, LNG, 10, limit=10)[0]]
+
+    def test_across_the_antimeridian(self, user):
+        east = post_at(user, 0.0, 179.95)
+        west = post_at(user, 0.0, -179.95)
+
+        posts, _ = nearby_feed(0.0, 179.99, 25)
+
+        assert [post.id for post in posts] == [east.id, west.id]
+
+    def test_polar_fallback(self, user):
+        post = post_at(user, 89.96, 120.0)
+
+        posts, _ = nearby_feed(89.95, 0, 20)
+
+        assert [p.id for p in posts] == [post.id]
+
+
+@pytest.mark.django_db
+class TestNearbyFeedEndpoint:
+    """GET /api/v1/social/feed/nearby/."""
+
+    def test_nearby_endpoint_pages(self, authenticated_client, user):
+        posts = [post_at(user, LAT + 0.001 * i, LNG) for i in range(3)]
+
+        response = authenticated_client.get('/api/v1/social/feed/nearby/', {'lat': LAT, 'lng': LNG, 'limit': 2})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert [post['id'] for post in data['results']] == [posts[0].id, posts[1].id]
+        assert data['results'][0]['distance_km'] == 0.0
+        assert data['results'][1]['distance_km'] == 0.1
+        assert 'location_lat' not in data['results'][0]
+        assert data['radius_km'] == 10
+
+        response = authenticated_client.get(
+            '/api/v1/social/feed/nearby/', {'lat': LAT, 'lng': LNG, 'limit': 2, 'cursor': data['next_cursor']}
+        )
+        data = response.data['data']
+        assert [post['id'] for post in data['results']] == [posts[2].id]
+        assert data['next_cursor'] is None
+
+    @pytest.mark.parametrize('params', [
+        {'lng': LNG}, {'lat': 'north', 'lng': LNG}, {'lat': 91, 'lng': LNG},
+        {'lat': LAT, 'lng': LNG, 'radius_km': 0}, {'lat': LAT, 'lng': LNG, 'cursor': 'abc'},
+    ])
+    def test_invalid_parameters(self, authenticated_client, params):
+        response = authenticated_client.get('/api/v1/social/feed/nearby/', params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,178 @@
+"""
+Tests for asynchronous post publishing.
+"""
+from datetime import timedelta
+from io import BytesIO
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.notifications.models import Notification
+from apps.social.models import Post
+from apps.social.publishing import process_post, requeue_stalled_posts
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='publisher@example.com',
+        username='publisher',
+        password='testpass123'
+    )
+
+
+def client_for(user):
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    return client_for(user)
+
+
+@pytest.fixture
+def other_client():
+    """Client for a second user."""
+    return client_for(User.objects.create_user(
+        email='viewer@example.com',
+        username='viewer',
+        password='testpass123'
+    ))
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def upload(name='photo.png', size=(40, 20)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'blue').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def staged_files(media_root):
+    staging = media_root / 'posts' / 'staging'
+    return list(staging.iterdir()) if staging.exists() else []
+
+
+@pytest.mark.django_db
+class TestPostPublishing:
+    """Uploaded images are processed before the post is published."""
+
+    def test_upload_is_resized_and_published(self, authenticated_client, user, media_root, settings):
+        settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+        settings.POST_PUBLISHING = {'MAX_WIDTH': 10}
+
+        response = authenticated_client.post(
+            '/api/v1/social/posts/', {'caption': 'New look', 'images_data': [upload(), upload('b.png')]}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        post = Post.objects.get()
+        assert post.status == 'published'
+        images = list(post.images.all())
+        assert len(images) == 2
+        for image in images:
+            assert image.is_processed
+            with Image.open(media_root / image.image.name) as stored:
+                assert stored.size == (10, 5)
+        assert staged_files(media_root) == []
+        assert Notification.objects.filter(user=user, title='Your post is live').exists()
+
+    def test_processing_post_is_hidden_until_published(self, authenticated_client, other_client, user, media_root):
+        # Background backends only dispatch on commit, which never happens in a test transaction
+        response = authenticated_client.post('/api/v1/social/posts/', {'caption': 'Soon', 'images_data': [upload()]})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['data']['status'] == 'processing'
+        post_id = response.data['data']['id']
+        assert len(staged_files(media_root)) == 1
+
+        response = authenticated_client.get(f'/api/v1/social/posts/{post_id}/status/')
+        assert response.data['data'] == {
+            'id': post_id, 'status': 'processing', 'images_total': 1, 'images_processed': 0
+        }
+        assert other_client.get(f'/api/v1/social/posts/{post_id}/status/').status_code == status.HTTP_404_NOT_FOUND
+        assert other_client.get(f'/api/v1/social/posts/{post_id}/').status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get(f'/api/v1/social/posts/{post_id}/').status_code == status.HTTP_200_OK
+        assert other_client.get('/api/v1/social/feed/', {'type': 'discover'}).data['results'] == []
+
+        assert process_post(post_id) == 'published'
+
+        response = authenticated_client.get(f'/api/v1/social/posts/{post_id}/status/')
+        assert response.data['data']['status'] == 'published'
+        assert response.data['data']['images_processed'] == 1
+        results = other_client.get('/api/v1/social/feed/', {'type': 'discover'}).data['results']
+        assert [post['id'] for post in results] == [post_id]
+        assert staged_files(media_root) == []
+        # Already published: processing again is a no-op
+        assert process_post(post_id) is None
+
+    def test_unreadable_images_fail_the_post(self, authenticated_client, user, media_root):
+        response = authenticated_client.post('/api/v1/social/posts/', {'caption': 'Oops', 'images_data': [upload()]})
+        post_id = response.data['data']['id']
+        [staged] = staged_files(media_root)
+        staged.write_bytes(b'not an image')
+
+        assert process_post(post_id) == 'failed'
+
+        post = Post.objects.get()
+        assert post.status == 'failed'
+        assert not post.images.exists()
+        assert staged_files(media_root) == []
+        assert Notification.objects.filter(user=user, title='Your post could not be published').exists()
+
+    def test_posts_without_uploads_publish_immediately(self, authenticated_client):
+        response = authenticated_client.post(
+            '/api/v1/social/posts/',
+            {'caption': 'Linked', 'image_urls': ['https://example.com/look.jpg']},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['data']['status'] == 'published'
+        assert Post.objects.get().images.get().is_processed
+
+    def test_upload_that_cannot_be_staged_fails_the_post(self, authenticated_client, media_root, settings, monkeypatch):
+        settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+
+        def read_only(*args, **kwargs):
+            raise OSError('Read-only file system')
+        monkeypatch.setattr(FileSystemStorage, 'save', read_only)
+
+        response = authenticated_client.post('/api/v1/social/posts/', {'caption': 'Lost', 'images_data': [upload()]})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        post = Post.objects.get()
+        assert post.status == 'failed'
+        assert not post.images.exists()
+
+    def test_stalled_posts_are_requeued_and_expired_ones_failed(self, authenticated_client, user, media_root, settings):
+        for caption in ('Stalled', 'Expired', 'Busy'):
+            authenticated_client.post('/api/v1/social/posts/', {'caption': caption, 'images_data': [upload()]})
+        settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Post.objects.filter(caption='Stalled').update(updated_at=an_hour_ago)
+        Post.objects.filter(caption='Expired').update(created_at=an_hour_ago - timedelta(days=1), updated_at=an_hour_ago)
+
+        assert requeue_stalled_posts() == (1, 1)
+
+        statuses = dict(Post.objects.values_list('caption', 'status'))
+        assert statuses == {'Stalled': 'published', 'Expired': 'failed', 'Busy': 'processing'}
+        assert not Post.objects.get(caption='Expired').images.exists()
+        assert len(staged_files(media_root)) == 1
+        assert Notification.objects.filter(user=user, title='Your post could not be published').count() == 1
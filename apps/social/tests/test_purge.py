@@ -0,0 +1,103 @@
+"""
+Tests for hard-purging soft-deleted posts and comments.
+"""
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.social.models import Comment, CommentLike, Post, PostImage, PostLike, PostSave
+from core.purge import purge_soft_deleted
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='purge@example.com',
+        username='purgeuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+def deleted_days_ago(instance, days):
+    type(instance).objects.filter(pk=instance.pk).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=days)
+    )
+
+
+def post_with_children(user, others):
+    post = Post.objects.create(user=user, caption='Busy')
+    image = PostImage(post=post, order=0)
+    image.image.save('look.jpg', ContentFile(b'jpeg'), save=True)
+    for other in others:
+        PostLike.objects.create(user=other, post=post)
+        PostSave.objects.create(user=other, post=post)
+        comment = Comment.objects.create(post=post, user=other, content='Nice')
+        CommentLike.objects.create(user=user, comment=comment)
+        Comment.objects.create(post=post, user=user, content='Thanks', parent_comment=comment)
+    return post, image
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSoftDeletePurge:
+    """purge_soft_deleted() on posts and comments."""
+
+    def test_deletes_record_deleted_at(self, authenticated_client, user):
+        post = Post.objects.create(user=user, caption='Bye')
+        comment = Comment.objects.create(post=post, user=user, content='Bye')
+
+        authenticated_client.delete(f'/api/v1/social/comments/{comment.id}/delete/')
+        response = authenticated_client.delete(f'/api/v1/social/posts/{post.id}/delete/')
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        post.refresh_from_db()
+        comment.refresh_from_db()
+        assert post.is_deleted and post.deleted_at is not None
+        assert comment.is_deleted and comment.deleted_at is not None
+
+    def test_purges_expired_posts_with_children(self, user, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        others = [User.objects.create_user(email=f'fan{i}@example.com', username=f'fan{i}', password='x') for i in range(3)]
+        expired, image = post_with_children(user, others)
+        recent, _ = post_with_children(user, others[:1])
+        live, _ = post_with_children(user, others[:1])
+        deleted_days_ago(expired, 45)
+        deleted_days_ago(recent, 5)
+
+        counts = purge_soft_deleted(Post, batch_size=2)
+
+        assert counts == {
+            'social.Post': 1, 'social.PostImage': 1, 'social.PostLike': 3, 'social.PostSave': 3,
+            'social.Comment': 6, 'social.CommentLike': 3,
+        }
+        assert set(Post.objects.values_list('id', flat=True)) == {recent.id, live.id}
+        assert not (tmp_path / image.image.name).exists()
+        assert PostLike.objects.count() == 2
+        assert Comment.objects.count() == 4
+
+    def test_purges_expired_comments(self, user, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        post, _ = post_with_children(user, [User.objects.create_user(email='fan@example.com', username='fan', password='x')])
+        comment = Comment.objects.get(parent_comment__isnull=True)
+        deleted_days_ago(comment, 31)
+
+        counts = purge_soft_deleted(Comment)
+
+        assert counts == {'social.Comment': 2, 'social.CommentLike': 1}
+        assert Post.objects.filter(id=post.id).exists()
+        assert not Comment.objects.exists()
@@ -0,0 +1,134 @@
+"""
+Tests for primary/replica routing using a SQLite stand-in for the replica.
+
+The "replica" is a second connection to the test database, so routed queries
+can be observed per connection. Tests use real transactions so the second
+connection sees committed rows.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.social.models import Post
+from core.db.routers import PrimaryReplicaRouter, use_primary, use_replicas
+
+User = get_user_model()
+
+REPLICA = 'replica_test'
+
+
+@pytest.fixture
+def sqlite_replica(settings, transactional_db):
+    """Register a second SQLite connection to the test database as a replica."""
+    connections.settings[REPLICA] = {
+        **connections[DEFAULT_DB_ALIAS].settings_dict,
+        'TEST': {'MIRROR': DEFAULT_DB_ALIAS},
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+    cache.clear()
+    yield connections[REPLICA]
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='replica@example.com',
+        username='replicauser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+class TestPrimaryReplicaRouter:
+    """Test routing decisions."""
+
+    def test_reads_outside_requests_use_primary(self, sqlite_replica):
+        """Test scripts and tasks read from the primary by default."""
+        assert Post.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_use_replicas_block(self, sqlite_replica):
+        """Test reads go to the replica when explicitly allowed."""
+        with use_replicas():
+            assert Post.objects.all().db == REPLICA
+            with use_primary():
+                assert Post.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_reads_in_atomic_block_use_primary(self, sqlite_replica):
+        """Test reads inside transaction.atomic stay on the primary."""
+        with use_replicas():
+            with transaction.atomic():
+                assert Post.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_reads_after_write_use_primary(self, sqlite_replica, user):
+        """Test a write sends the rest of the block to the primary."""
+        with use_replicas():
+            Post.objects.create(user=user, caption='Fresh post')
+            assert Post.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_no_migrations_on_replicas(self, sqlite_replica):
+        """Test migrations only run against the primary."""
+        router = PrimaryReplicaRouter()
+        assert router.allow_migrate(REPLICA, 'social') is False
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, 'social') is None
+
+
+class TestReplicaRequests:
+    """Test routing of API requests."""
+
+    def test_feed_reads_from_replica(self, sqlite_replica, authenticated_client):
+        """Test a GET request reads from the replica."""
+        author = User.objects.create_user(
+            email='author@example.com', username='author', password='testpass123'
+        )
+        Post.objects.create(user=author, caption='Replicated post', privacy='public')
+
+        with CaptureQueriesContext(sqlite_replica) as replica_queries:
+            response = authenticated_client.get('/api/v1/social/feed/', {'type': 'discover'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        assert len(replica_queries) > 0
+
+    def test_read_your_writes_after_post(self, sqlite_replica, authenticated_client):
+        """Test a user's reads stay on the primary right after they write."""
+        with CaptureQueriesContext(sqlite_replica) as replica_queries:
+            response = authenticated_client.post(
+                '/api/v1/social/posts/', {'caption': 'Just posted', 'privacy': 'public'}, format='json'
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            post = Post.objects.get(caption='Just posted')
+
+            response = authenticated_client.get(f'/api/v1/social/posts/{post.id}/')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(replica_queries) == 0
+
+    def test_other_users_still_use_replica(self, sqlite_replica, authenticated_client):
+        """Test the primary pin only applies to the user who wrote."""
+        authenticated_client.post(
+            '/api/v1/social/posts/', {'caption': 'Just posted', 'privacy': 'public'}, format='json'
+        )
+        other = User.objects.create_user(
+            email='other@example.com', username='other', password='testpass123'
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(other).access_token}')
+
+        with CaptureQueriesContext(sqlite_replica) as replica_queries:
+            response = client.get('/api/v1/social/feed/', {'type': 'discover'})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(replica_queries) > 0
@@ -0,0 +1,104 @@
+"""
+Tests for Redis token-bucket throttling of social write endpoints.
+"""
+import time
+import uuid
+import pytest
+import redis
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.social.models import Post
+from core.throttling import limiter, throttling_config
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='throttled@example.com',
+        username='throttleduser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def post(user):
+    return Post.objects.create(user=user, caption='Like me')
+
+
+@pytest.fixture
+def throttling(settings):
+    """Enable throttling (disabled in development without Redis) with a fresh limiter."""
+    settings.THROTTLING = {**settings.THROTTLING, 'ENABLED': True, 'KEY_PREFIX': f'throttle-test-{uuid.uuid4().hex}'}
+    limiter._script = None
+    limiter._unavailable_until = 0.0
+    yield settings.THROTTLING
+    limiter._script = None
+    limiter._unavailable_until = 0.0
+
+
+@pytest.mark.django_db
+class TestGCRAThrottle:
+    """Throttle decisions on the like endpoint."""
+
+    def test_denied_requests_get_429_with_retry_after(self, authenticated_client, user, post, throttling, monkeypatch):
+        calls = []
+
+        def hit(key, interval_ms, burst):
+            calls.append((key, interval_ms, burst))
+            return False, 1500
+
+        monkeypatch.setattr(limiter, 'hit', hit)
+        response = authenticated_client.post(f'/api/v1/social/posts/{post.id}/like/')
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '2'
+        assert calls == [(f"{throttling['KEY_PREFIX']}:post_like:user:{user.id}", 600, 20)]
+        assert not post.likes.exists()
+
+    def test_fails_open_when_redis_is_unavailable(self, authenticated_client, post, throttling, settings):
+        settings.THROTTLING = {**throttling, 'REDIS_URL': 'redis://127.0.0.1:1/0'}
+
+        response = authenticated_client.post(f'/api/v1/social/posts/{post.id}/like/')
+
+        assert response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED)
+        assert limiter._unavailable_until > time.monotonic()
+        # Redis is not retried until RETRY_AFTER_ERROR has passed
+        assert limiter.hit('any', 1000, 1) == (True, 0)
+
+    def test_disabled_throttling_skips_redis(self, authenticated_client, post, settings, monkeypatch):
+        settings.THROTTLING = {**settings.THROTTLING, 'ENABLED': False}
+        monkeypatch.setattr(limiter, 'hit', lambda *args: pytest.fail('Redis was called'))
+
+        response = authenticated_client.post(f'/api/v1/social/posts/{post.id}/like/')
+
+        assert response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED)
+
+
+class TestGCRAScript:
+    """The Lua script against a real Redis server."""
+
+    def test_burst_then_steady_rate(self, throttling):
+        try:
+            redis.Redis.from_url(throttling_config()['REDIS_URL'], socket_connect_timeout=0.2).ping()
+        except redis.RedisError:
+            pytest.skip('Redis is not available')
+        key = f"{throttling['KEY_PREFIX']}:gcra"
+
+        decisions = [limiter.hit(key, 60000, 3) for _ in range(4)]
+
+        assert [allowed for allowed, _ in decisions] == [True, True, True, False]
+        assert 59000 < decisions[-1][1] <= 60000
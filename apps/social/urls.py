@@ -4,7 +4,9 @@ URL patterns for social app.
 from django.urls import path
 from .views import (
     SocialFeedView,
+    NearbyFeedView,
     PostDetailView,
+    PostStatusView,
     PostCreateView,
     PostUpdateView,
     PostDeleteView,
@@ -16,6 +18,8 @@ from .views import (
     UpdateCommentView,
     DeleteCommentView,
     LikeCommentView,
+    TrendingHashtagsView,
+    HashtagFeedView,
 )
 
 app_name = 'social'
@@ -23,10 +27,16 @@ app_name = 'social'
 urlpatterns = [
     # Feed
     path('feed/', SocialFeedView.as_view(), name='feed'),
+    path('feed/nearby/', NearbyFeedView.as_view(), name='feed-nearby'),
+    
+    # Hashtags
+    path('hashtags/trending/', TrendingHashtagsView.as_view(), name='hashtags-trending'),
+    path('hashtags/<str:hashtag>/posts/', HashtagFeedView.as_view(), name='hashtag-feed'),
     
     # Posts
     path('posts/', PostCreateView.as_view(), name='post-create'),
     path('posts/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
+    path('posts/<int:pk>/status/', PostStatusView.as_view(), name='post-status'),
     path('posts/<int:pk>/update/', PostUpdateView.as_view(), name='post-update'),
     path('posts/<int:pk>/delete/', PostDeleteView.as_view(), name='post-delete'),
     
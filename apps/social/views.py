@@ -5,11 +5,16 @@ from rest_framework import generics, status, views, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Q
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer, OpenApiTypes
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
-from .models import Post, PostImage, PostLike, PostSave, Comment, CommentLike
-from .serializers import PostSerializer, PostCreateSerializer, CommentSerializer, PostImageSerializer
+from core.throttling import GCRAThrottle
+from .hashtags import cached_trending_hashtags, hashtag_config, hashtag_feed
+from .nearby import nearby_config, nearby_feed, parse_cursor
+from .ranking import ranked_post_ids
+from .models import Post, PostLike, PostSave, Comment, CommentLike
+from .serializers import PostSerializer, PostCreateSerializer, CommentSerializer, PostImageSerializer, NearbyPostSerializer
 
 
 class SocialFeedView(generics.ListAPIView):
@@ -21,10 +26,14 @@ class SocialFeedView(generics.ListAPIView):
     
     @extend_schema(
         summary="Get social feed",
-        description="Get posts feed (following, discover, or trending)",
+        description=(
+            "Get posts feed (following, discover, trending or forYou). forYou is ranked for the user "
+            "from followed authors, similar users and trending posts; until the user's ranking is "
+            "ready it lists recent public posts."
+        ),
         tags=["Social Feed"],
         parameters=[
-            OpenApiParameter(name='type', description='Feed type: following, discover, trending', required=False, type=str),
+            OpenApiParameter(name='type', description='Feed type: following, discover, trending, forYou', required=False, type=str),
             OpenApiParameter(name='page', description='Page number', required=False, type=int),
         ],
         responses={
@@ -52,7 +61,8 @@ class SocialFeedView(generics.ListAPIView):
                     queryset = Post.objects.filter(
                         user_id__in=following_users,
                         is_deleted=False,
-                        privacy='public'
+                        privacy='public',
+                        status='published'
                     )
                 else:
                     # Return empty queryset if user doesn't follow anyone
@@ -61,20 +71,23 @@ class SocialFeedView(generics.ListAPIView):
                 # Posts with high engagement
                 queryset = Post.objects.filter(
                     is_deleted=False,
-                    privacy='public'
+                    privacy='public',
+                    status='published'
                 ).order_by('-likes_count', '-created_at')
             elif feed_type == 'forYou' or feed_type == 'foryou':
-                # "For You" feed - mix of all public posts including user's own posts
-                # This is similar to discover but includes the user's own posts
+                # Fallback until the user's ranked "For You" list is ready (see list()):
+                # all public posts, including the user's own
                 queryset = Post.objects.filter(
                     is_deleted=False,
-                    privacy='public'
+                    privacy='public',
+                    status='published'
                 )
             else:  # discover
                 # All public posts (excluding user's own posts)
                 queryset = Post.objects.filter(
                     is_deleted=False,
-                    privacy='public'
+                    privacy='public',
+                    status='published'
                 ).exclude(user=user)
         except Exception as e:
             # Log the error and fallback to empty queryset
@@ -84,6 +97,95 @@ class SocialFeedView(generics.ListAPIView):
             queryset = Post.objects.none()
         
         return queryset.order_by('-created_at')
+    
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('type') not in ('forYou', 'foryou'):
+            return super().list(request, *args, **kwargs)
+        post_ids = ranked_post_ids(request.user)
+        if post_ids is None:
+            return super().list(request, *args, **kwargs)
+        
+        # Page through the cached ranked list; posts deleted or hidden since ranking are skipped
+        page_ids = self.paginate_queryset(post_ids)
+        posts = Post.objects.filter(
+            id__in=page_ids, is_deleted=False, privacy='public', status='published'
+        ).select_related('user', 'outfit').prefetch_related('images')
+        by_id = {post.id: post for post in posts}
+        serializer = self.get_serializer([by_id[post_id] for post_id in page_ids if post_id in by_id], many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class NearbyFeedView(views.APIView):
+    """
+    Get public posts near a location.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get nearby feed",
+        description=(
+            "Public posts located within radius_km of a point, ranked by distance and recency "
+            "(a post a day older ranks like one a kilometer further away). Pass the returned "
+            "next_cursor as cursor, with the same lat, lng and radius_km, to get the next page."
+        ),
+        tags=["Social Feed"],
+        parameters=[
+            OpenApiParameter(name='lat', description='Latitude (-90 to 90)', required=True, type=float),
+            OpenApiParameter(name='lng', description='Longitude (-180 to 180)', required=True, type=float),
+            OpenApiParameter(name='radius_km', description='Search radius in km (default 10, max 200)', required=False, type=float),
+            OpenApiParameter(name='cursor', description='next_cursor from the previous page', required=False, type=str),
+            OpenApiParameter(name='limit', description='Posts per page (default 20, max 50)', required=False, type=int),
+        ],
+        responses={
+            200: inline_serializer(
+                name='NearbyFeedResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='NearbyFeedData',
+                        fields={
+                            'radius_km': serializers.FloatField(),
+                            'results': NearbyPostSerializer(many=True),
+                            'next_cursor': serializers.CharField(allow_null=True),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get(self, request):
+        config = nearby_config()
+        try:
+            lat = float(request.query_params['lat'])
+            lng = float(request.query_params['lng'])
+            radius_km = float(request.query_params.get('radius_km', config['DEFAULT_RADIUS_KM']))
+            limit = min(max(int(request.query_params.get('limit', config['PAGE_SIZE'])), 1), config['MAX_PAGE_SIZE'])
+            cursor = parse_cursor(request.query_params['cursor']) if request.query_params.get('cursor') else None
+        except (KeyError, ValueError):
+            return Response({
+                'success': False,
+                'message': 'lat and lng are required; lat, lng and radius_km must be numbers, limit an integer '
+                           'and cursor a next_cursor value'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180) or not radius_km > 0:
+            return Response({
+                'success': False,
+                'message': 'lat must be between -90 and 90, lng between -180 and 180, and radius_km positive'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        radius_km = min(radius_km, config['MAX_RADIUS_KM'])
+        
+        posts, next_cursor = nearby_feed(lat, lng, radius_km, cursor=cursor, limit=limit)
+        return Response({
+            'success': True,
+            'data': {
+                'radius_km': radius_km,
+                'results': NearbyPostSerializer(posts, many=True, context={'request': request}).data,
+                'next_cursor': next_cursor,
+            }
+        }, status=status.HTTP_200_OK)
 
 
 class PostDetailView(generics.RetrieveAPIView):
@@ -104,7 +206,8 @@ class PostDetailView(generics.RetrieveAPIView):
         }
     )
     def get_queryset(self):
-        return Post.objects.filter(is_deleted=False)
+        # Posts still processing (or failed) are only visible to their author
+        return Post.objects.filter(is_deleted=False).filter(Q(status='published') | Q(user=self.request.user))
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -117,6 +220,58 @@ class PostDetailView(generics.RetrieveAPIView):
         return Response(serializer.data)
 
 
+class PostStatusView(views.APIView):
+    """
+    Publishing status of one of the user's posts, for polling after creation.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get post publishing status",
+        description=(
+            "Whether a new post is still processing its uploaded images, published or failed. "
+            "The author is also notified when processing finishes."
+        ),
+        tags=["Social Feed"],
+        responses={
+            200: inline_serializer(
+                name='PostStatusResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='PostStatusData',
+                        fields={
+                            'id': serializers.IntegerField(),
+                            'status': serializers.ChoiceField(choices=Post.STATUS_CHOICES),
+                            'images_total': serializers.IntegerField(),
+                            'images_processed': serializers.IntegerField(),
+                        }
+                    ),
+                }
+            ),
+            401: UnauthorizedErrorResponse,
+            404: NotFoundErrorResponse,
+        }
+    )
+    def get(self, request, pk):
+        post = get_object_or_404(
+            Post.objects.annotate(
+                images_total=Count('images'),
+                images_processed=Count('images', filter=Q(images__is_processed=True)),
+            ).only('id', 'status'),
+            pk=pk, user=request.user, is_deleted=False
+        )
+        return Response({
+            'success': True,
+            'data': {
+                'id': post.id,
+                'status': post.status,
+                'images_total': post.images_total,
+                'images_processed': post.images_processed,
+            }
+        }, status=status.HTTP_200_OK)
+
+
 class PostCreateView(generics.CreateAPIView):
     """
     Create a new post.
@@ -160,71 +315,30 @@ class PostCreateView(generics.CreateAPIView):
         logger = logging.getLogger(__name__)
         
         try:
-            # Log incoming request data for debugging
-            logger.info(f"Creating post with data keys: {list(request.data.keys())}")
-            logger.info(f"Creating post with FILES keys: {list(request.FILES.keys())}")
-            logger.info(f"Creating post with data: {dict(request.data)}")
-            
-            # Log file information
-            if request.FILES:
-                for key, file in request.FILES.items():
-                    logger.info(f"File '{key}': name={file.name}, size={file.size}, content_type={file.content_type}")
+            logger.debug(f"Creating post with data keys: {list(request.data.keys())}, FILES keys: {list(request.FILES.keys())}")
             
             serializer = self.get_serializer(data=request.data, context={'request': request})
             serializer.is_valid(raise_exception=True)
             
+            # Legacy multipart uploads under the old 'images'/'image'/'files' names (max 10),
+            # used when neither images_data nor image_urls were sent
+            save_kwargs = {}
+            if not serializer.validated_data.get('images_data') and not serializer.validated_data.get('image_urls'):
+                legacy_images = request.FILES.getlist('images') or request.FILES.getlist('image') or request.FILES.getlist('files')
+                if legacy_images:
+                    save_kwargs['images_data'] = legacy_images[:10]
+            
             # Create post - user is obtained from request context in serializer.create()
-            # The serializer will handle images_data and image_urls
+            # Uploaded images are staged and processed in the background (see apps.social.publishing)
             try:
-                post = serializer.save()
-                logger.info(f"Post created successfully with ID: {post.id}")
+                post = serializer.save(**save_kwargs)
+                logger.info(f"Post created successfully with ID: {post.id} ({post.status})")
             except Exception as create_error:
                 error_traceback = traceback.format_exc()
                 logger.error(f"Error in serializer.save(): {str(create_error)}")
                 logger.error(f"Full traceback:\n{error_traceback}")
                 raise
             
-            # Handle legacy multipart/form-data image uploads (if images_data/image_urls not provided)
-            # This supports the old 'images' field name for backward compatibility
-            # Backend will upload to S3 if enabled, otherwise will try filesystem
-            try:
-                if not post.images.exists():
-                    # Check for various possible field names
-                    images = request.FILES.getlist('images') or request.FILES.getlist('image') or request.FILES.getlist('files')
-                    logger.info(f"Found {len(images)} images in request.FILES (legacy field names)")
-                    
-                    if images:
-                        from django.conf import settings
-                        use_s3 = getattr(settings, 'USE_S3', False)
-                        
-                        for idx, image in enumerate(images[:10]):  # Max 10 images
-                            if image:  # Check if file is not None
-                                try:
-                                    if use_s3:
-                                        # S3 is enabled - upload to S3
-                                        PostImage.objects.create(post=post, image=image, order=idx)
-                                        logger.info(f"Uploaded legacy image {idx} to S3 for post {post.id}")
-                                    else:
-                                        # Try filesystem (will fail on Vercel)
-                                        try:
-                                            PostImage.objects.create(post=post, image=image, order=idx)
-                                            logger.info(f"Saved legacy image {idx} to filesystem for post {post.id}")
-                                        except (OSError, IOError) as fs_error:
-                                            logger.warning(f"Cannot save legacy image to filesystem (read-only): {str(fs_error)}")
-                                            logger.warning("S3 is not enabled. Please enable S3 or use image_urls field.")
-                                            # Create empty PostImage record
-                                            PostImage.objects.create(post=post, order=idx)
-                                except Exception as file_error:
-                                    logger.error(f"Failed to save legacy image {idx}: {str(file_error)}", exc_info=True)
-                                    # Continue with other images
-                                    continue
-            except Exception as img_upload_error:
-                logger.warning(f"Error handling legacy image uploads: {str(img_upload_error)}")
-                # Don't fail the entire request if legacy image upload fails
-            
-            # Return wrapped response - refresh from DB to ensure all relationships are loaded
-            post.refresh_from_db()
-            
             # Try to serialize the post with proper error handling
             try:
                 # Use select_related to prefetch user and outfit to avoid N+1 queries
@@ -306,7 +420,7 @@ class PostCreateView(generics.CreateAPIView):
             
             return Response({
                 'success': True,
-                'message': 'Post created successfully',
+                'message': 'Post is being processed' if post.status == 'processing' else 'Post created successfully',
                 'data': serializer_data
             }, status=status.HTTP_201_CREATED)
         except serializers.ValidationError as e:
@@ -385,6 +499,7 @@ class PostDeleteView(generics.DestroyAPIView):
     
     def perform_destroy(self, instance):
         instance.is_deleted = True
+        instance.deleted_at = timezone.now()
         instance.save()
 
 
@@ -393,6 +508,8 @@ class LikePostView(views.APIView):
     Like/unlike a post.
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [GCRAThrottle]
+    throttle_scope = 'post_like'
     
     @extend_schema(
         summary="Like/unlike post",
@@ -449,6 +566,8 @@ class SavePostView(views.APIView):
     Save/unsave a post.
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [GCRAThrottle]
+    throttle_scope = 'post_save'
     
     @extend_schema(
         summary="Save/unsave post",
@@ -505,6 +624,8 @@ class SharePostView(views.APIView):
     Share a post.
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [GCRAThrottle]
+    throttle_scope = 'post_share'
     
     @extend_schema(
         summary="Share post",
@@ -584,6 +705,8 @@ class AddCommentView(views.APIView):
     Add comment to post.
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [GCRAThrottle]
+    throttle_scope = 'comment_add'
     
     @extend_schema(
         summary="Add comment",
@@ -702,6 +825,7 @@ class DeleteCommentView(generics.DestroyAPIView):
     
     def perform_destroy(self, instance):
         instance.is_deleted = True
+        instance.deleted_at = timezone.now()
         instance.save()
         
         # Update post comment count
@@ -765,3 +889,125 @@ class LikeCommentView(views.APIView):
                 'likes_count': comment.likes_count
             }, status=status.HTTP_200_OK)
 
+
+
+class TrendingHashtagsView(views.APIView):
+    """
+    Get trending hashtags.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    MAX_LIMIT = 50
+    
+    @extend_schema(
+        summary="Get trending hashtags",
+        description=(
+            "Hashtags ranked by recent use: posts tagged per hour (last two days) and per day "
+            "(the week before), with older use decaying exponentially."
+        ),
+        tags=["Social Feed"],
+        parameters=[
+            OpenApiParameter(name='limit', description='Number of hashtags (default 10, max 50)', required=False, type=int),
+        ],
+        responses={
+            200: inline_serializer(
+                name='TrendingHashtagsResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='TrendingHashtag',
+                        many=True,
+                        fields={
+                            'hashtag': serializers.CharField(),
+                            'score': serializers.FloatField(),
+                            'posts_last_24h': serializers.IntegerField(),
+                            'post_count': serializers.IntegerField(),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), self.MAX_LIMIT)
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'data': cached_trending_hashtags(limit)
+        }, status=status.HTTP_200_OK)
+
+
+class HashtagFeedView(views.APIView):
+    """
+    Get public posts tagged with a hashtag.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get hashtag feed",
+        description=(
+            "Public posts tagged with a hashtag, newest first. Pass the returned next_cursor "
+            "as cursor to get the next page."
+        ),
+        tags=["Social Feed"],
+        parameters=[
+            OpenApiParameter(name='cursor', description='next_cursor from the previous page', required=False, type=int),
+            OpenApiParameter(name='limit', description='Posts per page (default 20, max 50)', required=False, type=int),
+        ],
+        responses={
+            200: inline_serializer(
+                name='HashtagFeedResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='HashtagFeedData',
+                        fields={
+                            'hashtag': serializers.CharField(),
+                            'post_count': serializers.IntegerField(),
+                            'results': PostSerializer(many=True),
+                            'next_cursor': serializers.IntegerField(allow_null=True),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+            404: NotFoundErrorResponse,
+        }
+    )
+    def get(self, request, hashtag):
+        config = hashtag_config()
+        try:
+            limit = min(max(int(request.query_params.get('limit', config['FEED_PAGE_SIZE'])), 1),
+                        config['MAX_FEED_PAGE_SIZE'])
+            cursor = int(request.query_params['cursor']) if request.query_params.get('cursor') else None
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'cursor and limit must be integers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        tag, posts, next_cursor = hashtag_feed(hashtag, cursor=cursor, limit=limit)
+        if tag is None:
+            return Response({
+                'success': False,
+                'message': 'Hashtag not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'success': True,
+            'data': {
+                'hashtag': tag.name,
+                'post_count': tag.post_count,
+                'results': PostSerializer(posts, many=True, context={'request': request}).data,
+                'next_cursor': next_cursor,
+            }
+        }, status=status.HTTP_200_OK)
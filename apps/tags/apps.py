@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TagsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tags'
+
+    def ready(self):
+        from .signals import connect_tag_signals
+        connect_tag_signals()
@@ -0,0 +1,38 @@
+"""
+Management command to rebuild the normalized tag tables.
+
+Normalizes the JSON tag lists of posts, wardrobe items, outfits and lookbooks
+and syncs their tag links, in primary-key batches. Signals keep the tables in
+sync for ordinary saves; run this after writes that bypass them (COPY,
+``bulk_create``, ``QuerySet.update``).
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.tags.sync import TAGGED_MODELS, backfill_tags, recount_tags
+
+
+class Command(BaseCommand):
+    help = 'Sync normalized tags from the JSON tag lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and synced per batch'
+        )
+        parser.add_argument(
+            '--recount',
+            action='store_true',
+            help='Recompute every tag counter from the link tables afterwards'
+        )
+
+    def handle(self, *args, **options):
+        for label in TAGGED_MODELS:
+            model = apps.get_model(label)
+            processed = backfill_tags(model, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Synced tags of {processed} {model._meta.verbose_name_plural}'))
+
+        if options['recount']:
+            updated = recount_tags()
+            self.stdout.write(self.style.SUCCESS(f'Recounted {updated} tags'))
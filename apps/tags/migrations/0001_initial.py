@@ -0,0 +1,92 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('lookbooks', '0002_lookbook_cover_image_url'),
+        ('outfits', '0004_outfititem_color_code'),
+        ('social', '0003_postimage_post_images_post_id_8637ba_idx'),
+        ('wardrobe', '0004_wardrobeitem_color_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('post_count', models.IntegerField(default=0)),
+                ('wardrobe_item_count', models.IntegerField(default=0)),
+                ('outfit_count', models.IntegerField(default=0)),
+                ('lookbook_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tags',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['-post_count'], name='tags_post_co_d124e2_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='social.post')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_links', to='tags.tag')),
+            ],
+            options={
+                'db_table': 'post_tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='post_tags_tag_id_5004a4_idx')],
+                'unique_together': {('post', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='OutfitTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('outfit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='outfits.outfit')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outfit_links', to='tags.tag')),
+            ],
+            options={
+                'db_table': 'outfit_tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='outfit_tags_tag_id_bc9327_idx')],
+                'unique_together': {('outfit', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LookbookTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('lookbook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='lookbooks.lookbook')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lookbook_links', to='tags.tag')),
+            ],
+            options={
+                'db_table': 'lookbook_tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='lookbook_ta_tag_id_fd36a2_idx')],
+                'unique_together': {('lookbook', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WardrobeItemTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='wardrobe.wardrobeitem')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wardrobe_item_links', to='tags.tag')),
+            ],
+            options={
+                'db_table': 'wardrobe_item_tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='wardrobe_it_tag_id_4d450c_idx')],
+                'unique_together': {('item', 'tag')},
+            },
+        ),
+    ]
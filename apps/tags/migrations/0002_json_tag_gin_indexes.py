@@ -0,0 +1,43 @@
+"""
+GIN indexes on the JSON tag columns (PostgreSQL only; a no-op elsewhere).
+
+The normalized tag tables serve the API's tag filters; these indexes keep
+ad-hoc ``tags__contains`` (jsonb ``@>``) queries on the JSON lists indexed
+too. ``jsonb_path_ops`` only supports containment, which is all tag lookups
+need, and is smaller and faster than the default operator class.
+"""
+from django.db import migrations
+
+JSON_TAG_COLUMNS = [
+    ('posts', 'tags'),
+    ('wardrobe_items', 'tags'),
+    ('outfits', 'style_tags'),
+    ('lookbooks', 'tags'),
+]
+
+
+def create_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in JSON_TAG_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_gin ON {table} USING gin ({column} jsonb_path_ops)'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in JSON_TAG_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tags', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def backfill_tags(apps, schema_editor):
+    from apps.tags.sync import TAGGED_MODELS, backfill_tags
+    for label in TAGGED_MODELS:
+        backfill_tags(apps.get_model(label), apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tags', '0002_json_tag_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tags', '0003_backfill_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='posttag',
+            index=models.Index(fields=['tag', '-post'], name='post_tags_tag_id_8131a6_idx'),
+        ),
+    ]
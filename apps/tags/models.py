@@ -0,0 +1,114 @@
+"""
+Normalized tag store for CuratorAI.
+
+Posts, wardrobe items, outfits and lookbooks keep their tags in a JSON list
+(``Post.tags``, ``WardrobeItem.tags``, ``Outfit.style_tags``,
+``Lookbook.tags``), which is what the API reads and writes. Each list is
+mirrored into a lower-cased ``Tag`` row per distinct tag and a link row per
+(object, tag), kept in sync by apps.tags.signals, so tag filters are indexed
+joins and tag counts are stored rather than counted.
+"""
+from django.db import models
+
+
+class Tag(models.Model):
+    """
+    A distinct, lower-cased tag, with the number of objects using it.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    
+    # Usage counts, maintained by apps.tags.sync
+    post_count = models.IntegerField(default=0)
+    wardrobe_item_count = models.IntegerField(default=0)
+    outfit_count = models.IntegerField(default=0)
+    lookbook_count = models.IntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tags'
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['-post_count']),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+class PostTag(models.Model):
+    """
+    Tags of a post.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='post_links')
+    post = models.ForeignKey('social.Post', on_delete=models.CASCADE, related_name='tag_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'post_tags'
+        unique_together = ('post', 'tag')
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+            # Per-hashtag post id index for keyset-paginated hashtag feeds
+            models.Index(fields=['tag', '-post']),
+        ]
+    
+    def __str__(self):
+        return f"Post {self.post_id} tagged {self.tag_id}"
+
+
+class WardrobeItemTag(models.Model):
+    """
+    Tags of a wardrobe item.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='wardrobe_item_links')
+    item = models.ForeignKey('wardrobe.WardrobeItem', on_delete=models.CASCADE, related_name='tag_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'wardrobe_item_tags'
+        unique_together = ('item', 'tag')
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Wardrobe item {self.item_id} tagged {self.tag_id}"
+
+
+class OutfitTag(models.Model):
+    """
+    Style tags of an outfit.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='outfit_links')
+    outfit = models.ForeignKey('outfits.Outfit', on_delete=models.CASCADE, related_name='tag_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'outfit_tags'
+        unique_together = ('outfit', 'tag')
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Outfit {self.outfit_id} tagged {self.tag_id}"
+
+
+class LookbookTag(models.Model):
+    """
+    Tags of a lookbook.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='lookbook_links')
+    lookbook = models.ForeignKey('lookbooks.Lookbook', on_delete=models.CASCADE, related_name='tag_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'lookbook_tags'
+        unique_together = ('lookbook', 'tag')
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Lookbook {self.lookbook_id} tagged {self.tag_id}"
@@ -0,0 +1,14 @@
+"""
+Serializers for tags app.
+"""
+from rest_framework import serializers
+from .models import Tag
+
+
+class TagSerializer(serializers.ModelSerializer):
+    """Serializer for tags and their usage counts."""
+    
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'post_count', 'wardrobe_item_count', 'outfit_count', 'lookbook_count']
+        read_only_fields = fields
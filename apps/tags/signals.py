@@ -0,0 +1,38 @@
+"""
+Signal handlers for tags app.
+"""
+from django.apps import apps
+from django.db.models.signals import post_save, pre_delete, pre_save
+from .sync import TAGGED_MODELS, clear_tags, normalize_tags, sync_tags, tagged_field
+
+
+def normalize_tags_on_save(sender, instance, raw=False, **kwargs):
+    """Store JSON tags lower-cased and de-duplicated, like the Tag rows."""
+    spec = tagged_field(sender)
+    value = getattr(instance, spec.field)
+    if isinstance(value, list):
+        setattr(instance, spec.field, normalize_tags(value))
+
+
+def sync_tags_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Sync tag links when the JSON tags (or the soft-delete flag) may have changed."""
+    if raw:
+        return
+    spec = tagged_field(sender)
+    if update_fields is not None and not {spec.field, 'is_deleted'} & set(update_fields):
+        return
+    sync_tags([instance])
+
+
+def clear_tags_on_delete(sender, instance, **kwargs):
+    """Decrement tag counts before the links are deleted along with the object."""
+    clear_tags([instance])
+
+
+def connect_tag_signals():
+    for label in TAGGED_MODELS:
+        model = apps.get_model(label)
+        uid = label.lower().replace('.', '_')
+        pre_save.connect(normalize_tags_on_save, sender=model, dispatch_uid=f'{uid}_tags_normalize')
+        post_save.connect(sync_tags_on_save, sender=model, dispatch_uid=f'{uid}_tags_sync')
+        pre_delete.connect(clear_tags_on_delete, sender=model, dispatch_uid=f'{uid}_tags_clear')
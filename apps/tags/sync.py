@@ -0,0 +1,204 @@
+"""
+Keep the normalized tag tables in sync with the JSON tag lists.
+
+``sync_tags`` diffs the JSON tags of a batch of objects against their link
+rows and applies the difference with a fixed number of queries per model:
+one read of the current links, one insert of new tags, one insert, one
+re-read and one delete of links, and one counter UPDATE per distinct delta.
+It takes an app registry so migrations can run it against historical models.
+
+Concurrent syncs of the same object never count a link twice: the current
+links are read with a row lock, so removals are serialized, and a link
+insert that lost to a concurrent one is ignored rather than counted.
+
+After links change, ``tags_changed`` is sent with the tagged model as sender
+and ``added`` / ``removed`` lists of ``(object pk, tag id, link created_at)``,
+so per-tag aggregates can be maintained incrementally.
+"""
+from collections import defaultdict, namedtuple
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.dispatch import Signal
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+MAX_TAG_LENGTH = 100
+
+tags_changed = Signal()
+
+# JSON field holding the tags, link model, link foreign key, Tag counter
+TaggedField = namedtuple('TaggedField', ['field', 'link_model', 'link_field', 'counter'])
+
+TAGGED_MODELS = {
+    'social.Post': TaggedField('tags', 'tags.PostTag', 'post', 'post_count'),
+    'wardrobe.WardrobeItem': TaggedField('tags', 'tags.WardrobeItemTag', 'item', 'wardrobe_item_count'),
+    'outfits.Outfit': TaggedField('style_tags', 'tags.OutfitTag', 'outfit', 'outfit_count'),
+    'lookbooks.Lookbook': TaggedField('tags', 'tags.LookbookTag', 'lookbook', 'lookbook_count'),
+}
+
+
+def normalize_tag(value):
+    """Lower-cased tag without a leading '#' and with single spaces, or ''."""
+    tag = ' '.join(str(value).lower().split()).lstrip('#').strip()
+    return tag[:MAX_TAG_LENGTH]
+
+
+def normalize_tags(values):
+    """Normalized, de-duplicated tags of a JSON tag list, in their original order."""
+    if not isinstance(values, (list, tuple)):
+        return []
+    tags = []
+    for value in values:
+        tag = normalize_tag(value) if value is not None else ''
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def tagged_field(model):
+    """The TaggedField for a model class or instance, or None if it isn't tagged."""
+    return TAGGED_MODELS.get(model._meta.label)
+
+
+def _wanted_tags(instance, spec):
+    # Soft-deleted objects don't count towards tags and don't match tag filters
+    if getattr(instance, 'is_deleted', False):
+        return set()
+    return set(normalize_tags(getattr(instance, spec.field)))
+
+
+def sync_tags(instances, apps=global_apps):
+    """Make the link rows and tag counts of ``instances`` match their JSON tags."""
+    by_label = defaultdict(list)
+    for instance in instances:
+        by_label[instance._meta.label].append(instance)
+    with transaction.atomic():
+        for label, group in by_label.items():
+            spec = TAGGED_MODELS[label]
+            _apply(label, {instance.pk: _wanted_tags(instance, spec) for instance in group}, apps)
+
+
+def clear_tags(instances, apps=global_apps):
+    """Remove the links of ``instances`` (about to be deleted) and decrement their tag counts."""
+    by_label = defaultdict(list)
+    for instance in instances:
+        by_label[instance._meta.label].append(instance.pk)
+    with transaction.atomic():
+        for label, pks in by_label.items():
+            _apply(label, {pk: set() for pk in pks}, apps)
+
+
+def _apply(label, wanted, apps):
+    spec = TAGGED_MODELS[label]
+    Tag = apps.get_model('tags', 'Tag')
+    Link = apps.get_model(spec.link_model)
+    fk = f'{spec.link_field}_id'
+
+    current = defaultdict(dict)  # object pk -> {tag name: (link id, tag id, created_at)}
+    links = Link.objects.select_for_update(of=('self',)).filter(**{f'{fk}__in': list(wanted)}).order_by('id')
+    for link_id, pk, tag_id, name, created_at in links.values_list('id', fk, 'tag_id', 'tag__name', 'created_at'):
+        current[pk][name] = (link_id, tag_id, created_at)
+
+    removed = []
+    deltas = defaultdict(int)  # tag id -> count change
+    for pk, names in wanted.items():
+        for name, (link_id, tag_id, created_at) in current[pk].items():
+            if name not in names:
+                removed.append((link_id, pk, tag_id, created_at))
+                deltas[tag_id] -= 1
+
+    added = []
+    new_tags = [(pk, name) for pk, names in wanted.items() for name in names if name not in current[pk]]
+    if new_tags:
+        names = {name for _, name in new_tags}
+        Tag.objects.bulk_create([Tag(name=name) for name in sorted(names)], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        links = Link.objects.bulk_create(
+            [Link(**{fk: pk, 'tag_id': tag_ids[name]}) for pk, name in new_tags],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts returns every object, including links a concurrent sync
+        # inserted first; only the rows stamped with our created_at are ours
+        stamps = {(getattr(link, fk), link.tag_id): link.created_at for link in links}
+        inserted = Link.objects.filter(
+            **{f'{fk}__in': {pk for pk, _ in stamps}}, tag_id__in={tag_id for _, tag_id in stamps}
+        ).values_list(fk, 'tag_id', 'created_at')
+        for pk, tag_id, created_at in inserted:
+            if stamps.get((pk, tag_id)) == created_at:
+                added.append((pk, tag_id, created_at))
+                deltas[tag_id] += 1
+
+    if removed:
+        Link.objects.filter(id__in=[link_id for link_id, _, _, _ in removed]).delete()
+
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        Tag.objects.filter(id__in=tag_ids).update(**{spec.counter: F(spec.counter) + delta})
+
+    if apps is global_apps and (added or removed):
+        tags_changed.send(
+            sender=apps.get_model(label),
+            added=added,
+            removed=[(pk, tag_id, created_at) for _, pk, tag_id, created_at in removed],
+        )
+
+
+def backfill_tags(model, batch_size=1000, apps=global_apps):
+    """
+    Normalize the JSON tags of every ``model`` row and sync its links.
+
+    Walks the table in primary-key order, one batch at a time, and rewrites
+    only the JSON lists that change. Returns the number of rows processed.
+    """
+    spec = tagged_field(model)
+    fields = ['pk', spec.field] + (['is_deleted'] if any(f.name == 'is_deleted' for f in model._meta.fields) else [])
+    processed = 0
+    last_pk = 0
+    while True:
+        batch = list(model._default_manager.filter(pk__gt=last_pk).order_by('pk').only(*fields)[:batch_size])
+        if not batch:
+            return processed
+        changed = []
+        for instance in batch:
+            tags = normalize_tags(getattr(instance, spec.field))
+            if tags != getattr(instance, spec.field):
+                setattr(instance, spec.field, tags)
+                changed.append(instance)
+        with transaction.atomic():
+            model._default_manager.bulk_update(changed, [spec.field])
+            sync_tags(batch, apps=apps)
+        processed += len(batch)
+        last_pk = batch[-1].pk
+
+
+def recount_tags(apps=global_apps):
+    """Recompute every tag counter from the link tables."""
+    Tag = apps.get_model('tags', 'Tag')
+    updates = {}
+    for spec in TAGGED_MODELS.values():
+        Link = apps.get_model(spec.link_model)
+        counts = Link.objects.filter(tag=OuterRef('pk')).values('tag').annotate(n=Count('id')).values('n')
+        updates[spec.counter] = Coalesce(Subquery(counts), Value(0))
+    return Tag.objects.update(**updates)
+
+
+def filter_by_tags(queryset, tags):
+    """
+    Objects of ``queryset`` tagged with every tag in ``tags``.
+
+    Tags are normalized like stored tags; an unknown tag matches nothing.
+    Each tag is one indexed join on the link table.
+    """
+    names = normalize_tags(tags)
+    if not names:
+        return queryset
+    Tag = global_apps.get_model('tags', 'Tag')
+    tag_ids = list(Tag.objects.filter(name__in=names).values_list('id', flat=True))
+    if len(tag_ids) < len(names):
+        return queryset.none()
+    for tag_id in tag_ids:
+        queryset = queryset.filter(tag_links__tag_id=tag_id)
+    return queryset
@@ -0,0 +1 @@
+# Tests for tags app
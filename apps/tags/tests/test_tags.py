@@ -0,0 +1,180 @@
+"""
+Tests for the normalized tag store.
+"""
+from io import StringIO
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.lookbooks.models import Lookbook
+from apps.outfits.models import Outfit
+from apps.social.models import Post
+from apps.tags.models import PostTag, Tag, WardrobeItemTag
+from apps.tags.sync import filter_by_tags, normalize_tags, sync_tags
+from apps.wardrobe.models import Wardrobe, WardrobeItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='tags@example.com',
+        username='tagsuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def wardrobe(user):
+    return Wardrobe.objects.create(user=user)
+
+
+def tag_counts(field):
+    return dict(Tag.objects.values_list('name', field))
+
+
+def test_normalize_tags():
+    assert normalize_tags(['#OOTD', ' Street  Style ', 'ootd', '', None, 42]) == ['ootd', 'street style', '42']
+    assert normalize_tags('not a list') == []
+
+
+@pytest.mark.django_db
+class TestTagSync:
+    """Link rows and counts follow the JSON tag lists."""
+
+    def test_save_normalizes_and_links(self, user):
+        post = Post.objects.create(user=user, caption='Hi', tags=['#Summer', 'SUMMER', 'Beach'])
+
+        post.refresh_from_db()
+        assert post.tags == ['summer', 'beach']
+        assert set(post.tag_links.values_list('tag__name', flat=True)) == {'summer', 'beach'}
+        assert tag_counts('post_count') == {'summer': 1, 'beach': 1}
+
+    def test_update_adds_and_removes_links(self, user):
+        post = Post.objects.create(user=user, caption='Hi', tags=['summer', 'beach'])
+        Post.objects.create(user=user, caption='Hi', tags=['summer'])
+
+        post.tags = ['summer', 'linen']
+        post.save()
+
+        assert tag_counts('post_count') == {'summer': 2, 'beach': 0, 'linen': 1}
+        assert PostTag.objects.count() == 3
+
+    def test_update_fields_without_tags_skips_sync(self, user, django_assert_num_queries):
+        post = Post.objects.create(user=user, caption='Hi', tags=['summer'])
+
+        with django_assert_num_queries(1):
+            post.save(update_fields=['views_count'])
+
+    def test_soft_delete_and_delete_decrement_counts(self, user, wardrobe):
+        item = WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='Tee', color='White', tags=['basic'])
+        other = WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='Tank', color='Black', tags=['basic'])
+        assert tag_counts('wardrobe_item_count') == {'basic': 2}
+
+        item.is_deleted = True
+        item.save(update_fields=['is_deleted'])
+        assert tag_counts('wardrobe_item_count') == {'basic': 1}
+
+        other.delete()
+        assert tag_counts('wardrobe_item_count') == {'basic': 0}
+        assert not WardrobeItemTag.objects.exists()
+
+    def test_sync_tags_batches_objects(self, user):
+        posts = Post.objects.bulk_create([
+            Post(user=user, caption=f'Post {i}', tags=['bulk', f'tag{i}']) for i in range(5)
+        ])
+        assert not PostTag.objects.exists()
+
+        sync_tags(posts)
+
+        assert PostTag.objects.count() == 10
+        assert tag_counts('post_count')['bulk'] == 5
+
+    def test_link_inserted_by_concurrent_sync_is_not_counted_twice(self, user, monkeypatch):
+        post = Post.objects.create(user=user, caption='Hi', tags=[])
+        tag = Tag.objects.create(name='linen')
+        bulk_create = PostTag.objects.bulk_create
+        
+        def concurrent_sync_first(objs, **kwargs):
+            # Another sync of the same post commits its link (and count) first
+            PostTag.objects.create(post=post, tag=tag)
+            Tag.objects.filter(id=tag.id).update(post_count=1)
+            return bulk_create(objs, **kwargs)
+        
+        monkeypatch.setattr(PostTag.objects, 'bulk_create', concurrent_sync_first)
+        post.tags = ['linen']
+        post.save()
+        
+        assert PostTag.objects.filter(post=post).count() == 1
+        assert tag_counts('post_count') == {'linen': 1}
+
+    def test_each_model_has_its_own_counter(self, user):
+        Outfit.objects.create(user=user, title='Look', style_tags=['Minimalist'])
+        Lookbook.objects.create(creator=user, title='Book', tags=['minimalist'])
+
+        tag = Tag.objects.get(name='minimalist')
+        assert (tag.outfit_count, tag.lookbook_count, tag.post_count) == (1, 1, 0)
+
+    def test_sync_tags_command(self, user):
+        Post.objects.bulk_create([Post(user=user, caption='Hi', tags=['Retro'])])
+        Post.objects.create(user=user, caption='Hi', tags=['retro'])
+        Tag.objects.update(post_count=0)
+
+        call_command('sync_tags', '--recount', stdout=StringIO())
+
+        assert Post.objects.filter(tags=['retro']).count() == 2
+        assert tag_counts('post_count') == {'retro': 2}
+
+
+@pytest.mark.django_db
+class TestTagFilters:
+    """Tag-filtered lists go through the link tables."""
+
+    def test_filter_by_tags_requires_all_tags(self, user, wardrobe):
+        both = WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='A', color='Red', tags=['work', 'summer'])
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='B', color='Red', tags=['work'])
+
+        assert list(filter_by_tags(WardrobeItem.objects.all(), ['Work', '#summer'])) == [both]
+        assert not filter_by_tags(WardrobeItem.objects.all(), ['work', 'unknown']).exists()
+
+    def test_wardrobe_list_tag_filter(self, authenticated_client, wardrobe):
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='Linen shirt', color='White', tags=['Summer', 'work'])
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='Wool sweater', color='Gray', tags=['winter'])
+
+        response = authenticated_client.get('/api/v1/wardrobe/items/', {'tags': 'summer, WORK'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['name'] for item in response.data['results']] == ['Linen shirt']
+
+    def test_outfit_list_tag_filter(self, authenticated_client, user):
+        Outfit.objects.create(user=user, title='Boho', style_tags=['boho'], is_public=True)
+        Outfit.objects.create(user=user, title='Street', style_tags=['streetwear'], is_public=True)
+
+        response = authenticated_client.get('/api/v1/outfits/', {'tags': 'Boho'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [outfit['title'] for outfit in response.data['results']] == ['Boho']
+
+    def test_tag_list_by_popularity(self, authenticated_client, user):
+        Post.objects.create(user=user, caption='Hi', tags=['summer', 'sun'])
+        Post.objects.create(user=user, caption='Hi', tags=['summer'])
+        Outfit.objects.create(user=user, title='Look', style_tags=['sunny'])
+
+        response = authenticated_client.get('/api/v1/tags/', {'search': '#SU'})
+        assert [tag['name'] for tag in response.data['results']] == ['summer', 'sun', 'sunny']
+
+        response = authenticated_client.get('/api/v1/tags/', {'type': 'outfit'})
+        assert [tag['name'] for tag in response.data['results']] == ['sunny']
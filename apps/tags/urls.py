@@ -0,0 +1,11 @@
+"""
+URL patterns for tags app.
+"""
+from django.urls import path
+from .views import TagListView
+
+app_name = 'tags'
+
+urlpatterns = [
+    path('', TagListView.as_view(), name='tag-list'),
+]
@@ -0,0 +1,63 @@
+"""
+Views for tags app.
+"""
+from rest_framework import generics, serializers
+from rest_framework.permissions import IsAuthenticated
+from django.db.models import F
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
+from core.serializers import UnauthorizedErrorResponse
+from .models import Tag
+from .serializers import TagSerializer
+from .sync import normalize_tag
+
+# ?type= value -> Tag counter
+TAG_COUNTERS = {
+    'post': 'post_count',
+    'wardrobe_item': 'wardrobe_item_count',
+    'outfit': 'outfit_count',
+    'lookbook': 'lookbook_count',
+}
+
+
+class TagListView(generics.ListAPIView):
+    """
+    List tags by popularity, e.g. for tag autocompletion.
+    """
+    serializer_class = TagSerializer
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="List tags",
+        description="List tags in use, most used first, optionally by name prefix",
+        tags=["Tags"],
+        parameters=[
+            OpenApiParameter(name='search', description='Tag name prefix (case-insensitive, leading # ignored)', required=False, type=str),
+            OpenApiParameter(name='type', description='Only tags used by this type, ordered by its count', required=False, type=str, enum=list(TAG_COUNTERS)),
+            OpenApiParameter(name='page', description='Page number', required=False, type=int),
+        ],
+        responses={
+            200: inline_serializer(
+                name='TagListResponse',
+                fields={
+                    'count': serializers.IntegerField(),
+                    'next': serializers.URLField(allow_null=True),
+                    'previous': serializers.URLField(allow_null=True),
+                    'results': TagSerializer(many=True),
+                }
+            ),
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get_queryset(self):
+        queryset = Tag.objects.all()
+        
+        search = normalize_tag(self.request.query_params.get('search', ''))
+        if search:
+            queryset = queryset.filter(name__startswith=search)
+        
+        counter = TAG_COUNTERS.get(self.request.query_params.get('type'))
+        if counter:
+            return queryset.filter(**{f'{counter}__gt': 0}).order_by(f'-{counter}', 'name')
+        
+        total = F('post_count') + F('wardrobe_item_count') + F('outfit_count') + F('lookbook_count')
+        return queryset.alias(total=total).filter(total__gt=0).order_by('-total', 'name')
@@ -3,10 +3,14 @@ Endpoint testing utility for discovering and testing API endpoints.
 """
 import json
 import logging
+import math
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from django.urls import get_resolver
 from django.conf import settings
+from django.db import connection, connections
 from django.test import Client, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -19,6 +23,65 @@ User = get_user_model()
 # Set up logging to capture debug information
 logger = logging.getLogger(__name__)
 
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper that counts SQL queries.
+    
+    Install with ``connection.execute_wrapper(counter)``; connections are
+    per-thread, so each sweep worker counts only its own queries.
+    """
+    
+    def __init__(self):
+        self.count = 0
+    
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_timings(durations: List[float], query_counts: List[int]) -> Dict:
+    """
+    Build a timing distribution (percentiles + histogram) and SQL query stats
+    from the raw per-request samples of one endpoint.
+    """
+    ordered = sorted(durations)
+    histogram = []
+    remaining = ordered
+    for bucket in LATENCY_BUCKETS_MS:
+        in_bucket = [d for d in remaining if d <= bucket]
+        histogram.append({'le': bucket, 'count': len(in_bucket)})
+        remaining = remaining[len(in_bucket):]
+    histogram.append({'le': None, 'count': len(remaining)})
+    
+    count = len(ordered)
+    return {
+        'count': count,
+        'min_ms': round(ordered[0], 2) if ordered else 0.0,
+        'max_ms': round(ordered[-1], 2) if ordered else 0.0,
+        'mean_ms': round(sum(ordered) / count, 2) if count else 0.0,
+        'p50_ms': round(_percentile(ordered, 50), 2),
+        'p95_ms': round(_percentile(ordered, 95), 2),
+        'p99_ms': round(_percentile(ordered, 99), 2),
+        'histogram': histogram,
+        'queries': {
+            'min': min(query_counts) if query_counts else 0,
+            'max': max(query_counts) if query_counts else 0,
+            'mean': round(sum(query_counts) / len(query_counts), 2) if query_counts else 0.0,
+        },
+    }
+
 
 class EndpointDiscovery:
     """Discover all API endpoints in the application."""
@@ -191,6 +254,15 @@ class EndpointDiscovery:
 class EndpointTester:
     """Test API endpoints with detailed logging."""
     
+    # Sweep limits, so a dashboard request can't spawn unbounded work
+    DEFAULT_CONCURRENCY = 4
+    MAX_CONCURRENCY = 16
+    MAX_REPEAT = 50
+    
+    # Sweep results above these thresholds are flagged in the summary
+    SLOW_P95_MS = 500
+    QUERY_HEAVY_THRESHOLD = 20
+    
     def __init__(self):
         # Use APIClient which bypasses middleware and doesn't require ALLOWED_HOSTS
         # APIClient is a test client that doesn't go through normal HTTP stack
@@ -198,6 +270,7 @@ class EndpointTester:
         self.logs = []
         self.request_log = {}
         self.response_log = {}
+        self.performance = {}
     
     def _replace_url_params(self, path: str) -> str:
         """Replace URL parameters with example values."""
@@ -253,6 +326,7 @@ class EndpointTester:
         self.logs = []
         self.request_log = {}
         self.response_log = {}
+        self.performance = {}
         
         # Clear any previous credentials
         self.client.credentials()
@@ -308,10 +382,9 @@ class EndpointTester:
             # 2. The test client doesn't make real HTTP requests
             # 3. We're using a specific test host, not '*'
             # 4. This only runs in the test dashboard, not in production API calls
-            test_hosts = list(settings.ALLOWED_HOSTS) + ['testserver', 'localhost', '127.0.0.1']
             # Temporarily enable DEBUG to get detailed error messages
             original_debug = settings.DEBUG
-            with override_settings(ALLOWED_HOSTS=test_hosts, SERVER_NAME='testserver', DEBUG=True):
+            with override_settings(ALLOWED_HOSTS=self._test_hosts(), SERVER_NAME='testserver', DEBUG=True):
                 # Make the request using APIClient (test client)
                 method_func = getattr(self.client, method.lower())
                 
@@ -327,15 +400,17 @@ class EndpointTester:
                 if method.upper() in ['POST', 'PUT', 'PATCH'] and data:
                     request_headers['HTTP_CONTENT_TYPE'] = 'application/json'
                 
-                # Make the request
-                if data and method.upper() not in ['GET', 'HEAD']:
-                    response = method_func(actual_path, data, format='json', **request_headers)
-                else:
-                    # For GET/HEAD/DELETE, data goes as query params
-                    if data and method.upper() in ['GET', 'HEAD']:
-                        response = method_func(actual_path, data, format='json', **request_headers)
-                    else:
-                        response = method_func(actual_path, format='json', **request_headers)
+                # Make the request, timing it and counting its SQL queries
+                counter = QueryCounter()
+                started = time.perf_counter()
+                try:
+                    with connection.execute_wrapper(counter):
+                        response = self._send(method_func, method, actual_path, data, request_headers)
+                finally:
+                    self.performance = {
+                        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+                        'query_count': counter.count,
+                    }
             
             # Capture response
             try:
@@ -505,11 +580,168 @@ class EndpointTester:
             'logs': self.logs,
             'stdout': stdout_content,
             'stderr': stderr_content,
+            'performance': self.performance,
             'summary': self._generate_summary(),
         }
         
         return result
     
+    def sweep(
+        self,
+        endpoints: List[Dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        repeat: int = 1,
+        auth_token: Optional[str] = None,
+        user_id: Optional[int] = None,
+        host: str = 'testserver'
+    ) -> Dict:
+        """
+        Exercise many endpoints through a bounded thread pool.
+        
+        Each endpoint is requested ``repeat`` times; every request is timed and
+        its SQL queries counted, and the samples are aggregated per endpoint.
+        
+        Args:
+            endpoints: List of dicts with ``path`` and optional ``method``/``data``
+            concurrency: Number of worker threads (capped at MAX_CONCURRENCY)
+            repeat: Requests per endpoint (capped at MAX_REPEAT)
+            auth_token: JWT token for authentication
+            user_id: User ID to authenticate as (creates token if not provided)
+            host: Host header of the requests; must be in ALLOWED_HOSTS (the
+                dashboard passes its own request's host)
+        
+        Returns:
+            Per-endpoint status counts, timing distributions and a summary
+        """
+        concurrency = max(1, min(int(concurrency), self.MAX_CONCURRENCY))
+        repeat = max(1, min(int(repeat), self.MAX_REPEAT))
+        
+        if not auth_token and user_id:
+            try:
+                user = User.objects.get(id=user_id)
+                auth_token = str(RefreshToken.for_user(user).access_token)
+            except User.DoesNotExist:
+                logger.warning(f'User with ID {user_id} not found, sweeping without authentication')
+        
+        jobs = []
+        for endpoint in endpoints:
+            method = (endpoint.get('method') or 'GET').upper()
+            path = endpoint.get('path', '')
+            if not path:
+                continue
+            actual_path = self._replace_url_params(path)
+            for _ in range(repeat):
+                jobs.append((method, path, actual_path, endpoint.get('data')))
+        
+        samples = {}
+        started = time.perf_counter()
+        # No settings overrides here: they are process-wide and the server keeps
+        # handling other traffic, so requests use an already allowed host instead
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self._sweep_request, method, actual_path, data, auth_token, host)
+                for method, path, actual_path, data in jobs
+            ]
+            for (method, path, actual_path, _), future in zip(jobs, futures):
+                sample = future.result()
+                entry = samples.setdefault((method, path), {
+                    'method': method,
+                    'path': path,
+                    'actual_path': actual_path,
+                    'durations': [],
+                    'query_counts': [],
+                    'status_codes': {},
+                    'errors': [],
+                })
+                entry['durations'].append(sample['duration_ms'])
+                entry['query_counts'].append(sample['query_count'])
+                code = str(sample['status_code'])
+                entry['status_codes'][code] = entry['status_codes'].get(code, 0) + 1
+                if sample.get('error') and len(entry['errors']) < 5:
+                    entry['errors'].append(sample['error'])
+        wall_time_ms = round((time.perf_counter() - started) * 1000, 2)
+        
+        results = []
+        for entry in samples.values():
+            failures = sum(
+                count for code, count in entry['status_codes'].items() if int(code) >= 400
+            )
+            results.append({
+                'method': entry['method'],
+                'path': entry['path'],
+                'actual_path': entry['actual_path'],
+                'status_codes': entry['status_codes'],
+                'failures': failures,
+                'errors': entry['errors'],
+                'timings': summarize_timings(entry['durations'], entry['query_counts']),
+            })
+        results.sort(key=lambda r: r['timings']['p95_ms'], reverse=True)
+        
+        sweep_result = {
+            'success': all(r['failures'] == 0 for r in results),
+            'config': {
+                'concurrency': concurrency,
+                'repeat': repeat,
+                'total_requests': len(jobs),
+            },
+            'wall_time_ms': wall_time_ms,
+            'endpoints': results,
+        }
+        sweep_result['summary'] = self._generate_summary(sweep=sweep_result)
+        return sweep_result
+    
+    def _sweep_request(
+        self,
+        method: str,
+        actual_path: str,
+        data: Optional[Dict],
+        auth_token: Optional[str],
+        host: str
+    ) -> Dict:
+        """Run one timed request on a worker thread with its own client."""
+        client = APIClient(HTTP_HOST=host)
+        if auth_token:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {auth_token}')
+        counter = QueryCounter()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(counter):
+                response = self._send(getattr(client, method.lower()), method, actual_path, data, {})
+            status_code = response.status_code
+            error = None
+        except Exception as e:
+            status_code = 500
+            error = f'{type(e).__name__}: {e}'
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            # Worker threads own their DB connections; don't leak them
+            connections.close_all()
+        return {
+            'status_code': status_code,
+            'duration_ms': duration_ms,
+            'query_count': counter.count,
+            'error': error,
+        }
+    
+    def _send(self, method_func, method: str, actual_path: str, data: Optional[Dict], request_headers: Dict):
+        """Dispatch a request through a test client method."""
+        if data and method.upper() not in ['GET', 'HEAD']:
+            return method_func(actual_path, data, format='json', **request_headers)
+        # For GET/HEAD/DELETE, data goes as query params
+        if data and method.upper() in ['GET', 'HEAD']:
+            return method_func(actual_path, data, format='json', **request_headers)
+        return method_func(actual_path, format='json', **request_headers)
+    
+    def _test_hosts(self) -> List[str]:
+        """
+        Hosts to allow while testing.
+        
+        We use 'testserver' which is Django's default test host. This is safe
+        because the test client doesn't make real HTTP requests and the
+        override only applies inside the dashboard's request context.
+        """
+        return list(settings.ALLOWED_HOSTS) + ['testserver', 'localhost', '127.0.0.1']
+    
     def _log(self, level: str, message: str):
         """Add a log entry."""
         self.logs.append({
@@ -537,12 +769,16 @@ class EndpointTester:
         }
         return status_map.get(status_code, 'Unknown')
     
-    def _generate_summary(self) -> Dict:
+    def _generate_summary(self, sweep: Optional[Dict] = None) -> Dict:
         """Generate a human-readable summary."""
+        if sweep is not None:
+            return self._generate_sweep_summary(sweep)
+        
         summary = {
             'for_frontend': '',
             'for_backend': '',
             'for_layman': '',
+            'for_performance': '',
         }
         
         status_code = self.response_log.get('status_code', 0)
@@ -572,5 +808,65 @@ class EndpointTester:
         else:
             summary['for_layman'] = f'Something went wrong. The server returned an error code {status_code}. This usually means the request was missing some information or there was a problem processing it.'
         
+        # Performance summary
+        if self.performance:
+            summary['for_performance'] = (
+                f'{method} {path} took {self.performance["duration_ms"]} ms '
+                f'and ran {self.performance["query_count"]} SQL queries.'
+            )
+        
+        return summary
+    
+    def _generate_sweep_summary(self, sweep: Dict) -> Dict:
+        """Summarize a concurrent sweep, flagging slow and query-heavy endpoints."""
+        results = sweep.get('endpoints', [])
+        config = sweep.get('config', {})
+        failing = [r for r in results if r['failures']]
+        slow = [r for r in results if r['timings']['p95_ms'] > self.SLOW_P95_MS]
+        query_heavy = [
+            r for r in results if r['timings']['queries']['max'] > self.QUERY_HEAVY_THRESHOLD
+        ]
+        
+        summary = {
+            'for_frontend': '',
+            'for_backend': '',
+            'for_layman': '',
+            'for_performance': '',
+        }
+        
+        if failing:
+            summary['for_frontend'] = f'❌ {len(failing)} of {len(results)} endpoints returned errors during the sweep.'
+        else:
+            summary['for_frontend'] = f'✅ All {len(results)} endpoints responded successfully during the sweep.'
+        
+        backend_lines = [
+            f'{r["method"]} {r["path"]}: statuses {r["status_codes"]}'
+            for r in failing
+        ]
+        summary['for_backend'] = (
+            'Failing endpoints:\n' + '\n'.join(backend_lines) if backend_lines
+            else f'{config.get("total_requests", 0)} requests completed without errors.'
+        )
+        
+        summary['for_layman'] = (
+            f'We called {len(results)} endpoints {config.get("repeat", 1)} time(s) each, '
+            f'{config.get("concurrency", 1)} at a time, in {sweep.get("wall_time_ms", 0)} ms.'
+        )
+        
+        performance_lines = [
+            f'{r["method"]} {r["path"]}: p50 {r["timings"]["p50_ms"]} ms, '
+            f'p95 {r["timings"]["p95_ms"]} ms, max {r["timings"]["queries"]["max"]} queries'
+            for r in results[:5]
+        ]
+        if slow:
+            performance_lines.append(
+                f'⚠️ Slow (p95 > {self.SLOW_P95_MS} ms): ' + ', '.join(r['path'] for r in slow)
+            )
+        if query_heavy:
+            performance_lines.append(
+                f'⚠️ Query-heavy (> {self.QUERY_HEAVY_THRESHOLD} queries): ' + ', '.join(r['path'] for r in query_heavy)
+            )
+        summary['for_performance'] = '\n'.join(performance_lines)
+        
         return summary
 
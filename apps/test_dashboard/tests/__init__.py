@@ -0,0 +1 @@
+# Tests for test dashboard app
@@ -0,0 +1,144 @@
+"""
+Tests for the test dashboard endpoint tester.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from apps.test_dashboard.endpoint_tester import EndpointTester, summarize_timings
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create test user."""
+    return User.objects.create_user(
+        email='sweep@example.com',
+        username='sweepuser',
+        password='testpass123'
+    )
+
+
+class TestSummarizeTimings:
+    """Test timing distribution helper."""
+    
+    def test_percentiles_and_histogram(self):
+        """Test percentiles and histogram buckets from raw samples."""
+        durations = [1.0, 2.0, 3.0, 4.0, 30.0, 40.0, 80.0, 300.0, 900.0, 5000.0]
+        stats = summarize_timings(durations, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        assert stats['count'] == 10
+        assert stats['min_ms'] == 1.0
+        assert stats['max_ms'] == 5000.0
+        assert stats['p50_ms'] == 30.0
+        assert stats['p95_ms'] == 5000.0
+        assert sum(bucket['count'] for bucket in stats['histogram']) == 10
+        assert stats['histogram'][0] == {'le': 5, 'count': 4}
+        assert stats['histogram'][-1] == {'le': None, 'count': 1}
+        assert stats['queries'] == {'min': 1, 'max': 10, 'mean': 5.5}
+    
+    def test_empty_samples(self):
+        """Test that no samples produce zeroed stats."""
+        stats = summarize_timings([], [])
+        assert stats['count'] == 0
+        assert stats['p95_ms'] == 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEndpointSweep:
+    """Test concurrent endpoint sweeps."""
+    
+    def test_single_request_reports_performance(self, user):
+        """Test that a single endpoint test records timing and query count."""
+        result = EndpointTester().test_endpoint('GET', '/api/v1/auth/me/', user_id=user.id)
+        assert result['performance']['duration_ms'] > 0
+        assert result['performance']['query_count'] >= 1
+        assert 'SQL queries' in result['summary']['for_performance']
+    
+    def test_sweep_aggregates_repeats(self, user):
+        """Test that a sweep repeats each endpoint and aggregates samples."""
+        result = EndpointTester().sweep(
+            endpoints=[
+                {'method': 'GET', 'path': '/api/v1/auth/me/'},
+                {'method': 'GET', 'path': '/api/v1/notifications/'},
+            ],
+            concurrency=2,
+            repeat=3,
+            user_id=user.id,
+        )
+        assert result['config'] == {'concurrency': 2, 'repeat': 3, 'total_requests': 6}
+        assert len(result['endpoints']) == 2
+        for endpoint in result['endpoints']:
+            assert endpoint['timings']['count'] == 3
+            assert sum(endpoint['status_codes'].values()) == 3
+        assert 'for_performance' in result['summary']
+    
+    def test_sweep_clamps_concurrency(self):
+        """Test that concurrency and repeat are bounded."""
+        result = EndpointTester().sweep(
+            endpoints=[{'path': '/api/v1/auth/me/'}],
+            concurrency=1000,
+            repeat=0,
+        )
+        assert result['config']['concurrency'] == EndpointTester.MAX_CONCURRENCY
+        assert result['config']['repeat'] == 1
+        assert result['endpoints'][0]['status_codes'] == {'401': 1}
+        assert result['success'] is False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSweepView:
+    """Test access and input checks of the sweep endpoint."""
+    
+    url = '/test-dashboard/api/sweep/'
+    
+    def test_requires_staff(self, client, user):
+        """Test that anonymous and non-staff users are refused."""
+        response = client.post(self.url, {}, content_type='application/json')
+        assert response.status_code == 403
+        client.force_login(user)
+        response = client.post(self.url, {}, content_type='application/json')
+        assert response.status_code == 403
+    
+    def test_staff_can_sweep(self, client, user):
+        """Test that staff users run sweeps against the dashboard's own host."""
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+        client.force_login(user)
+        response = client.post(self.url, {
+            'endpoints': [{'path': '/api/v1/auth/me/'}],
+            'repeat': '2',
+            'user_id': user.id,
+        }, content_type='application/json')
+        assert response.status_code == 200
+        assert response.json()['endpoints'][0]['status_codes'] == {'200': 2}
+    
+    @pytest.mark.parametrize('body', [
+        {'concurrency': 'many'},
+        {'repeat': 2.5},
+        {'repeat': True},
+        {'endpoints': '/api/v1/auth/me/'},
+    ])
+    def test_rejects_invalid_parameters(self, client, user, body):
+        """Test that malformed parameters are a 400, not a 500."""
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+        client.force_login(user)
+        response = client.post(self.url, body, content_type='application/json')
+        assert response.status_code == 400
+        assert 'error' in response.json()
+
+
+@pytest.mark.django_db
+class TestDbPoolView:
+    """Test access to the connection pool statistics."""
+    
+    url = '/test-dashboard/api/db-pool/'
+    
+    def test_requires_staff(self, client, user):
+        """Test that only staff users see pool statistics."""
+        assert client.get(self.url).status_code == 403
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+        client.force_login(user)
+        response = client.get(self.url)
+        assert response.status_code == 200
+        assert 'pools' in response.json()
@@ -9,7 +9,9 @@ from .views import (
     run_single_test,
     get_test_list,
     get_endpoints,
+    get_db_pool_stats,
     test_endpoint,
+    sweep_endpoints,
     create_test_user,
 )
 
@@ -23,6 +25,8 @@ urlpatterns = [
     path('api/tests/', get_test_list, name='test-list'),
     path('api/endpoints/', get_endpoints, name='endpoints'),
     path('api/test-endpoint/', test_endpoint, name='test-endpoint'),
+    path('api/sweep/', sweep_endpoints, name='sweep'),
+    path('api/db-pool/', get_db_pool_stats, name='db-pool'),
     path('api/create-test-user/', create_test_user, name='create-test-user'),
 ]
 
@@ -2,15 +2,39 @@
 Test dashboard views for running and viewing test results.
 """
 import json
+from functools import wraps
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import render
+from core.db.backends.postgresql.base import pool_stats
 from core.test_runner import TestRunner
 from .endpoint_tester import EndpointDiscovery, EndpointTester
 from pathlib import Path
 
 
+def staff_or_debug_required(view):
+    """Only let staff users in, unless DEBUG is on (the dashboard is mounted in production)."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not settings.DEBUG and not (request.user.is_authenticated and request.user.is_staff):
+            return JsonResponse({'error': 'Staff access required'}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _int_param(data, name, default):
+    """``data[name]`` as an int, ``default`` if missing; ValueError if it isn't a whole number."""
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f'{name} must be an integer')
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+
 def test_dashboard(request):
     """Render test dashboard page."""
     runner = TestRunner()
@@ -97,6 +121,13 @@ def get_endpoints(request):
     return JsonResponse({'endpoints': endpoints})
 
 
+@staff_or_debug_required
+@require_http_methods(["GET"])
+def get_db_pool_stats(request):
+    """API endpoint to get connection pool usage and wait statistics for this worker."""
+    return JsonResponse({'pools': pool_stats()})
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def test_endpoint(request):
@@ -131,6 +162,56 @@ def test_endpoint(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@staff_or_debug_required
+@require_http_methods(["POST"])
+def sweep_endpoints(request):
+    """
+    API endpoint to run a concurrent sweep over many API endpoints.
+    
+    Defaults to every discovered GET endpoint; each is requested `repeat`
+    times through a pool of `concurrency` workers. Staff only (or DEBUG),
+    since one call fans out into many requests.
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8') or '{}')
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+        try:
+            concurrency = _int_param(data, 'concurrency', EndpointTester.DEFAULT_CONCURRENCY)
+            repeat = _int_param(data, 'repeat', 1)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        endpoints = data.get('endpoints')
+        if endpoints is not None and not (
+            isinstance(endpoints, list) and all(isinstance(endpoint, dict) for endpoint in endpoints)
+        ):
+            return JsonResponse({'error': 'endpoints must be a list of objects'}, status=400)
+        if not endpoints:
+            discovery = EndpointDiscovery()
+            endpoints = [
+                {'method': 'GET', 'path': ep['path']}
+                for ep in discovery.discover_endpoints()
+                if 'GET' in ep['methods']
+            ]
+        
+        tester = EndpointTester()
+        result = tester.sweep(
+            endpoints=endpoints,
+            concurrency=concurrency,
+            repeat=repeat,
+            auth_token=data.get('auth_token', ''),
+            user_id=data.get('user_id'),
+            host=request.get_host()
+        )
+        
+        return JsonResponse(result)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def create_test_user(request):
@@ -1,9 +1,12 @@
 from django.contrib import admin
-from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemAttribute, WardrobeItemWearLog
+from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemAttribute, WardrobeItemWearLog, WardrobeImportJob
+from .models import WardrobeItemWearRollup, WardrobeWearRollup
 
 admin.site.register(Wardrobe)
 admin.site.register(WardrobeItem)
 admin.site.register(WardrobeItemImage)
 admin.site.register(WardrobeItemAttribute)
 admin.site.register(WardrobeItemWearLog)
-
+admin.site.register(WardrobeImportJob)
+admin.site.register(WardrobeItemWearRollup)
+admin.site.register(WardrobeWearRollup)
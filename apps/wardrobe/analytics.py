@@ -0,0 +1,248 @@
+"""
+Wear-log rollups and wardrobe wear analytics.
+
+Every wear event (``WardrobeItemWearLog``) is counted into daily, weekly
+(Monday-based) and monthly buckets, per item (``WardrobeItemWearRollup``) and
+per wardrobe (``WardrobeWearRollup``). ``record_wear`` updates the buckets
+incrementally when an item is marked as worn; ``rebuild_wear_rollups``
+recomputes them from the logs in batches of wardrobes, for backfills and
+repairs.
+
+The analytics below answer from the rollups with a fixed number of queries,
+however many wear logs a wardrobe has.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+
+PERIODS = ('day', 'week', 'month')
+TRUNCATE = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+SEASON_MONTHS = {
+    'winter': (12, 1, 2),
+    'spring': (3, 4, 5),
+    'summer': (6, 7, 8),
+    'fall': (9, 10, 11),
+}
+
+
+def period_start(day, period):
+    """First day of the day, week (Monday) or month containing ``day``."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period_start(start, period):
+    if period == 'week':
+        return start + timedelta(weeks=1)
+    if period == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def period_starts(start, end, period):
+    """Every period start from the period containing ``start`` up to ``end``."""
+    current = period_start(start, period)
+    starts = []
+    while current <= end:
+        starts.append(current)
+        current = next_period_start(current, period)
+    return starts
+
+
+def _bucket_filter(buckets):
+    condition = Q()
+    for period, start in buckets:
+        condition |= Q(period=period, period_start=start)
+    return condition
+
+
+def record_wear(item, worn_date, count=1):
+    """
+    Add ``count`` wears of ``item`` on ``worn_date`` to its item and wardrobe buckets.
+
+    Locks the wardrobe row first, like ``rebuild_wear_rollups``, so a rebuild
+    never replaces the buckets between this increment and its commit.
+    """
+    from .models import Wardrobe, WardrobeItemWearRollup, WardrobeWearRollup
+
+    buckets = [(period, period_start(worn_date, period)) for period in PERIODS]
+    with transaction.atomic():
+        list(Wardrobe.objects.select_for_update().filter(pk=item.wardrobe_id).values_list('pk', flat=True))
+        WardrobeItemWearRollup.objects.bulk_create([
+            WardrobeItemWearRollup(item_id=item.id, wardrobe_id=item.wardrobe_id, period=period, period_start=start)
+            for period, start in buckets
+        ], ignore_conflicts=True)
+        WardrobeWearRollup.objects.bulk_create([
+            WardrobeWearRollup(wardrobe_id=item.wardrobe_id, period=period, period_start=start)
+            for period, start in buckets
+        ], ignore_conflicts=True)
+        WardrobeItemWearRollup.objects.filter(_bucket_filter(buckets), item_id=item.id).update(
+            wear_count=F('wear_count') + count
+        )
+        WardrobeWearRollup.objects.filter(_bucket_filter(buckets), wardrobe_id=item.wardrobe_id).update(
+            wear_count=F('wear_count') + count
+        )
+
+
+def rebuild_wear_rollups(wardrobe_ids=None, batch_size=500, apps=global_apps):
+    """
+    Recompute the rollups of ``wardrobe_ids`` (default: every wardrobe) from the wear logs.
+
+    Each batch of wardrobes is read and replaced in its own transaction,
+    with the wardrobe rows locked so that wears recorded meanwhile (see
+    ``record_wear``) are either counted from the logs or added afterwards,
+    never lost. Returns the number of wardrobes rebuilt.
+    """
+    Wardrobe = apps.get_model('wardrobe', 'Wardrobe')
+    WearLog = apps.get_model('wardrobe', 'WardrobeItemWearLog')
+    ItemRollup = apps.get_model('wardrobe', 'WardrobeItemWearRollup')
+    WardrobeRollup = apps.get_model('wardrobe', 'WardrobeWearRollup')
+
+    wardrobes = Wardrobe.objects.order_by('pk')
+    if wardrobe_ids is not None:
+        wardrobes = wardrobes.filter(pk__in=wardrobe_ids)
+    rebuilt = 0
+    last_pk = 0
+    while True:
+        batch = list(wardrobes.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return rebuilt
+        with transaction.atomic():
+            list(Wardrobe.objects.select_for_update().filter(pk__in=batch).order_by('pk').values_list('pk', flat=True))
+            item_rows = []
+            wardrobe_totals = defaultdict(int)
+            for period in PERIODS:
+                counts = (
+                    WearLog.objects.filter(item__wardrobe_id__in=batch)
+                    .annotate(start=TRUNCATE[period]('worn_date'))
+                    .values('item_id', 'item__wardrobe_id', 'start')
+                    .annotate(wears=Count('id'))
+                )
+                for row in counts:
+                    item_rows.append(ItemRollup(
+                        item_id=row['item_id'], wardrobe_id=row['item__wardrobe_id'],
+                        period=period, period_start=row['start'], wear_count=row['wears'],
+                    ))
+                    wardrobe_totals[(row['item__wardrobe_id'], period, row['start'])] += row['wears']
+            ItemRollup.objects.filter(wardrobe_id__in=batch).delete()
+            WardrobeRollup.objects.filter(wardrobe_id__in=batch).delete()
+            ItemRollup.objects.bulk_create(item_rows, batch_size=1000)
+            WardrobeRollup.objects.bulk_create([
+                WardrobeRollup(wardrobe_id=wardrobe_id, period=period, period_start=start, wear_count=wears)
+                for (wardrobe_id, period, start), wears in wardrobe_totals.items()
+            ], batch_size=1000)
+        rebuilt += len(batch)
+        last_pk = batch[-1]
+
+
+def wear_frequency(wardrobe, period, start, end, item=None):
+    """
+    Wears per period between ``start`` and ``end``, zero-filled, oldest first.
+
+    Counts the whole wardrobe, or one ``item``.
+    """
+    from .models import WardrobeItemWearRollup, WardrobeWearRollup
+
+    if item is not None:
+        rollups = WardrobeItemWearRollup.objects.filter(item=item)
+    else:
+        rollups = WardrobeWearRollup.objects.filter(wardrobe=wardrobe)
+    counts = dict(
+        rollups.filter(period=period, period_start__gte=period_start(start, period), period_start__lte=end)
+        .values_list('period_start', 'wear_count')
+    )
+    return [
+        {'period_start': bucket, 'wear_count': counts.get(bucket, 0)}
+        for bucket in period_starts(start, end, period)
+    ]
+
+
+def cost_per_wear(wardrobe, start=None, end=None):
+    """
+    Price divided by wears for every priced item, cheapest per wear first.
+
+    Wears are counted from the monthly rollups, optionally limited to the
+    months between ``start`` and ``end``. Items never worn in the range have a
+    ``cost_per_wear`` of None and are listed last.
+    """
+    from .models import WardrobeItem, WardrobeItemWearRollup
+
+    rollups = WardrobeItemWearRollup.objects.filter(item=OuterRef('pk'), period='month')
+    if start:
+        rollups = rollups.filter(period_start__gte=period_start(start, 'month'))
+    if end:
+        rollups = rollups.filter(period_start__lte=end)
+    wears = rollups.values('item').annotate(total=Sum('wear_count')).values('total')
+
+    items = list(
+        WardrobeItem.objects.filter(wardrobe=wardrobe, is_deleted=False, price__isnull=False)
+        .annotate(wears=Coalesce(Subquery(wears), 0))
+        .values('id', 'name', 'category', 'price', 'currency', 'wears')
+    )
+    for item in items:
+        item['cost_per_wear'] = round(item['price'] / item['wears'], 2) if item['wears'] else None
+    items.sort(key=lambda item: (item['cost_per_wear'] is None, item['cost_per_wear'] or 0, item['name']))
+
+    total_spend = sum(item['price'] for item in items)
+    total_wears = sum(item['wears'] for item in items)
+    return {
+        'total_spend': total_spend,
+        'total_wears': total_wears,
+        'average_cost_per_wear': round(total_spend / total_wears, 2) if total_wears else None,
+        'items': items,
+    }
+
+
+def seasonal_utilization(wardrobe, start, end):
+    """
+    Wears and share of the wardrobe worn in each season between ``start`` and ``end``.
+
+    Seasons are meteorological (northern hemisphere); a season's
+    ``utilization`` is the fraction of the wardrobe's current items worn at
+    least once in it.
+    """
+    from .models import WardrobeItem, WardrobeItemWearRollup
+
+    season = Case(
+        *[When(period_start__month__in=months, then=Value(name)) for name, months in SEASON_MONTHS.items()],
+        output_field=CharField(),
+    )
+    rows = (
+        WardrobeItemWearRollup.objects
+        .filter(
+            wardrobe=wardrobe, period='month', item__is_deleted=False,
+            period_start__gte=period_start(start, 'month'), period_start__lte=end,
+        )
+        .annotate(season=season)
+        .values('season')
+        .annotate(wears=Sum('wear_count'), items_worn=Count('item', distinct=True))
+    )
+    by_season = {row['season']: row for row in rows}
+    total_items = WardrobeItem.objects.filter(wardrobe=wardrobe, is_deleted=False).count()
+
+    seasons = []
+    for name in SEASON_MONTHS:
+        row = by_season.get(name, {'wears': 0, 'items_worn': 0})
+        seasons.append({
+            'season': name,
+            'wears': row['wears'],
+            'items_worn': row['items_worn'],
+            'utilization': round(row['items_worn'] / total_items, 3) if total_items else 0.0,
+        })
+    return {'total_items': total_items, 'seasons': seasons}
+
+
+def default_range(period, periods=12, today=None):
+    """(start, end) covering the last ``periods`` periods up to ``today``."""
+    end = today or date.today()
+    start = period_start(end, period)
+    for _ in range(periods - 1):
+        start = period_start(start - timedelta(days=1), period)
+    return start, end
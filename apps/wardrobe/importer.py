@@ -0,0 +1,395 @@
+"""
+Bulk wardrobe import from CSV, JSON or JSON Lines files.
+
+Rows are read one at a time (CSV and JSON Lines are streamed from the upload;
+a JSON array is parsed whole, which the upload size limit keeps bounded),
+validated with WardrobeItemCreateSerializer, and inserted with bulk_create in
+batches together with their attributes. Invalid rows are skipped and reported
+on the job.
+
+Remote ``primary_image_url`` images are fetched afterwards by a background
+worker pool, compressed, and stored as the item's ``primary_image``. Only
+http(s) URLs whose host resolves to public addresses are fetched, and
+redirects are followed by hand so every hop is checked the same way; the
+server must not be usable to reach internal services (e.g. the instance
+metadata endpoint).
+"""
+import codecs
+import csv
+import ipaddress
+import json
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import urljoin, urlsplit
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.tags.sync import normalize_tags, sync_tags
+from core.background import run_in_background
+from core.colors import normalize_color
+from core.utils import compress_image, generate_unique_filename
+from .models import WardrobeImportJob, WardrobeItem, WardrobeItemAttribute
+from .serializers import WardrobeItemCreateSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARDROBE_IMPORT = {
+    'BATCH_SIZE': 500,
+    'MAX_ROWS': 5000,
+    'MAX_FILE_SIZE': 5 * 1024 * 1024,
+    'MAX_REPORTED_ERRORS': 100,
+    'IMAGE_WORKERS': 4,
+    'IMAGE_TIMEOUT': 10,
+    'IMAGE_MAX_REDIRECTS': 3,
+    'STALLED_AFTER': 900,
+}
+
+# CSV columns named "attr:<Key>" become item attributes; tags are ";"-separated.
+ATTRIBUTE_COLUMN_PREFIX = 'attr:'
+TAG_SEPARATOR = ';'
+IMPORT_FIELDS = [
+    field for field in WardrobeItemCreateSerializer.Meta.fields
+    if field not in ('primary_image', 'attributes')
+]
+
+
+class ImportFileError(Exception):
+    """The uploaded file can't be read as the declared format."""
+
+
+def import_config():
+    """WARDROBE_IMPORT settings merged over the defaults."""
+    return {**DEFAULT_WARDROBE_IMPORT, **getattr(settings, 'WARDROBE_IMPORT', {})}
+
+
+def detect_format(file_name, declared=None):
+    """File format from an explicit ``format`` value or the file extension."""
+    if declared:
+        return declared
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension in ('csv', 'json'):
+        return extension
+    return None
+
+
+def _csv_rows(file):
+    reader = csv.DictReader(codecs.iterdecode(file, 'utf-8-sig'))
+    for row in reader:
+        item = {}
+        attributes = []
+        for column, value in row.items():
+            if column is None:
+                continue
+            column = column.strip()
+            value = (value or '').strip()
+            if not value:
+                continue
+            if column.startswith(ATTRIBUTE_COLUMN_PREFIX):
+                attributes.append({'key': column[len(ATTRIBUTE_COLUMN_PREFIX):].strip(), 'value': value})
+            elif column == 'tags':
+                item['tags'] = [tag.strip() for tag in value.split(TAG_SEPARATOR) if tag.strip()]
+            else:
+                item[column] = value
+        if attributes:
+            item['attributes'] = attributes
+        yield item
+
+
+def _jsonl_rows(file):
+    for line in codecs.iterdecode(file, 'utf-8-sig'):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Reported as an invalid row rather than failing the whole file
+            yield None
+
+
+def _json_rows(file):
+    try:
+        rows = json.load(codecs.getreader('utf-8-sig')(file))
+    except ValueError as e:
+        raise ImportFileError(f'Invalid JSON: {str(e)}')
+    if isinstance(rows, dict):
+        rows = rows.get('items')
+    if not isinstance(rows, list):
+        raise ImportFileError('JSON file must contain a list of items (or {"items": [...]})')
+    yield from rows
+
+
+def iter_rows(file, file_format):
+    """Yield raw row dicts (None for unparseable rows) from an uploaded file."""
+    readers = {'csv': _csv_rows, 'json': _json_rows, 'jsonl': _jsonl_rows}
+    try:
+        yield from readers[file_format](file)
+    except UnicodeDecodeError:
+        raise ImportFileError('File must be UTF-8 encoded')
+    except csv.Error as e:
+        raise ImportFileError(f'Invalid CSV: {str(e)}')
+
+
+def _normalize_attributes(attributes):
+    """Accept attributes as a list of {key, value} or a {key: value} mapping."""
+    if isinstance(attributes, dict):
+        return [{'key': key, 'value': value} for key, value in attributes.items()]
+    return attributes
+
+
+def validate_row(row):
+    """Return ``(validated data, None)`` or ``(None, errors)`` for one row."""
+    if not isinstance(row, dict):
+        return None, {'row': ['Expected an object with item fields']}
+    data = {key: value for key, value in row.items() if key in IMPORT_FIELDS or key == 'attributes'}
+    if 'attributes' in data:
+        data['attributes'] = _normalize_attributes(data['attributes'])
+
+    serializer = WardrobeItemCreateSerializer(data=data)
+    if not serializer.is_valid():
+        return None, serializer.errors
+
+    attributes = {}
+    for attribute in serializer.validated_data.get('attributes', []):
+        key = str(attribute.get('key') or '').strip()
+        value = str(attribute.get('value') or '').strip()
+        if not key or len(key) > 100 or len(value) > 200:
+            return None, {'attributes': [f'Invalid attribute {key!r}: key 1-100 and value up to 200 characters']}
+        # unique_together (item, key): the last value for a key wins
+        attributes[key] = value
+    validated = dict(serializer.validated_data)
+    validated['attributes'] = attributes
+    return validated, None
+
+
+def _insert_batch(job, wardrobe, batch):
+    """bulk_create a batch of validated rows and their attributes; return the items."""
+    # bulk_create skips save() and its signals, so derived fields are set here
+    items = [
+        WardrobeItem(
+            wardrobe=wardrobe,
+            import_job=job,
+            color_code=normalize_color(data['color']),
+            **{key: value for key, value in data.items() if key != 'attributes'},
+        )
+        for data in batch
+    ]
+    for item in items:
+        item.tags = normalize_tags(item.tags)
+
+    with transaction.atomic():
+        items = WardrobeItem.objects.bulk_create(items)
+        WardrobeItemAttribute.objects.bulk_create([
+            WardrobeItemAttribute(item=item, key=key, value=value)
+            for item, data in zip(items, batch)
+            for key, value in data['attributes'].items()
+        ])
+        sync_tags(items)
+    return items
+
+
+def run_import(job, wardrobe, file):
+    """
+    Validate and insert every row of ``file`` for ``job``.
+
+    Returns the ids of created items that have a remote primary image.
+    """
+    config = import_config()
+    batch_size = config['BATCH_SIZE']
+    errors = []
+    error_count = 0
+    total = 0
+    imported = 0
+    image_item_ids = []
+    batch = []
+
+    def flush():
+        nonlocal imported
+        items = _insert_batch(job, wardrobe, batch)
+        imported += len(items)
+        image_item_ids.extend(item.id for item in items if item.primary_image_url)
+        batch.clear()
+
+    for row in iter_rows(file, job.file_format):
+        total += 1
+        if total > config['MAX_ROWS']:
+            raise ImportFileError(f"Files are limited to {config['MAX_ROWS']} items")
+        data, row_errors = validate_row(row)
+        if row_errors:
+            error_count += 1
+            if len(errors) < config['MAX_REPORTED_ERRORS']:
+                errors.append({'row': total, 'errors': row_errors})
+            continue
+        batch.append(data)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    job.total_rows = total
+    job.imported_count = imported
+    job.error_count = error_count
+    job.errors = errors
+    job.images_total = len(image_item_ids)
+    if image_item_ids:
+        job.status = 'fetching_images'
+    else:
+        job.status = 'completed'
+        job.completed_at = timezone.now()
+    job.save()
+    return image_item_ids
+
+
+# Background image fetching
+
+_http = requests.Session()
+
+
+def _check_public_url(url):
+    """Raise ValueError unless ``url`` is http(s) and its host only resolves to public addresses."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f'Unsupported image URL {url!r}')
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, ValueError) as e:
+        raise ValueError(f'Cannot resolve image host {parts.hostname!r}: {str(e)}')
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        # Private, loopback, link-local, reserved, shared and unspecified addresses are not global
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f'Image host {parts.hostname!r} resolves to a non-public address')
+
+
+def _open_image_url(url, config):
+    """GET ``url``, following redirects only to URLs that pass the same checks."""
+    for _ in range(config['IMAGE_MAX_REDIRECTS'] + 1):
+        _check_public_url(url)
+        response = _http.get(url, timeout=config['IMAGE_TIMEOUT'], stream=True, allow_redirects=False)
+        if not response.is_redirect:
+            return response
+        response.close()
+        url = urljoin(url, response.headers['Location'])
+    raise ValueError('Too many redirects')
+
+
+def _download_image(url):
+    """Download an image from a public URL, enforcing the upload size and type limits."""
+    config = import_config()
+    max_size = getattr(settings, 'MAX_UPLOAD_SIZE', 10 * 1024 * 1024)
+    allowed_types = getattr(settings, 'ALLOWED_IMAGE_TYPES', ['image/jpeg', 'image/png', 'image/webp'])
+    with _open_image_url(url, config) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in allowed_types:
+            raise ValueError(f'Unsupported image type {content_type!r}')
+        content = BytesIO()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content.write(chunk)
+            if content.tell() > max_size:
+                raise ValueError('Image exceeds the maximum upload size')
+    content.seek(0)
+    return content
+
+
+def fetch_item_image(job_id, item_id):
+    """
+    Fetch, compress and store one item's remote primary image.
+
+    On success the stored copy replaces ``primary_image_url``; on failure the
+    item keeps its URL. Either way the job's counters advance, and the job
+    completes when the last image is done.
+    """
+    try:
+        item = WardrobeItem.objects.only('id', 'primary_image_url').get(id=item_id)
+        content = compress_image(_download_image(item.primary_image_url))
+        item.primary_image.save(
+            generate_unique_filename('image.jpg', prefix=f'import-{item.id}-'),
+            ContentFile(content.read()),
+            save=False
+        )
+        WardrobeItem.objects.filter(id=item.id).update(
+            primary_image=item.primary_image.name,
+            primary_image_url='',
+            updated_at=timezone.now()
+        )
+        counter = 'images_fetched'
+    except Exception as e:
+        logger.warning(f'Failed to fetch image for wardrobe item {item_id}: {str(e)}')
+        counter = 'images_failed'
+
+    # updated_at doubles as the heartbeat requeue_stalled_imports() checks
+    WardrobeImportJob.objects.filter(id=job_id).update(**{counter: F(counter) + 1, 'updated_at': timezone.now()})
+    WardrobeImportJob.objects.filter(
+        id=job_id,
+        status='fetching_images',
+        images_total__lte=F('images_fetched') + F('images_failed'),
+    ).update(status='completed', completed_at=timezone.now())
+
+
+def _fetch_in_worker(job_id, item_id):
+    """Worker-thread entry point: use, then release, the thread's DB connection."""
+    close_old_connections()
+    try:
+        fetch_item_image(job_id, item_id)
+    finally:
+        close_old_connections()
+
+
+def fetch_job_images(job_id, item_ids):
+    """Fetch images for ``item_ids``, ``IMAGE_WORKERS`` at a time, and wait for them (Celery task body)."""
+    workers = import_config()['IMAGE_WORKERS']
+    if workers <= 1:
+        for item_id in item_ids:
+            fetch_item_image(job_id, item_id)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda item_id: _fetch_in_worker(job_id, item_id), item_ids))
+
+
+def schedule_image_fetch(job, item_ids):
+    """Queue background image fetches once the import transaction commits."""
+    if not item_ids:
+        return
+    from .tasks import fetch_import_images
+    run_in_background(fetch_import_images, job.id, item_ids)
+
+
+def requeue_stalled_imports():
+    """
+    Fetch the images of ``fetching_images`` jobs again after ``STALLED_AFTER`` seconds without progress.
+
+    Fetches queued to a worker that died are lost, and their job would never
+    complete. Its items that still have a ``primary_image_url`` (including
+    ones that failed before) are fetched again, so ``images_failed`` starts
+    over. Returns the number of jobs requeued.
+    """
+    cutoff = timezone.now() - timedelta(seconds=import_config()['STALLED_AFTER'])
+    requeued = 0
+    for job in WardrobeImportJob.objects.filter(status='fetching_images', updated_at__lt=cutoff):
+        item_ids = list(
+            job.items.filter(is_deleted=False).exclude(primary_image_url='').values_list('id', flat=True)
+        )
+        now = timezone.now()
+        done = {} if item_ids else {'status': 'completed', 'completed_at': now}
+        with transaction.atomic():
+            # Skip jobs a worker made progress on in the meantime
+            if not WardrobeImportJob.objects.filter(id=job.id, status='fetching_images', updated_at__lt=cutoff).update(
+                images_total=F('images_fetched') + len(item_ids), images_failed=0, updated_at=now, **done
+            ):
+                continue
+            schedule_image_fetch(job, item_ids)
+        logger.info(f'Requeued {len(item_ids)} image fetches of stalled wardrobe import {job.id}')
+        requeued += 1
+    return requeued
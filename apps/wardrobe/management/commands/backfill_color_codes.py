@@ -0,0 +1,52 @@
+"""
+Management command to (re)compute canonical color codes.
+
+Sets ``color_code`` on wardrobe and outfit items from their free-text color,
+in primary-key batches. Run it after changing the palette or synonyms in
+core.colors; migrations backfill existing rows once when the column is added.
+"""
+import logging
+from django.core.management.base import BaseCommand
+from core.colors import backfill_color_codes, dominant_image_color
+from apps.outfits.models import OutfitItem
+from apps.wardrobe.models import WardrobeItem
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Backfill canonical color codes on wardrobe and outfit items'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and updated per batch'
+        )
+        parser.add_argument(
+            '--from-images',
+            action='store_true',
+            help='For wardrobe items whose color text is not recognized, use the dominant color of the stored image'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, image_flag in ((WardrobeItem, 'color_code_from_image'), (OutfitItem, None)):
+            updated = backfill_color_codes(model.objects.all(), batch_size=batch_size, image_flag=image_flag)
+            self.stdout.write(self.style.SUCCESS(f'Updated {updated} {model._meta.verbose_name_plural}'))
+
+        if options['from_images']:
+            updated = 0
+            unresolved = WardrobeItem.objects.filter(color_code='').exclude(primary_image='').exclude(primary_image=None)
+            for item in unresolved.only('id', 'primary_image').iterator(chunk_size=batch_size):
+                try:
+                    with item.primary_image.open('rb') as image:
+                        code = dominant_image_color(image)
+                except Exception as e:
+                    logger.warning(f'Could not read image for wardrobe item {item.id}: {str(e)}')
+                    continue
+                updated += WardrobeItem.objects.filter(id=item.id, color_code='').update(
+                    color_code=code, color_code_from_image=True
+                )
+            self.stdout.write(self.style.SUCCESS(f'Set {updated} wardrobe item colors from images'))
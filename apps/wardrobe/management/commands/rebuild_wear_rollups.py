@@ -0,0 +1,32 @@
+"""
+Management command to rebuild the wear rollups from the wear logs.
+
+The daily, weekly and monthly rollups are updated incrementally as items are
+marked worn; run this after importing or editing wear logs directly, or to
+repair drift. A nightly Celery task does the same.
+"""
+from django.core.management.base import BaseCommand
+from apps.wardrobe.analytics import rebuild_wear_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-item and per-wardrobe wear rollups from the wear logs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Wardrobes rebuilt per transaction'
+        )
+        parser.add_argument(
+            '--wardrobe',
+            type=int,
+            action='append',
+            dest='wardrobe_ids',
+            help='Only rebuild this wardrobe id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_wear_rollups(wardrobe_ids=options['wardrobe_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt wear rollups for {rebuilt} wardrobes'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0002_wardrobeitem_primary_image_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WardrobeImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('importing', 'Importing'), ('fetching_images', 'Fetching Images'), ('completed', 'Completed'), ('failed', 'Failed')], default='importing', max_length=20)),
+                ('file_format', models.CharField(choices=[('csv', 'CSV'), ('json', 'JSON'), ('jsonl', 'JSON Lines')], max_length=10)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('total_rows', models.IntegerField(default=0)),
+                ('imported_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(default=list, help_text='First row errors, as {row, errors} objects')),
+                ('images_total', models.IntegerField(default=0)),
+                ('images_fetched', models.IntegerField(default=0)),
+                ('images_failed', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wardrobe_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'wardrobe_import_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='wardrobe_im_user_id_7a6c46_idx')],
+            },
+        ),
+    ]
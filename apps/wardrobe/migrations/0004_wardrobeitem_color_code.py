@@ -0,0 +1,28 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:28
+
+from django.db import migrations, models
+
+
+def backfill_color_codes(apps, schema_editor):
+    from core.colors import backfill_color_codes
+    backfill_color_codes(apps.get_model('wardrobe', 'WardrobeItem').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0003_wardrobeimportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wardrobeitem',
+            name='color_code',
+            field=models.CharField(blank=True, help_text='Canonical palette color (see core.colors), derived from color', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='wardrobeitem',
+            index=models.Index(fields=['wardrobe', 'color_code'], name='wardrobe_it_wardrob_59c2cf_idx'),
+        ),
+        migrations.RunPython(backfill_color_codes, migrations.RunPython.noop),
+    ]
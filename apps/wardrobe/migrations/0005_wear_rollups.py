@@ -0,0 +1,50 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def rebuild_wear_rollups(apps, schema_editor):
+    from apps.wardrobe.analytics import rebuild_wear_rollups
+    rebuild_wear_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0004_wardrobeitem_color_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WardrobeItemWearRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('wear_count', models.IntegerField(default=0)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wear_rollups', to='wardrobe.wardrobeitem')),
+                ('wardrobe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_wear_rollups', to='wardrobe.wardrobe')),
+            ],
+            options={
+                'db_table': 'wardrobe_item_wear_rollups',
+                'indexes': [models.Index(fields=['wardrobe', 'period', 'period_start'], name='wardrobe_it_wardrob_09197a_idx')],
+                'unique_together': {('item', 'period', 'period_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WardrobeWearRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('wear_count', models.IntegerField(default=0)),
+                ('wardrobe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wear_rollups', to='wardrobe.wardrobe')),
+            ],
+            options={
+                'db_table': 'wardrobe_wear_rollups',
+                'unique_together': {('wardrobe', 'period', 'period_start')},
+            },
+        ),
+        migrations.RunPython(rebuild_wear_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # Rows deleted before deleted_at existed start their grace period from their last update
+    WardrobeItem = apps.get_model('wardrobe', 'WardrobeItem')
+    WardrobeItem.objects.filter(is_deleted=True, deleted_at__isnull=True).update(deleted_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0005_wear_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='wardrobeitem',
+            name='wardrobe_it_wardrob_fa3817_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='wardrobeitem',
+            name='wardrobe_it_wardrob_5f46e8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='wardrobeitem',
+            name='wardrobe_it_is_dele_ce702e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='wardrobeitem',
+            name='wardrobe_it_wardrob_59c2cf_idx',
+        ),
+        migrations.AddField(
+            model_name='wardrobeitem',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='wardrobeitem',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['wardrobe', 'category'], name='wardrobe_items_live_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wardrobeitem',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['wardrobe', '-created_at'], name='wardrobe_items_live_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wardrobeitem',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['wardrobe', 'color_code'], name='wardrobe_items_live_color_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wardrobeitem',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='wardrobe_items_purge_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0006_soft_delete_purge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wardrobeitem',
+            name='import_job',
+            field=models.ForeignKey(blank=True, help_text='Import job that created the item', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='items', to='wardrobe.wardrobeimportjob'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-19 06:59
+
+from django.db import migrations, models
+
+
+def flag_image_color_codes(apps, schema_editor):
+    """
+    Codes of unrecognized colors came from the image (backfill_color_codes
+    --from-images) or are left over from an earlier color: flag the first,
+    clear the rest.
+    """
+    from core.colors import normalize_color
+    WardrobeItem = apps.get_model('wardrobe', 'WardrobeItem')
+    from_image, stale = [], []
+    items = WardrobeItem.objects.exclude(color_code='').only('pk', 'color', 'primary_image')
+    for item in items.iterator(chunk_size=1000):
+        if not normalize_color(item.color):
+            (from_image if item.primary_image else stale).append(item.pk)
+    WardrobeItem.objects.filter(pk__in=from_image).update(color_code_from_image=True)
+    WardrobeItem.objects.filter(pk__in=stale).update(color_code='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0007_wardrobeitem_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wardrobeitem',
+            name='color_code_from_image',
+            field=models.BooleanField(default=False, help_text='color_code was taken from the image because color is not a known color'),
+        ),
+        migrations.RunPython(flag_image_color_codes, migrations.RunPython.noop),
+    ]
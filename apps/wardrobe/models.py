@@ -2,7 +2,9 @@
 Wardrobe models for CuratorAI.
 """
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from core.colors import normalize_color
 
 
 class Wardrobe(models.Model):
@@ -53,6 +55,10 @@ class WardrobeItem(models.Model):
     name = models.CharField(max_length=200)
     brand = models.CharField(max_length=100, blank=True)
     color = models.CharField(max_length=50)
+    color_code = models.CharField(max_length=20, blank=True, help_text='Canonical palette color (see core.colors), derived from color')
+    color_code_from_image = models.BooleanField(
+        default=False, help_text='color_code was taken from the image because color is not a known color'
+    )
     size = models.CharField(max_length=20, blank=True)
     
     # Price Information
@@ -62,6 +68,10 @@ class WardrobeItem(models.Model):
     # Images
     primary_image = models.ImageField(upload_to='wardrobe/items/', null=True, blank=True)
     primary_image_url = models.URLField(blank=True, help_text='External image URL (used when primary_image is not available)')
+    import_job = models.ForeignKey(
+        'WardrobeImportJob', on_delete=models.SET_NULL, null=True, blank=True, related_name='items',
+        help_text='Import job that created the item'
+    )
     
     # Additional Details
     season = models.CharField(max_length=20, choices=SEASON_CHOICES, default='all')
@@ -76,8 +86,9 @@ class WardrobeItem(models.Model):
     times_worn = models.IntegerField(default=0)
     last_worn_date = models.DateField(null=True, blank=True)
     
-    # Soft Delete
+    # Soft Delete (hard-deleted after a grace period, see core.purge)
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -87,13 +98,26 @@ class WardrobeItem(models.Model):
         db_table = 'wardrobe_items'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['wardrobe', 'category']),
-            models.Index(fields=['wardrobe', '-created_at']),
-            models.Index(fields=['is_deleted']),
+            # Wardrobe queries only read live items: partial indexes leave deleted rows out
+            models.Index(fields=['wardrobe', 'category'], name='wardrobe_items_live_cat_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['wardrobe', '-created_at'], name='wardrobe_items_live_recent_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['wardrobe', 'color_code'], name='wardrobe_items_live_color_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['deleted_at'], name='wardrobe_items_purge_idx', condition=Q(is_deleted=True)),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.category})"
+    
+    def save(self, *args, **kwargs):
+        # The text wins when it is a known color; otherwise only an image-derived code is kept
+        code = normalize_color(self.color)
+        if code or not self.color_code_from_image:
+            self.color_code = code
+            self.color_code_from_image = False
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'color' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'color_code', 'color_code_from_image'}
+        super().save(*args, **kwargs)
 
 
 class WardrobeItemImage(models.Model):
@@ -149,3 +173,102 @@ class WardrobeItemWearLog(models.Model):
     def __str__(self):
         return f"{self.item.name} worn on {self.worn_date}"
 
+
+class WardrobeItemWearRollup(models.Model):
+    """
+    Number of times an item was worn per day, week (starting Monday) or month.
+    
+    Maintained incrementally when items are marked as worn and rebuilt from
+    the wear logs by apps.wardrobe.analytics.rebuild_wear_rollups.
+    """
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+    
+    item = models.ForeignKey(WardrobeItem, on_delete=models.CASCADE, related_name='wear_rollups')
+    wardrobe = models.ForeignKey(Wardrobe, on_delete=models.CASCADE, related_name='item_wear_rollups')
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    wear_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'wardrobe_item_wear_rollups'
+        unique_together = ('item', 'period', 'period_start')
+        indexes = [
+            models.Index(fields=['wardrobe', 'period', 'period_start']),
+        ]
+    
+    def __str__(self):
+        return f"Item {self.item_id} worn {self.wear_count}x in {self.period} of {self.period_start}"
+
+
+class WardrobeWearRollup(models.Model):
+    """
+    Number of item wears in a wardrobe per day, week (starting Monday) or month.
+    """
+    wardrobe = models.ForeignKey(Wardrobe, on_delete=models.CASCADE, related_name='wear_rollups')
+    period = models.CharField(max_length=5, choices=WardrobeItemWearRollup.PERIOD_CHOICES)
+    period_start = models.DateField()
+    wear_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'wardrobe_wear_rollups'
+        unique_together = ('wardrobe', 'period', 'period_start')
+    
+    def __str__(self):
+        return f"Wardrobe {self.wardrobe_id}: {self.wear_count} wears in {self.period} of {self.period_start}"
+
+
+class WardrobeImportJob(models.Model):
+    """
+    Bulk import of wardrobe items from a CSV/JSON file.
+
+    Rows are validated and inserted while the upload request is handled;
+    remote primary images are then fetched in the background, and clients
+    poll the job for progress.
+    """
+    STATUS_CHOICES = [
+        ('importing', 'Importing'),
+        ('fetching_images', 'Fetching Images'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='wardrobe_imports')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='importing')
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file_name = models.CharField(max_length=255, blank=True)
+    
+    # Row progress
+    total_rows = models.IntegerField(default=0)
+    imported_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, help_text='First row errors, as {row, errors} objects')
+    
+    # Image progress
+    images_total = models.IntegerField(default=0)
+    images_fetched = models.IntegerField(default=0)
+    images_failed = models.IntegerField(default=0)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'wardrobe_import_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Wardrobe import {self.id} for {self.user.username} ({self.status})"
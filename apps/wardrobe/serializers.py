@@ -2,7 +2,8 @@
 Serializers for wardrobe app.
 """
 from rest_framework import serializers
-from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemAttribute, WardrobeItemWearLog
+from core.nested import NestedChildren, create_nested
+from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemAttribute, WardrobeItemWearLog, WardrobeImportJob
 
 
 class WardrobeItemAttributeSerializer(serializers.ModelSerializer):
@@ -52,6 +53,20 @@ class WardrobeItemSerializer(serializers.ModelSerializer):
         return None
 
 
+class WardrobeItemSummarySerializer(WardrobeItemSerializer):
+    """Compact wardrobe item, without nested images and attributes."""
+    
+    class Meta(WardrobeItemSerializer.Meta):
+        fields = ['id', 'category', 'name', 'brand', 'color', 'primary_image', 'season', 'tags', 'last_worn_date']
+
+
+class OutfitSuggestionSerializer(serializers.Serializer):
+    """Serializer for a generated outfit suggestion."""
+    score = serializers.FloatField()
+    items = WardrobeItemSummarySerializer(many=True)
+    breakdown = serializers.DictField(child=serializers.FloatField())
+
+
 class WardrobeItemCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating wardrobe items."""
     attributes = serializers.ListField(
@@ -97,17 +112,13 @@ class WardrobeItemCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         attributes_data = validated_data.pop('attributes', [])
-        item = WardrobeItem.objects.create(**validated_data)
-        
-        # Create attributes
-        for attr_data in attributes_data:
-            WardrobeItemAttribute.objects.create(
-                item=item,
-                key=attr_data.get('key'),
-                value=attr_data.get('value')
-            )
-        
-        return item
+        # unique_together (item, key): the last value for a key wins
+        attributes = {attr_data.get('key'): attr_data.get('value') for attr_data in attributes_data}
+        return create_nested(WardrobeItem, validated_data, [
+            NestedChildren('attributes', WardrobeItemAttribute, 'item', [
+                {'key': key, 'value': value} for key, value in attributes.items()
+            ]),
+        ])
 
 
 class WardrobeSerializer(serializers.ModelSerializer):
@@ -141,3 +152,17 @@ class WardrobeItemWearLogSerializer(serializers.ModelSerializer):
         fields = ['id', 'worn_date', 'outfit_id', 'notes', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+
+
+class WardrobeImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for bulk import job status."""
+    
+    class Meta:
+        model = WardrobeImportJob
+        fields = [
+            'id', 'status', 'file_format', 'file_name',
+            'total_rows', 'imported_count', 'error_count', 'errors',
+            'images_total', 'images_fetched', 'images_failed',
+            'created_at', 'updated_at', 'completed_at'
+        ]
+        read_only_fields = fields
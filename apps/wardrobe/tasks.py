@@ -0,0 +1,32 @@
+"""
+Celery tasks for wardrobe app.
+"""
+from celery import shared_task
+from core.purge import purge_soft_deleted
+from .analytics import rebuild_wear_rollups as rebuild_rollups
+from .importer import fetch_job_images, requeue_stalled_imports as requeue_imports
+from .models import WardrobeItem
+
+
+@shared_task(ignore_result=True)
+def fetch_import_images(job_id, item_ids):
+    """Fetch remote primary images for items created by an import job."""
+    fetch_job_images(job_id, item_ids)
+
+
+@shared_task(ignore_result=True)
+def requeue_stalled_imports():
+    """Fetch the images of import jobs whose fetches were lost again."""
+    requeue_imports()
+
+
+@shared_task(ignore_result=True)
+def rebuild_wear_rollups():
+    """Recompute every wardrobe's wear rollups from the wear logs."""
+    rebuild_rollups()
+
+
+@shared_task(ignore_result=True)
+def purge_deleted_wardrobe_items():
+    """Hard-delete wardrobe items soft-deleted longer than the grace period."""
+    purge_soft_deleted(WardrobeItem)
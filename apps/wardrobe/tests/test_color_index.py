@@ -0,0 +1,150 @@
+"""
+Tests for the canonical color index.
+"""
+from io import StringIO
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.colors import color_filter_codes, normalize_color, similar_colors
+from apps.outfits.models import Outfit, OutfitItem
+from apps.wardrobe.models import Wardrobe, WardrobeItem
+
+User = get_user_model()
+
+ITEMS_URL = '/api/v1/wardrobe/items/'
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='colors@example.com',
+        username='colorsuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def wardrobe(user):
+    wardrobe = Wardrobe.objects.create(user=user)
+    for name, color in [
+        ('Blazer', 'Navy'),
+        ('Chinos', 'dark blue'),
+        ('Sweater', 'Burgundy'),
+        ('Tee', 'Red'),
+        ('Scarf', 'Chartreuse-ish'),
+    ]:
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name=name, color=color)
+    return wardrobe
+
+
+@pytest.mark.parametrize('text, code', [
+    ('Navy', 'navy'),
+    ('dark blue', 'navy'),
+    ('Light Heather Grey', 'gray'),
+    ('black/white', 'black'),
+    ('Off-White', 'cream'),
+    ('#c81e28', 'red'),
+    ('Chartreuse-ish', ''),
+])
+def test_normalize_color(text, code):
+    assert normalize_color(text) == code
+
+
+def test_similar_colors_are_closest_first():
+    assert similar_colors('red', 30) == ['red', 'burgundy']
+    assert similar_colors('navy', 0) == ['navy']
+
+
+def test_color_filter_always_matches_the_exact_color():
+    assert color_filter_codes('navy', float('nan')) == ['navy']
+    assert color_filter_codes('navy', -5) == ['navy']
+    assert color_filter_codes('red', 30) == ['red', 'burgundy']
+
+
+@pytest.mark.django_db
+class TestColorFilter:
+    """Test color filtering through the index."""
+    
+    def names(self, response):
+        return {item['name'] for item in response.data['results']}
+    
+    def test_items_get_color_codes_on_save(self, wardrobe):
+        assert dict(WardrobeItem.objects.values_list('name', 'color_code')) == {
+            'Blazer': 'navy', 'Chinos': 'navy', 'Sweater': 'burgundy', 'Tee': 'red', 'Scarf': '',
+        }
+    
+    def test_unknown_color_clears_code_from_old_text(self, user, wardrobe):
+        tee = WardrobeItem.objects.get(name='Tee')
+        tee.color = 'Sunset'
+        tee.save(update_fields=['color'])
+        tee.refresh_from_db()
+        assert tee.color_code == ''
+        
+        outfit = Outfit.objects.create(user=user, title='Beach', occasion='casual', season='summer')
+        item = OutfitItem.objects.create(outfit=outfit, item_type='top', name='Shirt', color='Red')
+        item.color = 'Sunset'
+        item.save()
+        item.refresh_from_db()
+        assert item.color_code == ''
+    
+    def test_image_color_code_kept_until_text_is_known(self, wardrobe):
+        scarf = WardrobeItem.objects.get(name='Scarf')
+        WardrobeItem.objects.filter(id=scarf.id).update(color_code='olive', color_code_from_image=True)
+        scarf.refresh_from_db()
+        scarf.color = 'Mossy'
+        scarf.save()
+        scarf.refresh_from_db()
+        assert (scarf.color_code, scarf.color_code_from_image) == ('olive', True)
+        
+        scarf.color = 'Navy'
+        scarf.save(update_fields=['color'])
+        scarf.refresh_from_db()
+        assert (scarf.color_code, scarf.color_code_from_image) == ('navy', False)
+    
+    def test_synonyms_match_exactly(self, authenticated_client, wardrobe):
+        response = authenticated_client.get(ITEMS_URL, {'color': 'navy blue'})
+        assert self.names(response) == {'Blazer', 'Chinos'}
+    
+    def test_similar_colors_within_delta_e(self, authenticated_client, wardrobe):
+        assert self.names(authenticated_client.get(ITEMS_URL, {'color': 'red'})) == {'Tee'}
+        response = authenticated_client.get(ITEMS_URL, {'color': 'red', 'color_distance': 30})
+        assert self.names(response) == {'Tee', 'Sweater'}
+    
+    @pytest.mark.parametrize('distance', ['-5', 'nan', 'inf', 'far'])
+    def test_invalid_color_distance_is_rejected(self, authenticated_client, wardrobe, distance):
+        response = authenticated_client.get(ITEMS_URL, {'color': 'navy', 'color_distance': distance})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_unknown_color_falls_back_to_text(self, authenticated_client, wardrobe):
+        assert self.names(authenticated_client.get(ITEMS_URL, {'color': 'chartreuse'})) == {'Scarf'}
+    
+    def test_outfits_filter_by_item_color(self, user):
+        outfit = Outfit.objects.create(user=user, title='Date night', occasion='party', season='fall')
+        OutfitItem.objects.create(outfit=outfit, item_type='dress', name='Slip Dress', color='Wine')
+        Outfit.objects.create(user=user, title='Empty', occasion='casual', season='fall')
+        
+        response = APIClient().get('/api/v1/outfits/', {'color': 'burgundy'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['title'] for result in response.data['results']] == ['Date night']
+    
+    def test_backfill_command(self, wardrobe):
+        WardrobeItem.objects.update(color_code='')
+        WardrobeItem.objects.filter(name='Scarf').update(color_code='olive', color_code_from_image=True)
+        WardrobeItem.objects.filter(name='Tee').update(color='Sunset', color_code='red')
+        call_command('backfill_color_codes', batch_size=2, stdout=StringIO())
+        assert dict(WardrobeItem.objects.values_list('name', 'color_code')) == {
+            'Blazer': 'navy', 'Chinos': 'navy', 'Sweater': 'burgundy', 'Tee': '', 'Scarf': 'olive',
+        }
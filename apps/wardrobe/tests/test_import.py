@@ -0,0 +1,244 @@
+"""
+Tests for bulk wardrobe import.
+"""
+import json
+import socket
+from datetime import timedelta
+from io import BytesIO
+import pytest
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.wardrobe import importer
+from apps.wardrobe.models import Wardrobe, WardrobeImportJob, WardrobeItem
+
+User = get_user_model()
+
+IMPORT_URL = '/api/v1/wardrobe/items/import/'
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='closet@example.com',
+        username='closetuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+def upload(name, content):
+    return SimpleUploadedFile(name, content.encode('utf-8'))
+
+
+@pytest.mark.django_db
+class TestWardrobeImport:
+    """Test CSV/JSON import of wardrobe items."""
+    
+    def test_csv_import_with_attributes_and_row_errors(self, authenticated_client, user, settings):
+        settings.WARDROBE_IMPORT = {'BATCH_SIZE': 2}
+        content = (
+            'name,category,color,brand,tags,attr:Material,attr:Fit\n'
+            'White Tee,top,white,Uniqlo,basics;summer,Cotton,Regular\n'
+            'Black Jeans,bottom,black,,denim,,Slim\n'
+            'Mystery,not-a-category,red,,,,\n'
+            'Loafers,shoes,brown,,,Leather,\n'
+        )
+        response = authenticated_client.post(IMPORT_URL, {'file': upload('items.csv', content)}, format='multipart')
+        
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.data['data']
+        assert job['status'] == 'completed'
+        assert (job['total_rows'], job['imported_count'], job['error_count']) == (4, 3, 1)
+        assert job['errors'][0]['row'] == 3
+        assert 'category' in job['errors'][0]['errors']
+        
+        items = {item.name: item for item in WardrobeItem.objects.filter(wardrobe__user=user)}
+        assert set(items) == {'White Tee', 'Black Jeans', 'Loafers'}
+        assert items['White Tee'].tags == ['basics', 'summer']
+        assert items['White Tee'].season == 'all'
+        assert dict(items['White Tee'].attributes.values_list('key', 'value')) == {'Material': 'Cotton', 'Fit': 'Regular'}
+        assert dict(items['Black Jeans'].attributes.values_list('key', 'value')) == {'Fit': 'Slim'}
+    
+    def test_jsonl_import_reports_unparseable_lines(self, authenticated_client, user):
+        lines = [
+            json.dumps({'name': 'Trench', 'category': 'outerwear', 'color': 'beige',
+                        'attributes': {'Material': 'Gabardine'}}),
+            '{not json',
+            '',
+            json.dumps({'name': 'Scarf', 'category': 'accessory', 'color': 'red', 'price': '19.99'}),
+        ]
+        response = authenticated_client.post(
+            IMPORT_URL, {'file': upload('items.jsonl', '\n'.join(lines))}, format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert (response.data['data']['imported_count'], response.data['data']['error_count']) == (2, 1)
+        trench = WardrobeItem.objects.get(name='Trench')
+        assert trench.attributes.get().value == 'Gabardine'
+    
+    def test_too_many_rows_fails_without_partial_import(self, authenticated_client, user, settings):
+        settings.WARDROBE_IMPORT = {'MAX_ROWS': 2, 'BATCH_SIZE': 1}
+        rows = [{'name': f'Item {i}', 'category': 'top', 'color': 'blue'} for i in range(3)]
+        response = authenticated_client.post(
+            IMPORT_URL, {'file': upload('items.json', json.dumps(rows))}, format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['data']['status'] == 'failed'
+        assert not WardrobeItem.objects.filter(wardrobe__user=user).exists()
+    
+    def test_unexpected_error_fails_the_job(self, authenticated_client, user, monkeypatch):
+        def broken(job, wardrobe, rows):
+            raise RuntimeError('database went away')
+
+        monkeypatch.setattr(importer, '_insert_batch', broken)
+        rows = [{'name': 'Shirt', 'category': 'top', 'color': 'blue'}]
+        response = authenticated_client.post(
+            IMPORT_URL, {'file': upload('items.json', json.dumps(rows))}, format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        job = WardrobeImportJob.objects.get(user=user)
+        assert job.status == 'failed'
+        assert job.completed_at is not None
+        assert not WardrobeItem.objects.filter(wardrobe__user=user).exists()
+    
+    def test_unsupported_format(self, authenticated_client):
+        response = authenticated_client.post(IMPORT_URL, {'file': upload('items.xlsx', 'x')}, format='multipart')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_remote_images_are_fetched_and_job_completes(self, authenticated_client, user, settings, tmp_path, monkeypatch):
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+        settings.WARDROBE_IMPORT = {'IMAGE_WORKERS': 1}
+        
+        def fake_download(url):
+            if 'broken' in url:
+                raise ValueError('404')
+            buffer = BytesIO()
+            Image.new('RGB', (40, 40), (200, 10, 10)).save(buffer, format='PNG')
+            buffer.seek(0)
+            return buffer
+        monkeypatch.setattr(importer, '_download_image', fake_download)
+        
+        rows = [
+            {'name': 'Red Dress', 'category': 'dress', 'color': 'red',
+             'primary_image_url': 'https://images.example.com/dress.png'},
+            {'name': 'Blue Shirt', 'category': 'top', 'color': 'blue',
+             'primary_image_url': 'https://images.example.com/broken.png'},
+            {'name': 'Belt', 'category': 'accessory', 'color': 'black'},
+        ]
+        response = authenticated_client.post(
+            IMPORT_URL, {'file': upload('items.json', json.dumps({'items': rows}))}, format='multipart'
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        
+        status_response = authenticated_client.get(f"/api/v1/wardrobe/imports/{response.data['data']['id']}/")
+        job = status_response.data
+        assert job['status'] == 'completed'
+        assert (job['images_total'], job['images_fetched'], job['images_failed']) == (2, 1, 1)
+        
+        dress = WardrobeItem.objects.get(name='Red Dress')
+        assert dress.primary_image and dress.primary_image_url == ''
+        assert WardrobeItem.objects.get(name='Blue Shirt').primary_image_url.endswith('broken.png')
+    
+    def test_job_status_is_private(self, authenticated_client):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        job = WardrobeImportJob.objects.create(user=other, file_format='csv')
+        response = authenticated_client.get(f'/api/v1/wardrobe/imports/{job.id}/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class FakeResponse:
+    def __init__(self, location):
+        self.is_redirect = True
+        self.headers = {'Location': location}
+
+    def close(self):
+        pass
+
+
+class TestImageURLChecks:
+    """Remote images are only fetched from public hosts."""
+
+    @pytest.fixture
+    def fake_dns(self, monkeypatch):
+        hosts = {'images.example.com': '93.184.216.34', 'internal.example.com': '10.0.0.5'}
+
+        def getaddrinfo(host, port, **kwargs):
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (hosts.get(host, host), port))]
+        monkeypatch.setattr(importer.socket, 'getaddrinfo', getaddrinfo)
+
+    @pytest.mark.parametrize('url', [
+        'http://169.254.169.254/latest/meta-data/',
+        'http://127.0.0.1:8000/admin/',
+        'http://[::ffff:10.0.0.1]/',
+        'https://internal.example.com/secret.png',
+        'file:///etc/passwd',
+    ])
+    def test_internal_urls_are_rejected(self, url, fake_dns, monkeypatch):
+        monkeypatch.setattr(importer._http, 'get', lambda *args, **kwargs: pytest.fail('URL was fetched'))
+
+        with pytest.raises(ValueError):
+            importer._download_image(url)
+
+    def test_redirects_to_internal_hosts_are_rejected(self, fake_dns, monkeypatch):
+        requested = []
+
+        def get(url, **kwargs):
+            assert kwargs['allow_redirects'] is False
+            requested.append(url)
+            return FakeResponse('http://internal.example.com/latest/meta-data/')
+        monkeypatch.setattr(importer._http, 'get', get)
+
+        with pytest.raises(ValueError, match='non-public'):
+            importer._download_image('https://images.example.com/dress.png')
+        assert requested == ['https://images.example.com/dress.png']
+
+
+@pytest.mark.django_db
+def test_stalled_image_fetches_are_requeued(user, settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.BACKGROUND_TASKS = {'BACKEND': 'sync'}
+    settings.WARDROBE_IMPORT = {'IMAGE_WORKERS': 1}
+    wardrobe = Wardrobe.objects.create(user=user)
+    job = WardrobeImportJob.objects.create(
+        user=user, file_format='json', status='fetching_images', images_total=3, images_fetched=1, images_failed=1
+    )
+    WardrobeItem.objects.create(wardrobe=wardrobe, import_job=job, name='Done', category='top', color='red')
+    for name in ('Lost', 'Failed'):
+        WardrobeItem.objects.create(
+            wardrobe=wardrobe, import_job=job, name=name, category='top', color='red',
+            primary_image_url=f'https://images.example.com/{name}.png'
+        )
+    fresh = WardrobeImportJob.objects.create(user=user, file_format='json', status='fetching_images', images_total=1)
+    WardrobeImportJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def fake_download(url):
+        buffer = BytesIO()
+        Image.new('RGB', (40, 40), (200, 10, 10)).save(buffer, format='PNG')
+        buffer.seek(0)
+        return buffer
+    monkeypatch.setattr(importer, '_download_image', fake_download)
+
+    assert importer.requeue_stalled_imports() == 1
+
+    job.refresh_from_db()
+    assert job.status == 'completed'
+    assert (job.images_total, job.images_fetched, job.images_failed) == (3, 3, 0)
+    assert not WardrobeItem.objects.exclude(primary_image_url='').exists()
+    assert WardrobeImportJob.objects.get(id=fresh.id).status == 'fetching_images'
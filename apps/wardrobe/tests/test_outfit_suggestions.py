@@ -0,0 +1,150 @@
+"""
+Tests for outfit suggestions generated from the wardrobe.
+"""
+import random
+import time
+from datetime import date, timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.models import StylePreference
+from apps.wardrobe.generator import color_harmony, generate_outfits, unary_scores
+from apps.wardrobe.models import Wardrobe, WardrobeItem
+from core.colors import normalize_color
+
+User = get_user_model()
+
+SUGGESTIONS_URL = '/api/v1/wardrobe/outfits/suggestions/'
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='stylist@example.com',
+        username='stylistuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def wardrobe(user):
+    """A small wardrobe with two tops, two bottoms, shoes and a dress."""
+    wardrobe = Wardrobe.objects.create(user=user)
+    for category, name, color, tags in [
+        ('top', 'White Tee', 'white', ['casual']),
+        ('top', 'Orange Blouse', 'orange', ['boho']),
+        ('bottom', 'Navy Jeans', 'navy', ['casual']),
+        ('bottom', 'Purple Skirt', 'purple', ['evening']),
+        ('shoes', 'White Sneakers', 'white', ['casual']),
+        ('dress', 'Black Dress', 'black', ['evening']),
+    ]:
+        WardrobeItem.objects.create(wardrobe=wardrobe, category=category, name=name, color=color, tags=tags)
+    return wardrobe
+
+
+def test_color_harmony_prefers_neutrals_and_analogous_hues():
+    items = [WardrobeItem(color=color, color_code=normalize_color(color)) for color in [
+        'navy', 'red', 'orange', 'green', 'teal', 'dark blue', 'chartreuse',
+    ]]
+    harmony = color_harmony(items)
+    assert harmony[0, 1] == 1.0  # neutral with anything
+    assert harmony[1, 2] == 1.0  # analogous
+    assert harmony[1, 3] < harmony[1, 2]  # red/green clash less well than red/orange
+    assert harmony[1, 4] == 0.9  # complementary
+    assert (harmony[5] == harmony[0]).all()  # synonyms score like their palette color
+    assert harmony[1, 6] == 0.6  # unknown colors are neutral-ish
+
+
+def test_preferred_colors_match_palette_codes():
+    items = [WardrobeItem(color=color, color_code=normalize_color(color), season='all') for color in ['Navy', 'Red']]
+    preference = StylePreference(preferred_colors=['dark blue'])
+    scores = unary_scores(items, 'summer', preference, today=date(2025, 1, 1))
+    assert scores['preference'].tolist() == [0.75, 0.5]
+
+
+def test_generates_top_k_from_200_items_quickly():
+    rng = random.Random(7)
+    categories = ['top'] * 60 + ['bottom'] * 50 + ['shoes'] * 30 + ['outerwear'] * 20 + ['dress'] * 15 + ['accessory'] * 25
+    colors = ['black', 'white', 'navy', 'red', 'blue', 'green', 'yellow', 'pink', 'beige', 'purple']
+    items = [
+        WardrobeItem(
+            id=index, category=category, name=f'Item {index}', color_code=rng.choice(colors),
+            season=rng.choice(['summer', 'winter', 'all']),
+            tags=rng.sample(['casual', 'work', 'boho', 'sporty', 'evening'], 2),
+            last_worn_date=date(2025, 1, 1) - timedelta(days=rng.randint(0, 60)) if rng.random() < 0.5 else None,
+        )
+        for index, category in enumerate(categories)
+    ]
+    
+    started = time.perf_counter()
+    outfits = generate_outfits(items, limit=10, season='summer', today=date(2025, 1, 1))
+    elapsed = time.perf_counter() - started
+    
+    assert elapsed < 1.0
+    assert len(outfits) == 10
+    scores = [outfit['score'] for outfit in outfits]
+    assert scores == sorted(scores, reverse=True)
+    for outfit in outfits:
+        outfit_categories = [item.category for item in outfit['items']]
+        assert 'shoes' in outfit_categories
+        assert 'dress' in outfit_categories or {'top', 'bottom'} <= set(outfit_categories)
+
+
+@pytest.mark.django_db
+class TestOutfitSuggestionsView:
+    """Test the outfit suggestions endpoint."""
+    
+    def test_returns_harmonious_outfits_first(self, authenticated_client, wardrobe):
+        response = authenticated_client.get(SUGGESTIONS_URL, {'season': 'summer'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        outfits = response.data['data']['outfits']
+        assert len(outfits) == 5  # 2 tops x 2 bottoms + the dress
+        assert [item['name'] for item in outfits[0]['items']] == ['White Tee', 'Navy Jeans', 'White Sneakers']
+        assert set(outfits[0]['breakdown']) == {'color_harmony', 'style_match', 'season', 'preference', 'freshness'}
+    
+    def test_recently_worn_items_score_lower(self, authenticated_client, wardrobe):
+        def tee_outfit_score():
+            response = authenticated_client.get(SUGGESTIONS_URL, {'season': 'summer'})
+            return next(
+                outfit for outfit in response.data['data']['outfits']
+                if [item['name'] for item in outfit['items']] == ['White Tee', 'Navy Jeans', 'White Sneakers']
+            )
+        
+        fresh = tee_outfit_score()
+        tee = WardrobeItem.objects.get(name='White Tee')
+        tee.last_worn_date = date.today()
+        tee.save()
+        worn = tee_outfit_score()
+        
+        assert worn['breakdown']['freshness'] < fresh['breakdown']['freshness']
+        assert worn['score'] < fresh['score']
+    
+    def test_cached_until_wardrobe_changes(self, authenticated_client, wardrobe):
+        authenticated_client.get(SUGGESTIONS_URL, {'season': 'summer'})
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(SUGGESTIONS_URL, {'season': 'summer'})
+        assert not any('FROM "wardrobe_items" WHERE' in query['sql'] and 'MAX(' not in query['sql']
+                       for query in queries.captured_queries)
+        
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='dress', name='Red Dress', color='red')
+        response = authenticated_client.get(SUGGESTIONS_URL, {'season': 'summer'})
+        assert len(response.data['data']['outfits']) == 6
+    
+    def test_invalid_season(self, authenticated_client, wardrobe):
+        response = authenticated_client.get(SUGGESTIONS_URL, {'season': 'monsoon'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
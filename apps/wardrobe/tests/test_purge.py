@@ -0,0 +1,53 @@
+"""
+Tests for hard-purging soft-deleted wardrobe items.
+"""
+from datetime import date, timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.wardrobe.models import Wardrobe, WardrobeItem, WardrobeItemAttribute, WardrobeItemWearLog
+from core.purge import purge_soft_deleted
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='purgeitems@example.com',
+        username='purgeitems',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.mark.django_db
+def test_deleted_items_are_purged_after_grace_period(authenticated_client, user):
+    wardrobe = Wardrobe.objects.create(user=user)
+    items = [WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name=f'Shirt {i}', color='white') for i in range(2)]
+    for item in items:
+        WardrobeItemAttribute.objects.create(item=item, key='fabric', value='linen')
+        WardrobeItemWearLog.objects.create(item=item, worn_date=date.today())
+
+    response = authenticated_client.delete(f'/api/v1/wardrobe/items/{items[0].id}/delete/')
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert purge_soft_deleted(WardrobeItem) == {}
+    counts = purge_soft_deleted(WardrobeItem, now=timezone.now() + timedelta(days=31))
+
+    assert counts['wardrobe.WardrobeItem'] == 1
+    assert counts['wardrobe.WardrobeItemWearLog'] == 1
+    assert list(WardrobeItem.objects.values_list('id', flat=True)) == [items[1].id]
+    assert WardrobeItemAttribute.objects.get().item_id == items[1].id
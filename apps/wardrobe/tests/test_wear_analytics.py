@@ -0,0 +1,210 @@
+"""
+Tests for wear rollups and wear analytics.
+"""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.wardrobe.analytics import default_range, period_starts, rebuild_wear_rollups, wear_frequency
+from apps.wardrobe.models import (
+    Wardrobe, WardrobeItem, WardrobeItemWearLog, WardrobeItemWearRollup, WardrobeWearRollup,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    """Create a test user."""
+    return User.objects.create_user(
+        email='wear@example.com',
+        username='wearuser',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def authenticated_client(user):
+    """Create authenticated API client."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def wardrobe(user):
+    return Wardrobe.objects.create(user=user)
+
+
+@pytest.fixture
+def items(wardrobe):
+    return [
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='top', name='Tee', color='White', price=Decimal('20.00')),
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='outerwear', name='Coat', color='Camel', price=Decimal('300.00')),
+        WardrobeItem.objects.create(wardrobe=wardrobe, category='shoes', name='Sandals', color='Tan'),
+    ]
+
+
+def mark_worn(client, item, worn_date):
+    return client.post(f'/api/v1/wardrobe/items/{item.id}/worn/', {'date': worn_date.isoformat()}, format='json')
+
+
+def rollups():
+    return (
+        set(WardrobeItemWearRollup.objects.values_list('item_id', 'period', 'period_start', 'wear_count')),
+        set(WardrobeWearRollup.objects.values_list('wardrobe_id', 'period', 'period_start', 'wear_count')),
+    )
+
+
+def test_period_starts():
+    assert period_starts(date(2024, 1, 10), date(2024, 1, 24), 'week') == [
+        date(2024, 1, 8), date(2024, 1, 15), date(2024, 1, 22)
+    ]
+    assert period_starts(date(2024, 11, 15), date(2025, 1, 1), 'month') == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)
+    ]
+    assert default_range('month', 3, today=date(2024, 3, 15)) == (date(2024, 1, 1), date(2024, 3, 15))
+
+
+@pytest.mark.django_db
+class TestWearRollups:
+    """Incremental rollups match a rebuild from the wear logs."""
+
+    def test_mark_worn_matches_rebuild(self, authenticated_client, wardrobe, items):
+        tee, coat, _ = items
+        for item, worn_date in [
+            (tee, date(2024, 1, 1)), (tee, date(2024, 1, 1)), (tee, date(2024, 1, 7)),
+            (coat, date(2024, 1, 8)), (coat, date(2024, 2, 29)),
+        ]:
+            assert mark_worn(authenticated_client, item, worn_date).status_code == status.HTTP_200_OK
+
+        incremental = rollups()
+        assert (tee.id, 'day', date(2024, 1, 1), 2) in incremental[0]
+        assert (tee.id, 'week', date(2024, 1, 1), 3) in incremental[0]
+        assert (wardrobe.id, 'month', date(2024, 1, 1), 4) in incremental[1]
+
+        WardrobeItemWearRollup.objects.all().delete()
+        WardrobeWearRollup.objects.all().delete()
+        assert rebuild_wear_rollups(batch_size=1) == 1
+        assert rollups() == incremental
+
+    def test_older_wear_keeps_last_worn_date(self, authenticated_client, items):
+        tee = items[0]
+        mark_worn(authenticated_client, tee, date(2024, 5, 1))
+        mark_worn(authenticated_client, tee, date(2024, 4, 1))
+
+        tee.refresh_from_db()
+        assert (tee.times_worn, tee.last_worn_date) == (2, date(2024, 5, 1))
+
+    def test_invalid_date_is_rejected(self, authenticated_client, items):
+        response = authenticated_client.post(f'/api/v1/wardrobe/items/{items[0].id}/worn/', {'date': '2024-02-30'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not WardrobeItemWearLog.objects.exists()
+
+    def test_rebuild_command_repairs_drift(self, wardrobe, items):
+        WardrobeItemWearLog.objects.create(item=items[0], worn_date=date(2024, 3, 3))
+        WardrobeWearRollup.objects.create(wardrobe=wardrobe, period='day', period_start=date(2024, 3, 4), wear_count=9)
+
+        call_command('rebuild_wear_rollups', stdout=StringIO())
+
+        assert wear_frequency(wardrobe, 'day', date(2024, 3, 3), date(2024, 3, 4)) == [
+            {'period_start': date(2024, 3, 3), 'wear_count': 1},
+            {'period_start': date(2024, 3, 4), 'wear_count': 0},
+        ]
+
+
+@pytest.mark.django_db
+class TestWearAnalyticsEndpoints:
+    """Analytics endpoints read the rollups."""
+
+    @pytest.fixture
+    def worn(self, authenticated_client, items):
+        tee, coat, sandals = items
+        for item, worn_date in [
+            (tee, date(2024, 1, 15)), (tee, date(2024, 7, 2)), (tee, date(2024, 7, 9)), (tee, date(2024, 7, 10)),
+            (coat, date(2024, 1, 20)), (coat, date(2024, 12, 5)),
+            (sandals, date(2024, 7, 3)),
+        ]:
+            mark_worn(authenticated_client, item, worn_date)
+        return items
+
+    def test_wear_frequency_is_zero_filled(self, authenticated_client, worn):
+        response = authenticated_client.get('/api/v1/wardrobe/analytics/wear-frequency/', {
+            'period': 'month', 'start': '2024-06-01', 'end': '2024-08-31',
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert [bucket['wear_count'] for bucket in data['series']] == [0, 4, 0]
+        assert data['total_wears'] == 4
+
+        response = authenticated_client.get('/api/v1/wardrobe/analytics/wear-frequency/', {
+            'period': 'week', 'start': '2024-07-01', 'end': '2024-07-14', 'item_id': worn[0].id,
+        })
+        assert [bucket['wear_count'] for bucket in response.data['data']['series']] == [1, 2]
+
+    def test_wear_frequency_validates_parameters(self, authenticated_client, worn):
+        url = '/api/v1/wardrobe/analytics/wear-frequency/'
+        assert authenticated_client.get(url, {'period': 'year'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert authenticated_client.get(url, {'start': 'soon'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert authenticated_client.get(url, {'start': '2024-02-01', 'end': '2024-01-01'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert authenticated_client.get(url, {'period': 'day', 'start': '2020-01-01', 'end': '2024-01-01'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert authenticated_client.get(url, {'item_id': 'abc'}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cost_per_wear(self, authenticated_client, worn):
+        response = authenticated_client.get('/api/v1/wardrobe/analytics/cost-per-wear/')
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert [(item['name'], item['wears'], item['cost_per_wear']) for item in data['items']] == [
+            ('Tee', 4, Decimal('5.00')), ('Coat', 2, Decimal('150.00')),
+        ]
+        assert (data['total_spend'], data['total_wears'], data['average_cost_per_wear']) == (
+            Decimal('320.00'), 6, Decimal('53.33')
+        )
+
+        response = authenticated_client.get('/api/v1/wardrobe/analytics/cost-per-wear/', {
+            'start': '2024-07-01', 'end': '2024-07-31',
+        })
+        assert [(item['name'], item['cost_per_wear']) for item in response.data['data']['items']] == [
+            ('Tee', Decimal('6.67')), ('Coat', None),
+        ]
+
+    def test_seasonal_utilization(self, authenticated_client, worn):
+        response = authenticated_client.get('/api/v1/wardrobe/analytics/seasonal-utilization/', {
+            'start': '2024-01-01', 'end': '2024-12-31',
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        seasons = {season['season']: season for season in data['seasons']}
+        assert data['total_items'] == 3
+        assert (seasons['winter']['wears'], seasons['winter']['items_worn']) == (3, 2)
+        assert (seasons['summer']['wears'], seasons['summer']['utilization']) == (4, 0.667)
+        assert seasons['spring']['wears'] == 0
+
+    def test_query_count_does_not_grow_with_wears(
+        self, authenticated_client, wardrobe, worn, django_assert_max_num_queries
+    ):
+        urls = [
+            '/api/v1/wardrobe/analytics/wear-frequency/?period=day&start=2024-01-01&end=2024-12-31',
+            '/api/v1/wardrobe/analytics/cost-per-wear/',
+            '/api/v1/wardrobe/analytics/seasonal-utilization/?start=2024-01-01&end=2024-12-31',
+        ]
+        WardrobeItemWearLog.objects.bulk_create([
+            WardrobeItemWearLog(item=item, worn_date=date(2024, month, day))
+            for item in worn for month in range(1, 13) for day in range(1, 28, 3)
+        ])
+        rebuild_wear_rollups()
+
+        for url in urls:
+            # Authentication plus the wardrobe lookup and the analytics queries
+            with django_assert_max_num_queries(5):
+                assert authenticated_client.get(url).status_code == status.HTTP_200_OK
@@ -12,6 +12,12 @@ from .views import (
     WardrobeItemImageUploadView,
     MarkItemAsWornView,
     WardrobeStatisticsView,
+    WardrobeItemImportView,
+    WardrobeImportJobDetailView,
+    OutfitSuggestionsView,
+    WearFrequencyView,
+    CostPerWearView,
+    SeasonalUtilizationView,
 )
 
 app_name = 'wardrobe'
@@ -24,6 +30,7 @@ urlpatterns = [
     # Wardrobe Items
     path('items/', WardrobeItemListView.as_view(), name='item-list'),
     path('items/create/', WardrobeItemCreateView.as_view(), name='item-create'),
+    path('items/import/', WardrobeItemImportView.as_view(), name='item-import'),
     path('items/<int:pk>/', WardrobeItemDetailView.as_view(), name='item-detail'),
     path('items/<int:pk>/update/', WardrobeItemUpdateView.as_view(), name='item-update'),
     path('items/<int:pk>/delete/', WardrobeItemDeleteView.as_view(), name='item-delete'),
@@ -33,5 +40,16 @@ urlpatterns = [
     
     # Wear Tracking
     path('items/<int:item_id>/worn/', MarkItemAsWornView.as_view(), name='mark-worn'),
+    
+    # Wear Analytics
+    path('analytics/wear-frequency/', WearFrequencyView.as_view(), name='wear-frequency'),
+    path('analytics/cost-per-wear/', CostPerWearView.as_view(), name='cost-per-wear'),
+    path('analytics/seasonal-utilization/', SeasonalUtilizationView.as_view(), name='seasonal-utilization'),
+    
+    # Outfit Suggestions
+    path('outfits/suggestions/', OutfitSuggestionsView.as_view(), name='outfit-suggestions'),
+    
+    # Bulk Import
+    path('imports/<int:pk>/', WardrobeImportJobDetailView.as_view(), name='import-detail'),
 ]
 
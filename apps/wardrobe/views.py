@@ -5,18 +5,30 @@ from rest_framework import generics, status, views, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from datetime import date
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
-from django.db import models
+from django.utils.dateparse import parse_date
+from django.core.cache import cache
+from django.db.models import Q, Count, Avg, Max
+from django.db import models, transaction
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer, OpenApiTypes
+from apps.tags.sync import filter_by_tags
+from core.colors import color_filter_codes, parse_color_distance
 from core.serializers import ValidationErrorResponse, UnauthorizedErrorResponse, NotFoundErrorResponse, ForbiddenErrorResponse
-from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemWearLog
+from .analytics import (
+    PERIODS, cost_per_wear, default_range, record_wear, seasonal_utilization, wear_frequency,
+)
+from .generator import current_season, generate_outfits
+from .importer import ImportFileError, detect_format, import_config, run_import, schedule_image_fetch
+from .models import Wardrobe, WardrobeItem, WardrobeItemImage, WardrobeItemWearLog, WardrobeImportJob
 from .serializers import (
     WardrobeSerializer,
     WardrobeItemSerializer,
     WardrobeItemCreateSerializer,
     WardrobeItemImageSerializer,
-    WardrobeItemWearLogSerializer
+    WardrobeItemWearLogSerializer,
+    WardrobeImportJobSerializer,
+    OutfitSuggestionSerializer
 )
 
 
@@ -63,10 +75,11 @@ class WardrobeItemListView(generics.ListAPIView):
         tags=["Wardrobe"],
         parameters=[
             OpenApiParameter(name='category', description='Filter by category', required=False, type=str),
-            OpenApiParameter(name='color', description='Filter by color', required=False, type=str),
+            OpenApiParameter(name='color', description='Filter by color (name, synonym or hex; e.g. "dark blue" matches navy)', required=False, type=str),
+            OpenApiParameter(name='color_distance', description='Also match palette colors within this CIE76 ΔE of color (non-negative, e.g. 30)', required=False, type=float),
             OpenApiParameter(name='season', description='Filter by season', required=False, type=str),
             OpenApiParameter(name='brand', description='Filter by brand', required=False, type=str),
-            OpenApiParameter(name='tags', description='Filter by tags (comma-separated)', required=False, type=str),
+            OpenApiParameter(name='tags', description='Items having all of these tags (comma-separated, case-insensitive)', required=False, type=str),
             OpenApiParameter(name='page', description='Page number', required=False, type=int),
         ],
         responses={
@@ -93,7 +106,16 @@ class WardrobeItemListView(generics.ListAPIView):
         
         color = self.request.query_params.get('color')
         if color:
-            queryset = queryset.filter(color__icontains=color)
+            try:
+                max_delta_e = parse_color_distance(self.request.query_params.get('color_distance'))
+            except ValueError:
+                raise serializers.ValidationError({'color_distance': ['Must be a non-negative number']})
+            codes = color_filter_codes(color, max_delta_e)
+            if codes is None:
+                # Not a known color; fall back to matching the free text
+                queryset = queryset.filter(color__icontains=color)
+            else:
+                queryset = queryset.filter(color_code__in=codes)
         
         season = self.request.query_params.get('season')
         if season:
@@ -105,9 +127,7 @@ class WardrobeItemListView(generics.ListAPIView):
         
         tags = self.request.query_params.get('tags')
         if tags:
-            tag_list = [tag.strip() for tag in tags.split(',')]
-            for tag in tag_list:
-                queryset = queryset.filter(tags__contains=tag)
+            queryset = filter_by_tags(queryset, tags.split(','))
         
         return queryset
 
@@ -225,6 +245,7 @@ class WardrobeItemDeleteView(generics.DestroyAPIView):
     def perform_destroy(self, instance):
         # Soft delete
         instance.is_deleted = True
+        instance.deleted_at = timezone.now()
         instance.save()
 
 
@@ -294,6 +315,128 @@ class WardrobeItemImageUploadView(views.APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class WardrobeItemImportView(views.APIView):
+    """
+    Bulk import wardrobe items from a CSV, JSON or JSON Lines file.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Import wardrobe items",
+        description=(
+            "Import up to 5000 items from a CSV, JSON or JSON Lines file. Rows are validated like "
+            "item creation; invalid rows are skipped and reported on the job. CSV tags are "
+            "';'-separated and 'attr:<Key>' columns become attributes. Remote primary_image_url "
+            "images are fetched in the background; poll the import job for progress."
+        ),
+        tags=["Wardrobe"],
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary'},
+                    'format': {'type': 'string', 'enum': ['csv', 'json', 'jsonl']},
+                },
+                'required': ['file']
+            }
+        },
+        responses={
+            202: inline_serializer(
+                name='WardrobeImportResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'message': serializers.CharField(),
+                    'data': WardrobeImportJobSerializer(),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({
+                'success': False,
+                'message': 'File is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        max_size = import_config()['MAX_FILE_SIZE']
+        if upload.size > max_size:
+            return Response({
+                'success': False,
+                'message': f'File size exceeds maximum of {max_size // (1024 * 1024)}MB'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = detect_format(upload.name, request.data.get('format'))
+        if file_format not in dict(WardrobeImportJob.FORMAT_CHOICES):
+            return Response({
+                'success': False,
+                'message': 'Unsupported file format. Use csv, json or jsonl'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
+        job = WardrobeImportJob.objects.create(
+            user=request.user,
+            file_format=file_format,
+            file_name=upload.name[:255]
+        )
+        
+        try:
+            # All-or-nothing for file-level errors (bad encoding, too many rows)
+            with transaction.atomic():
+                image_item_ids = run_import(job, wardrobe, upload)
+        except ImportFileError as e:
+            job.status = 'failed'
+            job.errors = [{'row': None, 'errors': {'file': [str(e)]}}]
+            job.completed_at = timezone.now()
+            job.save(update_fields=['status', 'errors', 'completed_at', 'updated_at'])
+            return Response({
+                'success': False,
+                'message': str(e),
+                'data': WardrobeImportJobSerializer(job).data
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            # The rows were rolled back; don't leave the job importing forever
+            job.status = 'failed'
+            job.errors = [{'row': None, 'errors': {'file': ['The import failed unexpectedly']}}]
+            job.completed_at = timezone.now()
+            job.save(update_fields=['status', 'errors', 'completed_at', 'updated_at'])
+            raise
+        
+        schedule_image_fetch(job, image_item_ids)
+        job.refresh_from_db()
+        return Response({
+            'success': True,
+            'message': f'Imported {job.imported_count} of {job.total_rows} items',
+            'data': WardrobeImportJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class WardrobeImportJobDetailView(generics.RetrieveAPIView):
+    """
+    Get the status of a wardrobe import job.
+    """
+    serializer_class = WardrobeImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get import job status",
+        description="Progress of a bulk wardrobe import, including row errors and background image fetching",
+        tags=["Wardrobe"],
+        responses={
+            200: WardrobeImportJobSerializer,
+            401: UnauthorizedErrorResponse,
+            404: NotFoundErrorResponse,
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        return WardrobeImportJob.objects.filter(user=self.request.user)
+
+
 class MarkItemAsWornView(views.APIView):
     """
     Mark item as worn on a specific date.
@@ -330,20 +473,33 @@ class MarkItemAsWornView(views.APIView):
         wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
         item = get_object_or_404(WardrobeItem, id=item_id, wardrobe=wardrobe, is_deleted=False)
         
-        worn_date = request.data.get('date', timezone.now().date())
+        worn_date = request.data.get('date') or timezone.localdate()
+        if isinstance(worn_date, str):
+            try:
+                worn_date = parse_date(worn_date)
+            except ValueError:
+                worn_date = None
+        if not isinstance(worn_date, date):
+            return Response({
+                'success': False,
+                'message': 'date must be a valid date (YYYY-MM-DD)'
+            }, status=status.HTTP_400_BAD_REQUEST)
         outfit_id = request.data.get('outfit_id')
         
-        # Create wear log
-        WardrobeItemWearLog.objects.create(
-            item=item,
-            worn_date=worn_date,
-            outfit_id=outfit_id
-        )
-        
-        # Update item statistics
-        item.times_worn += 1
-        item.last_worn_date = worn_date
-        item.save()
+        with transaction.atomic():
+            # Create wear log
+            WardrobeItemWearLog.objects.create(
+                item=item,
+                worn_date=worn_date,
+                outfit_id=outfit_id
+            )
+            record_wear(item, worn_date)
+            
+            # Update item statistics
+            item.times_worn += 1
+            if not item.last_worn_date or worn_date > item.last_worn_date:
+                item.last_worn_date = worn_date
+            item.save()
         
         return Response({
             'success': True,
@@ -449,3 +605,297 @@ class WardrobeStatisticsView(views.APIView):
             'items_never_worn': items_never_worn
         }, status=status.HTTP_200_OK)
 
+
+class OutfitSuggestionsView(views.APIView):
+    """
+    Suggest outfits from the user's own wardrobe.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    # Cached suggestions are keyed by a wardrobe fingerprint, so they expire
+    # as soon as any item or the style preference changes.
+    CACHE_TIMEOUT = 60 * 60 * 24
+    MAX_LIMIT = 50
+    
+    @extend_schema(
+        summary="Suggest outfits",
+        description=(
+            "Generate outfits (top + bottom or dress, shoes, optional outerwear and accessory) from "
+            "the user's wardrobe, scored on color harmony, style tags, season, style preferences and "
+            "how recently items were worn."
+        ),
+        tags=["Wardrobe"],
+        parameters=[
+            OpenApiParameter(name='limit', description='Number of outfits (default 10, max 50)', required=False, type=int),
+            OpenApiParameter(
+                name='season', description='Target season (default: current season)', required=False, type=str,
+                enum=['spring', 'summer', 'fall', 'winter']
+            ),
+        ],
+        responses={
+            200: inline_serializer(
+                name='OutfitSuggestionsResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='OutfitSuggestionsData',
+                        fields={
+                            'season': serializers.CharField(),
+                            'outfits': OutfitSuggestionSerializer(many=True),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), self.MAX_LIMIT)
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        season = request.query_params.get('season') or current_season()
+        if season not in ('spring', 'summer', 'fall', 'winter'):
+            return Response({
+                'success': False,
+                'message': 'Invalid season'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
+        items = WardrobeItem.objects.filter(wardrobe=wardrobe)
+        fingerprint = items.aggregate(count=Count('id'), changed=Max('updated_at'))
+        preference = getattr(request.user, 'style_preference', None)
+        cache_key = ':'.join(str(part) for part in (
+            'wardrobe:outfits', wardrobe.id, fingerprint['count'],
+            fingerprint['changed'].timestamp() if fingerprint['changed'] else 0,
+            preference.updated_at.timestamp() if preference else 0,
+            timezone.localdate(), season, limit,
+        ))
+        
+        outfits = cache.get(cache_key)
+        if outfits is None:
+            suggestions = generate_outfits(
+                items.filter(is_deleted=False),
+                limit=limit,
+                season=season,
+                preference=preference,
+                today=timezone.localdate()
+            )
+            outfits = OutfitSuggestionSerializer(suggestions, many=True, context={'request': request}).data
+            cache.set(cache_key, outfits, self.CACHE_TIMEOUT)
+        
+        return Response({
+            'success': True,
+            'data': {
+                'season': season,
+                'outfits': outfits,
+            }
+        }, status=status.HTTP_200_OK)
+
+
+def _analytics_range(request, period, periods=12):
+    """
+    (start, end) from the ``start``/``end`` query parameters, defaulting to the
+    last ``periods`` periods, or a 400 Response.
+    """
+    default_start, default_end = default_range(period, periods, today=timezone.localdate())
+    try:
+        start = parse_date(request.query_params['start']) if request.query_params.get('start') else default_start
+        end = parse_date(request.query_params['end']) if request.query_params.get('end') else default_end
+    except ValueError:
+        start = end = None
+    if start is None or end is None:
+        return None, None, Response({
+            'success': False,
+            'message': 'start and end must be valid dates (YYYY-MM-DD)'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if start > end:
+        return None, None, Response({
+            'success': False,
+            'message': 'start must not be after end'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return start, end, None
+
+
+class WearFrequencyView(views.APIView):
+    """
+    Wear counts over time for the wardrobe or one item.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    # Longest range, in days, served per period
+    MAX_RANGE_DAYS = {'day': 366, 'week': 5 * 366, 'month': 10 * 366}
+    
+    @extend_schema(
+        summary="Get wear frequency",
+        description="Number of wears per day, week or month, for the whole wardrobe or one item",
+        tags=["Wardrobe"],
+        parameters=[
+            OpenApiParameter(name='period', description='Bucket size (default week)', required=False, type=str, enum=list(PERIODS)),
+            OpenApiParameter(name='start', description='First date (default: 12 periods ago)', required=False, type=OpenApiTypes.DATE),
+            OpenApiParameter(name='end', description='Last date (default: today)', required=False, type=OpenApiTypes.DATE),
+            OpenApiParameter(name='item_id', description='Only this wardrobe item', required=False, type=int),
+        ],
+        responses={
+            200: inline_serializer(
+                name='WearFrequencyResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='WearFrequencyData',
+                        fields={
+                            'period': serializers.CharField(),
+                            'total_wears': serializers.IntegerField(),
+                            'series': serializers.ListField(child=serializers.DictField()),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+            404: NotFoundErrorResponse,
+        }
+    )
+    def get(self, request):
+        period = request.query_params.get('period', 'week')
+        if period not in PERIODS:
+            return Response({
+                'success': False,
+                'message': 'period must be day, week or month'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        start, end, error = _analytics_range(request, period)
+        if error:
+            return error
+        if (end - start).days > self.MAX_RANGE_DAYS[period]:
+            return Response({
+                'success': False,
+                'message': f'At most {self.MAX_RANGE_DAYS[period]} days can be requested per {period}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        item_id = None
+        if request.query_params.get('item_id'):
+            try:
+                item_id = int(request.query_params['item_id'])
+            except ValueError:
+                return Response({
+                    'success': False,
+                    'message': 'item_id must be an integer'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
+        wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
+        item = None
+        if item_id is not None:
+            item = get_object_or_404(WardrobeItem, id=item_id, wardrobe=wardrobe)
+        
+        series = wear_frequency(wardrobe, period, start, end, item=item)
+        return Response({
+            'success': True,
+            'data': {
+                'period': period,
+                'total_wears': sum(bucket['wear_count'] for bucket in series),
+                'series': series,
+            }
+        }, status=status.HTTP_200_OK)
+
+
+class CostPerWearView(views.APIView):
+    """
+    Cost per wear of the wardrobe's priced items.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get cost per wear",
+        description=(
+            "Price divided by number of wears for every item with a price, cheapest per wear first. "
+            "Without start/end, all wears are counted."
+        ),
+        tags=["Wardrobe"],
+        parameters=[
+            OpenApiParameter(name='start', description='Count wears from this month', required=False, type=OpenApiTypes.DATE),
+            OpenApiParameter(name='end', description='Count wears up to this date', required=False, type=OpenApiTypes.DATE),
+        ],
+        responses={
+            200: inline_serializer(
+                name='CostPerWearResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='CostPerWearData',
+                        fields={
+                            'total_spend': serializers.DecimalField(max_digits=12, decimal_places=2),
+                            'total_wears': serializers.IntegerField(),
+                            'average_cost_per_wear': serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True),
+                            'items': serializers.ListField(child=serializers.DictField()),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get(self, request):
+        start = end = None
+        if request.query_params.get('start') or request.query_params.get('end'):
+            start, end, error = _analytics_range(request, 'month')
+            if error:
+                return error
+        
+        wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
+        return Response({
+            'success': True,
+            'data': cost_per_wear(wardrobe, start, end)
+        }, status=status.HTTP_200_OK)
+
+
+class SeasonalUtilizationView(views.APIView):
+    """
+    Wears and share of the wardrobe worn per season.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get seasonal utilization",
+        description=(
+            "For each season, the number of wears and the share of the wardrobe's items worn at "
+            "least once, over the last 12 months by default."
+        ),
+        tags=["Wardrobe"],
+        parameters=[
+            OpenApiParameter(name='start', description='First month (default: 11 months ago)', required=False, type=OpenApiTypes.DATE),
+            OpenApiParameter(name='end', description='Last date (default: today)', required=False, type=OpenApiTypes.DATE),
+        ],
+        responses={
+            200: inline_serializer(
+                name='SeasonalUtilizationResponse',
+                fields={
+                    'success': serializers.BooleanField(),
+                    'data': inline_serializer(
+                        name='SeasonalUtilizationData',
+                        fields={
+                            'total_items': serializers.IntegerField(),
+                            'seasons': serializers.ListField(child=serializers.DictField()),
+                        }
+                    ),
+                }
+            ),
+            400: ValidationErrorResponse,
+            401: UnauthorizedErrorResponse,
+        }
+    )
+    def get(self, request):
+        start, end, error = _analytics_range(request, 'month')
+        if error:
+            return error
+        
+        wardrobe, _ = Wardrobe.objects.get_or_create(user=request.user)
+        return Response({
+            'success': True,
+            'data': seasonal_utilization(wardrobe, start, end)
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,68 @@
+"""
+Background work, started once the current transaction commits.
+
+Features defer work with ``run_in_background(task, *args)``, where ``task``
+is a Celery task (post publishing, For You ranking, wardrobe import images,
+account teardown). ``BACKGROUND_TASKS['BACKEND']`` decides where it runs:
+
+- ``celery`` (the default): ``task.delay(*args)`` on commit, so queued work
+  survives restarts and deploys of the web process;
+- ``thread``: the task body runs on commit in a shared in-process worker
+  pool. For development without a broker only: queued work is lost with
+  the process (features requeue their stalled work periodically);
+- ``sync``: the task body runs inline, right away (tests).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKGROUND_TASKS = {
+    'BACKEND': 'celery',
+    'THREAD_WORKERS': 4,
+}
+
+
+def background_config():
+    return {**DEFAULT_BACKGROUND_TASKS, **getattr(settings, 'BACKGROUND_TASKS', {})}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=background_config()['THREAD_WORKERS'],
+                    thread_name_prefix='background',
+                )
+    return _executor
+
+
+def _run_in_worker(task, args):
+    """Worker-thread entry point: use, then release, the thread's DB connection."""
+    close_old_connections()
+    try:
+        task(*args)
+    except Exception:
+        logger.exception(f'Background task {task.name} failed')
+    finally:
+        close_old_connections()
+
+
+def run_in_background(task, *args):
+    """Run the Celery task ``task`` with ``args`` on the configured backend."""
+    backend = background_config()['BACKEND']
+    if backend == 'sync':
+        task(*args)
+    elif backend == 'celery':
+        transaction.on_commit(lambda: task.delay(*args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, task, args))
@@ -0,0 +1,113 @@
+"""
+Two-tier caches of pickled model instances under versioned keys.
+
+Values live in the shared Django cache (Redis in production) and, for a few
+seconds, in process memory. Every key belongs to a version *scope* (one
+user, or all promo codes): the scope's version is a timestamp stored in the
+shared cache, and values are cached under ``(key, version)``. Invalidating
+a scope bumps its version, which every worker sees on its next read, so no
+stale value is served once the bump is visible.
+
+Versions are timestamps rather than counters starting at zero, so a version
+lost to eviction can never collide with an older cached entry.
+
+Values are pickled, so every read returns its own copy that callers may
+mutate. Errors from the shared cache are logged; callers fall back to the
+database.
+"""
+import logging
+import pickle
+import threading
+import time
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedCache:
+    """
+    Process memory + shared cache store keyed by ``(key, scope version)``.
+
+    ``config`` returns the cache's settings: ``CACHE_ALIAS``, ``TTL``
+    (seconds in the shared cache) and ``LOCAL_TTL`` (seconds in process
+    memory). Keys are prefixed with ``name``.
+    """
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self._local = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.config()['CACHE_ALIAS']]
+
+    def _version_key(self, scope):
+        return f'{self.name}:version:{scope}'
+
+    def _value_key(self, key, version):
+        return f'{self.name}:{key}:{version}'
+
+    def current_version(self, scope):
+        """Read ``scope``'s version, creating one if it was never set or evicted; raises if the cache is down."""
+        version_key = self._version_key(scope)
+        version = self.shared.get(version_key)
+        if version is None:
+            self.shared.add(version_key, time.time_ns(), timeout=None)
+            version = self.shared.get(version_key)
+        return version
+
+    def read(self, key, version):
+        """The value cached for ``key`` under ``version``, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+        if entry and entry[0] == version and entry[2] > now:
+            return pickle.loads(entry[1])
+
+        try:
+            payload = self.shared.get(self._value_key(key, version))
+        except Exception as e:
+            logger.debug(f'{self.name} cache unavailable: {str(e)}')
+            return None
+        if payload is None:
+            return None
+
+        with self._lock:
+            self._local[key] = (version, payload, now + self.config()['LOCAL_TTL'])
+        return pickle.loads(payload)
+
+    def write(self, key, version, value):
+        """Cache ``value`` for ``key`` under ``version`` in both tiers."""
+        config = self.config()
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (version, payload, time.monotonic() + config['LOCAL_TTL'])
+        try:
+            self.shared.set(self._value_key(key, version), payload, timeout=config['TTL'])
+        except Exception as e:
+            logger.debug(f'{self.name} cache unavailable: {str(e)}')
+
+    def bump(self, scope, keys=None):
+        """
+        Give ``scope`` a new version so every worker stops serving its cached values.
+
+        ``keys`` are dropped from this process's memory right away (all of
+        them if None); other processes see the new version on their next read.
+        """
+        with self._lock:
+            if keys is None:
+                self._local.clear()
+            else:
+                for key in keys:
+                    self._local.pop(key, None)
+        try:
+            self.shared.set(self._version_key(scope), time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.warning(f'Could not invalidate {self.name} cache ({scope}): {str(e)}')
+
+    def clear_local(self):
+        """Drop the in-process tier (used by tests)."""
+        with self._lock:
+            self._local.clear()
@@ -0,0 +1,250 @@
+"""
+Canonical color palette for CuratorAI.
+
+Free-text colors ("Dark Blue", "navy", "#1f2a44") are normalized to a small
+palette of canonical color codes, which are stored and indexed on wardrobe and
+outfit items (``color_code``). Each palette color has CIELAB coordinates, so
+"similar colors" are the palette codes within a CIE76 ΔE of the target color,
+which turns a similarity filter into an indexed ``color_code IN (...)``
+lookup. Outfit suggestions score color harmony from the same codes: the
+neutral colors, and the CIELAB hue angle of every other palette color.
+"""
+import math
+import re
+from functools import lru_cache
+from PIL import Image
+
+# code: (display name, sRGB)
+PALETTE = {
+    'black': ('Black', (20, 20, 20)),
+    'charcoal': ('Charcoal', (54, 69, 79)),
+    'gray': ('Gray', (128, 128, 128)),
+    'silver': ('Silver', (192, 192, 192)),
+    'white': ('White', (250, 250, 250)),
+    'cream': ('Cream', (255, 253, 208)),
+    'beige': ('Beige', (222, 200, 160)),
+    'khaki': ('Khaki', (195, 176, 145)),
+    'tan': ('Tan', (210, 180, 140)),
+    'camel': ('Camel', (193, 154, 107)),
+    'brown': ('Brown', (120, 75, 40)),
+    'navy': ('Navy', (20, 30, 80)),
+    'blue': ('Blue', (30, 80, 200)),
+    'light_blue': ('Light Blue', (150, 200, 240)),
+    'teal': ('Teal', (0, 128, 128)),
+    'turquoise': ('Turquoise', (64, 224, 208)),
+    'green': ('Green', (40, 140, 60)),
+    'olive': ('Olive', (110, 110, 40)),
+    'mint': ('Mint', (170, 240, 200)),
+    'yellow': ('Yellow', (250, 220, 50)),
+    'mustard': ('Mustard', (220, 170, 40)),
+    'gold': ('Gold', (212, 175, 55)),
+    'orange': ('Orange', (245, 130, 30)),
+    'coral': ('Coral', (255, 127, 80)),
+    'red': ('Red', (200, 30, 40)),
+    'burgundy': ('Burgundy', (128, 0, 32)),
+    'pink': ('Pink', (245, 170, 190)),
+    'magenta': ('Magenta', (220, 40, 140)),
+    'purple': ('Purple', (110, 40, 140)),
+    'lavender': ('Lavender', (200, 170, 230)),
+}
+
+SYNONYMS = {
+    'grey': 'gray', 'heather gray': 'gray', 'heather grey': 'gray',
+    'dark gray': 'charcoal', 'dark grey': 'charcoal', 'graphite': 'charcoal',
+    'light gray': 'silver', 'light grey': 'silver',
+    'off white': 'cream', 'ivory': 'cream', 'ecru': 'cream',
+    'sand': 'beige', 'nude': 'beige', 'stone': 'beige', 'taupe': 'khaki',
+    'chocolate': 'brown', 'coffee': 'brown', 'cognac': 'brown',
+    'dark blue': 'navy', 'navy blue': 'navy', 'midnight': 'navy', 'midnight blue': 'navy',
+    'denim': 'blue', 'royal blue': 'blue', 'cobalt': 'blue', 'indigo': 'blue',
+    'sky blue': 'light_blue', 'baby blue': 'light_blue', 'powder blue': 'light_blue',
+    'aqua': 'turquoise', 'cyan': 'turquoise',
+    'forest green': 'green', 'emerald': 'green', 'dark green': 'green',
+    'army green': 'olive', 'olive green': 'olive', 'khaki green': 'olive',
+    'sage': 'mint', 'mint green': 'mint',
+    'lemon': 'yellow',
+    'rust': 'orange', 'burnt orange': 'orange',
+    'peach': 'coral', 'salmon': 'coral',
+    'maroon': 'burgundy', 'wine': 'burgundy', 'oxblood': 'burgundy', 'dark red': 'burgundy',
+    'crimson': 'red', 'scarlet': 'red',
+    'blush': 'pink', 'rose': 'pink', 'light pink': 'pink',
+    'fuchsia': 'magenta', 'hot pink': 'magenta',
+    'violet': 'purple', 'plum': 'purple', 'eggplant': 'purple',
+    'lilac': 'lavender', 'mauve': 'lavender',
+}
+
+DEFAULT_SIMILAR_DELTA_E = 30
+
+HEX_COLOR_RE = re.compile(r'^#?([0-9a-f]{3}|[0-9a-f]{6})$')
+# Multi-color descriptions ("black/white") are indexed by their first color
+SEPARATOR_RE = re.compile(r'\s*(?:/|,|&|\+|\band\b|\bwith\b)\s*')
+
+
+def rgb_to_lab(rgb):
+    """Convert an sRGB ``(r, g, b)`` tuple (0-255) to CIELAB (D65)."""
+    def linear(channel):
+        channel /= 255
+        return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+    r, g, b = (linear(channel) for channel in rgb)
+    x = (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047
+    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    z = (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def delta_e(lab1, lab2):
+    """CIE76 color difference (Euclidean distance in LAB)."""
+    return math.dist(lab1, lab2)
+
+
+PALETTE_LAB = {code: rgb_to_lab(rgb) for code, (_, rgb) in PALETTE.items()}
+# Colors that go with everything
+NEUTRAL_COLORS = frozenset({
+    'black', 'charcoal', 'gray', 'silver', 'white', 'cream', 'beige', 'khaki', 'tan', 'camel', 'brown', 'navy',
+})
+# Hue angle (degrees, CIELAB LCh) of every non-neutral palette color
+PALETTE_HUES = {
+    code: math.degrees(math.atan2(b, a)) % 360
+    for code, (_, a, b) in PALETTE_LAB.items() if code not in NEUTRAL_COLORS
+}
+COLOR_NAMES = {
+    **{name.lower(): code for code, (name, _) in PALETTE.items()},
+    **SYNONYMS,
+}
+
+
+def nearest_color(rgb):
+    """Palette code closest to an sRGB color."""
+    lab = rgb_to_lab(rgb)
+    return min(PALETTE_LAB, key=lambda code: delta_e(lab, PALETTE_LAB[code]))
+
+
+def _parse_hex(value):
+    digits = HEX_COLOR_RE.match(value).group(1)
+    if len(digits) == 3:
+        digits = ''.join(digit * 2 for digit in digits)
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=4096)
+def normalize_color(text):
+    """
+    Canonical palette code for a free-text color, or '' if it isn't recognized.
+
+    Accepts palette names, synonyms and hex values, ignores case and extra
+    words ("Light Heather Grey" -> ``gray``), and uses the first color of
+    multi-color descriptions.
+    """
+    value = ' '.join((text or '').lower().replace('-', ' ').replace('_', ' ').split())
+    if not value:
+        return ''
+    if HEX_COLOR_RE.match(value):
+        return nearest_color(_parse_hex(value))
+    if value in COLOR_NAMES:
+        return COLOR_NAMES[value]
+
+    words = SEPARATOR_RE.split(value)[0].split()
+    # Longest known phrase, preferring the rightmost (the color noun comes last)
+    for length in range(len(words), 0, -1):
+        for start in range(len(words) - length, -1, -1):
+            phrase = ' '.join(words[start:start + length])
+            if phrase in COLOR_NAMES:
+                return COLOR_NAMES[phrase]
+    return ''
+
+
+def color_name(code):
+    """Display name of a palette code."""
+    return PALETTE[code][0] if code in PALETTE else ''
+
+
+def similar_colors(code, max_delta_e=DEFAULT_SIMILAR_DELTA_E):
+    """Palette codes within ``max_delta_e`` of ``code`` (including itself), closest first."""
+    if code not in PALETTE_LAB:
+        return []
+    lab = PALETTE_LAB[code]
+    distances = {other: delta_e(lab, other_lab) for other, other_lab in PALETTE_LAB.items()}
+    return sorted((other for other, distance in distances.items() if distance <= max_delta_e), key=distances.get)
+
+
+def parse_color_distance(value):
+    """
+    ΔE of a ``color_distance`` query value, or None if it wasn't given.
+    Raises ValueError unless it's a finite, non-negative number.
+    """
+    if value is None:
+        return None
+    distance = float(value)
+    if not math.isfinite(distance) or distance < 0:
+        raise ValueError(f'Invalid color distance {value!r}')
+    return distance
+
+
+def color_filter_codes(text, max_delta_e=None):
+    """
+    Palette codes matching a color filter value, or None if ``text`` isn't a
+    recognized color. Without ``max_delta_e`` only the exact color matches;
+    the exact color always does, whatever ``max_delta_e`` is.
+    """
+    code = normalize_color(text)
+    if not code:
+        return None
+    if max_delta_e is None or not max_delta_e >= 0:
+        return [code]
+    return [code] + [other for other in similar_colors(code, max_delta_e) if other != code]
+
+
+def dominant_image_color(image_file, size=64):
+    """
+    Palette code of the dominant color in the central area of an image.
+
+    The outer quarter on each side is ignored, since product photos usually
+    have a plain background around the garment.
+    """
+    img = Image.open(image_file).convert('RGB')
+    img.thumbnail((size, size))
+    width, height = img.size
+    img = img.crop((width // 4, height // 4, width - width // 4, height - height // 4))
+    quantized = img.quantize(colors=5)
+    palette = quantized.getpalette()
+    count, index = max(quantized.getcolors())
+    return nearest_color(tuple(palette[index * 3:index * 3 + 3]))
+
+
+def backfill_color_codes(queryset, batch_size=1000, image_flag=None):
+    """
+    Set ``color_code`` from ``color`` for every row of ``queryset``.
+
+    Rows whose color isn't recognized get an empty code, unless ``image_flag``
+    names a boolean field that is set on rows whose code came from their
+    image; recognized colors replace those codes and clear the flag.
+
+    Walks the table in primary-key order, one batch at a time, and only writes
+    rows whose code changes. Returns the number of rows updated.
+    """
+    fields = ['color_code', image_flag] if image_flag else ['color_code']
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk').only('pk', 'color', *fields)[:batch_size])
+        if not batch:
+            return updated
+        changed = []
+        for item in batch:
+            code = normalize_color(item.color)
+            if not code and image_flag and getattr(item, image_flag):
+                continue
+            if code != item.color_code:
+                item.color_code = code
+                if image_flag:
+                    setattr(item, image_flag, False)
+                changed.append(item)
+        queryset.bulk_update(changed, fields)
+        updated += len(changed)
+        last_pk = batch[-1].pk
@@ -0,0 +1,149 @@
+"""
+PostgreSQL backend with psycopg 3 connection pooling.
+
+Django 5.0's PostgreSQL backend opens a new connection per request (or keeps
+one per thread with CONN_MAX_AGE). This backend instead checks connections out
+of a per-process ``psycopg_pool.ConnectionPool`` and returns them when Django
+closes the connection at the end of the request, so workers skip the TCP, TLS
+and auth handshake on every request.
+
+Pooling is enabled with ``OPTIONS['pool']``, using the same shape as Django
+5.1's native pool support (``True`` or a dict of ConnectionPool arguments), so
+upgrading Django later is a settings-only change. ``CONN_HEALTH_CHECKS`` makes
+the pool check connections before handing them out.
+"""
+import logging
+import threading
+import time
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.base.base import NO_DB_ALIAS
+
+logger = logging.getLogger(__name__)
+
+# Pool checkouts slower than this are logged as warnings (pool too small).
+SLOW_CHECKOUT_MS = 100
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    _connection_pools = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+        return {} if options is True else dict(options)
+
+    @property
+    def pool(self):
+        """The process-wide pool for this alias, created on first use."""
+        pool_options = self.pool_options
+        if pool_options is None:
+            return None
+
+        pool = self._connection_pools.get(self.alias)
+        if pool is not None:
+            if pool.kwargs.get('dbname') == self.settings_dict['NAME']:
+                return pool
+            # NAME changed (e.g. the test runner switched to the test
+            # database), so connections from the old pool are no good.
+            self.close_pool()
+
+        if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+            raise ImproperlyConfigured(
+                "Connection pooling doesn't support persistent connections; set CONN_MAX_AGE to 0."
+            )
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                'Error loading psycopg_pool module. Did you install psycopg[pool]?'
+            ) from e
+
+        with self._pools_lock:
+            if self.alias not in self._connection_pools:
+                connect_kwargs = self.get_connection_params()
+                # Django switches autocommit on/off itself after checkout.
+                connect_kwargs['autocommit'] = True
+                self._connection_pools[self.alias] = ConnectionPool(
+                    kwargs=connect_kwargs,
+                    name=self.alias,
+                    open=False,
+                    check=(
+                        ConnectionPool.check_connection
+                        if self.settings_dict['CONN_HEALTH_CHECKS'] else None
+                    ),
+                    **pool_options,
+                )
+        return self._connection_pools[self.alias]
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        options = self.settings_dict['OPTIONS']
+        if 'isolation_level' in options:
+            raise ImproperlyConfigured(
+                "OPTIONS['isolation_level'] isn't supported together with OPTIONS['pool']."
+            )
+        self.isolation_level = self.Database.IsolationLevel.READ_COMMITTED
+
+        # Opening is idempotent; the pool is opened lazily so that forking
+        # servers (gunicorn --preload) create it inside each worker.
+        pool.open()
+        started = time.monotonic()
+        connection = pool.getconn()
+        waited_ms = (time.monotonic() - started) * 1000
+        if waited_ms > SLOW_CHECKOUT_MS:
+            logger.warning(
+                f'Waited {waited_ms:.0f}ms for a connection from pool "{self.alias}" '
+                f'(max_size={pool.max_size}); consider raising DB_POOL_MAX_SIZE'
+            )
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # putconn() rolls back anything left open and discards broken
+            # connections instead of handing them to the next request.
+            self.connection._pool.putconn(self.connection)
+            self.connection = None
+
+    def close_pool(self):
+        """Close this alias' pool; the next connection creates a new one."""
+        with self._pools_lock:
+            pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+
+def pool_stats():
+    """
+    Return ``{alias: stats}`` for every open pool in this process.
+
+    Stats are psycopg_pool's counters (``pool_size``, ``pool_available``,
+    ``requests_waiting``, ``requests_wait_ms``, ``usage_ms``, ...). Cumulative
+    counters are reported since the process started.
+    """
+    return {
+        alias: pool.get_stats()
+        for alias, pool in sorted(DatabaseWrapper._connection_pools.items())
+    }
+
+
+def close_pools():
+    """Close every pool in this process (e.g. from a worker-exit hook)."""
+    with DatabaseWrapper._pools_lock:
+        pools = list(DatabaseWrapper._connection_pools.values())
+        DatabaseWrapper._connection_pools.clear()
+    for pool in pools:
+        pool.close()
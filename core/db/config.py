@@ -0,0 +1,87 @@
+"""
+Helpers for building DATABASES entries in settings.
+
+This module is imported from the settings files, so it must not import
+anything that needs configured Django settings.
+"""
+
+POSTGRES_ENGINES = (
+    'django.db.backends.postgresql',
+    'core.db.backends.postgresql',
+)
+POOLED_ENGINE = 'core.db.backends.postgresql'
+
+
+def pool_size_per_worker(max_connections, workers, reserved=0):
+    """
+    Split a database connection budget across worker processes.
+
+    ``max_connections`` is what the app may use in total (the server's
+    max_connections, or the PgBouncer pool size, minus what other clients
+    need); ``reserved`` connections are kept back for migrations, shells and
+    Celery. Every worker gets at least one connection.
+    """
+    return max(1, (max_connections - reserved) // max(1, workers))
+
+
+def configure_database(db, pool=True, min_size=1, max_size=4, timeout=10,
+                       max_idle=300, max_lifetime=1800, health_checks=True,
+                       pgbouncer=False):
+    """
+    Apply connection pooling and PgBouncer options to a DATABASES entry.
+
+    ``db`` is a settings dict, typically from ``dj_database_url.parse()``;
+    a new dict is returned. Non-PostgreSQL databases are returned unchanged.
+
+    - ``pool`` switches to the pooling backend with a per-process
+      ``psycopg_pool.ConnectionPool`` of ``min_size``..``max_size``
+      connections. ``timeout`` is how long a request waits for a free
+      connection before failing; idle connections above ``min_size`` are
+      closed after ``max_idle`` seconds and all are recycled after
+      ``max_lifetime`` seconds.
+    - ``health_checks`` checks connections before reuse.
+    - ``pgbouncer`` makes the connection safe behind PgBouncer in transaction
+      mode: no server-side cursors and no prepared statements, both of which
+      rely on session state that transaction pooling doesn't keep.
+    """
+    if db.get('ENGINE') not in POSTGRES_ENGINES:
+        return db
+
+    db = {**db, 'OPTIONS': dict(db.get('OPTIONS') or {})}
+    db['CONN_HEALTH_CHECKS'] = health_checks
+
+    if pgbouncer:
+        db['DISABLE_SERVER_SIDE_CURSORS'] = True
+        db['OPTIONS']['prepare_threshold'] = None
+
+    if pool:
+        db['ENGINE'] = POOLED_ENGINE
+        # Connections go back to the pool at the end of each request.
+        db['CONN_MAX_AGE'] = 0
+        db['OPTIONS']['pool'] = {
+            'min_size': min(min_size, max_size),
+            'max_size': max_size,
+            'timeout': timeout,
+            'max_idle': max_idle,
+            'max_lifetime': max_lifetime,
+        }
+    return db
+
+
+def configure_replicas(urls, **options):
+    """
+    Build the DATABASES entries of read replicas from their database URLs.
+
+    Replicas are named ``replica_1``, ``replica_2``... in ``urls`` order and
+    get the same ``configure_database()`` ``options`` as the primary. In
+    tests they mirror ``default``, so no separate test database is created.
+    """
+    import dj_database_url
+
+    replicas = {}
+    for index, url in enumerate(urls, start=1):
+        replicas[f'replica_{index}'] = {
+            **configure_database(dj_database_url.parse(url), **options),
+            'TEST': {'MIRROR': 'default'},
+        }
+    return replicas
@@ -0,0 +1,182 @@
+"""
+Primary/replica database routing.
+
+Reads made while serving a safe (GET/HEAD/OPTIONS) request go to one of the
+read replicas listed in ``settings.DATABASE_REPLICAS``; everything else goes to
+the primary (``default``):
+
+- writes, and any read after a write in the same request;
+- every query of an unsafe (POST/PUT/PATCH/DELETE) request;
+- reads inside ``transaction.atomic`` on the primary;
+- reads outside a request (Celery, management commands, shells), unless
+  wrapped in ``use_replicas()``;
+- for ``DATABASE_REPLICA_PIN_SECONDS`` after a user's write, that user's
+  requests, so they read their own writes despite replication lag (e.g.
+  creating a post and then loading the feed).
+
+ReplicaRoutingMiddleware tracks the request state; the pin is stored in the
+default cache so it holds across workers.
+"""
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+def get_replicas():
+    """Aliases of the configured read replicas."""
+    return [
+        alias for alias in getattr(settings, 'DATABASE_REPLICAS', [])
+        if alias in connections
+    ]
+
+
+def _pin_key(user_id):
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Send ``user_id``'s reads to the primary for the pin window."""
+    try:
+        cache.set(_pin_key(user_id), True, timeout=getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5))
+    except Exception as e:
+        logger.warning(f'Could not pin user {user_id} to the primary database: {str(e)}')
+
+
+def is_pinned_to_primary(user_id):
+    try:
+        return bool(cache.get(_pin_key(user_id)))
+    except Exception as e:
+        logger.debug(f'Could not read primary pin for user {user_id}: {str(e)}')
+        return False
+
+
+def _authenticated_user_id(request):
+    """
+    Id of the request's user if authentication has already run, else None.
+
+    Never triggers authentication itself: a lazy ``request.user`` that hasn't
+    been evaluated yet is treated as unknown.
+    """
+    user = getattr(request, '__dict__', {}).get('user')
+    if user is None:
+        return None
+    if isinstance(user, LazyObject):
+        if user._wrapped is empty:
+            return None
+        user = user._wrapped
+    return user.pk if user.is_authenticated else None
+
+
+class RoutingState:
+    """Per-request (or per-block) routing decisions."""
+
+    def __init__(self, request=None, use_primary=False):
+        self.request = request
+        self.use_primary = use_primary
+        self.wrote = False
+        self.replica = None
+        self._pin_checked = request is None
+
+    def wants_primary(self):
+        if self.use_primary or self.wrote:
+            return True
+        if not self._pin_checked:
+            user_id = _authenticated_user_id(self.request)
+            if user_id is not None:
+                self._pin_checked = True
+                self.use_primary = is_pinned_to_primary(user_id)
+        return self.use_primary
+
+
+@contextmanager
+def use_primary():
+    """Send every query in the block to the primary."""
+    token = _routing_state.set(RoutingState(use_primary=True))
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+@contextmanager
+def use_replicas():
+    """Allow reads in the block to go to a replica, e.g. in a reporting task."""
+    token = _routing_state.set(RoutingState())
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Route reads to read replicas and writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return None
+        state = _routing_state.get()
+        if state is None or state.wants_primary():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            # One replica per request, so paginated reads are consistent.
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track routing state per request and pin users to the primary after writes.
+
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replicas():
+            return self.get_response(request)
+
+        state = RoutingState(request, use_primary=request.method not in SAFE_METHODS)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        if state.wrote:
+            user_id = _authenticated_user_id(request)
+            if user_id is not None:
+                pin_to_primary(user_id)
+        return response
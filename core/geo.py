@@ -0,0 +1,114 @@
+"""
+Geohash cells for indexed proximity queries.
+
+A geohash is a base32 string naming a latitude/longitude cell; every extra
+character splits the cell into 32, and all points in a cell share its hash as
+a prefix. Storing each point's full geohash in an indexed column turns "points
+near here" into a few B-tree range scans (``geohash >= cell AND geohash <
+cell + '{'``, one per covering cell), without a spatial database extension.
+The cells found that way are then narrowed down with a bounding box and an
+exact great-circle distance.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 12
+# Sorts after every base32 character: the exclusive upper bound of a prefix range
+PREFIX_END = '{'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def valid_coordinates(lat, lng):
+    return lat is not None and lng is not None and -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def encode_geohash(lat, lng, precision=PRECISION):
+    """Geohash of the cell of ``precision`` characters containing (``lat``, ``lng``)."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # bits alternate between longitude and latitude, longitude first
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            interval[0] = middle
+        else:
+            value *= 2
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(latitude, longitude) span in degrees of a geohash cell."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lng_bits
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    (south, west, north, east) degrees enclosing the circle of ``radius_km``.
+
+    ``west`` is greater than ``east`` when the box crosses the antimeridian.
+    Returns None when the circle reaches a pole, where no longitude range
+    bounds it.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    south, north = lat - d_lat, lat + d_lat
+    if south <= -90 or north >= 90:
+        return None
+    d_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    if d_lng >= 180:
+        return None
+    west = (lng - d_lng + 540) % 360 - 180
+    east = (lng + d_lng + 540) % 360 - 180
+    return south, west, north, east
+
+
+def covering_cells(lat, lng, radius_km, max_cells=9):
+    """
+    Geohash prefixes of the cells covering the circle of ``radius_km``.
+
+    Uses the longest prefix for which the circle's bounding box overlaps at
+    most ``max_cells`` cells. Returns None if the circle has no bounding box,
+    or if even one-character cells are too small; callers then fall back to a
+    bounding-box query.
+    """
+    box = bounding_box(lat, lng, radius_km)
+    if box is None:
+        return None
+    south, west, north, east = box
+    width = (east - west) % 360
+    for precision in range(PRECISION, 0, -1):
+        lat_span, lng_span = cell_size(precision)
+        steps_lat = math.ceil((north - south) / lat_span)
+        steps_lng = math.ceil(width / lng_span)
+        if (steps_lat + 1) * (steps_lng + 1) > max_cells:
+            continue
+        # Sample the box one cell apart (and at its far edges): every cell it overlaps gets a sample
+        cells = set()
+        for i in range(steps_lat + 1):
+            point_lat = min(south + i * lat_span, north)
+            for j in range(steps_lng + 1):
+                point_lng = (west + min(j * lng_span, width) + 540) % 360 - 180
+                cells.add(encode_geohash(point_lat, point_lng, precision))
+        return sorted(cells)
+    return None
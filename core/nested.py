@@ -0,0 +1,138 @@
+"""
+Bulk writes for nested create serializers.
+
+Serializers that create an object together with its children (outfit items,
+lookbook outfits, wardrobe item attributes, post images) describe each kind
+of child as ``NestedChildren``. Every child is built and validated before
+anything is written; then the parent is created and each child model is
+inserted with one ``bulk_create``, all in one transaction, so the number of
+queries does not grow with the number of children.
+
+``bulk_create`` skips ``Model.save()`` and its signals: fields a child model
+derives in ``save()`` must be set by the ``prepare`` callback. ``prepare``
+runs only once every child is valid, inside the transaction; files it
+stores (uploads moved into storage) are deleted again if the transaction
+fails, so a rejected or failed create leaves no orphaned files.
+"""
+from collections import namedtuple
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, transaction
+from rest_framework import serializers
+
+# Serializer field the children came from (for error messages), child model,
+# foreign key to the parent, field dicts, optional callback run on each
+# validated, unsaved child, and fields not validated (e.g. files stored by
+# ``prepare``)
+NestedChildren = namedtuple(
+    'NestedChildren', ['name', 'model', 'parent_field', 'rows', 'prepare', 'exclude'], defaults=(None, ())
+)
+
+
+def build_children(spec):
+    """
+    Unsaved, validated ``spec.model`` instances for ``spec.rows``, not prepared yet.
+
+    Fields are checked with ``clean_fields``; foreign keys other than the
+    parent are checked with one query per key rather than one per child.
+    Raises a DRF ValidationError keyed by ``spec.name`` with one error dict
+    per row, as a nested list serializer would.
+    """
+    instances = [spec.model(**row) for row in spec.rows]
+
+    foreign_keys = [
+        field for field in spec.model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey) and field.name != spec.parent_field and field.name not in spec.exclude
+    ]
+    skipped = {spec.parent_field, *spec.exclude, *(field.name for field in foreign_keys)}
+    errors = [{} for _ in instances]
+    for error, instance in zip(errors, instances):
+        try:
+            instance.clean_fields(exclude=skipped)
+        except DjangoValidationError as e:
+            error.update({field: [str(message) for message in messages] for field, messages in e.message_dict.items()})
+
+    for field in foreign_keys:
+        values = {getattr(instance, field.attname) for instance in instances} - {None}
+        target = field.target_field.attname
+        existing = set(
+            field.related_model._base_manager.filter(**{f'{target}__in': values}).values_list(target, flat=True)
+        ) if values else set()
+        for error, instance in zip(errors, instances):
+            value = getattr(instance, field.attname)
+            if value is None and not field.null:
+                error.setdefault(field.name, []).append('This field is required.')
+            elif value is not None and value not in existing:
+                error.setdefault(field.name, []).append(f'{field.related_model._meta.verbose_name.capitalize()} {value} does not exist.')
+
+    if any(errors):
+        raise serializers.ValidationError({spec.name: errors})
+    return instances
+
+
+def _pending_files(instance):
+    """File fields of ``instance`` holding an upload that is not in storage yet."""
+    return [
+        field.attname for field in instance._meta.concrete_fields
+        if isinstance(field, models.FileField)
+        and getattr(instance, field.attname) and not getattr(instance, field.attname)._committed
+    ]
+
+
+def _prepare_children(children, built, stored):
+    """Run each spec's ``prepare`` on its instances, adding the files it stored to ``stored``."""
+    for spec, instances in zip(children, built):
+        if not spec.prepare:
+            continue
+        for instance in instances:
+            pending = _pending_files(instance)
+            spec.prepare(instance)
+            for attname in pending:
+                file = getattr(instance, attname)
+                if file and file._committed:
+                    stored.append((file.storage, file.name))
+
+
+def _insert_children(parent, children, built):
+    for spec, instances in zip(children, built):
+        for instance in instances:
+            setattr(instance, spec.parent_field, parent)
+        spec.model.objects.bulk_create(instances)
+
+
+def _write(children, built, create_parent):
+    """Prepare and insert ``built`` children of ``create_parent()`` in one transaction."""
+    stored = []
+    try:
+        with transaction.atomic():
+            _prepare_children(children, built, stored)
+            parent = create_parent()
+            _insert_children(parent, children, built)
+    except BaseException:
+        for storage, name in stored:
+            storage.delete(name)
+        raise
+    return parent
+
+
+def bulk_create_children(parent, children):
+    """
+    Validate ``children`` of an existing ``parent`` and insert them.
+
+    One ``bulk_create`` per child model, in one transaction. Returns the
+    created instances of each spec, in order.
+    """
+    built = [build_children(spec) for spec in children]
+    _write(children, built, lambda: parent)
+    return built
+
+
+def create_nested(model, fields, children=()):
+    """
+    Create a ``model`` row from ``fields`` together with its ``children``.
+
+    Children are validated before the parent is written. The parent is saved
+    normally (so its ``save()`` and signals run) and the children are bulk
+    inserted in the same transaction. Returns the parent.
+    """
+    built = [build_children(spec) for spec in children]
+    return _write(children, built, lambda: model.objects.create(**fields))
@@ -0,0 +1,111 @@
+"""
+Hard purge of soft-deleted rows.
+
+Posts, comments and wardrobe items are soft-deleted (``is_deleted`` and
+``deleted_at``) so deletes can be reviewed or undone for a while. Once the
+``GRACE_DAYS`` grace period has passed, ``purge_soft_deleted`` removes them
+for good, together with every row that cascades from them (images, likes,
+saves, comments and their likes, tag links, wear logs, ...), and deletes
+their stored files once the transaction commits.
+
+Work is bounded: rows are purged ``BATCH_SIZE`` at a time, and so are their
+children, depth first, so no single statement or transaction touches more
+than a batch of rows however many likes or comments a post collected.
+``delete_with_children`` applies the same bounded cascade to any rows, e.g.
+those of a deleted account.
+"""
+import logging
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOFT_DELETE_PURGE = {
+    'GRACE_DAYS': 30,
+    'BATCH_SIZE': 500,
+}
+
+
+def purge_config():
+    return {**DEFAULT_SOFT_DELETE_PURGE, **getattr(settings, 'SOFT_DELETE_PURGE', {})}
+
+
+def _cascade_relations(model):
+    """Reverse foreign keys whose rows are deleted with ``model``'s (self-references excluded)."""
+    return [
+        relation for relation in model._meta.related_objects
+        if relation.on_delete is models.CASCADE and relation.related_model is not model and not relation.many_to_many
+    ]
+
+
+def _stored_files(model, pks):
+    fields = [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+    if not fields:
+        return []
+    files = []
+    for row in model._base_manager.filter(pk__in=pks).values_list(*(field.attname for field in fields)):
+        files += [(field.storage, name) for field, name in zip(fields, row) if name]
+    return files
+
+
+def _delete_files(files):
+    for storage, name in files:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f'Could not delete purged file {name}: {str(e)}')
+
+
+def _delete_rows(model, lookup, values, batch_size, counts):
+    """Delete ``model`` rows whose ``lookup`` is in ``values``, children first, ``batch_size`` rows at a time."""
+    rows = model._base_manager.filter(**{f'{lookup}__in': values}).order_by('pk')
+    while True:
+        batch = list(rows.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return
+        for relation in _cascade_relations(model):
+            _delete_rows(relation.related_model, relation.field.name, batch, batch_size, counts)
+        files = _stored_files(model, batch)
+        with transaction.atomic():
+            # Only self-references (e.g. comment replies) and SET_NULL links are left to the collector
+            _, deleted = model._base_manager.filter(pk__in=batch).delete()
+            transaction.on_commit(partial(_delete_files, files))
+        counts.update({label: count for label, count in deleted.items() if count})
+
+
+def delete_with_children(model, pks, batch_size=None):
+    """
+    Hard-delete the ``model`` rows ``pks`` with their children, ``batch_size`` rows at a time.
+
+    Returns the number of rows deleted per model label.
+    """
+    counts = Counter()
+    _delete_rows(model, 'pk', list(pks), batch_size or purge_config()['BATCH_SIZE'], counts)
+    return dict(counts)
+
+
+def purge_soft_deleted(model, grace_days=None, batch_size=None, now=None):
+    """
+    Hard-delete ``model`` rows soft-deleted more than ``grace_days`` ago, with their children.
+
+    Returns the number of rows deleted per model label.
+    """
+    config = purge_config()
+    grace_days = config['GRACE_DAYS'] if grace_days is None else grace_days
+    batch_size = batch_size or config['BATCH_SIZE']
+    cutoff = (now or timezone.now()) - timedelta(days=grace_days)
+
+    expired = model._base_manager.filter(is_deleted=True, deleted_at__lt=cutoff).order_by('pk')
+    counts = Counter()
+    while True:
+        batch = list(expired.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            if counts:
+                logger.info(f'Purged soft-deleted {model._meta.label} rows: {dict(counts)}')
+            return dict(counts)
+        _delete_rows(model, 'pk', batch, batch_size, counts)
+
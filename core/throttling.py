@@ -0,0 +1,145 @@
+"""
+Redis-backed throttling for write endpoints.
+
+``GCRAThrottle`` limits a view per ``throttle_scope`` with the generic cell
+rate algorithm, a token bucket that stores a single timestamp per client:
+the "theoretical arrival time" (TAT) at which the client's bucket is full
+again. A scope allows ``RATE`` requests on average with bursts of up to
+``BURST``; each decision is one atomic Lua script call (one round trip), and
+the script reads the time from Redis so application servers' clocks do not
+matter.
+
+Clients are keyed by user id, or by IP address for anonymous requests (or
+always, with ``'KEY': 'ip'``). Throttling fails open: if Redis errors or is
+slower than ``SOCKET_TIMEOUT``, the request is allowed and Redis is not
+tried again for ``RETRY_AFTER_ERROR`` seconds, so an outage costs at most
+one timeout per process every few seconds.
+"""
+import logging
+import threading
+import time
+import redis
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THROTTLING = {
+    'ENABLED': True,
+    'REDIS_URL': 'redis://127.0.0.1:6379/1',
+    'KEY_PREFIX': 'throttle',
+    'SOCKET_TIMEOUT': 0.05,
+    'RETRY_AFTER_ERROR': 5,
+    'RATES': {},
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# KEYS[1]: the client's TAT key. ARGV[1]: emission interval (ms), ARGV[2]: burst size.
+# Returns {allowed (0/1), milliseconds until the next request would be allowed}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if now < allow_at then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, 0}
+"""
+
+
+def throttling_config():
+    return {**DEFAULT_THROTTLING, **getattr(settings, 'THROTTLING', {})}
+
+
+def parse_rate(rate):
+    """``(requests, seconds)`` from a rate like ``'60/min'`` or ``'1000/day'``."""
+    requests, period = rate.split('/')
+    return int(requests), PERIODS[period[0]]
+
+
+class GCRALimiter:
+    """Runs the GCRA script on the throttling Redis, failing open."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._script = None
+        self._url = None
+        self._unavailable_until = 0.0
+
+    def _get_script(self, config):
+        if self._script is None or self._url != config['REDIS_URL']:
+            with self._lock:
+                if self._script is None or self._url != config['REDIS_URL']:
+                    client = redis.Redis.from_url(
+                        config['REDIS_URL'],
+                        socket_timeout=config['SOCKET_TIMEOUT'],
+                        socket_connect_timeout=config['SOCKET_TIMEOUT'],
+                    )
+                    self._script = client.register_script(GCRA_SCRIPT)
+                    self._url = config['REDIS_URL']
+        return self._script
+
+    def hit(self, key, interval_ms, burst):
+        """
+        Count one request against ``key``.
+
+        Returns ``(allowed, retry_after_ms)``; always allowed while Redis is
+        unavailable.
+        """
+        config = throttling_config()
+        if time.monotonic() < self._unavailable_until:
+            return True, 0
+        try:
+            allowed, retry_after_ms = self._get_script(config)(keys=[key], args=[interval_ms, burst])
+        except (redis.RedisError, OSError) as e:
+            self._unavailable_until = time.monotonic() + config['RETRY_AFTER_ERROR']
+            logger.warning(f'Throttling unavailable, allowing requests for {config["RETRY_AFTER_ERROR"]}s: {str(e)}')
+            return True, 0
+        return bool(allowed), retry_after_ms
+
+
+limiter = GCRALimiter()
+
+
+class GCRAThrottle(BaseThrottle):
+    """
+    Throttle a view by its ``throttle_scope``, as configured in ``THROTTLING['RATES']``.
+
+    Each scope has a ``RATE`` (e.g. ``'60/min'``), an optional ``BURST``
+    (default 1) and an optional ``KEY`` (``'user'``, the default, or
+    ``'ip'``). Views without a configured scope are not throttled.
+    """
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_ident_key(self, request, key_by):
+        if key_by == 'user' and request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        config = throttling_config()
+        self.scope = getattr(view, 'throttle_scope', None)
+        scope_config = config['RATES'].get(self.scope)
+        if not config['ENABLED'] or not scope_config:
+            return True
+
+        requests, seconds = parse_rate(scope_config['RATE'])
+        key = f"{config['KEY_PREFIX']}:{self.scope}:{self.get_ident_key(request, scope_config.get('KEY', 'user'))}"
+        allowed, retry_after_ms = limiter.hit(key, max(seconds * 1000 // requests, 1), scope_config.get('BURST', 1))
+        if not allowed:
+            self.retry_after = retry_after_ms / 1000
+        return allowed
+
+    def wait(self):
+        return self.retry_after
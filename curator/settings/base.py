@@ -79,6 +79,7 @@ INSTALLED_APPS = [
     'apps.cart',
     'apps.social',
     'apps.lookbooks',
+    'apps.tags',
     'apps.search',
     'apps.test_dashboard',
 ]
@@ -90,6 +91,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
@@ -117,25 +119,54 @@ WSGI_APPLICATION = 'curator.wsgi.application'
 ASGI_APPLICATION = 'curator.asgi.application'
 
 # Database
+# Connection pooling (psycopg_pool) and PgBouncer settings, applied to PostgreSQL
+# databases by configure_database(). Pools are per worker process, so the
+# default max size splits DB_MAX_CONNECTIONS across WEB_CONCURRENCY workers.
+from core.db.config import configure_database, configure_replicas, pool_size_per_worker
+
+DATABASE_POOL = {
+    'pool': config('DB_POOL', default=True, cast=bool),
+    'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+    'max_size': config('DB_POOL_MAX_SIZE', default=pool_size_per_worker(
+        config('DB_MAX_CONNECTIONS', default=20, cast=int),
+        config('WEB_CONCURRENCY', default=4, cast=int),
+        reserved=config('DB_RESERVED_CONNECTIONS', default=4, cast=int),
+    ), cast=int),
+    'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),  # seconds to wait for a connection
+    'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+    'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+    'health_checks': config('DB_HEALTH_CHECKS', default=True, cast=bool),
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode
+    'pgbouncer': config('DB_PGBOUNCER', default=False, cast=bool),
+}
+
 # Support DATABASE_URL for easy configuration (used in production)
 DATABASE_URL = config('DATABASE_URL', default=None)
 if DATABASE_URL:
     import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL)
+        'default': configure_database(dj_database_url.parse(DATABASE_URL), **DATABASE_POOL)
     }
 else:
     DATABASES = {
-        'default': {
+        'default': configure_database({
             'ENGINE': 'django.db.backends.postgresql',
             'NAME': config('DB_NAME', default='curator_db'),
             'USER': config('DB_USER', default='curator_user'),
             'PASSWORD': config('DB_PASSWORD', default='curator_pass'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
-        }
+        }, **DATABASE_POOL)
     }
 
+# Read replicas: safe-method reads go to these, see core.db.routers
+DATABASE_REPLICA_URLS = config('DATABASE_REPLICA_URLS', default='', cast=Csv())
+DATABASES.update(configure_replicas(DATABASE_REPLICA_URLS, **DATABASE_POOL))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Seconds a user's reads stay on the primary after they write
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+DATABASE_ROUTERS = ['core.db.routers.PrimaryReplicaRouter']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -180,7 +211,7 @@ SITE_ID = 1
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -223,19 +254,119 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+CELERY_BEAT_SCHEDULE = {
+    'maintain-notification-partitions': {
+        'task': 'apps.notifications.tasks.maintain_notification_partitions',
+        'schedule': timedelta(days=1),
+    },
+    'prune-hashtag-usage-rollups': {
+        'task': 'apps.social.tasks.prune_hashtag_usage_rollups',
+        'schedule': timedelta(hours=6),
+    },
+    'rebuild-wear-rollups': {
+        'task': 'apps.wardrobe.tasks.rebuild_wear_rollups',
+        'schedule': timedelta(days=1),
+    },
+    'purge-deleted-posts': {
+        'task': 'apps.social.tasks.purge_deleted_posts',
+        'schedule': timedelta(days=1),
+    },
+    'purge-deleted-wardrobe-items': {
+        'task': 'apps.wardrobe.tasks.purge_deleted_wardrobe_items',
+        'schedule': timedelta(days=1),
+    },
+    'requeue-stalled-posts': {
+        'task': 'apps.social.tasks.requeue_stalled_posts',
+        'schedule': timedelta(minutes=15),
+    },
+    'requeue-stalled-wardrobe-imports': {
+        'task': 'apps.wardrobe.tasks.requeue_stalled_imports',
+        'schedule': timedelta(minutes=15),
+    },
+    'resume-account-deletions': {
+        'task': 'apps.accounts.tasks.resume_account_deletions',
+        'schedule': timedelta(minutes=15),
+    },
+    'release-expired-promo-reservations': {
+        'task': 'apps.cart.tasks.release_expired_promo_reservations',
+        'schedule': timedelta(minutes=5),
+    },
+}
+
+# Deferred work (post publishing, For You ranking, import images, account teardown), see core.background
+BACKGROUND_TASKS = {
+    'BACKEND': config('BACKGROUND_TASKS_BACKEND', default='celery'),  # celery, thread (development) or sync
+    'THREAD_WORKERS': config('BACKGROUND_THREAD_WORKERS', default=4, cast=int),
+}
+
+# Hard purge of soft-deleted posts, comments and wardrobe items, see core.purge
+SOFT_DELETE_PURGE = {
+    'GRACE_DAYS': config('SOFT_DELETE_GRACE_DAYS', default=30, cast=int),
+    'BATCH_SIZE': 500,  # parent rows, and child rows, per delete statement
+}
+
+# Background teardown of deleted accounts' data, see apps.accounts.teardown
+ACCOUNT_TEARDOWN = {
+    'BATCH_SIZE': 500,  # rows per table per transaction
+    'STALLED_AFTER': 900,  # seconds without progress before a running teardown is requeued
+    'MAX_ATTEMPTS': 5,
+}
+
+# Monthly notification partitions (PostgreSQL), see apps.notifications.partitions
+NOTIFICATION_PARTITIONS = {
+    'MONTHS_AHEAD': 3,  # partitions pre-created ahead of the current month
+    'RETENTION_MONTHS': config('NOTIFICATION_RETENTION_MONTHS', default=12, cast=int),
+    'ARCHIVE': config('NOTIFICATION_ARCHIVE', default=True, cast=bool),  # gzipped JSONL in default storage
+    'ARCHIVE_PATH': 'archives/notifications',
+    'RECENT_DAYS': 90,  # inbox reads only look this far back, so old partitions are pruned
+}
 
 # Cache Configuration
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
-        'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-        },
         'KEY_PREFIX': 'curatorai',
     }
 }
 
+# Redis token-bucket (GCRA) throttling of write endpoints, see core.throttling
+THROTTLING = {
+    'ENABLED': config('THROTTLING_ENABLED', default=True, cast=bool),
+    'REDIS_URL': config('THROTTLE_REDIS_URL', default=config('REDIS_URL', default='redis://127.0.0.1:6379/1')),
+    'SOCKET_TIMEOUT': 0.05,  # seconds; slower Redis calls let the request through
+    'RETRY_AFTER_ERROR': 5,  # seconds requests are let through after a Redis error
+    # Per view throttle_scope; KEY is 'user' (IP when anonymous) or 'ip'
+    'RATES': {
+        'post_like': {'RATE': '100/min', 'BURST': 20},
+        'post_save': {'RATE': '100/min', 'BURST': 20},
+        'post_share': {'RATE': '30/min', 'BURST': 10},
+        'comment_add': {'RATE': '20/min', 'BURST': 5},
+        'follow': {'RATE': '60/min', 'BURST': 10},
+    },
+}
+
+# Authenticated-user cache used by CachedJWTAuthentication
+AUTH_USER_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TTL': config('AUTH_USER_CACHE_TTL', default=60, cast=int),  # seconds in the shared cache
+    'LOCAL_TTL': config('AUTH_USER_CACHE_LOCAL_TTL', default=5, cast=int),  # seconds in process memory
+    # One-to-one relations loaded and cached with the user
+    'SELECT_RELATED': ['profile', 'style_preference'],
+}
+
+# Promo code lookups (usage is always reserved in the database)
+PROMO_CODE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TTL': config('PROMO_CODE_CACHE_TTL', default=300, cast=int),  # seconds in the shared cache
+    'LOCAL_TTL': 10,  # seconds in process memory
+}
+
+# Promo code uses reserved by carts, see apps.cart.promos
+PROMO_CODE_RESERVATION = {
+    'HOLD_FOR': config('PROMO_CODE_HOLD_FOR', default=1800, cast=int),  # seconds a cart holds its code's use
+}
+
 # AWS S3 Settings (Optional)
 USE_S3 = config('USE_S3', default=False, cast=bool)
 
@@ -349,6 +480,14 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+# OAuth provider verification
+# Google ID tokens are verified locally against this cached key set
+GOOGLE_JWKS_URL = config('GOOGLE_JWKS_URL', default='https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_JWKS_CACHE_SECONDS = config('GOOGLE_JWKS_CACHE_SECONDS', default=3600, cast=int)
+# Timeout (seconds) and connection pool size for remaining provider HTTP calls
+OAUTH_HTTP_TIMEOUT = config('OAUTH_HTTP_TIMEOUT', default=5, cast=float)
+OAUTH_HTTP_POOL_SIZE = config('OAUTH_HTTP_POOL_SIZE', default=10, cast=int)
+
 # Email Configuration (Console for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -389,3 +528,63 @@ ML_VISUAL_SEARCH_SERVICE_URL = config('ML_VISUAL_SEARCH_SERVICE_URL', default='h
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/webp']
 
+
+# Outfit image embeddings, see apps.outfits.embeddings
+EMBEDDINGS = {
+    'MODEL_VERSION': config('EMBEDDING_MODEL_VERSION', default='v1'),
+    'DTYPE': config('EMBEDDING_DTYPE', default='float32'),  # float32 or float16
+}
+
+# Post publishing: uploaded images are resized in the background, see apps.social.publishing
+POST_PUBLISHING = {
+    'STAGING_PATH': 'posts/staging',  # raw uploads, deleted once processed
+    'MAX_WIDTH': 1920,
+    'QUALITY': 85,
+    'STALLED_AFTER': 900,  # seconds a post may stay processing before it is queued again
+    'FAIL_AFTER': 86400,  # seconds after creation before a processing post is marked failed
+}
+
+# Hashtag feeds and trending hashtags, see apps.social.hashtags
+HASHTAGS = {
+    'HALF_LIFE_HOURS': config('HASHTAG_TRENDING_HALF_LIFE_HOURS', default=12, cast=int),
+    'HOURLY_WINDOW_HOURS': 48,  # hourly buckets kept and ranked, older days use daily buckets
+    'DAILY_WINDOW_DAYS': 7,
+    'TRENDING_CACHE_TTL': 300,  # seconds
+    'FEED_PAGE_SIZE': 20,
+    'MAX_FEED_PAGE_SIZE': 50,
+}
+
+# Nearby posts feed (geohash-indexed post locations), see apps.social.nearby
+NEARBY_FEED = {
+    'DEFAULT_RADIUS_KM': 10,
+    'MAX_RADIUS_KM': 200,
+    'KM_PER_DAY': 1.0,  # recency weight: a post a day older ranks like one a km further away
+    'DISTANCE_STEP_KM': 0.1,  # distances are rounded to this, so post locations can't be triangulated
+    'MAX_CANDIDATES': 5000,  # most recent posts in range that are ranked
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 50,
+}
+
+# Personalized "For You" feed ranking, see apps.social.ranking
+FOR_YOU = {
+    'CANDIDATE_WINDOW_DAYS': 14,
+    'CANDIDATES_PER_SOURCE': 300,  # followed authors, similar users, trending
+    'SIMILAR_USERS': 50,
+    'AFFINITY_WINDOW_DAYS': 60,
+    'FRESHNESS_HALF_LIFE_HOURS': 24,
+    'WEIGHTS': {'affinity': 3.0, 'tag_overlap': 2.0, 'velocity': 1.5, 'freshness': 1.0},
+    'FEED_SIZE': 500,  # ranked post ids cached per user
+    'CACHE_TTL': 3600,  # seconds
+    'REFRESH_AFTER': 600,  # seconds before a cached list is re-ranked in the background
+}
+
+
+# Wardrobe Bulk Import
+WARDROBE_IMPORT = {
+    'BATCH_SIZE': 500,  # rows per bulk_create
+    'MAX_ROWS': 5000,
+    'MAX_FILE_SIZE': 5 * 1024 * 1024,  # 5MB
+    'IMAGE_WORKERS': config('WARDROBE_IMPORT_IMAGE_WORKERS', default=4, cast=int),  # concurrent downloads per job
+    'IMAGE_TIMEOUT': 10,  # seconds per image download
+    'STALLED_AFTER': 900,  # seconds without progress before a job's image fetches are requeued
+}
@@ -13,6 +13,19 @@ DATABASES = {
     }
 }
 
+# Use in-process cache unless Redis is configured (no Redis required)
+if not config('REDIS_URL', default=''):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'curatorai-dev',
+        }
+    }
+    # Throttling needs Redis as well
+    THROTTLING['ENABLED'] = False
+    # ... and so does the Celery broker: run background work in-process
+    BACKGROUND_TASKS['BACKEND'] = 'thread'
+
 # Add debug toolbar for development (if available)
 try:
     import debug_toolbar
@@ -118,7 +118,7 @@ else:
 
 DATABASE_URL = config('DATABASE_URL', default=None)
 if DATABASE_URL:
-    DATABASES['default'] = dj_database_url.parse(DATABASE_URL)
+    DATABASES['default'] = configure_database(dj_database_url.parse(DATABASE_URL), **DATABASE_POOL)
 elif IS_BUILD:
     # During build, use PostgreSQL with dummy connection to avoid SQLite dependency
     # SQLite is not available in Vercel build environment
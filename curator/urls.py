@@ -83,6 +83,7 @@ urlpatterns = [
     path('api/v1/social/', include('apps.social.urls')),
     path('api/v1/lookbooks/', include('apps.lookbooks.urls')),
     path('api/v1/search/', include('apps.search.urls')),
+    path('api/v1/tags/', include('apps.tags.urls')),
     
     # ML Search endpoints (legacy/alternative paths)
     path('ml/search/upload', VisualSearchUploadView.as_view(), name='ml-search-upload'),